@@ -458,6 +458,10 @@ def _weekly_correlations_legacy(ctx) -> List[Finding]:
     hr_df = wellness.get("raw_heart_rate", pd.DataFrame())
     act_df = wellness.get("raw_activity_daily", pd.DataFrame())
     activities_df = ctx.get("activities_df")
+    snapshot = ctx.get("snapshot")
+    if snapshot is not None:
+        # Lag patterns need the whole window, not just the last 7 days.
+        activities_df = snapshot.activities()
     if sleep_df.empty:
         return []
     findings = []
@@ -1,7 +1,7 @@
 import numpy as np
 
 from analytics.training_load import normalized_power
-from strava.streams import aligned_arrays, parse_streams_json
+from strava.streams import aligned_arrays, parse_streams
 
 
 def _half_split_metric(streams, value_key, stable_key=None, stable_tolerance=0.1):
@@ -31,8 +31,9 @@ def _half_split_metric(streams, value_key, stable_key=None, stable_tolerance=0.1
     return {"first_half": m1, "second_half": m2, "drift": drift}
 
 
-def compute_activity_metrics(streams_json, sport_type):
-    streams = parse_streams_json(streams_json)
+def compute_activity_metrics(streams, sport_type):
+    if not isinstance(streams, dict):
+        streams = parse_streams(streams)
     out = {
         "hr_drift": None,
         "aerobic_decoupling": None,
@@ -10,6 +10,7 @@ import pandas as pd
 
 from analytics.digest_features import ELEVATED_MAGNITUDES, intensity_label, safe_float
 from analytics.stress_curve import analyze_stress_day
+from garmin.samples import row_samples
 
 
 def _magnitude_stress_positive(delta: Optional[float]) -> Optional[str]:
@@ -220,9 +221,10 @@ def build_stress_context(
         "settled_after": y.get("stress_settled_after"),
         "high_stress_minutes": safe_float(y.get("high_stress_minutes")),
     }
-    if raw_stress_row is not None and raw_stress_row.get("samples_json"):
+    samples = row_samples(raw_stress_row)
+    if samples is not None and len(samples):
         live = analyze_stress_day(
-            raw_stress_row.get("samples_json"),
+            samples,
             day_avg_stress=avg_y,
             bands_config=bands_config,
         )
@@ -18,11 +18,18 @@ def _env(name, *, default=None, required=True):
 
 class Settings:
     def __init__(self):
-        self.BQ_PROJECT_ID = _env("BQ_PROJECT_ID")
-        self.BQ_DATASET_ID = _env("BQ_DATASET_ID")
-        self.BQ_LOCATION = _env("BQ_LOCATION")
+        # "bigquery" (default) or "local" (Parquet + DuckDB under LOCAL_WAREHOUSE_DIR).
+        self.STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "bigquery").strip().lower()
+        if self.STORAGE_BACKEND not in ("bigquery", "local"):
+            raise RuntimeError(f"Unknown STORAGE_BACKEND: {self.STORAGE_BACKEND}")
+        # Local backend only: replay every write to BigQuery in the background.
+        self.BQ_MIRROR = os.getenv("BQ_MIRROR", "false").strip().lower() in ("1", "true", "yes")
+        needs_bq = self.STORAGE_BACKEND == "bigquery" or self.BQ_MIRROR
+        self.BQ_PROJECT_ID = _env("BQ_PROJECT_ID", required=needs_bq)
+        self.BQ_DATASET_ID = _env("BQ_DATASET_ID", required=needs_bq)
+        self.BQ_LOCATION = _env("BQ_LOCATION", required=needs_bq)
         self.SERVICE_ACCOUNT_PATH = Path(
-            _env("GOOGLE_APPLICATION_CREDENTIALS")
+            _env("GOOGLE_APPLICATION_CREDENTIALS", default="", required=needs_bq)
         ).expanduser()
         self.GARMIN_EMAIL = _env("GARMIN_EMAIL")
         self.GARMIN_PASSWORD = _env("GARMIN_PASSWORD")
@@ -47,9 +54,15 @@ class Settings:
         self.FTP_WATTS = float(_env("FTP_WATTS"))
         self.THRESHOLD_HR = float(_env("THRESHOLD_HR"))
         self.LOCAL_STATE_DIR = Path(_env("LOCAL_STATE_DIR")).expanduser()
+        self.LOCAL_WAREHOUSE_DIR = Path(
+            os.getenv("LOCAL_WAREHOUSE_DIR") or self.LOCAL_STATE_DIR / "warehouse"
+        ).expanduser()
         self.GARMIN_DEVICES = frozenset(
             {"garmin", "edge", "vivoactive", "forerunner", "fenix", "epix"}
         )
+        self.GARMIN_MAX_RPS = float(os.getenv("GARMIN_MAX_RPS", "3"))
+        self.GARMIN_CONCURRENCY = int(os.getenv("GARMIN_CONCURRENCY", "6"))
+        self.GARMIN_DAY_WORKERS = int(os.getenv("GARMIN_DAY_WORKERS", "3"))
         self.CTL_FLOOR = float(os.getenv("CTL_FLOOR", "30"))
         self.STRESS_TIME_BANDS = {
             "morning": os.getenv("STRESS_BAND_MORNING", "06:00–09:00"),
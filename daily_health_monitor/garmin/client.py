@@ -1,6 +1,10 @@
+import threading
 import time
 
-from util.retry import with_retry
+from util.rate_limit import RateLimiter, is_rate_limited
+
+RATE_LIMIT_RETRIES = 5
+RATE_LIMIT_BACKOFF_SEC = 15
 
 
 class GarminClient:
@@ -9,6 +13,13 @@ class GarminClient:
     def __init__(self, settings):
         self._settings = settings
         self._api = None
+        self._login_lock = threading.Lock()
+        self._limiter = RateLimiter(settings.GARMIN_MAX_RPS)
+
+    @property
+    def throttled(self):
+        """429 backoffs so far, across all threads."""
+        return self._limiter.backoffs
 
     @classmethod
     def get(cls, settings):
@@ -18,16 +29,33 @@ class GarminClient:
 
     @property
     def api(self):
-        if self._api is None:
-            from garminconnect import Garmin
-
-            self._api = Garmin(
-                self._settings.GARMIN_EMAIL,
-                self._settings.GARMIN_PASSWORD,
-                prompt_mfa=lambda: input("Garmin MFA code: ").strip(),
-            )
-            self._api.login(str(self._settings.GARMINTOKENS))
+        with self._login_lock:
+            if self._api is None:
+                from garminconnect import Garmin
+
+                api = Garmin(
+                    self._settings.GARMIN_EMAIL,
+                    self._settings.GARMIN_PASSWORD,
+                    prompt_mfa=lambda: input("Garmin MFA code: ").strip(),
+                )
+                api.login(str(self._settings.GARMINTOKENS))
+                self._api = api
         return self._api
 
     def call(self, fn, *args, retries=3, **kwargs):
-        return with_retry(fn, *args, retries=retries, **kwargs)
+        """Rate-limited call; 429s back off globally and don't use up ``retries``."""
+        attempt = 0
+        throttled = 0
+        while True:
+            self._limiter.acquire()
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                if is_rate_limited(e) and throttled < RATE_LIMIT_RETRIES:
+                    self._limiter.backoff(RATE_LIMIT_BACKOFF_SEC * 2**throttled)
+                    throttled += 1
+                    continue
+                attempt += 1
+                if attempt >= retries:
+                    raise
+                time.sleep(2 ** (attempt - 1))
@@ -8,16 +8,22 @@ from typing import Any, Dict, Optional
 
 import pandas as pd
 
+from garmin.samples import hr_arrays, row_samples
 from util.json_util import to_json
 
 
 def fetch_hrv_day(garmin_client, d) -> Dict[str, Any]:
     """Return raw_hrv row dict for date d."""
-    cdate = d.isoformat()
     try:
-        raw = garmin_client.call(garmin_client.api.get_hrv_data, cdate) or {}
+        raw = garmin_client.call(garmin_client.api.get_hrv_data, d.isoformat()) or {}
     except Exception:
         raw = {}
+    return hrv_row(d, raw)
+
+
+def hrv_row(d, raw: Any) -> Dict[str, Any]:
+    """raw_hrv row dict from a ``get_hrv_data`` response."""
+    cdate = d.isoformat()
     if not isinstance(raw, dict):
         raw = {}
 
@@ -49,35 +55,15 @@ def nocturnal_proxy_index(
     """Nocturnal autonomic proxy from overnight HR samples (NOT RMSSD)."""
     if hr_row is None or sleep_row is None:
         return None
-    samples_raw = hr_row.get("samples_json")
-    if not samples_raw:
-        return None
-    try:
-        samples = json.loads(samples_raw) if isinstance(samples_raw, str) else samples_raw
-    except (json.JSONDecodeError, TypeError):
-        return None
-    if not samples:
+    ts, bpm = hr_arrays(row_samples(hr_row))
+    if not len(ts):
         return None
 
     start_ms, end_ms = _sleep_window_ms(sleep_row)
     if start_ms is None or end_ms is None:
         return None
 
-    hrs = []
-    for item in samples:
-        if not isinstance(item, dict):
-            continue
-        t = item.get("t")
-        hr = item.get("hr")
-        if t is None or hr is None:
-            continue
-        try:
-            t_ms = int(t)
-            hr_f = float(hr)
-        except (TypeError, ValueError):
-            continue
-        if start_ms <= t_ms <= end_ms and hr_f > 0:
-            hrs.append(hr_f)
+    hrs = bpm[(ts >= start_ms) & (ts <= end_ms) & (bpm > 0)].astype(float).tolist()
 
     if len(hrs) < 3:
         return None
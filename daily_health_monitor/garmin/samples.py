@@ -0,0 +1,141 @@
+"""Garmin intraday samples (heart rate, stress): JSON payload shapes and compact blobs.
+
+``raw_heart_rate`` and ``raw_stress`` rows carry their samples in ``samples_bin``
+(``util.series_codec``: epoch-ms timestamps plus a uint8 ``hr`` / ``stress`` channel).
+Rows written before that column existed still have ``samples_json``; every reader goes
+through ``row_samples`` and the ``*_arrays`` helpers, which accept either.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from util.series_codec import decode_series, encode_series, is_series_blob
+
+
+def row_samples(row) -> Any:
+    """A raw_heart_rate / raw_stress row's samples: ``samples_bin`` when set, else JSON."""
+    if row is None:
+        return None
+    blob = row.get("samples_bin")
+    if is_series_blob(blob):
+        return blob
+    raw = row.get("samples_json")
+    return raw if isinstance(raw, (str, list, dict)) else None
+
+
+def _loads(samples: Any) -> Any:
+    if isinstance(samples, str):
+        try:
+            return json.loads(samples)
+        except (json.JSONDecodeError, TypeError):
+            return None
+    return samples
+
+
+def _channel(samples: Any, name: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    if not is_series_blob(samples):
+        return None
+    t, channels = decode_series(samples)
+    values = channels.get(name)
+    if values is None:
+        return t[:0], np.empty(0)
+    return t, values
+
+
+def _timestamp_ms(ts: Any) -> Optional[int]:
+    if isinstance(ts, (int, float)):
+        return int(ts)
+    if ts is None:
+        return None
+    try:
+        stamp = pd.Timestamp(ts)
+    except (ValueError, TypeError):
+        return None
+    if stamp is pd.NaT:
+        return None
+    # Wall-clock time, as the band/peak analysis reads it.
+    return stamp.tz_localize(None).value // 1_000_000
+
+
+def hr_arrays(samples: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """(epoch ms, bpm) from ``samples_bin`` or ``[{"t": ms, "hr": bpm}, ...]`` JSON."""
+    decoded = _channel(samples, "hr")
+    if decoded is not None:
+        return decoded
+    ts, hrs = [], []
+    for item in _loads(samples) or []:
+        if not isinstance(item, dict):
+            continue
+        t = item.get("t")
+        hr = item.get("hr")
+        if t is None or hr is None:
+            continue
+        try:
+            t_ms = int(t)
+            hr_f = float(hr)
+        except (TypeError, ValueError):
+            continue
+        ts.append(t_ms)
+        hrs.append(hr_f)
+    return np.array(ts, dtype=np.int64), np.array(hrs, dtype=float)
+
+
+def stress_arrays(samples: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """(epoch ms, stress level) from ``samples_bin`` or a ``get_stress_data`` payload.
+
+    Invalid readings (Garmin's negative "no data" levels, unparseable items) are dropped.
+    """
+    decoded = _channel(samples, "stress")
+    if decoded is not None:
+        return decoded
+    raw = _loads(samples)
+    arr = None
+    if isinstance(raw, dict):
+        arr = raw.get("stressValuesArray") or raw.get("stressValueDescriptors")
+    elif isinstance(raw, list):
+        arr = raw
+
+    ts_out, levels = [], []
+    for item in arr or []:
+        if isinstance(item, (list, tuple)) and len(item) >= 2:
+            ts, level = item[0], item[1]
+        elif isinstance(item, dict):
+            ts = item.get("t") or item.get("timestamp") or item.get("startTimestampGMT")
+            level = item.get("stress") or item.get("stressLevel") or item.get("value")
+        else:
+            continue
+        try:
+            level_f = float(level)
+        except (TypeError, ValueError):
+            continue
+        if level_f < 0:
+            continue
+        t_ms = _timestamp_ms(ts)
+        if t_ms is None:
+            continue
+        ts_out.append(t_ms)
+        levels.append(level_f)
+    return np.array(ts_out, dtype=np.int64), np.array(levels, dtype=float)
+
+
+def hr_samples_blob(samples: Any) -> Optional[bytes]:
+    """``samples_bin`` for a raw_heart_rate row (None if the samples cannot be packed)."""
+    t, hr = hr_arrays(samples)
+    try:
+        return encode_series(t, {"hr": hr})
+    except ValueError:
+        return None
+
+
+def stress_samples_blob(samples: Any) -> Optional[bytes]:
+    """``samples_bin`` for a raw_stress row; keeps only the valid stress readings."""
+    t, levels = stress_arrays(samples)
+    try:
+        return encode_series(t, {"stress": levels})
+    except ValueError:
+        return None
@@ -1,14 +1,20 @@
-import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 
 import pandas as pd
 
 from garmin import transforms
 from garmin.capabilities import get_capabilities
-from garmin.hrv import fetch_hrv_day, nocturnal_proxy_index
+from garmin.hrv import hrv_row as build_hrv_row, nocturnal_proxy_index
 from garmin.client import GarminClient
+from garmin.samples import hr_samples_blob, stress_samples_blob
 from util.json_util import to_json
 
+# Connect's range endpoints answer at most four weeks per request.
+RANGE_CHUNK_DAYS = 28
+# Daily HRV summaries for a date range (the per-day call is get_hrv_data).
+HRV_RANGE_PATH = "/hrv-service/hrv/daily/{start}/{end}"
+
 
 class WellnessFetcher:
     TABLES = (
@@ -26,37 +32,107 @@ class WellnessFetcher:
         self._settings = settings
         self._garmin = garmin or GarminClient.get(settings)
         self.stats = {"fetched_days": 0, "skipped_days": 0}
+        self._ranges_failed = set()
         cache_path = settings.LOCAL_STATE_DIR / "garmin_capabilities.json"
         self._caps = get_capabilities(self._garmin, cache_path)
 
-    def fetch_day(self, d):
+    def fetch_day(self, d, pool=None, ranged=None):
         try:
-            return self._fetch_day(d)
+            if pool is None:
+                with self._endpoint_pool() as pool:
+                    return self._fetch_day(d, pool, ranged or {})
+            return self._fetch_day(d, pool, ranged or {})
         except Exception as e:
             print(f"Garmin fetch failed for {d}: {e}")
             return {}
 
-    def _fetch_day(self, d):
-        cdate = d.isoformat()
+    def _endpoint_pool(self):
+        return ThreadPoolExecutor(
+            max_workers=max(1, self._settings.GARMIN_CONCURRENCY), thread_name_prefix="garmin"
+        )
+
+    def _endpoints(self, cdate, ranged):
         api = self._garmin.api
-        call = self._garmin.call
-
-        stats = call(api.get_stats, cdate) or {}
-        hr = call(api.get_heart_rates, cdate) or {}
-        stress = call(api.get_stress_data, cdate) or {}
-        sleep_raw = call(api.get_sleep_data, cdate) or {}
-        bb_list = call(api.get_body_battery, cdate, cdate) or []
-        resp = call(api.get_respiration_data, cdate) or {}
-        training = call(api.get_training_status, cdate) or {}
-        readiness = {}
+        calls = {
+            "stats": (api.get_stats, cdate),
+            "hr": (api.get_heart_rates, cdate),
+            "stress": (api.get_stress_data, cdate),
+            "sleep": (api.get_sleep_data, cdate),
+            "training": (api.get_training_status, cdate),
+        }
+        if "bb" not in ranged:
+            calls["bb"] = (api.get_body_battery, cdate, cdate)
         if self._caps.get("training_readiness"):
-            readiness = call(api.get_training_readiness, cdate) or {}
-        morning = {}
+            calls["readiness"] = (api.get_training_readiness, cdate)
         if self._caps.get("morning_readiness"):
-            morning = call(api.get_morning_training_readiness, cdate) or {}
-        hrv = {}
+            calls["morning"] = (api.get_morning_training_readiness, cdate)
+        if self._caps.get("nightly_hrv") and "hrv" not in ranged:
+            calls["hrv"] = (api.get_hrv_data, cdate)
+        return calls
+
+    def _fetch_ranges(self, days, pool):
+        """One call per chunk for the range-capable endpoints.
+
+        Returns ``{"bb": {cdate: [day]}, "hrv": {cdate: summary}}``; an endpoint
+        that fails is left out so its days fall back to per-day calls.
+        """
+        first, last = days[0].isoformat(), days[-1].isoformat()
+        api = self._garmin.api
+        calls = {"bb": (api.get_body_battery, first, last)}
         if self._caps.get("nightly_hrv"):
-            hrv = call(api.get_hrv_data, cdate) or {}
+            calls["hrv"] = (api.connectapi, HRV_RANGE_PATH.format(start=first, end=last))
+        # A range endpoint that failed once stays per-day for the rest of the run.
+        futures = {
+            name: pool.submit(self._garmin.call, *call, retries=1)
+            for name, call in calls.items()
+            if name not in self._ranges_failed
+        }
+        out = {}
+        for name, f in futures.items():
+            try:
+                result = f.result()
+            except Exception as e:
+                print(f"  Garmin {name} range {first}..{last} failed, fetching per day: {e}")
+                self._ranges_failed.add(name)
+                continue
+            if name == "bb":
+                items, key = result if isinstance(result, list) else [], "date"
+                by_date = {str(i.get(key))[:10]: [i] for i in items if isinstance(i, dict) and i.get(key)}
+            else:
+                items, key = (result or {}).get("hrvSummaries") or [], "calendarDate"
+                by_date = {str(i.get(key))[:10]: i for i in items if isinstance(i, dict) and i.get(key)}
+            if items and not by_date:
+                # Unrecognised shape: don't silently blank the chunk.
+                self._ranges_failed.add(name)
+                continue
+            out[name] = by_date
+        return out
+
+    def _fetch_day(self, d, pool, ranged):
+        cdate = d.isoformat()
+        # All of a day's endpoints go out at once; GarminClient.call keeps the
+        # shared rate limit, so the pool size only bounds calls in flight.
+        futures = {
+            name: pool.submit(self._garmin.call, *call)
+            for name, call in self._endpoints(cdate, ranged).items()
+        }
+        raw = {name: f.result() for name, f in futures.items()}
+        for name, by_date in ranged.items():
+            raw[name] = by_date.get(cdate)
+
+        stats = raw["stats"] or {}
+        hr = raw["hr"] or {}
+        stress = raw["stress"] or {}
+        sleep_raw = raw["sleep"] or {}
+        bb_list = raw["bb"] or []
+        resp = {}
+        if stats.get("avgWakingRespirationValue") is None:
+            # Only a fallback for waking_rr; most days get_stats already has it.
+            resp = self._garmin.call(self._garmin.api.get_respiration_data, cdate) or {}
+        training = raw["training"] or {}
+        readiness = raw.get("readiness") or {}
+        morning = raw.get("morning") or {}
+        hrv = raw.get("hrv") or {}
 
         sleep = sleep_raw.get("dailySleepDTO") or {}
         hr_values = hr.get("heartRateValues") or []
@@ -81,7 +157,7 @@ class WellnessFetcher:
             "avg_hr": stats.get("averageHeartRate"),
             "min_hr": stats.get("minHeartRate"),
             "max_hr": stats.get("maxHeartRate"),
-            "samples_json": to_json(samples),
+            "samples_bin": hr_samples_blob(samples),
         }
         sleep_row = {
             "date": cdate,
@@ -97,7 +173,7 @@ class WellnessFetcher:
             "raw_json": to_json(sleep),
         }
         if self._caps.get("nightly_hrv"):
-            hrv_row = fetch_hrv_day(self._garmin, d)
+            hrv_row = build_hrv_row(d, hrv)
         else:
             hrv_row = {"date": cdate, "raw_json": "{}"}
         if hrv_row.get("last_night_avg_ms") is None and self._caps.get("nocturnal_proxy", True):
@@ -113,7 +189,7 @@ class WellnessFetcher:
                 "rest_pct": stats.get("restStressPercentage"),
                 "high_pct": (stats.get("highStressPercentage") or 0)
                 + (stats.get("veryHighStressPercentage") or 0),
-                "samples_json": to_json(stress),
+                "samples_bin": stress_samples_blob(stress),
             },
             "raw_sleep": sleep_row,
             "raw_body_battery": {
@@ -156,18 +232,47 @@ class WellnessFetcher:
         }
 
     def fetch_range(self, start, end, skip_dates=None):
-        skip_dates = skip_dates or set()
+        """All days in [start, end] not in ``skip_dates``, as one frame per table."""
         tables = {name: [] for name in self.TABLES}
-        d = start
-        while d <= end:
-            if d in skip_dates:
-                self.stats["skipped_days"] += 1
-            else:
-                day_data = self.fetch_day(d)
-                self.stats["fetched_days"] += 1
-                for table_name in self.TABLES:
-                    if table_name in day_data and day_data[table_name]:
-                        tables[table_name].append(day_data[table_name])
-                time.sleep(0.5)
-            d += timedelta(days=1)
-        return {k: pd.DataFrame(v) for k, v in tables.items() if v}
+        for chunk in self.fetch_chunks(start, end, skip_dates=skip_dates):
+            for table_name, df in chunk.items():
+                tables[table_name].append(df)
+        return {k: pd.concat(v, ignore_index=True) for k, v in tables.items() if v}
+
+    def fetch_chunks(self, start, end, skip_dates=None, chunk_days=RANGE_CHUNK_DAYS):
+        """Yield ``{table: DataFrame}`` per chunk of up to ``chunk_days`` days.
+
+        Range-capable endpoints (body battery, HRV summaries) are fetched once
+        per chunk; the rest per day, ``GARMIN_DAY_WORKERS`` days at a time.
+        Rows come back in date order.
+        """
+        skip_dates = skip_dates or set()
+        day_workers = max(1, self._settings.GARMIN_DAY_WORKERS)
+        logged_in = False
+        with self._endpoint_pool() as pool, ThreadPoolExecutor(max_workers=day_workers) as day_pool:
+            chunk_start = start
+            while chunk_start <= end:
+                chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), end)
+                days = []
+                d = chunk_start
+                while d <= chunk_end:
+                    if d in skip_dates:
+                        self.stats["skipped_days"] += 1
+                    else:
+                        days.append(d)
+                    d += timedelta(days=1)
+                chunk_start = chunk_end + timedelta(days=1)
+                if not days:
+                    continue
+                if not logged_in:
+                    self._garmin.api  # log in once before the workers share the session
+                    logged_in = True
+
+                ranged = self._fetch_ranges(days, pool)
+                tables = {name: [] for name in self.TABLES}
+                for day_data in day_pool.map(lambda day: self.fetch_day(day, pool, ranged), days):
+                    self.stats["fetched_days"] += 1
+                    for table_name in self.TABLES:
+                        if table_name in day_data and day_data[table_name]:
+                            tables[table_name].append(day_data[table_name])
+                yield {k: pd.DataFrame(v) for k, v in tables.items() if v}
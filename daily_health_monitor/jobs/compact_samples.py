@@ -0,0 +1,49 @@
+"""Re-encode stored JSON streams and intraday samples as compact binary series.
+
+One-off migration for rows written before ``streams_bin`` / ``samples_bin`` existed
+(run ``--init-bq`` first so BigQuery has the columns). Rows are paged by key; each
+packed row gets its blob and its JSON cleared. Rows that cannot be packed (streams
+without a time axis, ragged arrays) keep their JSON, which readers still accept.
+"""
+
+import pandas as pd
+
+from garmin.samples import hr_samples_blob, stress_samples_blob
+from strava.streams import parse_streams_json, streams_to_blob
+
+
+def _streams_blob(raw):
+    return streams_to_blob(parse_streams_json(raw))
+
+
+# (table, key column, JSON column, blob column, JSON -> blob)
+COMPACT_TARGETS = (
+    ("activity_streams", "strava_activity_id", "streams_json", "streams_bin", _streams_blob),
+    ("raw_heart_rate", "date", "samples_json", "samples_bin", hr_samples_blob),
+    ("raw_stress", "date", "samples_json", "samples_bin", stress_samples_blob),
+)
+
+
+def run_compact_samples(repo, batch_size=500):
+    """Pack every JSON-only row; returns rows packed per table."""
+    counts = {}
+    for table, key, json_col, bin_col, encode in COMPACT_TARGETS:
+        counts[table] = 0
+        after = None
+        while True:
+            rows = repo.load_uncompacted(table, key, json_col, bin_col, after=after, limit=batch_size)
+            if rows.empty:
+                break
+            after = rows[key].iloc[-1]
+            blobs = rows[json_col].map(encode)
+            packed = rows.loc[blobs.notna(), [key]]
+            if not packed.empty:
+                packed[bin_col] = blobs[blobs.notna()]
+                # Typed nulls, so the staging load keeps the column a STRING.
+                packed[json_col] = pd.Series(pd.NA, index=packed.index, dtype="string")
+                repo.merge(table, packed, [key])
+                counts[table] += len(packed)
+            if len(rows) < batch_size:
+                break
+    repo.flush()
+    return counts
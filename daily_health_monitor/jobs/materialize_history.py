@@ -10,6 +10,7 @@ from analytics.derived_blocks import add_sleep_quality_index, compute_sleep_qual
 from analytics.digest_features import is_hard_day, safe_float
 from analytics.stress_curve import analyze_stress_day
 from config import settings
+from garmin.samples import row_samples
 
 
 def _daily_tss_by_date(activities_df: pd.DataFrame) -> pd.DataFrame:
@@ -49,7 +50,7 @@ def materialize_day_row(
 
     avg_stress = safe_float(stress_row.get("avg_stress")) if stress_row is not None else None
     curve = analyze_stress_day(
-        stress_row.get("samples_json") if stress_row is not None else None,
+        row_samples(stress_row),
         day_avg_stress=avg_stress,
         bands_config=bands_config,
     )
@@ -21,6 +21,11 @@ def parse_args():
     )
     p.add_argument("--init-bq", action="store_true", help="Create BQ dataset and tables")
     p.add_argument("--materialize-history", action="store_true", help="Rebuild wellness_daily_complete from raw tables")
+    p.add_argument(
+        "--compact-samples",
+        action="store_true",
+        help="Re-encode stored streams_json / samples_json rows as binary (one-off migration)",
+    )
     return p.parse_args()
 
 
@@ -49,6 +54,12 @@ def main():
         print(f"Weekly insights refreshed ({wf} findings).")
         return 0
 
+    if args.compact_samples:
+        from jobs.compact_samples import run_compact_samples
+        counts = run_compact_samples(pipeline._repo)
+        print("Compacted " + ", ".join(f"{t}={n}" for t, n in counts.items()) + ".")
+        return 0
+
     if args.strava_backfill:
         n = pipeline.sync_strava(backfill=True)
         print(f"Strava backfill synced {n} activities (last {settings.ANALYSIS_DAYS} days).")
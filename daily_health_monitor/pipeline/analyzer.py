@@ -7,8 +7,9 @@ from analytics.derived_blocks import compute_recovery_response
 from analytics.digest_features import build_day_session, build_yesterday, format_last_workout, safe_float
 from analytics import digest_features
 from pipeline.digest_payload import DigestPayloadBuilder
+from pipeline.snapshot import AnalysisSnapshot
 from strava import transforms
-from strava.streams import parse_streams_json
+from strava.streams import parse_streams
 from util.json_util import to_json
 
 
@@ -36,8 +37,9 @@ class Analyzer:
         ftp = self._settings.FTP_WATTS
         thr = self._settings.THRESHOLD_HR
 
-        wellness = self._repo.load_wellness(days)
-        activities = self._repo.load_activities_for_analysis(days)
+        snapshot = AnalysisSnapshot.load(self._repo, target, days)
+        wellness = snapshot.wellness()
+        activities = snapshot.activities()
 
         if "tss_proxy" in activities.columns:
             needs_metrics = activities[
@@ -50,8 +52,8 @@ class Analyzer:
         stream_map = {}
         if not needs_metrics.empty:
             ids = [int(x) for x in needs_metrics["strava_activity_id"].unique()]
-            raw_streams = self._repo.load_streams_by_ids(ids)
-            stream_map = {aid: parse_streams_json(raw) for aid, raw in raw_streams.items()}
+            raw_streams = snapshot.streams(ids)
+            stream_map = {aid: parse_streams(raw) for aid, raw in raw_streams.items()}
 
         self.stats = {
             "activities": len(activities),
@@ -66,9 +68,9 @@ class Analyzer:
         if load.get("load_ratio", 0) > 1.3:
             legacy_flags.append("Strava load ratio >1.3 (overreaching risk)")
 
-        activities_7d = self._repo.get_last_7d_activities(target)
-        intensity_minutes_df = self._repo.get_intensity_minutes_window(target, days=7)
-        last_workout_raw = self._repo.get_last_workout_with_metrics(target)
+        activities_7d = snapshot.last_7d_activities()
+        intensity_minutes_df = snapshot.intensity_minutes(days=7)
+        last_workout_raw = snapshot.last_workout()
         last_workout = format_last_workout(last_workout_raw)
         yesterday = build_yesterday(
             activities_7d,
@@ -131,11 +133,10 @@ class Analyzer:
                 continue
 
             if aid not in stream_map and training_load.activity_needs_tss_recompute(row):
-                raw_streams = self._repo.load_streams_by_ids([aid])
-                stream_map[aid] = parse_streams_json(raw_streams.get(aid))
+                raw_streams = snapshot.streams([aid])
+                stream_map[aid] = parse_streams(raw_streams.get(aid))
 
-            streams_json = to_json(stream_map[aid]) if aid in stream_map else None
-            m = stream_metrics.compute_activity_metrics(streams_json, row.get("sport_type"))
+            m = stream_metrics.compute_activity_metrics(stream_map.get(aid), row.get("sport_type"))
             m["strava_activity_id"] = aid
             tss_val, tss_src = training_load.activity_tss_with_source(
                 row, stream_map.get(aid), ftp, thr
@@ -148,7 +149,9 @@ class Analyzer:
                 hr_drifts.append(True)
 
         if act_rows:
-            self._repo.save_activity_metrics(pd.DataFrame(act_rows))
+            metrics_df = pd.DataFrame(act_rows)
+            self._repo.save_activity_metrics(metrics_df)
+            snapshot.merge_activity_metrics(metrics_df)
 
         sleep_df = wellness.get("raw_sleep", pd.DataFrame())
         poor_sleep = False
@@ -178,18 +181,18 @@ class Analyzer:
 
         load_cols = {k: load[k] for k in ("atl", "ctl", "load_ratio") if k in load}
         public_scores = {k: v for k, v in scores.items() if not str(k).startswith("_")}
-        self._repo.save_daily_aggregate(
-            {
-                "date": target.isoformat(),
-                **public_scores,
-                **load_cols,
-                "garmin_fitness_partial": partial_legacy,
-                "scores_json": to_json(public_scores),
-                "flags_json": to_json(legacy_flags),
-                "pattern_alerts_json": to_json(legacy_patterns),
-                "data_quality_json": to_json(legacy_data_quality),
-            }
-        )
+        aggregate = {
+            "date": target.isoformat(),
+            **public_scores,
+            **load_cols,
+            "garmin_fitness_partial": partial_legacy,
+            "scores_json": to_json(public_scores),
+            "flags_json": to_json(legacy_flags),
+            "pattern_alerts_json": to_json(legacy_patterns),
+            "data_quality_json": to_json(legacy_data_quality),
+        }
+        self._repo.save_daily_aggregate(aggregate)
+        snapshot.replace_dates("daily_aggregates", pd.DataFrame([aggregate]))
 
         return {
             "scores": scores,
@@ -200,6 +203,11 @@ class Analyzer:
             "garmin_fitness_partial": partial_legacy,
             "expected_fatigue": expected_fatigue,
             "digest_payload": self._payload_builder.build(
-                target, wellness, load, scores, expected_fatigue=expected_fatigue
+                target,
+                wellness,
+                load,
+                scores,
+                expected_fatigue=expected_fatigue,
+                snapshot=snapshot,
             ),
         }
@@ -15,6 +15,7 @@ from analytics.digest_features import safe_float
 from analytics import digest_v4
 from analytics.insight_detectors import run_all_detectors
 from garmin.capabilities import load_capabilities
+from pipeline.snapshot import AnalysisSnapshot
 from analytics.stress_context import build_stress_context
 from analytics import training_load
 from analytics.wellness_scores import illness_watch_signals
@@ -28,9 +29,11 @@ class DigestPayloadBuilder:
         self._settings = settings
         self._repo = repo
 
-    def build(self, target, wellness, load, scores, expected_fatigue=None):
+    def build(self, target, wellness, load, scores, expected_fatigue=None, snapshot=None):
+        if snapshot is None:
+            snapshot = AnalysisSnapshot.load(self._repo, target, self._settings.ANALYSIS_DAYS)
         caps = self._load_caps()
-        wellness_window = self._repo.get_wellness_window(target, days=30)
+        wellness_window = snapshot.wellness_window(days=30)
         wellness_window = self._augment_wellness_window(wellness_window)
         today_is_partial = target >= date.today()
         today_wellness = digest_v4.enrich_today_wellness(
@@ -41,15 +44,15 @@ class DigestPayloadBuilder:
         today_wellness = self._reshape_hrv_proxy(today_wellness, wellness_window, hrv_source)
         today_wellness = apply_confidence_pass(today_wellness, wellness, hrv_source=hrv_source)
 
-        garmin_status = self._repo.get_garmin_status_today(target, caps=caps)
-        activities_7d = self._repo.get_last_7d_activities(target)
-        intensity_minutes_df = self._repo.get_intensity_minutes_window(target, days=7)
-        last_workout_raw = self._repo.get_last_workout_with_metrics(target)
+        garmin_status = snapshot.garmin_status(caps=caps)
+        activities_7d = snapshot.last_7d_activities()
+        intensity_minutes_df = snapshot.intensity_minutes(days=7)
+        last_workout_raw = snapshot.last_workout()
         last_workout = digest_features.format_last_workout(last_workout_raw)
         last_7d = digest_features.build_last_7d(activities_7d, intensity_minutes_df, target)
         yesterday = digest_features.build_yesterday(activities_7d, intensity_minutes_df, target)
 
-        sleep_hist = self._repo.get_sleep_history_window(target, days=30)
+        sleep_hist = snapshot.sleep_history(days=30)
         sleep_context = digest_v4.compute_sleep_context(
             sleep_hist,
             target,
@@ -101,7 +104,7 @@ class DigestPayloadBuilder:
             expected_fatigue,
         )
 
-        complete_df = self._repo.load_wellness_daily_complete(days=30, target=target)
+        complete_df = snapshot.wellness_daily_complete(days=30)
         raw_stress = wellness.get("raw_stress", pd.DataFrame())
         ystress = None
         if not raw_stress.empty:
@@ -147,12 +150,12 @@ class DigestPayloadBuilder:
         )
 
         recovery_traj = digest_v4.compute_score_trajectory(
-            self._repo.get_score_history(target, "recovery_score", days=30),
+            snapshot.score_history("recovery_score", days=30),
             target,
             higher_is_better=True,
         )
         cognitive_traj = digest_v4.compute_score_trajectory(
-            self._repo.get_score_history(target, "cognitive_readiness_score", days=30),
+            snapshot.score_history("cognitive_readiness_score", days=30),
             target,
             higher_is_better=True,
         )
@@ -199,8 +202,8 @@ class DigestPayloadBuilder:
             "recovery_response": recovery_response,
             "stress_context": stress_context,
             "training_load_context": training_load_context,
-            "recent_digests": self._repo.get_recent_digests(target, n=3),
-            "recent_themes_7d": self._repo.get_recent_themes_7d(target),
+            "recent_digests": snapshot.recent_digests(n=3),
+            "recent_themes_7d": snapshot.recent_themes_7d(),
             "insights": [],
         }
 
@@ -219,14 +222,15 @@ class DigestPayloadBuilder:
             "scores": score_blocks,
             "sleep_df": wellness.get("raw_sleep", sleep_hist),
             "activities_df": activities_7d,
-            "cached_weekly": self._repo.get_insight_cache(),
-            "recent_finding_categories": self._repo.get_recent_finding_categories(target),
+            "cached_weekly": snapshot.insight_cache,
+            "recent_finding_categories": snapshot.recent_finding_categories(),
             "hrv_source": hrv_source,
             "stress_context": stress_context,
             "complete_df": complete_df,
             "training_load_context": training_load_context,
             "expected_fatigue": expected_fatigue,
             "illness_watch": illness_watch,
+            "snapshot": snapshot,
         }
         payload["insights"] = run_all_detectors(ctx)
         payload["health_state"] = digest_features.compute_health_state(
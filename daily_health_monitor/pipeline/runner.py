@@ -35,10 +35,11 @@ class Pipeline:
             skip_dates = self._repo.wellness_dates_complete(start, end)
             refresh_cutoff = end - timedelta(days=1)
             skip_dates = {d for d in skip_dates if d < refresh_cutoff}
-        tables = self._wellness.fetch_range(start, end, skip_dates=skip_dates)
-        for table_name, df in tables.items():
-            if not df.empty:
-                self._repo.replace_dates(table_name, df)
+        # Written per chunk so a long backfill keeps what it has fetched so far.
+        for tables in self._wellness.fetch_chunks(start, end, skip_dates=skip_dates):
+            for table_name, df in tables.items():
+                if not df.empty:
+                    self._repo.replace_dates(table_name, df)
         print(
             f"  Garmin: {self._wellness.stats['fetched_days']} days fetched, "
             f"{self._wellness.stats['skipped_days']} skipped (already in BQ)"
@@ -115,9 +116,11 @@ class Pipeline:
 
             log.step("pipeline log (success)")
             self._repo.log_pipeline_run(target, "success")
+            self._repo.flush()
             log.finish()
             return 0
         except Exception as e:
             self._repo.log_pipeline_run(target, "failed", error=str(e))
+            self._repo.flush()
             log.finish()
             raise
@@ -0,0 +1,346 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import pandas as pd
+
+from storage.repository import (
+    SCORE_HISTORY_COLUMNS,
+    WELLNESS_TABLES,
+    as_date,
+    digest_summaries,
+    flatten_list_column,
+    garmin_status_from_fitness,
+    score_history_points,
+)
+
+# (table, date column) scanned once per run; insight_history / digest_themes only
+# feed the 7-day "recent" views but are tiny.
+SNAPSHOT_TABLES = tuple((t, "date") for t in WELLNESS_TABLES) + (
+    ("wellness_daily_complete", "date"),
+    ("daily_aggregates", "date"),
+    ("insight_history", "date"),
+    ("digest_themes", "date"),
+)
+
+WELLNESS_WINDOW_COLUMNS = (
+    "date",
+    "rhr_bpm",
+    "sleep_minutes",
+    "deep_sleep_minutes",
+    "rem_minutes",
+    "light_minutes",
+    "awake_minutes",
+    "sleep_score",
+    "sleep_stress",
+    "sleep_rr",
+    "avg_stress",
+    "high_stress_pct",
+    "body_battery_high",
+    "body_battery_low",
+    "bb_charged",
+    "bb_drained",
+    "hrv_rmssd_ms",
+    "hrv_proxy_nocturnal",
+    "steps",
+    "waking_rr_brpm",
+)
+
+ANALYSIS_ACTIVITY_COLUMNS = [
+    "strava_activity_id",
+    "name",
+    "sport_type",
+    "start_date",
+    "moving_time",
+    "avg_hr",
+    "suffer_score",
+    "weighted_avg_watts",
+    "avg_watts",
+    "device_name",
+    "trainer",
+    "tss_proxy",
+    "tss_source",
+    "hr_drift",
+]
+
+LAST_7D_ACTIVITY_COLUMNS = [
+    "strava_activity_id",
+    "name",
+    "sport_type",
+    "start_date_local",
+    "local_date",
+    "moving_time",
+    "suffer_score",
+    "avg_hr",
+    "weighted_avg_watts",
+    "device_name",
+    "trainer",
+    "tss_proxy",
+    "tss_source",
+]
+
+
+def _column(df, name):
+    return df[name] if name in df.columns else pd.Series(None, index=df.index, dtype=object)
+
+
+class AnalysisSnapshot:
+    """Every table one analysis run reads, loaded once for ``target``.
+
+    ``load`` issues one scan per table for ``target - days .. target`` (concurrently,
+    so the run pays roughly one BigQuery round trip); the methods below are the
+    in-memory equivalents of the matching ``Repository.get_*`` queries for any
+    window up to ``days``. Streams are fetched lazily and cached by activity id.
+    """
+
+    def __init__(self, repo, target, days, tables, activities, insight_cache):
+        self._repo = repo
+        self.target = target
+        self.days = days
+        self._tables = tables
+        self._activities = activities
+        self._insight_cache = insight_cache
+        self._streams = {}
+        self._dates = {}
+
+    @classmethod
+    def load(cls, repo, target, days, max_workers=8):
+        start = target - timedelta(days=days)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            tables = {
+                table: pool.submit(repo.load_table_window, table, start, target, date_col)
+                for table, date_col in SNAPSHOT_TABLES
+            }
+            # Local start dates can be a day either side of the UTC one.
+            activities = pool.submit(
+                repo.load_activities_window, start - timedelta(days=1), target + timedelta(days=1)
+            )
+            insight_cache = pool.submit(repo.get_insight_cache)
+            return cls(
+                repo,
+                target,
+                days,
+                {table: f.result() for table, f in tables.items()},
+                activities.result(),
+                insight_cache.result(),
+            )
+
+    # --- window helpers ---
+
+    def _table_dates(self, table):
+        if table not in self._dates:
+            df = self._tables.get(table, pd.DataFrame())
+            dates = df["date"].map(as_date) if "date" in df.columns else pd.Series(dtype=object)
+            self._dates[table] = dates
+        return self._dates[table]
+
+    def table(self, table, days=None, end_offset=0):
+        """Rows of ``table`` dated target-``days`` .. target-``end_offset``."""
+        df = self._tables.get(table, pd.DataFrame())
+        if df.empty:
+            return df.copy()
+        days = self.days if days is None else days
+        dates = self._table_dates(table)
+        lo = self.target - timedelta(days=days)
+        hi = self.target - timedelta(days=end_offset)
+        return df[(dates >= lo) & (dates <= hi)].copy()
+
+    def _activity_dates(self, column):
+        key = ("activities", column)
+        if key not in self._dates:
+            df = self._activities
+            if df.empty or column not in df.columns:
+                self._dates[key] = pd.Series(dtype=object, index=df.index)
+            else:
+                self._dates[key] = pd.to_datetime(df[column], utc=True).dt.date
+        return self._dates[key]
+
+    # --- views (Repository equivalents) ---
+
+    def wellness(self, days=None):
+        """``Repository.load_wellness``: {table: rows in the window}."""
+        return {table: self.table(table, days) for table in WELLNESS_TABLES}
+
+    def activities(self, days=None):
+        """``Repository.load_activities_for_analysis``, newest first."""
+        df = self._activities
+        if df.empty:
+            return df.copy()
+        days = self.days if days is None else days
+        dates = self._activity_dates("start_date")
+        keep = (dates >= self.target - timedelta(days=days)) & (dates <= self.target)
+        out = df.loc[keep, [c for c in ANALYSIS_ACTIVITY_COLUMNS if c in df.columns]]
+        return out.sort_values("start_date", ascending=False).reset_index(drop=True)
+
+    def last_7d_activities(self):
+        """``Repository.get_last_7d_activities``: local dates target-7 .. target-1."""
+        df = self._activities
+        if df.empty:
+            return df.copy()
+        local = self._activity_dates("start_date_local")
+        keep = (local >= self.target - timedelta(days=7)) & (local <= self.target - timedelta(days=1))
+        out = df[keep].assign(local_date=local[keep])
+        out = out[[c for c in LAST_7D_ACTIVITY_COLUMNS if c in out.columns]]
+        return out.sort_values("start_date_local").reset_index(drop=True)
+
+    def last_workout(self):
+        """``Repository.get_last_workout_with_metrics``; older than the window falls back to a query."""
+        df = self._activities
+        local = self._activity_dates("start_date_local")
+        before = df[local <= self.target - timedelta(days=1)] if not df.empty else df
+        if before.empty:
+            return self._repo.get_last_workout_with_metrics(self.target)
+        r = before.sort_values("start_date_local", ascending=False).iloc[0]
+        return {
+            "name": r.get("name"),
+            "sport": r.get("sport_type"),
+            "date": local[r.name],
+            "minutes": r.get("moving_time") / 60.0 if pd.notna(r.get("moving_time")) else None,
+            "avg_hr": r.get("avg_hr"),
+            "weighted_avg_watts": r.get("weighted_avg_watts"),
+            "suffer_score": r.get("suffer_score"),
+            "device": r.get("device_name"),
+            "tss": r.get("tss_proxy"),
+            "tss_source": r.get("tss_source"),
+            "hr_drift_pct": r.get("hr_drift"),
+            "aerobic_decoupling_pct": r.get("aerobic_decoupling"),
+            "efficiency_factor": r.get("efficiency_factor"),
+        }
+
+    def intensity_minutes(self, days=7):
+        """``Repository.get_intensity_minutes_window``: target-``days`` .. target-1."""
+        df = self.table("raw_activity_daily", days, end_offset=1)
+        if df.empty:
+            return df
+        df = df[["date", "intensity_minutes"]]
+        df["date"] = pd.to_datetime(df["date"]).dt.date
+        return df.sort_values("date").reset_index(drop=True)
+
+    def wellness_window(self, days=7):
+        """``Repository.get_wellness_window``: one joined row per heart-rate date."""
+        hr = self.table("raw_heart_rate", days)
+        if hr.empty:
+            return pd.DataFrame(columns=list(WELLNESS_WINDOW_COLUMNS))
+        out = pd.DataFrame({"date": hr["date"].map(as_date), "rhr_bpm": _column(hr, "rhr")})
+        joins = (
+            ("raw_sleep", ("sleep_start", "sleep_minutes", "deep_minutes", "rem_minutes", "light_minutes",
+                           "awake_minutes", "sleep_score", "sleep_stress")),
+            ("raw_stress", ("avg_stress", "high_pct")),
+            ("raw_body_battery", ("bb_high", "bb_low", "charged", "drained")),
+            ("raw_activity_daily", ("steps",)),
+            ("raw_respiration", ("sleep_rr", "waking_rr")),
+            ("raw_hrv", ("last_night_avg_ms", "nocturnal_proxy")),
+        )
+        for table, columns in joins:
+            df = self.table(table, days)
+            right = pd.DataFrame({c: _column(df, c) for c in columns})
+            right.insert(0, "date", df["date"].map(as_date) if not df.empty else pd.Series(dtype=object))
+            out = out.merge(right, on="date", how="left")
+
+        valid_sleep = out["sleep_start"].notna() & (pd.to_numeric(out["sleep_minutes"], errors="coerce") > 0)
+        for col in ("sleep_minutes", "deep_minutes", "rem_minutes", "light_minutes", "awake_minutes",
+                    "sleep_score", "sleep_stress", "sleep_rr"):
+            out[col] = out[col].where(valid_sleep)
+        out = out.rename(
+            columns={
+                "deep_minutes": "deep_sleep_minutes",
+                "high_pct": "high_stress_pct",
+                "bb_high": "body_battery_high",
+                "bb_low": "body_battery_low",
+                "charged": "bb_charged",
+                "drained": "bb_drained",
+                "last_night_avg_ms": "hrv_rmssd_ms",
+                "nocturnal_proxy": "hrv_proxy_nocturnal",
+                "waking_rr": "waking_rr_brpm",
+            }
+        )
+        return out[list(WELLNESS_WINDOW_COLUMNS)].sort_values("date").reset_index(drop=True)
+
+    def garmin_status(self, caps=None):
+        """``Repository.get_garmin_status_today`` over the latest 30 raw_fitness rows."""
+        df = self.table("raw_fitness")
+        if not df.empty:
+            df = df.assign(_d=self._table_dates("raw_fitness")).sort_values("_d", ascending=False).head(30)
+        return garmin_status_from_fitness(df, caps or {})
+
+    def sleep_history(self, days=30):
+        """``Repository.get_sleep_history_window``."""
+        df = self.table("raw_sleep", days)
+        if df.empty:
+            return df
+        cols = [c for c in ("date", "sleep_start", "sleep_end", "sleep_minutes", "deep_minutes") if c in df.columns]
+        return df.assign(_d=self._table_dates("raw_sleep")).sort_values("_d")[cols].reset_index(drop=True)
+
+    def wellness_daily_complete(self, days=30):
+        """``Repository.load_wellness_daily_complete``."""
+        df = self.table("wellness_daily_complete", days)
+        if df.empty:
+            return df
+        df["date"] = pd.to_datetime(df["date"]).dt.date
+        return df.sort_values("date").reset_index(drop=True)
+
+    def score_history(self, score_name, days=30):
+        """``Repository.get_score_history``."""
+        if score_name not in SCORE_HISTORY_COLUMNS:
+            raise ValueError(f"unsupported score_name: {score_name}")
+        df = self.table("daily_aggregates", days)
+        if df.empty or score_name not in df.columns:
+            return []
+        df = df.assign(value=df[score_name], _d=self._table_dates("daily_aggregates"))
+        return score_history_points(df.sort_values("_d"))
+
+    def recent_digests(self, n=3):
+        """``Repository.get_recent_digests``."""
+        df = self.table("insight_history", 7, end_offset=1)
+        if df.empty or "headline" not in df.columns:
+            return []
+        df = df[df["headline"].notna()].assign(_d=self._table_dates("insight_history"))
+        return digest_summaries(df.sort_values("_d", ascending=False).head(int(n)))
+
+    def recent_themes_7d(self):
+        """``Repository.get_recent_themes_7d``."""
+        df = self.table("digest_themes", 7, end_offset=1)
+        if df.empty:
+            return []
+        df = df.assign(_d=self._table_dates("digest_themes")).sort_values("_d", ascending=False)
+        return flatten_list_column(df, "themes")
+
+    def recent_finding_categories(self, days=2):
+        """``Repository.get_recent_finding_categories``."""
+        return flatten_list_column(self.table("insight_history", days, end_offset=1), "categories")
+
+    # --- writes made during the run ---
+
+    def replace_dates(self, table, df):
+        """Mirror a ``Repository.replace_dates`` / date-keyed merge into the snapshot."""
+        if df is None or df.empty:
+            return
+        current = self._tables.get(table, pd.DataFrame())
+        if not current.empty:
+            current = current[~self._table_dates(table).isin(set(df["date"].map(as_date)))]
+        self._tables[table] = pd.concat([current, df], ignore_index=True) if not current.empty else df.copy()
+        self._dates.pop(table, None)
+
+    def merge_activity_metrics(self, df):
+        """Apply freshly saved ``activity_derived_metrics`` rows to the loaded activities."""
+        if df is None or df.empty or self._activities.empty:
+            return
+        metrics = df.drop_duplicates("strava_activity_id", keep="last").set_index("strava_activity_id")
+        ids = self._activities["strava_activity_id"].astype("int64")
+        hit = ids.isin(metrics.index)
+        for col in metrics.columns:
+            if col in self._activities.columns:
+                self._activities.loc[hit, col] = ids[hit].map(metrics[col]).values
+
+    @property
+    def insight_cache(self):
+        return self._insight_cache
+
+    def streams(self, activity_ids):
+        """Stored streams (``streams_bin`` blob or legacy JSON) by activity id; each id is
+        queried at most once per run."""
+        missing = [int(a) for a in activity_ids if int(a) not in self._streams]
+        if missing:
+            loaded = self._repo.load_streams_by_ids(missing)
+            for aid in missing:
+                self._streams[aid] = loaded.get(aid)
+        return {int(a): self._streams[int(a)] for a in activity_ids if self._streams.get(int(a)) is not None}
@@ -1,3 +1,5 @@
+import atexit
+
 from storage.bigquery import BigQueryClient
 from storage.repository import Repository
 
@@ -10,7 +12,12 @@ def get_bq():
     if _bq is None:
         from config import settings
 
-        _bq = BigQueryClient(settings)
+        if settings.STORAGE_BACKEND == "local":
+            from storage.local import LocalWarehouse
+
+            _bq = LocalWarehouse(settings)
+        else:
+            _bq = BigQueryClient(settings)
     return _bq
 
 
@@ -19,7 +26,16 @@ def get_repo():
     if _repo is None:
         from config import settings
 
-        _repo = Repository(get_bq(), settings)
+        if settings.STORAGE_BACKEND == "local":
+            from storage.local import BigQueryMirror, LocalRepository
+
+            mirror = None
+            if settings.BQ_MIRROR:
+                mirror = BigQueryMirror(Repository(BigQueryClient(settings), settings))
+            _repo = LocalRepository(get_bq(), settings, mirror=mirror)
+            atexit.register(_repo.flush)
+        else:
+            _repo = Repository(get_bq(), settings)
     return _repo
 
 
@@ -1,4 +1,5 @@
 import re
+import threading
 from pathlib import Path
 
 import pandas as pd
@@ -109,16 +110,19 @@ class BigQueryClient:
     def __init__(self, settings):
         self._settings = settings
         self._client = None
+        self._client_lock = threading.Lock()
 
     @property
     def client(self):
-        if self._client is None:
-            creds = service_account.Credentials.from_service_account_file(
-                str(self._settings.SERVICE_ACCOUNT_PATH)
-            )
-            self._client = bigquery.Client(
-                credentials=creds, project=self._settings.BQ_PROJECT_ID
-            )
+        # AnalysisSnapshot queries from several threads; build the client once.
+        with self._client_lock:
+            if self._client is None:
+                creds = service_account.Credentials.from_service_account_file(
+                    str(self._settings.SERVICE_ACCOUNT_PATH)
+                )
+                self._client = bigquery.Client(
+                    credentials=creds, project=self._settings.BQ_PROJECT_ID
+                )
         return self._client
 
     @staticmethod
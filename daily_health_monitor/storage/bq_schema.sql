@@ -8,6 +8,7 @@ CREATE TABLE IF NOT EXISTS `{BQ_PROJECT_ID}.{BQ_DATASET_ID}.raw_heart_rate` (
   min_hr FLOAT64,
   max_hr FLOAT64,
   samples_json STRING,
+  samples_bin BYTES,
   ingested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP()
 );
 
@@ -17,9 +18,16 @@ CREATE TABLE IF NOT EXISTS `{BQ_PROJECT_ID}.{BQ_DATASET_ID}.raw_stress` (
   rest_pct FLOAT64,
   high_pct FLOAT64,
   samples_json STRING,
+  samples_bin BYTES,
   ingested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP()
 );
 
+ALTER TABLE `{BQ_PROJECT_ID}.{BQ_DATASET_ID}.raw_heart_rate`
+ADD COLUMN IF NOT EXISTS samples_bin BYTES;
+
+ALTER TABLE `{BQ_PROJECT_ID}.{BQ_DATASET_ID}.raw_stress`
+ADD COLUMN IF NOT EXISTS samples_bin BYTES;
+
 CREATE TABLE IF NOT EXISTS `{BQ_PROJECT_ID}.{BQ_DATASET_ID}.raw_sleep` (
   date DATE NOT NULL,
   sleep_start TIMESTAMP,
@@ -109,9 +117,13 @@ CREATE TABLE IF NOT EXISTS `{BQ_PROJECT_ID}.{BQ_DATASET_ID}.activities` (
 CREATE TABLE IF NOT EXISTS `{BQ_PROJECT_ID}.{BQ_DATASET_ID}.activity_streams` (
   strava_activity_id INT64 NOT NULL,
   streams_json STRING,
+  streams_bin BYTES,
   fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP()
 );
 
+ALTER TABLE `{BQ_PROJECT_ID}.{BQ_DATASET_ID}.activity_streams`
+ADD COLUMN IF NOT EXISTS streams_bin BYTES;
+
 CREATE TABLE IF NOT EXISTS `{BQ_PROJECT_ID}.{BQ_DATASET_ID}.garmin_activity_enrichment` (
   strava_activity_id INT64 NOT NULL,
   aerobic_te FLOAT64,
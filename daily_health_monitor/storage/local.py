@@ -0,0 +1,284 @@
+"""Local storage backend: tables as month-partitioned Parquet, queried through DuckDB.
+
+Layout is ``LOCAL_WAREHOUSE_DIR/<table>/<YYYY-MM>/part-*.parquet`` for tables with
+a date column and ``<table>/_all/`` for the rest. A write rewrites only the
+partitions it touches, so a daily run costs a few small files instead of a
+staging-table MERGE per write.
+
+``Repository`` queries are written in BigQuery SQL. ``LocalWarehouse.load``
+translates the few BigQuery-only constructs they use, so both backends share one
+``Repository``; only the write primitives (merge / append / replace_dates) are
+overridden in ``LocalRepository``. With ``BQ_MIRROR`` on, every local write is
+replayed against BigQuery on a background thread.
+"""
+
+import functools
+import os
+import queue
+import re
+import threading
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from storage.bigquery import BigQueryClient
+from storage.repository import Repository
+
+PARTITION_COLUMNS = ("date", "computed_on", "run_date", "start_date")
+UNPARTITIONED = "_all"
+
+_DUCKDB_TYPES = {
+    "STRING": "VARCHAR",
+    "INT64": "BIGINT",
+    "FLOAT64": "DOUBLE",
+    "BOOL": "BOOLEAN",
+    "DATE": "DATE",
+    "TIMESTAMP": "TIMESTAMPTZ",
+    "BYTES": "BLOB",
+    "ARRAY<STRING>": "VARCHAR[]",
+}
+_CREATE_TABLE_RE = re.compile(r"CREATE TABLE IF NOT EXISTS `[^`]*\.(\w+)` \((.*?)\n\);", re.S)
+_COLUMN_RE = re.compile(r"^\s*(\w+)\s+([A-Z0-9<>]+)", re.M)
+_TABLE_REF_RE = re.compile(r"`[^`]*\.([A-Za-z0-9_]+)`")
+_DATE_SUB_RE = re.compile(r"DATE_SUB\((DATE '[0-9-]+'|current_date),\s*INTERVAL (\d+) DAY\)")
+_DATE_FN_RE = re.compile(r"\bDATE\(([\w.]+)\)")
+
+
+@functools.cache
+def schema_columns():
+    """``{table: [(column, duckdb_type)]}`` from bq_schema.sql, so unwritten tables and
+    columns read as empty / NULL the way they do in BigQuery."""
+    sql = (Path(__file__).parent / "bq_schema.sql").read_text()
+    return {
+        table: [(col, _DUCKDB_TYPES.get(typ, "VARCHAR")) for col, typ in _COLUMN_RE.findall(body)]
+        for table, body in _CREATE_TABLE_RE.findall(sql)
+    }
+
+
+def to_duckdb_sql(sql, table_source):
+    """Rewrite a Repository (BigQuery) query for DuckDB; ``table_source(name)`` gives the FROM item."""
+    sql = _TABLE_REF_RE.sub(lambda m: table_source(m.group(1)), sql)
+    sql = sql.replace("CURRENT_DATE()", "current_date")
+    sql = _DATE_SUB_RE.sub(r"CAST(\1 - INTERVAL \2 DAY AS DATE)", sql)
+    sql = _DATE_FN_RE.sub(r"CAST(\1 AS DATE)", sql)
+    return sql.replace("FLOAT64", "DOUBLE")
+
+
+def partition_of(df):
+    """Partition name per row: the month of the first date-like column, else ``_all``."""
+    for col in PARTITION_COLUMNS:
+        if col in df.columns:
+            months = pd.to_datetime(df[col], errors="coerce", utc=True).dt.strftime("%Y-%m")
+            return months.fillna(UNPARTITIONED)
+    return pd.Series(UNPARTITIONED, index=df.index)
+
+
+def _lists_as_python(df):
+    # Parquet LIST columns come back as numpy arrays; Repository expects lists.
+    for col in df.columns[df.dtypes == object]:
+        if df[col].map(lambda v: isinstance(v, np.ndarray)).any():
+            df[col] = df[col].map(lambda v: v.tolist() if isinstance(v, np.ndarray) else v)
+    return df
+
+
+def _key_index(df, key_columns):
+    return pd.MultiIndex.from_frame(df[list(key_columns)].astype(str))
+
+
+class LocalWarehouse:
+    """Parquet files plus an in-process DuckDB; stands in for BigQueryClient."""
+
+    def __init__(self, settings):
+        self._settings = settings
+        self.root = Path(settings.LOCAL_WAREHOUSE_DIR)
+        self.lock = threading.RLock()
+        self._con = None
+
+    @property
+    def con(self):
+        if self._con is None:
+            try:
+                import duckdb
+            except ImportError as exc:
+                raise RuntimeError(
+                    "STORAGE_BACKEND=local needs duckdb and pyarrow: pip install duckdb pyarrow"
+                ) from exc
+            self._con = duckdb.connect()
+            # BigQuery evaluates DATE(timestamp) in UTC; match it.
+            self._con.execute("SET TimeZone = 'UTC'")
+        return self._con
+
+    def _source(self, table):
+        pattern = str(self.root / table / "*" / "*.parquet").replace("'", "''")
+        files = f"SELECT * FROM read_parquet('{pattern}', union_by_name = true)"
+        columns = schema_columns().get(table)
+        if not columns:
+            return f"({files})"
+        empty = "SELECT " + ", ".join(f"CAST(NULL AS {typ}) AS {col}" for col, typ in columns) + " WHERE false"
+        if not any((self.root / table).glob("*/*.parquet")):
+            return f"({empty})"
+        return f"({files} UNION ALL BY NAME {empty})"
+
+    def load(self, query):
+        sql = to_duckdb_sql(query, self._source)
+        with self.lock:
+            return _lists_as_python(self.con.execute(sql).df())
+
+    def execute(self, sql):
+        with self.lock:
+            return self.con.execute(to_duckdb_sql(sql, self._source)).fetchall()
+
+    def init_schema(self):
+        # Tables appear with their first write; an empty table reads as "not found".
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def partitions(self, table):
+        base = self.root / table
+        if not base.is_dir():
+            return []
+        return sorted(p.name for p in base.iterdir() if p.is_dir())
+
+    def read_partition(self, table, partition):
+        files = sorted((self.root / table / partition).glob("*.parquet"))
+        frames = [pd.read_parquet(f) for f in files]
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return pd.DataFrame()
+        return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+    def write_partition(self, table, partition, df):
+        """Replace the partition's files with ``df`` (written first, then swapped in)."""
+        part_dir = self.root / table / partition
+        part_dir.mkdir(parents=True, exist_ok=True)
+        old = list(part_dir.glob("*.parquet"))
+        if not df.empty:
+            tmp = part_dir / f".part-{uuid.uuid4().hex}.tmp"
+            BigQueryClient.prepare_dataframe(df).to_parquet(tmp, index=False)
+            os.replace(tmp, part_dir / f"part-{uuid.uuid4().hex}.parquet")
+        for path in old:
+            path.unlink(missing_ok=True)
+
+    def append_partition(self, table, partition, df):
+        part_dir = self.root / table / partition
+        part_dir.mkdir(parents=True, exist_ok=True)
+        tmp = part_dir / f".part-{uuid.uuid4().hex}.tmp"
+        BigQueryClient.prepare_dataframe(df).to_parquet(tmp, index=False)
+        os.replace(tmp, part_dir / f"part-{uuid.uuid4().hex}.parquet")
+
+    def save(self, df, table, mode="WRITE_APPEND"):
+        if df is None or df.empty:
+            return None
+        with self.lock:
+            if mode == "WRITE_TRUNCATE":
+                for partition in self.partitions(table):
+                    self.write_partition(table, partition, pd.DataFrame())
+            for partition, chunk in df.groupby(partition_of(df), sort=False):
+                self.append_partition(table, partition, chunk)
+        return None
+
+
+class LocalRepository(Repository):
+    """``Repository`` over a ``LocalWarehouse``; writes optionally mirrored to BigQuery."""
+
+    def __init__(self, warehouse, settings, mirror=None):
+        super().__init__(warehouse, settings)
+        self._mirror = mirror
+
+    def _rewrite(self, table, df, partitions, keep):
+        """Rewrite each partition as ``keep(existing_rows, incoming_rows)``."""
+        parts = partition_of(df)
+        with self._bq.lock:
+            for partition in partitions:
+                chunk = df[parts == partition]
+                existing = self._bq.read_partition(table, partition)
+                if not existing.empty:
+                    chunk = keep(existing, chunk)
+                self._bq.write_partition(table, partition, chunk)
+
+    def merge(self, table, df, key_columns):
+        if df is None or df.empty:
+            return
+        df = BigQueryClient.prepare_dataframe(df).drop_duplicates(list(key_columns), keep="last")
+        key_columns = list(key_columns)
+
+        def upsert(existing, chunk):
+            if chunk.empty:
+                return existing
+            matched = _key_index(existing, key_columns).isin(_key_index(chunk, key_columns))
+            # Like MERGE ... UPDATE SET <df columns>: columns the update doesn't carry keep
+            # their stored values on matched rows.
+            extra = [c for c in existing.columns if c not in chunk.columns]
+            if extra and matched.any():
+                old = existing.loc[matched, key_columns + extra].astype({c: str for c in key_columns})
+                keyed = chunk.astype({c: str for c in key_columns}).merge(old, on=key_columns, how="left")
+                chunk = pd.concat([chunk.reset_index(drop=True), keyed[extra]], axis=1)
+            return pd.concat([existing[~matched], chunk], ignore_index=True)
+
+        # Rows are partitioned by their own date, so a key's stored row lives in the
+        # partition its update lands in.
+        self._rewrite(table, df, sorted(set(partition_of(df))), upsert)
+        if self._mirror is not None:
+            self._mirror.submit("merge", table, df, key_columns)
+
+    def append(self, table, df):
+        if df is None or df.empty:
+            return
+        self._bq.save(df, table, mode="WRITE_APPEND")
+        if self._mirror is not None:
+            self._mirror.submit("append", table, df)
+
+    def replace_dates(self, table, df, date_col="date"):
+        if df is None or df.empty:
+            return
+        df = BigQueryClient.prepare_dataframe(df)
+        dates = {str(d)[:10] for d in df[date_col].unique()}
+        # Only when the date column is also the partition column do the replaced
+        # dates all sit in the incoming partitions.
+        partitions = set(partition_of(df))
+        if next((c for c in PARTITION_COLUMNS if c in df.columns), None) != date_col:
+            partitions |= set(self._bq.partitions(table))
+
+        def replace(existing, chunk):
+            if date_col not in existing.columns:
+                return pd.concat([existing, chunk], ignore_index=True)
+            stale = existing[date_col].astype(str).str[:10].isin(dates)
+            return pd.concat([existing[~stale], chunk], ignore_index=True)
+
+        self._rewrite(table, df, sorted(partitions), replace)
+        if self._mirror is not None:
+            self._mirror.submit("replace_dates", table, df, date_col)
+
+    def flush(self):
+        if self._mirror is not None:
+            self._mirror.flush()
+
+
+class BigQueryMirror:
+    """Replays local writes against a BigQuery ``Repository`` on a background thread."""
+
+    def __init__(self, repo):
+        self._repo = repo
+        self._queue = queue.Queue()
+        self.failures = 0
+        self._thread = threading.Thread(target=self._run, name="bq-mirror", daemon=True)
+        self._thread.start()
+
+    def submit(self, method, table, df, *args):
+        self._queue.put((method, table, df.copy(), args))
+
+    def _run(self):
+        while True:
+            method, table, df, args = self._queue.get()
+            try:
+                getattr(self._repo, method)(table, df, *args)
+            except Exception as exc:
+                self.failures += 1
+                print(f"  BigQuery mirror: {method} {table} failed: {exc}")
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Block until every queued write has been sent (or has failed)."""
+        self._queue.join()
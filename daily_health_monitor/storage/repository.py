@@ -3,6 +3,8 @@ from datetime import date, datetime, timezone
 
 import pandas as pd
 
+from util.series_codec import is_series_blob
+
 WELLNESS_TABLES = (
     "raw_heart_rate",
     "raw_stress",
@@ -34,6 +36,104 @@ DAILY_AGGREGATE_COLUMNS = frozenset(
     }
 )
 
+SCORE_HISTORY_COLUMNS = frozenset(
+    {"recovery_score", "illness_probability_score", "cognitive_readiness_score"}
+)
+
+
+def as_date(value):
+    """BigQuery DATE / TIMESTAMP / ISO string -> datetime.date."""
+    if hasattr(value, "hour"):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def garmin_status_from_fitness(df, caps):
+    """Garmin status block from raw_fitness rows ordered newest first."""
+    fitness_available = bool(
+        caps.get("training_readiness")
+        or caps.get("morning_readiness")
+        or caps.get("hrv_status")
+        or caps.get("training_status")
+    )
+    if not fitness_available and not caps.get("vo2max", True):
+        return {}
+    if df is None or df.empty:
+        return {}
+
+    def _val(v):
+        if v is None or (isinstance(v, float) and pd.isna(v)):
+            return None
+        if isinstance(v, str) and v.strip().lower() in ("none", ""):
+            return None
+        return v
+
+    row = df.iloc[0]
+    out = {}
+    if fitness_available:
+        for col in ("hrv_status", "training_status"):
+            v = _val(row.get(col))
+            if v is not None:
+                out[col] = v
+        if pd.notna(row.get("readiness_score")):
+            out["readiness_score"] = int(row["readiness_score"])
+        if pd.notna(row.get("morning_readiness")):
+            out["morning_readiness"] = int(row["morning_readiness"])
+
+    vo2 = _val(row.get("vo2max"))
+    if vo2 is None and caps.get("vo2max", True):
+        for _, r in df.iterrows():
+            v = _val(r.get("vo2max"))
+            if v is not None:
+                vo2 = v
+                break
+    if vo2 is not None:
+        out["vo2max"] = float(vo2)
+
+    if pd.notna(row.get("garmin_only_load")):
+        out["garmin_only_load"] = bool(row.get("garmin_only_load"))
+    return out
+
+
+def score_history_points(df):
+    """[(date, value)] from rows with ``date`` and ``value``, skipping missing values."""
+    out = []
+    for _, r in df.iterrows():
+        v = r.get("value")
+        if pd.isna(v):
+            continue
+        out.append((as_date(r.get("date")), float(v)))
+    return out
+
+
+def digest_summaries(df):
+    out = []
+    for _, r in df.iterrows():
+        d = r.get("date")
+        if hasattr(d, "isoformat"):
+            d = d.isoformat()[:10]
+        else:
+            d = str(d)[:10]
+        out.append(
+            {
+                "date": d,
+                "headline": r.get("headline"),
+                "lead_finding_category": r.get("lead_finding_category"),
+            }
+        )
+    return out
+
+
+def flatten_list_column(df, column):
+    flat = []
+    for _, r in df.iterrows():
+        values = r.get(column)
+        if isinstance(values, list):
+            flat.extend([str(v) for v in values if v])
+    return flat
+
 
 class Repository:
     def __init__(self, bq, settings):
@@ -75,6 +175,9 @@ class Repository:
     def append(self, table, df):
         self._bq.save(df, table, mode="WRITE_APPEND")
 
+    def flush(self):
+        """Wait for writes still in flight (local backend's BigQuery mirror)."""
+
     def replace_dates(self, table, df, date_col="date"):
         if df is None or df.empty:
             return
@@ -185,7 +288,7 @@ class Repository:
             return {}
         ids = ",".join(str(int(i)) for i in activity_ids)
         q = f"""
-        SELECT strava_activity_id, streams_json
+        SELECT strava_activity_id, streams_bin, streams_json
         FROM {self._settings.table_id('activity_streams')}
         WHERE strava_activity_id IN ({ids})
         """
@@ -193,7 +296,70 @@ class Repository:
             df = self._bq.load(q)
         except Exception:
             return {}
-        return {int(r.strava_activity_id): r.streams_json for _, r in df.iterrows()}
+        return {
+            int(r.strava_activity_id): r.streams_bin if is_series_blob(r.streams_bin) else r.streams_json
+            for _, r in df.iterrows()
+        }
+
+    def load_uncompacted(self, table, key_column, json_column, bin_column, after=None, limit=500):
+        """Next ``limit`` rows (ordered by key, past ``after``) holding JSON but no blob yet."""
+        if after is None:
+            bound = ""
+        elif key_column == "date":
+            bound = f"AND {key_column} > DATE '{as_date(after).isoformat()}'"
+        else:
+            bound = f"AND {key_column} > {int(after)}"
+        q = f"""
+        SELECT {key_column}, {json_column}
+        FROM {self._settings.table_id(table)}
+        WHERE {bin_column} IS NULL AND {json_column} IS NOT NULL {bound}
+        ORDER BY {key_column}
+        LIMIT {int(limit)}
+        """
+        return self._bq.load(q)
+
+    def load_table_window(self, table, start, end, date_col="date"):
+        """Every column of ``table`` for rows with ``date_col`` in [start, end]."""
+        q = f"""
+        SELECT *
+        FROM {self._settings.table_id(table)}
+        WHERE {date_col} BETWEEN DATE '{start.isoformat()}' AND DATE '{end.isoformat()}'
+        """
+        try:
+            return self._bq.load(q)
+        except Exception:
+            return pd.DataFrame()
+
+    def load_activities_window(self, start, end):
+        """Activities (+ derived metrics) whose UTC start date is in [start, end]."""
+        q = f"""
+        SELECT
+          a.strava_activity_id,
+          a.name,
+          a.sport_type,
+          a.start_date,
+          a.start_date_local,
+          a.moving_time,
+          a.avg_hr,
+          a.suffer_score,
+          a.weighted_avg_watts,
+          a.avg_watts,
+          a.device_name,
+          a.trainer,
+          m.tss_proxy,
+          m.tss_source,
+          m.hr_drift,
+          m.aerobic_decoupling,
+          m.efficiency_factor
+        FROM {self._settings.table_id('activities')} a
+        LEFT JOIN {self._settings.table_id('activity_derived_metrics')} m
+          USING (strava_activity_id)
+        WHERE DATE(a.start_date) BETWEEN DATE '{start.isoformat()}' AND DATE '{end.isoformat()}'
+        """
+        try:
+            return self._bq.load(q)
+        except Exception:
+            return pd.DataFrame()
 
     def get_activity_ids_in_window(self, days=90):
         q = f"""
@@ -215,7 +381,7 @@ class Repository:
         FROM {self._settings.table_id('activity_streams')} s
         JOIN {self._settings.table_id('activities')} a USING (strava_activity_id)
         WHERE DATE(a.start_date) >= DATE_SUB(CURRENT_DATE(), INTERVAL {days} DAY)
-          AND s.streams_json IS NOT NULL
+          AND (s.streams_bin IS NOT NULL OR s.streams_json IS NOT NULL)
         """
         try:
             df = self._bq.load(q)
@@ -235,13 +401,7 @@ class Repository:
             df = self._bq.load(q)
             if df.empty:
                 return set()
-            out = set()
-            for d in df["date"]:
-                if hasattr(d, "isoformat"):
-                    out.add(d if not hasattr(d, "hour") else d.date())
-                else:
-                    out.add(date.fromisoformat(str(d)[:10]))
-            return out
+            return {as_date(d) for d in df["date"]}
         except Exception:
             return set()
 
@@ -260,13 +420,7 @@ class Repository:
             df = self._bq.load(q)
             if df.empty:
                 return set()
-            out = set()
-            for d in df["date"]:
-                if hasattr(d, "isoformat"):
-                    out.add(d if not hasattr(d, "hour") else d.date())
-                else:
-                    out.add(date.fromisoformat(str(d)[:10]))
-            return out
+            return {as_date(d) for d in df["date"]}
         except Exception:
             return set()
 
@@ -364,41 +518,7 @@ class Repository:
             df = self._bq.load(q)
         except Exception:
             return {}
-        if df.empty:
-            return {}
-
-        def _val(v):
-            if v is None or (isinstance(v, float) and pd.isna(v)):
-                return None
-            if isinstance(v, str) and v.strip().lower() in ("none", ""):
-                return None
-            return v
-
-        row = df.iloc[0]
-        out = {}
-        if fitness_available:
-            for col in ("hrv_status", "training_status"):
-                v = _val(row.get(col))
-                if v is not None:
-                    out[col] = v
-            if pd.notna(row.get("readiness_score")):
-                out["readiness_score"] = int(row["readiness_score"])
-            if pd.notna(row.get("morning_readiness")):
-                out["morning_readiness"] = int(row["morning_readiness"])
-
-        vo2 = _val(row.get("vo2max"))
-        if vo2 is None and caps.get("vo2max", True):
-            for _, r in df.iterrows():
-                v = _val(r.get("vo2max"))
-                if v is not None:
-                    vo2 = v
-                    break
-        if vo2 is not None:
-            out["vo2max"] = float(vo2)
-
-        if pd.notna(row.get("garmin_only_load")):
-            out["garmin_only_load"] = bool(row.get("garmin_only_load"))
-        return out
+        return garmin_status_from_fitness(df, caps)
 
     def get_last_7d_activities(self, target):
         """Activities + derived metrics within target-7..target-1 inclusive."""
@@ -482,8 +602,7 @@ class Repository:
 
     def get_score_history(self, target, score_name, days=30):
         """Return [(date, value)] for score in daily_aggregates over target-days..target."""
-        allowed = {"recovery_score", "illness_probability_score", "cognitive_readiness_score"}
-        if score_name not in allowed:
+        if score_name not in SCORE_HISTORY_COLUMNS:
             raise ValueError(f"unsupported score_name: {score_name}")
         target_iso = target.isoformat()
         q = f"""
@@ -497,20 +616,7 @@ class Repository:
             df = self._bq.load(q)
         except Exception:
             return []
-        if df.empty:
-            return []
-        out = []
-        for _, r in df.iterrows():
-            d = r.get("date")
-            v = r.get("value")
-            if pd.isna(v):
-                continue
-            if hasattr(d, "date"):
-                d = d.date()
-            elif not isinstance(d, date):
-                d = date.fromisoformat(str(d)[:10])
-            out.append((d, float(v)))
-        return out
+        return score_history_points(df)
 
     def get_sleep_history_window(self, target, days=30):
         target_iso = target.isoformat()
@@ -539,14 +645,7 @@ class Repository:
             df = self._bq.load(q)
         except Exception:
             return []
-        if df.empty:
-            return []
-        flat = []
-        for _, r in df.iterrows():
-            themes = r.get("themes")
-            if isinstance(themes, list):
-                flat.extend([str(t) for t in themes if t])
-        return flat
+        return flatten_list_column(df, "themes")
 
     def save_insight_history(
         self,
@@ -581,23 +680,7 @@ class Repository:
             df = self._bq.load(q)
         except Exception:
             return []
-        if df.empty:
-            return []
-        out = []
-        for _, r in df.iterrows():
-            d = r.get("date")
-            if hasattr(d, "isoformat"):
-                d = d.isoformat()[:10]
-            else:
-                d = str(d)[:10]
-            out.append(
-                {
-                    "date": d,
-                    "headline": r.get("headline"),
-                    "lead_finding_category": r.get("lead_finding_category"),
-                }
-            )
-        return out
+        return digest_summaries(df)
 
     def get_recent_finding_categories(self, target, days=2):
         target_iso = target.isoformat()
@@ -611,12 +694,7 @@ class Repository:
             df = self._bq.load(q)
         except Exception:
             return []
-        flat = []
-        for _, r in df.iterrows():
-            cats = r.get("categories")
-            if isinstance(cats, list):
-                flat.extend([str(c) for c in cats if c])
-        return flat
+        return flatten_list_column(df, "categories")
 
     def get_insight_cache(self):
         q = f"""
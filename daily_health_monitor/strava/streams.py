@@ -2,6 +2,11 @@ import json
 
 import numpy as np
 
+from util.series_codec import decode_series, encode_series, is_series_blob
+
+# Coordinates need more than float32's ~1 m resolution; every other stream fits it.
+PRECISE_STREAMS = ("latlng",)
+
 
 def parse_streams_json(streams_json):
     if not streams_json:
@@ -15,13 +20,38 @@ def parse_streams_json(streams_json):
     return {k: (v if isinstance(v, list) else []) for k, v in data.items()}
 
 
+def streams_to_blob(streams):
+    """Encode ``{type: data}`` streams as a ``streams_bin`` blob.
+
+    Returns None when the streams have no ``time`` axis or cannot be packed (ragged
+    or non-numeric data); those rows keep ``streams_json``.
+    """
+    time_data = streams.get("time")
+    if not time_data:
+        return None
+    channels = {k: v for k, v in streams.items() if k != "time" and v}
+    try:
+        return encode_series(time_data, channels, precise=PRECISE_STREAMS)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_streams(raw):
+    """Streams by type from a stored value: a ``streams_bin`` blob (NumPy views) or JSON."""
+    if is_series_blob(raw):
+        time_arr, channels = decode_series(raw)
+        return {"time": time_arr, **channels}
+    return parse_streams_json(raw)
+
+
 def aligned_arrays(streams):
-    time_arr = np.array(streams.get("time") or [], dtype=float)
+    time_arr = streams.get("time")
+    time_arr = np.asarray(time_arr if time_arr is not None else [], dtype=float)
     if len(time_arr) == 0:
         return {}
     out = {"time": time_arr}
     for key in ("heartrate", "watts", "cadence", "velocity_smooth", "distance"):
         arr = streams.get(key)
-        if arr and len(arr) == len(time_arr):
-            out[key] = np.array(arr, dtype=float)
+        if arr is not None and len(arr) == len(time_arr):
+            out[key] = np.asarray(arr, dtype=float)
     return out
@@ -1,3 +1,4 @@
+from strava.streams import streams_to_blob
 from util.json_util import to_json
 
 
@@ -47,7 +48,10 @@ def streams_to_row(activity_id, streams):
         by_type = {s.get("type"): s.get("data") for s in streams if isinstance(s, dict)}
     else:
         by_type = {k: v.get("data") if isinstance(v, dict) else v for k, v in streams.items()}
-    return {"strava_activity_id": activity_id, "streams_json": to_json(by_type)}
+    blob = streams_to_blob(by_type)
+    if blob is None:
+        return {"strava_activity_id": activity_id, "streams_json": to_json(by_type)}
+    return {"strava_activity_id": activity_id, "streams_bin": blob}
 
 
 def is_garmin_device(device_name, garmin_devices):
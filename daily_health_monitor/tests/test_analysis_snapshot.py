@@ -0,0 +1,100 @@
+"""AnalysisSnapshot: one load per run, in-memory windows matching the Repository queries."""
+
+from datetime import date, datetime, timedelta, timezone
+
+import pandas as pd
+
+from pipeline.snapshot import AnalysisSnapshot
+
+TARGET = date(2026, 6, 10)
+
+
+class FakeRepo:
+    def __init__(self, tables, activities):
+        self.tables = tables
+        self.activities = activities
+        self.stream_requests = []
+
+    def load_table_window(self, table, start, end, date_col="date"):
+        return self.tables.get(table, pd.DataFrame()).copy()
+
+    def load_activities_window(self, start, end):
+        return self.activities.copy()
+
+    def get_insight_cache(self):
+        return []
+
+    def load_streams_by_ids(self, activity_ids):
+        self.stream_requests.append(list(activity_ids))
+        return {aid: f"streams-{aid}" for aid in activity_ids if aid != 3}
+
+
+def _snapshot():
+    days = [TARGET - timedelta(days=i) for i in range(10)]
+    tables = {
+        "raw_heart_rate": pd.DataFrame({"date": days, "rhr": [50.0 + i for i in range(10)]}),
+        "raw_sleep": pd.DataFrame(
+            [
+                {"date": TARGET, "sleep_start": None, "sleep_minutes": 400.0, "deep_minutes": 60.0},
+                {
+                    "date": TARGET - timedelta(days=1),
+                    "sleep_start": datetime(2026, 6, 8, 22, tzinfo=timezone.utc),
+                    "sleep_minutes": 420.0,
+                    "deep_minutes": 70.0,
+                },
+            ]
+        ),
+        "raw_activity_daily": pd.DataFrame({"date": days, "intensity_minutes": [float(i) for i in range(10)]}),
+        "daily_aggregates": pd.DataFrame(
+            [{"date": TARGET - timedelta(days=1), "recovery_score": 60.0}, {"date": TARGET, "recovery_score": None}]
+        ),
+    }
+    starts = [datetime(2026, 6, 9, 23, 30, tzinfo=timezone.utc), datetime(2026, 6, 4, 6, tzinfo=timezone.utc)]
+    activities = pd.DataFrame(
+        {
+            "strava_activity_id": [1, 2],
+            "name": ["Late ride", "Old run"],
+            "sport_type": ["Ride", "Run"],
+            "start_date": starts,
+            # 23:30 UTC on the 9th is already the 10th locally.
+            "start_date_local": [s + timedelta(hours=2) for s in starts],
+            "moving_time": [3600, 1800],
+            "tss_proxy": [None, 30.0],
+        }
+    )
+    repo = FakeRepo(tables, activities)
+    return repo, AnalysisSnapshot.load(repo, TARGET, days=30)
+
+
+def test_windows_filter_by_date_like_the_queries():
+    _, snap = _snapshot()
+
+    assert len(snap.wellness(days=3)["raw_heart_rate"]) == 4
+    assert list(snap.intensity_minutes(days=7)["date"]) == [TARGET - timedelta(days=d) for d in range(7, 0, -1)]
+    # Local date decides the 7-day view: the late ride counts as today, not yesterday.
+    assert list(snap.last_7d_activities()["strava_activity_id"]) == [2]
+    assert snap.last_workout()["name"] == "Old run"
+    assert list(snap.activities()["strava_activity_id"]) == [1, 2]
+
+    window = snap.wellness_window(days=1)
+    assert list(window["rhr_bpm"]) == [51.0, 50.0]
+    # Sleep without a start time is not usable sleep, as in get_wellness_window.
+    assert window["sleep_minutes"].iloc[0] == 420.0 and pd.isna(window["sleep_minutes"].iloc[1])
+
+
+def test_streams_are_requested_once_per_activity():
+    repo, snap = _snapshot()
+
+    assert snap.streams([1, 3]) == {1: "streams-1"}
+    assert snap.streams([1, 3, 2]) == {1: "streams-1", 2: "streams-2"}
+    assert repo.stream_requests == [[1, 3], [2]]
+
+
+def test_writes_during_the_run_show_up_in_later_views():
+    _, snap = _snapshot()
+
+    snap.replace_dates("daily_aggregates", pd.DataFrame([{"date": TARGET.isoformat(), "recovery_score": 72.0}]))
+    snap.merge_activity_metrics(pd.DataFrame([{"strava_activity_id": 1, "tss_proxy": 80.0}]))
+
+    assert snap.score_history("recovery_score") == [(TARGET - timedelta(days=1), 60.0), (TARGET, 72.0)]
+    assert snap.activities().set_index("strava_activity_id").loc[1, "tss_proxy"] == 80.0
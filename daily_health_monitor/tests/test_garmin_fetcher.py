@@ -0,0 +1,189 @@
+"""Garmin day fetcher: concurrency, range endpoints, shared rate limit, 429 backoff."""
+
+import threading
+import time
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+import garmin.client
+from config import Settings
+from garmin.capabilities import CACHE_VERSION, save_capabilities
+from garmin.client import GarminClient
+from garmin.wellness import WellnessFetcher
+from util.rate_limit import RateLimiter
+
+
+class FakeApi:
+    def __init__(self, latency=0.02, hrv_range=True):
+        self.latency = latency
+        self.hrv_range = hrv_range
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def _call(self, name, cdate):
+        with self._lock:
+            self.calls.append((name, cdate))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.latency)
+        with self._lock:
+            self.in_flight -= 1
+
+    def get_stats(self, cdate):
+        self._call("stats", cdate)
+        day = int(cdate[-2:])
+        # Odd days lack waking respiration, so get_respiration_data fills it in.
+        return {"restingHeartRate": day, "avgWakingRespirationValue": 14.0 if day % 2 == 0 else None}
+
+    def get_heart_rates(self, cdate):
+        self._call("hr", cdate)
+        return {"heartRateValues": [[0, 50], [60000, 52]]}
+
+    def get_stress_data(self, cdate):
+        self._call("stress", cdate)
+        return {}
+
+    def get_sleep_data(self, cdate):
+        self._call("sleep", cdate)
+        return {"dailySleepDTO": {"sleepTimeSeconds": 25200}}
+
+    def get_body_battery(self, start, end):
+        self._call("bb", (start, end))
+        days = (date.fromisoformat(end) - date.fromisoformat(start)).days + 1
+        return [
+            {"date": (date.fromisoformat(start) + timedelta(days=i)).isoformat(), "bodyBatteryHighestValue": 90}
+            for i in range(days)
+        ]
+
+    def get_respiration_data(self, cdate):
+        self._call("resp", cdate)
+        return {"avgWakingRespirationValue": 15.0}
+
+    def get_training_status(self, cdate):
+        self._call("training", cdate)
+        return {}
+
+    def get_hrv_data(self, cdate):
+        self._call("hrv", cdate)
+        return {"lastNightAvg": 45}
+
+    def connectapi(self, path):
+        self._call("connectapi", path)
+        if not self.hrv_range:
+            raise RuntimeError("404 Not Found")
+        start, end = path.rsplit("/", 2)[1:]
+        days = (date.fromisoformat(end) - date.fromisoformat(start)).days + 1
+        return {
+            "hrvSummaries": [
+                {"calendarDate": (date.fromisoformat(start) + timedelta(days=i)).isoformat(), "lastNightAvg": 44}
+                for i in range(days)
+            ]
+        }
+
+
+def _names(api):
+    return sorted(name for name, _ in api.calls)
+
+
+def _fetcher(tmp_path, api, **overrides):
+    settings = Settings()
+    settings.LOCAL_STATE_DIR = tmp_path
+    for key, value in overrides.items():
+        setattr(settings, key, value)
+    save_capabilities(tmp_path / "garmin_capabilities.json", {"version": CACHE_VERSION, "nightly_hrv": True})
+    client = GarminClient(settings)
+    client._api = api
+    return WellnessFetcher(settings, garmin=client)
+
+
+def test_fetch_range_runs_days_concurrently_and_keeps_output(tmp_path):
+    api = FakeApi()
+    fetcher = _fetcher(tmp_path, api, GARMIN_MAX_RPS=0, GARMIN_CONCURRENCY=8, GARMIN_DAY_WORKERS=4)
+    start = date(2026, 6, 1)
+    end = start + timedelta(days=5)
+
+    t0 = time.perf_counter()
+    tables = fetcher.fetch_range(start, end, skip_dates={start + timedelta(days=2)})
+    elapsed = time.perf_counter() - t0
+
+    assert fetcher.stats == {"fetched_days": 5, "skipped_days": 1}
+    assert list(tables["raw_heart_rate"]["date"]) == ["2026-06-01", "2026-06-02", "2026-06-04", "2026-06-05", "2026-06-06"]
+    assert list(tables["raw_heart_rate"]["rhr"]) == [1, 2, 4, 5, 6]
+    assert list(tables["raw_hrv"]["last_night_avg_ms"]) == [44.0] * 5
+    assert list(tables["raw_body_battery"]["bb_high"]) == [90] * 5
+    assert list(tables["raw_respiration"]["waking_rr"]) == [15.0, 14.0, 14.0, 15.0, 14.0]
+    # Body battery and HRV come from one range call each; intraday series stay per day.
+    assert _names(api).count("bb") == 1 and _names(api).count("connectapi") == 1
+    assert "hrv" not in _names(api)
+    assert len(api.calls) == 2 + 5 * 5 + 2
+    assert api.max_in_flight > 1
+    assert elapsed < len(api.calls) * api.latency / 2
+
+
+def test_chunks_fall_back_to_per_day_calls_when_a_range_fails(tmp_path):
+    api = FakeApi(latency=0, hrv_range=False)
+    fetcher = _fetcher(tmp_path, api, GARMIN_MAX_RPS=0)
+    start = date(2026, 6, 1)
+
+    chunks = list(fetcher.fetch_chunks(start, start + timedelta(days=4), chunk_days=2))
+
+    assert [list(c["raw_hrv"]["date"]) for c in chunks] == [
+        ["2026-06-01", "2026-06-02"],
+        ["2026-06-03", "2026-06-04"],
+        ["2026-06-05"],
+    ]
+    assert list(pd.concat(c["raw_hrv"] for c in chunks)["last_night_avg_ms"]) == [45.0] * 5
+    assert _names(api).count("bb") == 3
+    assert _names(api).count("connectapi") == 1
+    assert _names(api).count("hrv") == 5
+
+
+def test_rate_limited_calls_back_off_and_retry(tmp_path, monkeypatch):
+    monkeypatch.setattr(garmin.client, "RATE_LIMIT_BACKOFF_SEC", 0.01)
+    settings = Settings()
+    settings.GARMIN_MAX_RPS = 0
+    client = GarminClient(settings)
+    attempts = []
+
+    def flaky():
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            err = RuntimeError("Client Error: Too Many Requests")
+            err.response = SimpleNamespace(status_code=429)
+            raise err
+        return {"ok": True}
+
+    assert client.call(flaky) == {"ok": True}
+    assert client.throttled == 2
+    assert attempts[2] - attempts[1] >= 0.02
+
+    def broken():
+        raise ValueError("bad payload for activity 4291")
+
+    with pytest.raises(ValueError):
+        client.call(broken, retries=1)
+    assert client.throttled == 2
+
+
+def test_rate_limiter_spaces_calls_across_threads():
+    limiter = RateLimiter(50)
+    stamps = []
+
+    def worker():
+        for _ in range(3):
+            limiter.acquire()
+            stamps.append(time.monotonic())
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stamps.sort()
+    assert stamps[-1] - stamps[0] >= 8 * 0.02 * 0.9
@@ -0,0 +1,140 @@
+import json
+from datetime import date, datetime, timezone
+
+import pandas as pd
+import pytest
+
+from analytics.stress_curve import analyze_stress_day
+from config import Settings
+from jobs.compact_samples import run_compact_samples
+from storage.local import LocalRepository, LocalWarehouse, to_duckdb_sql
+from strava.streams import parse_streams
+
+
+def test_bigquery_constructs_translated_for_duckdb():
+    sql = (
+        "SELECT DATE(a.start_date) AS d, CAST(NULL AS FLOAT64) AS x "
+        "FROM `p.ds.activities` a "
+        "WHERE DATE(a.start_date) >= DATE_SUB(CURRENT_DATE(), INTERVAL 90 DAY) "
+        "AND a.day <= DATE_SUB(DATE '2026-05-20', INTERVAL 1 DAY)"
+    )
+    out = to_duckdb_sql(sql, lambda t: f"src_{t}")
+    assert out == (
+        "SELECT CAST(a.start_date AS DATE) AS d, CAST(NULL AS DOUBLE) AS x "
+        "FROM src_activities a "
+        "WHERE CAST(a.start_date AS DATE) >= CAST(current_date - INTERVAL 90 DAY AS DATE) "
+        "AND a.day <= CAST(DATE '2026-05-20' - INTERVAL 1 DAY AS DATE)"
+    )
+
+
+@pytest.fixture
+def local_repo(tmp_path):
+    pytest.importorskip("duckdb")
+    pytest.importorskip("pyarrow")
+    settings = Settings()
+    settings.LOCAL_WAREHOUSE_DIR = tmp_path / "warehouse"
+    return LocalRepository(LocalWarehouse(settings), settings)
+
+
+def test_replace_dates_and_window_query(local_repo):
+    hr = pd.DataFrame(
+        [
+            {"date": "2026-05-30", "rhr": 50.0},
+            {"date": "2026-05-31", "rhr": 51.0},
+            {"date": "2026-06-01", "rhr": 52.0},
+        ]
+    )
+    local_repo.replace_dates("raw_heart_rate", hr)
+    local_repo.replace_dates("raw_heart_rate", pd.DataFrame([{"date": "2026-06-01", "rhr": 49.0}]))
+    local_repo.replace_dates(
+        "raw_sleep",
+        pd.DataFrame(
+            [
+                {
+                    "date": "2026-06-01",
+                    "sleep_start": datetime(2026, 5, 31, 22, tzinfo=timezone.utc),
+                    "sleep_minutes": 420.0,
+                }
+            ]
+        ),
+    )
+
+    assert local_repo.wellness_dates_complete(date(2026, 5, 1), date(2026, 6, 30)) == {date(2026, 6, 1)}
+    # Tables never written (raw_hrv, raw_stress, ...) read as empty, like fresh BigQuery tables.
+    window = local_repo.get_wellness_window(date(2026, 6, 1), days=7)
+    assert list(window["date"]) == [date(2026, 5, 30), date(2026, 5, 31), date(2026, 6, 1)]
+    assert list(window["rhr_bpm"]) == [50.0, 51.0, 49.0]
+    assert window["sleep_minutes"].iloc[-1] == 420.0
+
+
+def test_merge_upserts_and_keeps_columns_the_update_lacks(local_repo):
+    local_repo.merge(
+        "activities",
+        pd.DataFrame(
+            [
+                {
+                    "strava_activity_id": 1,
+                    "name": "Ride",
+                    "start_date": datetime(2026, 6, 1, 7, tzinfo=timezone.utc),
+                    "avg_hr": 140.0,
+                }
+            ]
+        ),
+        ["strava_activity_id"],
+    )
+    local_repo.merge(
+        "activities",
+        pd.DataFrame(
+            [
+                {"strava_activity_id": 1, "name": "Morning Ride", "start_date": datetime(2026, 6, 1, 7, tzinfo=timezone.utc)},
+                {"strava_activity_id": 2, "name": "Run", "start_date": datetime(2026, 6, 2, 7, tzinfo=timezone.utc)},
+            ]
+        ),
+        ["strava_activity_id"],
+    )
+    local_repo.set_sync_state("strava_last_sync", "100")
+    local_repo.set_sync_state("strava_last_sync", "200")
+
+    rows = local_repo._bq.load("SELECT * FROM `p.d.activities` ORDER BY strava_activity_id")
+    assert list(rows["name"]) == ["Morning Ride", "Run"]
+    assert rows["avg_hr"].iloc[0] == 140.0 and pd.isna(rows["avg_hr"].iloc[1])
+    assert local_repo.get_sync_state("strava_last_sync") == "200"
+
+
+def test_list_columns_read_back_as_lists(local_repo):
+    local_repo.save_digest_themes(date(2026, 6, 1), ["sleep", "stress"])
+    assert local_repo.get_recent_themes_7d(date(2026, 6, 2)) == ["sleep", "stress"]
+
+
+def test_compact_samples_migrates_json_rows(local_repo):
+    stress = {"stressValuesArray": [[1_780_000_000_000 + i * 120_000, 30 + i] for i in range(10)]}
+    local_repo.replace_dates(
+        "raw_stress",
+        pd.DataFrame(
+            [
+                {"date": "2026-06-01", "avg_stress": 30.0, "samples_json": json.dumps(stress)},
+                {"date": "2026-06-02", "avg_stress": 31.0, "samples_json": "{}"},
+            ]
+        ),
+    )
+    local_repo.merge(
+        "activity_streams",
+        pd.DataFrame(
+            [
+                {"strava_activity_id": 1, "streams_json": json.dumps({"time": [0, 1, 2], "watts": [100, 110, 120]})},
+                {"strava_activity_id": 2, "streams_json": json.dumps({"watts": [100, 110]})},
+            ]
+        ),
+        ["strava_activity_id"],
+    )
+
+    counts = run_compact_samples(local_repo, batch_size=1)
+
+    assert counts == {"activity_streams": 1, "raw_heart_rate": 0, "raw_stress": 2}
+    rows = local_repo._bq.load("SELECT * FROM `p.d.raw_stress` ORDER BY date")
+    assert rows["samples_json"].isna().all() and list(rows["avg_stress"]) == [30.0, 31.0]
+    assert analyze_stress_day(rows["samples_bin"].iloc[0]) == analyze_stress_day(json.dumps(stress))
+    streams = local_repo.load_streams_by_ids([1, 2])
+    assert list(parse_streams(streams[1])["watts"]) == [100, 110, 120]
+    # Without a time axis the row keeps its JSON.
+    assert json.loads(streams[2]) == {"watts": [100, 110]}
@@ -0,0 +1,89 @@
+"""Binary series encoding for Strava streams and Garmin intraday samples."""
+
+import json
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from analytics.stream_metrics import compute_activity_metrics
+from analytics.stress_curve import analyze_stress_day
+from garmin.hrv import nocturnal_proxy_index
+from garmin.samples import hr_samples_blob, row_samples, stress_samples_blob
+from strava.streams import parse_streams, streams_to_blob
+from strava.transforms import streams_to_row
+from util.series_codec import decode_series, encode_series
+
+
+def test_roundtrip_picks_compact_dtypes_and_decodes_without_copying():
+    blob = encode_series(
+        [1_000, 1_120, 1_240],
+        {
+            "hr": [50, 52, 255],
+            "watts": [None, 180.5, 200.0],
+            "alt": [-3, 400, 2_000],
+            "moving": [True, False, True],
+            "latlng": [[52.1, 21.0], [52.2, 21.1], [52.3, 21.2]],
+        },
+        precise=("latlng",),
+    )
+    t, ch = decode_series(blob)
+
+    assert t.tolist() == [1_000, 1_120, 1_240]
+    assert ch["hr"].dtype == np.uint8 and ch["hr"].tolist() == [50, 52, 255]
+    assert ch["watts"].dtype == np.float32 and np.isnan(ch["watts"][0])
+    assert ch["alt"].dtype == np.int16
+    assert ch["moving"].tolist() == [True, False, True]
+    assert ch["latlng"].shape == (3, 2) and ch["latlng"][2, 0] == 52.3
+    # Views into the blob, not copies.
+    assert not ch["hr"].flags.owndata and not ch["hr"].flags.writeable
+
+
+def test_stream_rows_are_binary_and_metrics_match_json():
+    streams = {
+        "time": list(range(120)),
+        "heartrate": [130] * 60 + [145] * 60,
+        "watts": [180] * 120,
+        "velocity_smooth": [8.25] * 120,
+    }
+    row = streams_to_row(1, [{"type": k, "data": v} for k, v in streams.items()])
+
+    assert set(row) == {"strava_activity_id", "streams_bin"}
+    assert compute_activity_metrics(parse_streams(row["streams_bin"]), "Ride") == compute_activity_metrics(
+        json.dumps(streams), "Ride"
+    )
+    # No time axis: nothing to align on, so the row stays JSON.
+    assert "streams_json" in streams_to_row(2, {"watts": {"data": [1, 2]}})
+    assert streams_to_blob({"time": [0, 1], "watts": [1, 2, 3]}) is None
+
+
+def _stress_payload(day):
+    base = int(datetime(day.year, day.month, day.day, 6).timestamp() * 1000)
+    levels = [20] * 60 + [55] * 90 + [-1] * 5 + [30] * 150 + [15] * 60
+    return json.dumps(
+        {"stressValuesArray": [[base + i * 120_000, lvl] for i, lvl in enumerate(levels)]}
+    )
+
+
+def test_stress_and_hr_blobs_analyze_like_json():
+    raw = _stress_payload(datetime(2026, 6, 1))
+    blob = stress_samples_blob(raw)
+
+    assert len(blob) < len(raw) / 3
+    assert decode_series(blob)[1]["stress"].dtype == np.uint8
+    assert analyze_stress_day(blob, day_avg_stress=35) == analyze_stress_day(raw, day_avg_stress=35)
+    assert row_samples(pd.Series({"samples_json": raw, "samples_bin": None})) == raw
+    assert row_samples(pd.Series({"samples_json": None, "samples_bin": blob})) is blob
+
+    start = int(datetime(2026, 6, 1, 0, 0).timestamp() * 1000)
+    samples = [{"t": start + i * 120_000, "hr": hr} for i, hr in enumerate([58, 55, None, 50, 48, 0, 47, 52])]
+    sleep = pd.Series(
+        {
+            "sleep_start": pd.Timestamp(start, unit="ms", tz="UTC").isoformat(),
+            "sleep_end": pd.Timestamp(start + 3_600_000, unit="ms", tz="UTC").isoformat(),
+            "raw_json": "{}",
+        }
+    )
+    from_json = nocturnal_proxy_index(pd.Series({"samples_json": json.dumps(samples)}), sleep)
+    from_blob = nocturnal_proxy_index(pd.Series({"samples_bin": hr_samples_blob(samples)}), sleep)
+    assert from_json is not None and from_json == from_blob
@@ -0,0 +1,45 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """Spaces calls to at most ``rps`` per second across all threads.
+
+    ``backoff(seconds)`` pushes the next free slot out for everyone, so one 429
+    pauses the whole pool instead of just the thread that hit it; ``backoffs``
+    counts them.
+    """
+
+    def __init__(self, rps):
+        self._interval = 1.0 / rps if rps and rps > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+        self.backoffs = 0
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def backoff(self, seconds):
+        with self._lock:
+            self._next = max(self._next, time.monotonic() + seconds)
+            self.backoffs += 1
+
+
+def is_rate_limited(exc):
+    """True for HTTP 429 errors from requests / garth / garminconnect.
+
+    Decided by exception type or response status only; messages that merely
+    mention 429 don't count.
+    """
+    if "TooManyRequests" in type(exc).__name__:
+        return True
+    for err in (exc, getattr(exc, "error", None), exc.__cause__):
+        response = getattr(err, "response", None)
+        if getattr(response, "status_code", None) == 429:
+            return True
+    return False
@@ -1,13 +0,0 @@
-import time
-
-
-def with_retry(fn, *args, retries=3, **kwargs):
-    last_err = None
-    for attempt in range(retries):
-        try:
-            return fn(*args, **kwargs)
-        except Exception as e:
-            last_err = e
-            if attempt < retries - 1:
-                time.sleep(2**attempt)
-    raise last_err
@@ -0,0 +1,119 @@
+"""Compact binary encoding for sampled series (Strava streams, Garmin intraday samples).
+
+A blob is a header, the timestamps as an int64 base plus int32 deltas, then one typed
+array per channel, each starting on an 8-byte boundary::
+
+    "HMS1" | n uint32 | channels uint8 | pad | t0 int64 | deltas int32[n] | pad
+    per channel: name_len uint8 | name | dtype char | width uint8 | pad | values
+
+Value dtypes are picked per channel: small non-negative whole numbers (HR, stress,
+cadence) as uint8, other whole numbers as int16/int32, flags as bool, everything else
+float32 (NaN for gaps) unless the caller asks for float64. ``decode_series`` wraps the
+value arrays with ``np.frombuffer`` (read-only views, no copy); only the timestamps are
+rebuilt.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+
+MAGIC = b"HMS1"
+_HEADER = struct.Struct("<4sIB7xq")
+_CHANNEL = struct.Struct("<cB")
+_DTYPES = {
+    b"?": np.bool_,
+    b"B": np.uint8,
+    b"h": np.int16,
+    b"i": np.int32,
+    b"f": np.float32,
+    b"d": np.float64,
+}
+_INT32 = np.iinfo(np.int32)
+
+
+def _pad(size: int) -> bytes:
+    return b"\0" * (-size % 8)
+
+
+def _compact(values, precise: bool) -> Tuple[bytes, np.ndarray]:
+    arr = np.asarray(values)
+    if arr.dtype == object:
+        # Lists with gaps (None) become NaN-padded floats.
+        arr = np.asarray(values, dtype=float)
+    if arr.dtype.kind == "b":
+        return b"?", arr
+    if arr.dtype.kind in "iu":
+        lo, hi = (int(arr.min()), int(arr.max())) if arr.size else (0, 0)
+        if lo >= 0 and hi <= 255:
+            return b"B", arr.astype(np.uint8)
+        if -(2**15) <= lo and hi < 2**15:
+            return b"h", arr.astype(np.int16)
+        if _INT32.min <= lo and hi <= _INT32.max:
+            return b"i", arr.astype(np.int32)
+        return b"d", arr.astype(np.float64)
+    if arr.dtype.kind != "f":
+        raise ValueError(f"unsupported series dtype {arr.dtype}")
+    if not precise and arr.size and np.isfinite(arr).all() and (arr == np.floor(arr)).all():
+        # Whole-number floats (JSON round trips, Garmin levels) pack as integers losslessly.
+        return _compact(arr.astype(np.int64), precise)
+    return (b"d", arr.astype(np.float64)) if precise else (b"f", arr.astype(np.float32))
+
+
+def encode_series(timestamps, channels: Dict[str, object], precise: Iterable[str] = ()) -> bytes:
+    """Pack ``timestamps`` (integers) and equal-length ``channels`` into one blob.
+
+    Raises ``ValueError`` when a channel's length differs from the timestamps, a gap
+    between timestamps overflows int32, or values are not numeric.
+    """
+    t = np.asarray(timestamps, dtype=np.int64)
+    n = len(t)
+    deltas = np.diff(t, prepend=t[:1]) if n else t
+    if n and (deltas.min() < _INT32.min or deltas.max() > _INT32.max):
+        raise ValueError("timestamp gap does not fit in int32")
+    precise = set(precise)
+
+    parts = [_HEADER.pack(MAGIC, n, len(channels), int(t[0]) if n else 0)]
+    parts.append(deltas.astype("<i4").tobytes())
+    parts.append(_pad(4 * n))
+    for name, values in channels.items():
+        code, arr = _compact(values, name in precise)
+        if arr.shape[:1] != (n,) or arr.ndim > 2:
+            raise ValueError(f"channel {name!r} does not match {n} timestamps")
+        width = arr.shape[1] if arr.ndim == 2 else 1
+        label = name.encode()
+        head = bytes([len(label)]) + label + _CHANNEL.pack(code, width)
+        parts += [head, _pad(len(head)), arr.astype(arr.dtype.newbyteorder("<")).tobytes()]
+        parts.append(_pad(arr.nbytes))
+    return b"".join(parts)
+
+
+def is_series_blob(value) -> bool:
+    return isinstance(value, (bytes, bytearray, memoryview)) and bytes(value[:4]) == MAGIC
+
+
+def decode_series(blob) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """``(timestamps int64, {channel: values})``; value arrays are views into ``blob``."""
+    if not is_series_blob(blob):
+        raise ValueError("not an encoded series")
+    buf = memoryview(blob).cast("B")
+    _, n, count, t0 = _HEADER.unpack_from(buf)
+    offset = _HEADER.size
+    deltas = np.frombuffer(buf, dtype="<i4", count=n, offset=offset)
+    timestamps = t0 + np.cumsum(deltas, dtype=np.int64)
+    offset += 4 * n + (-4 * n % 8)
+
+    channels = {}
+    for _ in range(count):
+        size = buf[offset]
+        name = bytes(buf[offset + 1 : offset + 1 + size]).decode()
+        code, width = _CHANNEL.unpack_from(buf, offset + 1 + size)
+        head = 1 + size + _CHANNEL.size
+        offset += head + (-head % 8)
+        dtype = np.dtype(_DTYPES[code]).newbyteorder("<")
+        values = np.frombuffer(buf, dtype=dtype, count=n * width, offset=offset)
+        channels[name] = values.reshape(n, width) if width > 1 else values
+        offset += values.nbytes + (-values.nbytes % 8)
+    return timestamps, channels
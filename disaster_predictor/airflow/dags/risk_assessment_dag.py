@@ -55,11 +55,23 @@ def setup_airflow_paths():
 def assess_all_hazards_task(**context):
     """Task wrapper for all hazard risk assessments in a single task to save memory."""
     setup_airflow_paths()
+    import os
     from risk_assessment.ml_risk_assessment import assess_daily_risks
     # Process all hazards sequentially in one task. 
     # This preloads data ONCE instead of 4 times in parallel.
     # We can use more workers here since we only have one task running.
-    return assess_daily_risks(disaster_types=['fire', 'flood', 'landslide', 'drought'], max_workers=10)
+    # Single-scan (default) loads/engineers each chunk once for all hazards with the
+    # four models loaded once; RISK_SINGLE_SCAN=false falls back to hazard-first.
+    single_scan = os.getenv("RISK_SINGLE_SCAN", "true").strip().lower() in ("1", "true", "yes")
+    # RISK_SCORING_BACKEND=process scores regions in one process per core (each
+    # worker holds its own copy of the models) instead of 10 GIL-bound threads.
+    backend = os.getenv("RISK_SCORING_BACKEND", "thread").strip().lower()
+    return assess_daily_risks(
+        disaster_types=['fire', 'flood', 'landslide', 'drought'],
+        max_workers=(os.cpu_count() or 4) if backend == "process" else 10,
+        single_scan=single_scan,
+        backend=backend,
+    )
 
 
 def get_ingestion_run_date(logical_date, **kwargs):
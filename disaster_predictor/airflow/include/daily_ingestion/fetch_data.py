@@ -30,7 +30,7 @@ _include_path = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(_include_path))
 
-from utils.bq_utils import save_to_bigquery, load_from_bigquery, execute_sql
+from utils.bq_utils import merge_to_bigquery, load_from_bigquery, execute_sql
 from utils.earth_engine_utils import init_ee, KEY_PATH, regions_ee, regions_openmeteo
 # Import daily_utils
 from daily_ingestion.daily_utils import (
@@ -51,11 +51,21 @@ from utils.datasets.openmeteo_utils import (
     fetch_openmeteo_forecast_batch,
     fetch_openmeteo_flood_discharge_batch,
     fetch_openmeteo_forecast_hourly_batch,
+    merge_openmeteo_historical_frames,
+    merge_openmeteo_forecast_frames,
 )
 from config import get_project_id
 
 PROJECT_ID = get_project_id()
 DATASET_ID = "daily_ingestion"
+# Upsert keys per daily_ingestion table: re-runs replace rows instead of appending duplicates.
+TABLE_KEYS = {
+    "era5": ["date", "region"],
+    "viirs": ["date", "region"],
+    "landsat": ["date", "region"],
+    "openmeteo_weather": ["date", "region_name"],
+    "openmeteo_forecast": ["date", "region_name"],
+}
 # Copernicus GloFAS historical in BigQuery (strict fallback when Open-Meteo Flood API fails)
 GLOFAS_BQ_DATASET = "climatology"
 GLOFAS_BQ_TABLE = "copernicus_glofas"
@@ -79,12 +89,6 @@ INGESTION_VIIRS_CHUNKS = 5
 
 
 
-def _dedupe_by_keys(df: pd.DataFrame, key_cols: list) -> pd.DataFrame:
-    if df is None or df.empty:
-        return df
-    return df.drop_duplicates(subset=key_cols, keep='last')
-
-
 def get_latest_bq_date(table_name: str) -> datetime.date:
     """Get the latest date from BigQuery for a table."""
     try:
@@ -222,7 +226,6 @@ def fetch_era5_data(**context):
         return False
     
     df = pd.concat(frames, ignore_index=True).sort_values(['region', 'date'])
-    df = _dedupe_by_keys(df, ['date', 'region'])
     
     if df is not None and not df.empty:
         # Ensure we have all required columns
@@ -235,7 +238,7 @@ def fetch_era5_data(**context):
         
         print(f"  Saving to BigQuery...", end=" ", flush=True)
         save_start = time.time()
-        save_to_bigquery(df[required_cols], PROJECT_ID, DATASET_ID, "era5", mode="WRITE_APPEND")
+        merge_to_bigquery(df[required_cols], PROJECT_ID, DATASET_ID, "era5", key_columns=TABLE_KEYS["era5"])
         print(f"✓ ({time.time() - save_start:.1f}s)")
         print(f"✓ ERA5 fetch complete: {len(df)} records")
         return True
@@ -338,11 +341,10 @@ def fetch_viirs_data(**context):
         # Ensure date column is datetime type (not date object)
         if 'date' in df.columns:
             df['date'] = pd.to_datetime(df['date'])
-        df = _dedupe_by_keys(df, ['date', 'region'])
         
         print(f"  Saving to BigQuery...", end=" ", flush=True)
         save_start = time.time()
-        save_to_bigquery(df, PROJECT_ID, DATASET_ID, "viirs", mode="WRITE_APPEND")
+        merge_to_bigquery(df, PROJECT_ID, DATASET_ID, "viirs", key_columns=TABLE_KEYS["viirs"])
         print(f"✓ ({time.time() - save_start:.1f}s)")
         print(f"✓ VIIRS fetch complete: {len(df)} records")
         return True
@@ -447,8 +449,7 @@ def fetch_landsat_data(**context):
         
         print(f"  Saving to BigQuery...", end=" ", flush=True)
         save_start = time.time()
-        aggregated = _dedupe_by_keys(aggregated, ['date', 'region'])
-        save_to_bigquery(aggregated, PROJECT_ID, DATASET_ID, "landsat", mode="WRITE_APPEND")
+        merge_to_bigquery(aggregated, PROJECT_ID, DATASET_ID, "landsat", key_columns=TABLE_KEYS["landsat"])
         print(f"✓ ({time.time() - save_start:.1f}s)")
         print(f"✓ Landsat fetch complete: {len(aggregated)} records")
         return True
@@ -500,95 +501,62 @@ def fetch_openmeteo_data(**context):
         print("No regions to fetch for this chunk.")
         return True
 
-    lats = [all_regions[name]['lat'] for name in regions_to_fetch_names]
-    lons = [all_regions[name]['lon'] for name in regions_to_fetch_names]
+    # 1. Plan and fetch every batch (historical + forecast endpoints) concurrently.
+    # Finished batches are checkpointed locally, so a task retry resumes instead of refetching.
+    from utils.datasets.openmeteo_scheduler import (
+        OpenMeteoCheckpoint,
+        plan_openmeteo_jobs,
+        run_openmeteo_jobs,
+        results_by_region,
+    )
+    historical_range = None if skip_historical else (format_date(start_date), format_date(end_date))
+    forecast_end = today + datetime.timedelta(days=6)  # 7 days ahead
+    print(f"Fetching forecast data for {format_date(today)} to {format_date(forecast_end)}")
+    jobs = plan_openmeteo_jobs(all_regions, historical_range=historical_range, region_names=regions_to_fetch_names)
+    run_key = f"daily_{format_date(today)}_{historical_range or 'forecast'}_chunk{chunk_index}of{total_chunks}"
+    checkpoint = OpenMeteoCheckpoint(run_key)
+    try:
+        frames = results_by_region(jobs, run_openmeteo_jobs(jobs, checkpoint=checkpoint))
+    except Exception as e:
+        print(f"✗ Error in OpenMeteo batch fetch: {e}")
+        raise
 
-    # 1. Fetch historical data for regions in this chunk (Batch)
-    import utils.datasets.openmeteo_utils as om_utils
-    if not skip_historical:
-        print(f"  Fetching historical data for {n_regions} region(s) in batch...")
-        
-        try:
-            # Fetch historical weather in batch
-            hist_weather_list = om_utils.fetch_openmeteo_historical_batch(lats, lons, format_date(start_date), format_date(end_date))
-            
-            # Fetch historical discharge in batch
-            hist_flood_list = om_utils.fetch_openmeteo_flood_discharge_batch(lats, lons, start_date=format_date(start_date), end_date=format_date(end_date))
-            
+    # 2. Historical weather + river discharge
+    if historical_range is not None:
+        if checkpoint.is_marked("historical_saved"):
+            print("  Historical weather already saved by a previous attempt; skipping")
+        else:
             hist_data = []
-            for i, name in enumerate(regions_to_fetch_names):
-                h_weather = hist_weather_list[i]
-                h_flood = hist_flood_list[i]
-                
-                if not h_weather.empty:
-                    # Merge discharge onto weather
-                    if not h_flood.empty and "river_discharge" in h_flood.columns:
-                        f = h_flood[["date", "river_discharge"]].copy()
-                        h_weather["date_norm"] = pd.to_datetime(h_weather["date"]).dt.normalize()
-                        f["date_norm"] = pd.to_datetime(f["date"]).dt.normalize()
-                        h_weather = h_weather.merge(f[["date_norm", "river_discharge"]], on="date_norm", how="left").drop(columns=["date_norm"])
-                    else:
-                        h_weather["river_discharge"] = pd.NA
-                    
+            for name in regions_to_fetch_names:
+                h_weather = frames["historical"].get(name)
+                if h_weather is not None and not h_weather.empty:
+                    h_weather = merge_openmeteo_historical_frames(h_weather, frames["historical_flood"].get(name))
                     h_weather['region_name'] = name
                     hist_data.append(h_weather)
-            
+
             if hist_data:
                 df_hist = pd.concat(hist_data, ignore_index=True)
-                save_to_bigquery(df_hist, PROJECT_ID, DATASET_ID, "openmeteo_weather", mode="WRITE_APPEND")
+                merge_to_bigquery(df_hist, PROJECT_ID, DATASET_ID, "openmeteo_weather", key_columns=TABLE_KEYS["openmeteo_weather"])
                 print(f"✓ Saved {len(df_hist)} historical weather records")
-        except Exception as e:
-            print(f"✗ Error in historical batch fetch: {e}")
-            raise
-
-    # 2. Fetch forecast data for regions in this chunk (Batch)
-    forecast_end = today + datetime.timedelta(days=6)  # 7 days ahead
-    print(f"Fetching forecast data for {format_date(today)} to {format_date(forecast_end)}")
-    print(f"  Fetching forecast for {n_regions} region(s) in batch...")
-
-    try:
-        # Fetch forecast weather in batch
-        fore_weather_list = om_utils.fetch_openmeteo_forecast_batch(lats, lons)
-        
-        # Fetch forecast soil moisture in batch
-        fore_sm_list = om_utils.fetch_openmeteo_forecast_hourly_batch(lats, lons, past_days=0, forecast_days=7, include_soil_temperature=False, include_sm1_sm2_equivalent=True)
-        
-        # Fetch forecast discharge in batch
-        fore_flood_list = om_utils.fetch_openmeteo_flood_discharge_batch(lats, lons, past_days=0, forecast_days=7)
-        
-        forecast_data = []
-        for i, name in enumerate(regions_to_fetch_names):
-            f_weather = fore_weather_list[i]
-            f_sm = fore_sm_list[i]
-            f_flood = fore_flood_list[i]
-            
-            if not f_weather.empty:
-                # Merge soil moisture
-                if not f_sm.empty and 'date' in f_sm.columns and 'sm1_mean' in f_sm.columns and 'sm2_mean' in f_sm.columns:
-                    f_weather = f_weather.merge(f_sm[['date', 'sm1_mean', 'sm2_mean']], on='date', how='left')
-                
-                # Merge discharge
-                if not f_flood.empty and "river_discharge" in f_flood.columns:
-                    f = f_flood[["date", "river_discharge"]].copy()
-                    f_weather["date_norm"] = pd.to_datetime(f_weather["date"]).dt.normalize()
-                    f["date_norm"] = pd.to_datetime(f["date"]).dt.normalize()
-                    f_weather = f_weather.merge(f[["date_norm", "river_discharge"]], on="date_norm", how="left").drop(columns=["date_norm"])
-                else:
-                    f_weather["river_discharge"] = pd.NA
-                
-                f_weather['region_name'] = name
-                forecast_data.append(f_weather)
-
-        if forecast_data:
-            df_forecast = pd.concat(forecast_data, ignore_index=True)
-            df_forecast = _dedupe_by_keys(df_forecast, ['date', 'region_name'])
-            save_to_bigquery(df_forecast, PROJECT_ID, DATASET_ID, "openmeteo_forecast", mode="WRITE_APPEND")
-            print(f"✓ Saved {len(df_forecast)} forecast records")
-            
-    except Exception as e:
-        print(f"✗ Error in forecast batch fetch: {e}")
-        raise
-    
+            checkpoint.mark("historical_saved")
+
+    # 3. Forecast weather + soil moisture + river discharge
+    forecast_data = []
+    for name in regions_to_fetch_names:
+        f_weather = frames["forecast"].get(name)
+        if f_weather is not None and not f_weather.empty:
+            f_weather = merge_openmeteo_forecast_frames(
+                f_weather, frames["forecast_soil"].get(name), frames["forecast_flood"].get(name)
+            )
+            f_weather['region_name'] = name
+            forecast_data.append(f_weather)
+
+    if forecast_data:
+        df_forecast = pd.concat(forecast_data, ignore_index=True)
+        merge_to_bigquery(df_forecast, PROJECT_ID, DATASET_ID, "openmeteo_forecast", key_columns=TABLE_KEYS["openmeteo_forecast"])
+        print(f"✓ Saved {len(df_forecast)} forecast records")
+
+    checkpoint.clear()
     print(f"✓ OpenMeteo fetch complete for this chunk")
     return True
 
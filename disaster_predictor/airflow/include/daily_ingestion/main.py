@@ -13,12 +13,13 @@ load_dotenv(dotenv_path=Path(__file__).resolve().parent.parent / ".env", overrid
 # This adds the include/ directory to sys.path, making utils importable if it's at include/utils/
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.bq_utils import save_to_bigquery, load_from_bigquery
+from utils.bq_utils import save_to_bigquery, merge_to_bigquery, load_from_bigquery
 from utils.earth_engine_utils import init_ee, KEY_PATH
 from .daily_utils import (
     get_era5_safe_date, get_viirs_safe_date, 
     get_landsat_safe_date, format_date
 )
+from .fetch_data import TABLE_KEYS
 from utils.datasets.era5_utils import fetch_all_regions_era5, update_era5_spi
 from utils.datasets.viirs_utils import fetch_all_regions_viirs
 from utils.datasets.firms_utils import sync_firms_incremental
@@ -62,7 +63,7 @@ def fetch_era5_daily():
     df = fetch_all_regions_era5(format_date(start_date), safe_date_str, daily=True)
     
     if df is not None and not df.empty:
-        save_to_bigquery(df, PROJECT_ID, DATASET_ID, "era5", mode="WRITE_APPEND")
+        merge_to_bigquery(df, PROJECT_ID, DATASET_ID, "era5", key_columns=TABLE_KEYS["era5"])
         print(f"✓ Saved {len(df)} ERA5 records")
         print("Computing SPI metrics...")
         update_era5_spi(PROJECT_ID, DATASET_ID, "era5_spi")
@@ -90,7 +91,7 @@ def fetch_viirs_daily():
     df = fetch_all_regions_viirs(format_date(start_date), safe_date_str, daily=True)
     
     if df is not None and not df.empty:
-        save_to_bigquery(df, PROJECT_ID, DATASET_ID, "viirs", mode="WRITE_APPEND")
+        merge_to_bigquery(df, PROJECT_ID, DATASET_ID, "viirs", key_columns=TABLE_KEYS["viirs"])
         print(f"✓ Saved {len(df)} VIIRS records")
     else:
         print("No VIIRS data fetched")
@@ -129,7 +130,7 @@ def fetch_landsat_daily():
     if frames:
         all_data = pd.concat(frames, ignore_index=True)
         aggregated = aggregate_landsat_to_16day(all_data)
-        save_to_bigquery(aggregated, PROJECT_ID, DATASET_ID, "landsat", mode="WRITE_APPEND")
+        merge_to_bigquery(aggregated, PROJECT_ID, DATASET_ID, "landsat", key_columns=TABLE_KEYS["landsat"])
         print(f"✓ Saved {len(aggregated)} Landsat records")
     else:
         print("No Landsat data fetched")
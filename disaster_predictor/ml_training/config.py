@@ -101,6 +101,18 @@ DISCHARGE_CLIMATOLOGY_TABLE = "copernicus_glofas"
 DISCHARGE_DAILY_DATASET = "daily_ingestion"
 DISCHARGE_DAILY_TABLE = "openmeteo_weather"
 
+# On-disk SPI precip store (one memory-mapped float32 array per region)
+SPI_PRECIP_STORE_DIR = Path(
+    os.getenv("SPI_PRECIP_STORE_DIR", PROJECT_ROOT / "data" / "spi_precip_store")
+)
+SPI_SCALE_DAYS = 30
+SPI_STORE_RESYNC_DAYS = 7  # Re-read recent daily_ingestion days to pick up late corrections
+
+# Local pickle of the indexed climatology_monthly lookup (see risk_assessment/climatology_index.py)
+CLIMATOLOGY_INDEX_PATH = Path(
+    os.getenv("CLIMATOLOGY_INDEX_PATH", PROJECT_ROOT / "data" / "climatology_index.pkl")
+)
+
 # Climatology Percentiles to Compute
 CLIMATOLOGY_PERCENTILES = [20, 80, 95]  # p20, p80, p95
 
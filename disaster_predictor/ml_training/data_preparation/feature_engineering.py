@@ -7,96 +7,114 @@ from typing import Optional
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
 from utils.datasets.era5_utils import compute_spi
+from ml_training.data_preparation.region_partition import partition_by_region
+
+
+# (source column, output column, window in rows, aggregation)
+_ROLLING_FEATURES = (
+    ('precipitation_sum_mm', 'precip_3d_max', 3, 'max'),
+    ('precipitation_sum_mm', 'precip_7d_sum', 7, 'sum'),
+    ('precipitation_sum_mm', 'precip_14d_sum', 14, 'sum'),
+    ('precipitation_sum_mm', 'precip_30d_sum', 30, 'sum'),
+    ('temp_2m_mean_C', 'temp_7d_mean', 7, 'mean'),
+    ('temp_2m_mean_C', 'temp_7d_max', 7, 'max'),
+    ('sm1_mean', 'sm1_14d_mean', 14, 'mean'),
+    ('sm2_mean', 'sm2_14d_mean', 14, 'mean'),
+    ('river_discharge', 'discharge_3d_max', 3, 'max'),
+    ('river_discharge', 'river_discharge_7d_mean', 7, 'mean'),
+    ('hotspot_count', 'hotspot_7d_sum', 7, 'sum'),
+    ('frp_mean', 'frp_7d_mean', 7, 'mean'),
+)
+
+NDVI_TREND_WINDOW = 30
+NDVI_TREND_MIN_POINTS = 3
+
+
+def _rolling_ndvi_slope(df: pd.DataFrame, grouped) -> pd.Series:
+    """Least-squares slope of ``ndvi_mean`` over the trailing 30 rows per region.
+
+    Equivalent to ``np.polyfit(x[valid], y[valid], 1)[0]`` on each window, but built
+    from rolling sums (n, Σx, Σy, Σxy, Σx²) over valid points only, so the whole
+    column is one groupby-rolling pass instead of a polyfit per row.
+    """
+    y = df['ndvi_mean'].astype(float)
+    valid = y.notna()
+    # Slope is shift-invariant in x, so the row position within the region works
+    # as the x axis for every window.
+    x = grouped.cumcount().astype(float).where(valid, 0.0)
+    y0 = y.where(valid, 0.0)
+
+    terms = pd.DataFrame({
+        'n': valid.astype(float),
+        'sx': x,
+        'sy': y0,
+        'sxy': x * y0,
+        'sxx': x * x,
+    }, index=df.index)
+    sums = (
+        terms.groupby(df['region'], sort=False)
+        .rolling(window=NDVI_TREND_WINDOW, min_periods=1)
+        .sum()
+        .reset_index(level=0, drop=True)
+        .reindex(df.index)
+    )
+
+    n = sums['n']
+    denom = n * sums['sxx'] - sums['sx'] ** 2
+    slope = (n * sums['sxy'] - sums['sx'] * sums['sy']) / denom
+    return slope.where((n >= NDVI_TREND_MIN_POINTS) & (denom > 0))
 
 
 def compute_temporal_features(df: pd.DataFrame) -> pd.DataFrame:
-    """Compute rolling window aggregations (7d, 14d, 30d)."""
+    """Compute rolling window aggregations (3d, 7d, 14d, 30d) and the 30d NDVI trend.
+
+    All windows are row-based per region (``min_periods=1``), computed with one
+    sorted groupby-rolling pass per (window, aggregation) pair.
+    """
     df = df.copy()
     df = df.sort_values(['region', 'date']).reset_index(drop=True)
-    
-    for region in df['region'].unique():
-        region_mask = df['region'] == region
-        region_df = df[region_mask].copy()
-        
-        if 'precipitation_sum_mm' in region_df.columns:
-            df.loc[region_mask, 'precip_3d_max'] = (
-                region_df['precipitation_sum_mm'].rolling(window=3, min_periods=1).max()
-            )
-            df.loc[region_mask, 'precip_7d_sum'] = (
-                region_df['precipitation_sum_mm'].rolling(window=7, min_periods=1).sum()
-            )
-            df.loc[region_mask, 'precip_14d_sum'] = (
-                region_df['precipitation_sum_mm'].rolling(window=14, min_periods=1).sum()
-            )
-            df.loc[region_mask, 'precip_30d_sum'] = (
-                region_df['precipitation_sum_mm'].rolling(window=30, min_periods=1).sum()
-            )
-        
-        if 'temp_2m_mean_C' in region_df.columns:
-            df.loc[region_mask, 'temp_7d_mean'] = (
-                region_df['temp_2m_mean_C'].rolling(window=7, min_periods=1).mean()
-            )
-            df.loc[region_mask, 'temp_7d_max'] = (
-                region_df['temp_2m_mean_C'].rolling(window=7, min_periods=1).max()
-            )
-        
-        if 'sm1_mean' in region_df.columns:
-            df.loc[region_mask, 'sm1_14d_mean'] = (
-                region_df['sm1_mean'].rolling(window=14, min_periods=1).mean()
-            )
-        if 'sm2_mean' in region_df.columns:
-            df.loc[region_mask, 'sm2_14d_mean'] = (
-                region_df['sm2_mean'].rolling(window=14, min_periods=1).mean()
-            )
-        
-        if 'river_discharge' in region_df.columns:
-            df.loc[region_mask, 'discharge_3d_max'] = (
-                region_df['river_discharge'].rolling(window=3, min_periods=1).max()
-            )
-            df.loc[region_mask, 'river_discharge_7d_mean'] = (
-                region_df['river_discharge'].rolling(window=7, min_periods=1).mean()
-            )
-        
-        if 'hotspot_count' in region_df.columns:
-            df.loc[region_mask, 'hotspot_7d_sum'] = (
-                region_df['hotspot_count'].rolling(window=7, min_periods=1).sum()
-            )
-        if 'frp_mean' in region_df.columns:
-            df.loc[region_mask, 'frp_7d_mean'] = (
-                region_df['frp_mean'].rolling(window=7, min_periods=1).mean()
-            )
-        
-        # NDVI trend: 30-day linear fit slope
-        if 'ndvi_mean' in region_df.columns:
-            ndvi_30d_trend = []
-            for i in range(len(region_df)):
-                window_start = max(0, i - 29)
-                window_data = region_df['ndvi_mean'].iloc[window_start:i+1]
-                if len(window_data) >= 3 and window_data.notna().sum() >= 3:
-                    x = np.arange(len(window_data))
-                    y = window_data.values
-                    valid = ~np.isnan(y)
-                    if valid.sum() >= 3:
-                        slope = np.polyfit(x[valid], y[valid], 1)[0]
-                        ndvi_30d_trend.append(slope)
-                    else:
-                        ndvi_30d_trend.append(np.nan)
-                else:
-                    ndvi_30d_trend.append(np.nan)
-            df.loc[region_mask, 'ndvi_30d_trend'] = ndvi_30d_trend
-    
+    grouped = df.groupby('region', sort=False)
+
+    passes: dict = {}
+    for source, output, window, agg in _ROLLING_FEATURES:
+        if source in df.columns:
+            passes.setdefault((window, agg), []).append((source, output))
+
+    outputs = {}
+    for (window, agg), columns in passes.items():
+        sources = list(dict.fromkeys(source for source, _ in columns))
+        rolled = getattr(
+            grouped[sources].rolling(window=window, min_periods=1), agg
+        )()
+        rolled = rolled.reset_index(level=0, drop=True).reindex(df.index)
+        for source, output in columns:
+            outputs[output] = rolled[source]
+
+    # Assign in declaration order so the column layout matches the feature lists.
+    for _, output, _, _ in _ROLLING_FEATURES:
+        if output in outputs:
+            df[output] = outputs[output]
+
+    if 'ndvi_mean' in df.columns:
+        df['ndvi_30d_trend'] = _rolling_ndvi_slope(df, grouped)
+
     return df
 
 
 def compute_spi_feature(
     df: pd.DataFrame,
     precip_history: Optional[pd.DataFrame] = None,
+    spi_store=None,
 ) -> pd.DataFrame:
     """Compute SPI30 (Standardized Precipitation Index, 30-day scale).
 
     When ``precip_history`` is provided (climatology + recent daily precip), SPI is
     calibrated on the full series and mapped back onto ``df`` rows. This matches
     training and avoids short-window inference artifacts.
+
+    ``spi_store`` (a ``SpiPrecipStore``) does the same from the on-disk store: the
+    distribution fitted on the climatology period is reused and only each row's
+    trailing window is read, with ``df`` precip overriding stored days.
     """
     df = df.copy()
     df = df.sort_values(['region', 'date']).reset_index(drop=True)
@@ -105,15 +123,20 @@ def compute_spi_feature(
         df['spi30'] = np.nan
         return df
 
-    spi_values = []
-    for region in df['region'].unique():
-        region_mask = df['region'] == region
-        region_df = df.loc[region_mask]
+    history_parts = None
+    if precip_history is not None and not precip_history.empty:
+        history_parts = partition_by_region(precip_history)
 
-        if precip_history is not None and not precip_history.empty:
-            rh = precip_history[precip_history['region'] == region][
-                ['date', 'precipitation_sum_mm']
-            ].copy()
+    spi_values = []
+    for region, region_df in partition_by_region(df).items():
+        if spi_store is not None and spi_store.has_region(region):
+            overrides = pd.Series(
+                region_df['precipitation_sum_mm'].to_numpy(dtype=float),
+                index=pd.to_datetime(region_df['date']),
+            )
+            spi_values.extend(spi_store.spi(region, region_df['date'], overrides=overrides))
+        elif history_parts is not None:
+            rh = history_parts.get(region)[['date', 'precipitation_sum_mm']].copy()
             rw = region_df[['date', 'precipitation_sum_mm']].rename(
                 columns={'precipitation_sum_mm': '_recent_precip'}
             )
@@ -298,6 +321,7 @@ def engineer_features(
     climatology: Optional[pd.DataFrame] = None,
     compute_climatology_from_data: bool = False,
     spi_precip_history: Optional[pd.DataFrame] = None,
+    spi_store=None,
 ) -> tuple:
     """Main feature engineering pipeline. Returns (features_df, climatology_df).
     
@@ -305,12 +329,13 @@ def engineer_features(
     to compute from df instead (slower, only needed if climatology table doesn't exist).
 
     Pass ``spi_precip_history`` at inference when ``df`` spans only a short recent
-    window so SPI30 uses the same long precip record as training.
+    window so SPI30 uses the same long precip record as training, or ``spi_store``
+    to read that record from the local memory-mapped store instead.
     """
     df = df.copy()
     
     df = compute_temporal_features(df)
-    df = compute_spi_feature(df, precip_history=spi_precip_history)
+    df = compute_spi_feature(df, precip_history=spi_precip_history, spi_store=spi_store)
     df = compute_temporal_metadata(df)
     
     if climatology is None:
@@ -9,6 +9,7 @@ from typing import List, Optional
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
 from utils.bq_utils import load_from_bigquery, execute_sql
+from ml_training.data_preparation.region_partition import partition_by_region
 from ml_training.config import (
     PROJECT_ID,
     CLIMATOLOGY_DATASET,
@@ -35,22 +36,6 @@ from ml_training.config import (
     DISCHARGE_DAILY_TABLE,
 )
 
-_SPI_PRECIP_CACHE: dict = {}
-
-
-def _spi_precip_cache_key(
-    regions: Optional[List[str]],
-    end_date: Optional[str],
-) -> tuple:
-    region_key = tuple(sorted(regions)) if regions else ("__all__",)
-    return (region_key, end_date or "")
-
-
-def clear_spi_precip_cache() -> None:
-    """Clear cached climatology precip used for SPI at inference."""
-    _SPI_PRECIP_CACHE.clear()
-
-
 def _build_year_filter(
     dataset_id: str,
     start_date: Optional[str],
@@ -123,7 +108,9 @@ def load_era5_data(
     year_filter = _build_year_filter(dataset_id, start_date, end_date)
 
     def _drop_duplicate_rows(df: pd.DataFrame, source: str) -> pd.DataFrame:
-        if df is None or df.empty:
+        # daily_ingestion tables are only written with MERGE on (date, region); the
+        # per-subregion climatology backfills still append, so only those can repeat.
+        if df is None or df.empty or dataset_id != CLIMATOLOGY_DATASET:
             return df
         dupes = df.duplicated(subset=['date', 'region'])
         if dupes.any():
@@ -195,7 +182,6 @@ def load_era5_data(
                     'soil_moisture_0_to_7cm_mean': 'sm1_mean',
                     'soil_moisture_7_to_28cm_mean': 'sm2_mean'
                 })
-                openmeteo_df = _drop_duplicate_rows(openmeteo_df, f"{dataset_id}.openmeteo_weather")
         except Exception as e:
             print(f"Warning: Could not load OpenMeteo backup data: {e}")
         
@@ -648,46 +634,15 @@ def load_spi_precip_history(
     end_date: Optional[str] = None,
     recent_precip: Optional[pd.DataFrame] = None,
 ) -> pd.DataFrame:
-    """Long-run daily precip for SPI: climatology ERA5 plus recent daily_ingestion overrides."""
-    cache_key = _spi_precip_cache_key(regions, end_date)
-    base = _SPI_PRECIP_CACHE.get(cache_key)
-    if base is None:
-        hist = load_era5_data(
-            regions=regions,
-            start_date=ERA5_START,
-            end_date=ERA5_END,
-            dataset_id=CLIMATOLOGY_DATASET,
-        )
-        if hist is None or hist.empty:
-            base = pd.DataFrame(columns=['date', 'region', 'precipitation_sum_mm'])
-        else:
-            base = hist[['date', 'region', 'precipitation_sum_mm']].copy()
-            base['date'] = pd.to_datetime(base['date']).dt.normalize()
-
-        if end_date and pd.Timestamp(end_date) > pd.Timestamp(ERA5_END):
-            recent_era5 = load_era5_data(
-                regions=regions,
-                start_date=(pd.Timestamp(ERA5_END) + pd.Timedelta(days=1)).strftime('%Y-%m-%d'),
-                end_date=end_date,
-                dataset_id='daily_ingestion',
-            )
-            if recent_era5 is not None and not recent_era5.empty:
-                recent_era5 = recent_era5[['date', 'region', 'precipitation_sum_mm']].copy()
-                recent_era5['date'] = pd.to_datetime(recent_era5['date']).dt.normalize()
-                base = base.merge(
-                    recent_era5.rename(columns={'precipitation_sum_mm': '_recent_precip'}),
-                    on=['date', 'region'],
-                    how='outer',
-                )
-                base['precipitation_sum_mm'] = base['_recent_precip'].combine_first(
-                    base['precipitation_sum_mm']
-                )
-                base = base.drop(columns=['_recent_precip'])
+    """Long-run daily precip for SPI: climatology ERA5 plus recent daily_ingestion overrides.
 
-        base = base.sort_values(['region', 'date']).reset_index(drop=True)
-        _SPI_PRECIP_CACHE[cache_key] = base
-    else:
-        base = base.copy()
+    Reads from the local SPI precip store (built from BigQuery on first use).
+    """
+    from ml_training.data_preparation.spi_precip_store import get_spi_precip_store
+
+    store = get_spi_precip_store(regions=regions, end_date=end_date)
+    base = store.to_frame(regions=regions, end_date=end_date)
+    base = base.sort_values(['region', 'date']).reset_index(drop=True)
 
     if recent_precip is None or recent_precip.empty:
         return base
@@ -718,9 +673,7 @@ def forward_fill_modis(modis_df: pd.DataFrame) -> pd.DataFrame:
     
     result_dfs = []
     
-    for region in modis_df['region'].unique():
-        region_modis = modis_df[modis_df['region'] == region].copy()
-        
+    for region, region_modis in partition_by_region(modis_df).items():
         min_date = region_modis['date'].min()
         max_date = region_modis['date'].max()
         
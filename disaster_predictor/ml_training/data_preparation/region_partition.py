@@ -0,0 +1,107 @@
+"""
+Region-partitioned frames: group a long (region, date, ...) frame once, then hand
+out each region's rows as a contiguous slice instead of re-filtering with
+``df[df['region'] == region]`` (O(rows) and a copy per lookup).
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+class RegionPartitionedFrame:
+    """Frame sorted by region with a region → row-slice table.
+
+    ``get(region)`` returns an ``iloc`` slice of the sorted frame (no boolean mask,
+    no per-region copy); callers that mutate the result should ``.copy()`` it.
+    Rows keep their original index labels.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        region_col: str = "region",
+        sort_by: Optional[List[str]] = None,
+    ):
+        self.region_col = region_col
+        if df is None:
+            df = pd.DataFrame(columns=[region_col])
+        keys = [region_col] + [c for c in (sort_by or []) if c in df.columns]
+        # Stable sort keeps the original row order within a region.
+        self.frame = df.sort_values(keys, kind="stable") if len(df) else df
+        self._slices: Dict[str, slice] = {}
+
+        if len(self.frame) and region_col in self.frame.columns:
+            values = self.frame[region_col].to_numpy()
+            valid = ~pd.isna(values)
+            if valid.any():
+                # Missing regions sort last; ignore them like boolean filtering does.
+                n_valid = int(np.flatnonzero(valid)[-1]) + 1
+                values = values[:n_valid]
+                starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+                stops = np.r_[starts[1:], n_valid]
+                self._slices = {
+                    values[start]: slice(int(start), int(stop))
+                    for start, stop in zip(starts, stops)
+                }
+
+    @property
+    def empty(self) -> bool:
+        return self.frame.empty
+
+    @property
+    def regions(self) -> List[str]:
+        return list(self._slices)
+
+    def __len__(self) -> int:
+        return len(self._slices)
+
+    def __contains__(self, region) -> bool:
+        return region in self._slices
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._slices)
+
+    def get(self, region) -> pd.DataFrame:
+        """Rows for ``region`` (an empty frame with the same columns if absent)."""
+        sl = self._slices.get(region)
+        if sl is None:
+            return self.frame.iloc[0:0]
+        return self.frame.iloc[sl]
+
+    def items(self) -> Iterator[Tuple[str, pd.DataFrame]]:
+        for region, sl in self._slices.items():
+            yield region, self.frame.iloc[sl]
+
+
+FrameOrPartition = Union[pd.DataFrame, RegionPartitionedFrame]
+
+
+def partition_by_region(
+    df: Optional[pd.DataFrame],
+    region_col: str = "region",
+    sort_by: Optional[List[str]] = None,
+) -> RegionPartitionedFrame:
+    """Build a ``RegionPartitionedFrame`` (``sort_by`` orders rows within a region)."""
+    return RegionPartitionedFrame(df, region_col=region_col, sort_by=sort_by)
+
+
+def region_rows(
+    data: Optional[FrameOrPartition],
+    region: str,
+    region_col: str = "region",
+) -> Optional[pd.DataFrame]:
+    """One region's rows from either a plain frame or a partitioned one.
+
+    ``None`` passes through so callers can keep their "not preloaded" branches.
+    """
+    if data is None:
+        return None
+    if isinstance(data, RegionPartitionedFrame):
+        return data.get(region)
+    if data.empty:
+        return data
+    return data[data[region_col] == region]
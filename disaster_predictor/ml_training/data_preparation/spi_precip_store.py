@@ -0,0 +1,363 @@
+"""
+On-disk daily precipitation store for SPI30 at inference.
+
+Layout under ``SPI_PRECIP_STORE_DIR``:
+- ``index.json``: store version plus, per region, the array file, first date,
+  length and the SPI distribution fitted on the climatology period
+- ``<region>.f32``: one contiguous float32 value per calendar day (NaN = missing)
+
+Arrays are memory-mapped on read, so SPI30 for a handful of recent days touches
+only the trailing window instead of re-querying and re-fitting decades of ERA5.
+The store is built once from the climatology table and then topped up with
+daily_ingestion precip as new days arrive.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+from ml_training.config import (
+    CLIMATOLOGY_DATASET,
+    ERA5_END,
+    ERA5_START,
+    SPI_PRECIP_STORE_DIR,
+    SPI_SCALE_DAYS,
+    SPI_STORE_RESYNC_DAYS,
+)
+from utils.datasets.era5_utils import fit_spi_distribution, spi_from_distribution
+
+STORE_VERSION = 1
+_DAY = np.timedelta64(1, "D")
+
+
+def _region_filename(region: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", region).strip("_")[:40]
+    digest = hashlib.sha1(region.encode("utf-8")).hexdigest()[:10]
+    return f"{slug}_{digest}.f32"
+
+
+def _to_day(value) -> np.datetime64:
+    return np.datetime64(pd.Timestamp(value).normalize().date(), "D")
+
+
+class SpiPrecipStore:
+    """Memory-mapped per-region daily precip arrays with cached SPI fits."""
+
+    def __init__(self, root: Path = SPI_PRECIP_STORE_DIR, scale: int = SPI_SCALE_DAYS):
+        self.root = Path(root)
+        self.scale = scale
+        self._index_path = self.root / "index.json"
+        self._maps: Dict[str, np.memmap] = {}
+        # Per-process record of which end_date each region was topped up to.
+        self.synced_through: Dict[str, str] = {}
+        # Regions already looked up in the climatology table this process (found or not).
+        self.build_attempted: Set[str] = set()
+        self.built_all = False
+        self.index = self._load_index()
+
+    def _load_index(self) -> dict:
+        empty = {"version": STORE_VERSION, "scale": self.scale, "regions": {}}
+        if not self._index_path.exists():
+            return empty
+        with open(self._index_path, encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") != STORE_VERSION or index.get("scale") != self.scale:
+            print("SPI precip store is stale (version/scale changed); rebuilding")
+            return empty
+        return index
+
+    def _save_index(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self._index_path.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, indent=2, sort_keys=True)
+        os.replace(tmp, self._index_path)
+
+    @property
+    def regions(self) -> List[str]:
+        return list(self.index["regions"])
+
+    def has_region(self, region: str) -> bool:
+        return region in self.index["regions"]
+
+    def last_date(self, region: str) -> Optional[pd.Timestamp]:
+        entry = self.index["regions"].get(region)
+        if not entry or not entry["length"]:
+            return None
+        return pd.Timestamp(np.datetime64(entry["start"], "D") + (entry["length"] - 1) * _DAY)
+
+    def _array(self, region: str) -> np.ndarray:
+        arr = self._maps.get(region)
+        if arr is None:
+            entry = self.index["regions"][region]
+            arr = np.memmap(
+                self.root / entry["file"], dtype=np.float32, mode="r", shape=(entry["length"],)
+            )
+            self._maps[region] = arr
+        return arr
+
+    def write_region(self, region: str, dates: pd.Series, precip: pd.Series) -> None:
+        """(Re)write a region's full array and refit its SPI distribution."""
+        days = pd.to_datetime(dates).dt.normalize().to_numpy().astype("datetime64[D]")
+        values = pd.to_numeric(precip, errors="coerce").to_numpy(dtype=np.float32)
+        if len(days) == 0:
+            return
+        start = days.min()
+        arr = np.full(int((days.max() - start) / _DAY) + 1, np.nan, dtype=np.float32)
+        arr[((days - start) / _DAY).astype(np.int64)] = values
+
+        self._maps.pop(region, None)
+        self.root.mkdir(parents=True, exist_ok=True)
+        filename = _region_filename(region)
+        arr.tofile(self.root / filename)
+        self.index["regions"][region] = {
+            "file": filename,
+            "start": str(start),
+            "length": int(len(arr)),
+            "spi_params": self._fit(arr, start),
+        }
+
+    def _fit(self, arr: np.ndarray, start: np.datetime64) -> Optional[Dict[str, float]]:
+        """Fit the SPI distribution on the climatology period only, so it stays fixed."""
+        fit_len = int((_to_day(ERA5_END) - start) / _DAY) + 1
+        if fit_len <= 0:
+            fit_len = len(arr)
+        series = pd.Series(arr[:fit_len], dtype=float)
+        rolling = series.rolling(window=self.scale, min_periods=self.scale // 2).sum()
+        return fit_spi_distribution(rolling)
+
+    def append(self, df: pd.DataFrame) -> int:
+        """Upsert daily precip rows (``date``, ``region``, ``precipitation_sum_mm``).
+
+        Existing days are overwritten in place; later days extend the array file.
+        Regions not yet in the store are written from scratch. Returns rows written.
+        """
+        if df is None or df.empty:
+            return 0
+        frame = df[["date", "region", "precipitation_sum_mm"]].copy()
+        frame["date"] = pd.to_datetime(frame["date"]).dt.normalize()
+        frame = frame.sort_values(["region", "date"]).drop_duplicates(
+            subset=["region", "date"], keep="last"
+        )
+
+        written = 0
+        for region, rdf in frame.groupby("region", sort=False):
+            entry = self.index["regions"].get(region)
+            if entry is None:
+                self.write_region(region, rdf["date"], rdf["precipitation_sum_mm"])
+                written += len(rdf)
+                continue
+
+            start = np.datetime64(entry["start"], "D")
+            offsets = ((rdf["date"].to_numpy().astype("datetime64[D]") - start) / _DAY).astype(np.int64)
+            values = pd.to_numeric(rdf["precipitation_sum_mm"], errors="coerce").to_numpy(dtype=np.float32)
+            keep = offsets >= 0
+            offsets, values = offsets[keep], values[keep]
+            if len(offsets) == 0:
+                continue
+
+            self._maps.pop(region, None)
+            path = self.root / entry["file"]
+            new_length = max(entry["length"], int(offsets.max()) + 1)
+            if new_length > entry["length"]:
+                with open(path, "ab") as f:
+                    np.full(new_length - entry["length"], np.nan, dtype=np.float32).tofile(f)
+                entry["length"] = new_length
+            arr = np.memmap(path, dtype=np.float32, mode="r+", shape=(new_length,))
+            arr[offsets] = values
+            arr.flush()
+            if entry.get("spi_params") is None:
+                # Regions first seen after the climatology period had too little history
+                # to fit on; retry as days arrive (fixed once a fit succeeds).
+                entry["spi_params"] = self._fit(np.asarray(arr), start)
+            del arr
+            written += len(offsets)
+
+        self._save_index()
+        return written
+
+    def precip_series(
+        self,
+        region: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> pd.Series:
+        """Daily precip for a region as a date-indexed float Series."""
+        entry = self.index["regions"][region]
+        start = np.datetime64(entry["start"], "D")
+        lo = 0 if start_date is None else max(0, int((_to_day(start_date) - start) / _DAY))
+        hi = entry["length"] if end_date is None else min(
+            entry["length"], int((_to_day(end_date) - start) / _DAY) + 1
+        )
+        values = np.asarray(self._array(region)[lo:max(lo, hi)], dtype=float)
+        dates = pd.date_range(pd.Timestamp(start + lo * _DAY), periods=len(values), freq="D")
+        return pd.Series(values, index=dates, name="precipitation_sum_mm")
+
+    def to_frame(
+        self,
+        regions: Optional[Iterable[str]] = None,
+        end_date: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Long ``date``/``region``/``precipitation_sum_mm`` frame (missing days dropped)."""
+        parts = []
+        for region in regions or self.regions:
+            if not self.has_region(region):
+                continue
+            series = self.precip_series(region, end_date=end_date).dropna()
+            parts.append(pd.DataFrame({
+                "date": series.index,
+                "region": region,
+                "precipitation_sum_mm": series.to_numpy(),
+            }))
+        if not parts:
+            return pd.DataFrame(columns=["date", "region", "precipitation_sum_mm"])
+        return pd.concat(parts, ignore_index=True)
+
+    def spi(
+        self,
+        region: str,
+        dates: pd.Series,
+        overrides: Optional[pd.Series] = None,
+    ) -> np.ndarray:
+        """SPI for ``dates`` of one region using only the trailing windows.
+
+        ``overrides`` (date-indexed precip) replaces stored values, so rows being
+        scored win over the stored history exactly like the merged-history path.
+        """
+        days = pd.to_datetime(pd.Series(dates)).dt.normalize().to_numpy().astype("datetime64[D]")
+        out = np.full(len(days), np.nan)
+        entry = self.index["regions"].get(region)
+        params = entry.get("spi_params") if entry else None
+        if len(days) == 0 or params is None:
+            return out
+
+        first = days.min() - (self.scale - 1) * _DAY
+        last = days.max()
+        n = int((last - first) / _DAY) + 1
+        window = np.full(n, np.nan)
+
+        start = np.datetime64(entry["start"], "D")
+        lo = int((first - start) / _DAY)
+        src_lo, src_hi = max(lo, 0), min(lo + n, entry["length"])
+        if src_hi > src_lo:
+            window[src_lo - lo:src_hi - lo] = self._array(region)[src_lo:src_hi]
+
+        if overrides is not None:
+            overrides = overrides.dropna()
+        if overrides is not None and not overrides.empty:
+            o_days = pd.to_datetime(overrides.index).normalize().to_numpy().astype("datetime64[D]")
+            o_pos = ((o_days - first) / _DAY).astype(np.int64)
+            inside = (o_pos >= 0) & (o_pos < n)
+            window[o_pos[inside]] = overrides.to_numpy(dtype=float)[inside]
+
+        rolling = pd.Series(window).rolling(window=self.scale, min_periods=self.scale // 2).sum()
+        spi_all = spi_from_distribution(rolling, params).to_numpy()
+        return spi_all[((days - first) / _DAY).astype(np.int64)]
+
+
+_STORE: Optional[SpiPrecipStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def build_spi_precip_store(
+    regions: Optional[List[str]] = None,
+    store: Optional[SpiPrecipStore] = None,
+) -> SpiPrecipStore:
+    """Populate the store from the ERA5 climatology table (one BigQuery scan)."""
+    from ml_training.data_preparation.load_training_data import load_era5_data
+
+    store = store or SpiPrecipStore()
+    hist = load_era5_data(
+        regions=regions,
+        start_date=ERA5_START,
+        end_date=ERA5_END,
+        dataset_id=CLIMATOLOGY_DATASET,
+    )
+    if hist is None or hist.empty:
+        return store
+
+    hist = hist[["date", "region", "precipitation_sum_mm"]].copy()
+    hist["date"] = pd.to_datetime(hist["date"]).dt.normalize()
+    hist = hist.sort_values(["region", "date"]).drop_duplicates(
+        subset=["region", "date"], keep="last"
+    )
+    for region, rdf in hist.groupby("region", sort=False):
+        store.write_region(region, rdf["date"], rdf["precipitation_sum_mm"])
+    store._save_index()
+    print(f"Built SPI precip store for {hist['region'].nunique()} regions at {store.root}")
+    return store
+
+
+def sync_spi_precip_store(
+    store: SpiPrecipStore,
+    end_date: str,
+    regions: Optional[List[str]] = None,
+) -> int:
+    """Append daily_ingestion precip after the stored history, up to ``end_date``."""
+    from ml_training.data_preparation.load_training_data import load_era5_data
+
+    regions = regions or store.regions
+    last_dates = [store.last_date(r) for r in regions if store.has_region(r)]
+    if not last_dates:
+        return 0
+    floor = max(pd.Timestamp(ERA5_END), min(d for d in last_dates if d is not None))
+    start = floor - pd.Timedelta(days=SPI_STORE_RESYNC_DAYS - 1)
+    start = max(start, pd.Timestamp(ERA5_END) + pd.Timedelta(days=1))
+    if start > pd.Timestamp(end_date):
+        return 0
+
+    recent = load_era5_data(
+        regions=regions,
+        start_date=start.strftime("%Y-%m-%d"),
+        end_date=end_date,
+        dataset_id="daily_ingestion",
+    )
+    if recent is None or recent.empty:
+        return 0
+    return store.append(recent[["date", "region", "precipitation_sum_mm"]])
+
+
+def get_spi_precip_store(
+    regions: Optional[List[str]] = None,
+    end_date: Optional[str] = None,
+) -> SpiPrecipStore:
+    """Shared store handle: builds missing regions once and tops up through ``end_date``."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = SpiPrecipStore()
+        store = _STORE
+
+        # Regions the climatology table has no rows for are looked up once per
+        # process, not on every call.
+        if regions is None:
+            if not store.regions and not store.built_all:
+                build_spi_precip_store(store=store)
+                store.built_all = True
+        else:
+            missing = [
+                r for r in regions
+                if not store.has_region(r) and r not in store.build_attempted
+            ]
+            if missing:
+                build_spi_precip_store(regions=missing, store=store)
+                store.build_attempted.update(missing)
+
+        if end_date and pd.Timestamp(end_date) > pd.Timestamp(ERA5_END):
+            stale = [
+                r for r in (regions or store.regions)
+                if store.synced_through.get(r) != end_date
+            ]
+            if stale:
+                sync_spi_precip_store(store, end_date, regions=stale)
+                store.synced_through.update({r: end_date for r in stale})
+        return store
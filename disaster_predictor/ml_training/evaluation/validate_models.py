@@ -53,6 +53,7 @@ from ml_training.models.train_models import (
     remove_correlated_features,
     get_feature_columns,
 )
+from ml_training.models.model_predictor import thresholded_levels
 
 
 def load_model(disaster_type: str) -> Tuple:
@@ -150,28 +151,7 @@ def _predict_from_proba_thresholded(
     disaster_type: str,
 ) -> np.ndarray:
     """L3 then L2 priority using calibrated thresholds; fallback argmax. Landslide: 3-class + UI L3."""
-    t2 = float(thresholds.get("level_2", 0.5))
-    t3 = float(thresholds.get("level_3", 0.5))
-    n_cls = len(col_idx)
-    i2 = col_idx.get(2)
-    i3 = col_idx.get(3)
-    preds = []
-    for row in proba:
-        if disaster_type == "landslide" and n_cls == 3 and i2 is not None:
-            if row[i2] >= t3:
-                preds.append(3)
-            elif row[i2] >= t2:
-                preds.append(2)
-            else:
-                preds.append(int(np.argmax(row)))
-            continue
-        if i3 is not None and row[i3] >= t3:
-            preds.append(3)
-        elif i2 is not None and row[i2] >= t2:
-            preds.append(2)
-        else:
-            preds.append(int(np.argmax(row)))
-    return np.array(preds, dtype=int)
+    return thresholded_levels(proba, list(col_idx), thresholds, disaster_type)
 
 
 def _flood_threshold_score(y_true: np.ndarray, y_pred: np.ndarray) -> float:
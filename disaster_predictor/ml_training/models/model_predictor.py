@@ -41,8 +41,8 @@ from ml_training.data_preparation.load_training_data import (
     merge_datasets,
     handle_missing_data,
     forward_fill_ndvi_columns,
-    load_spi_precip_history,
 )
+from ml_training.data_preparation.spi_precip_store import get_spi_precip_store
 from ml_training.data_preparation.descriptor_encoding import (
     apply_descriptor_string_encodings,
     load_descriptor_encodings,
@@ -75,6 +75,8 @@ class ModelPredictor:
         
         if not model_path.exists():
             raise FileNotFoundError(f"Model not found: {model_path}")
+        # Pickle size is a close proxy for the resident size of the fitted forest.
+        self.approx_size_mb = model_path.stat().st_size / (1024 * 1024)
         
         import warnings
         with warnings.catch_warnings():
@@ -124,34 +126,9 @@ class ModelPredictor:
             preloaded_static: Optional dict with 'terrain' and 'desc' DataFrames
         """
         if preloaded_data is not None and not preloaded_data.empty:
-            # Filter preloaded data for requested regions and dates
-            merged = preloaded_data[
-                (preloaded_data['region'].isin(regions)) & 
-                (preloaded_data['date'] >= pd.to_datetime(start_date)) & 
-                (preloaded_data['date'] <= pd.to_datetime(end_date))
-            ].copy()
-            
-            # Load static data (terrain and descriptors)
-            if preloaded_static:
-                terrain = preloaded_static.get('terrain', pd.DataFrame())
-                desc = preloaded_static.get('desc', pd.DataFrame())
-            else:
-                terrain = load_terrain_data(regions=regions)
-                desc = load_region_descriptors(regions=regions)
-            
-            if not terrain.empty:
-                terrain_cols = [col for col in terrain.columns if col != 'region']
-                # Filter terrain for these regions
-                t_chunk = terrain[terrain['region'].isin(regions)]
-                if not t_chunk.empty:
-                    merged = merged.merge(t_chunk[['region'] + terrain_cols], on='region', how='left')
-            
-            if not desc.empty:
-                desc_cols = [col for col in desc.columns if col not in ['region', 'elevation_mean_m', 'slope_mean_deg']]
-                # Filter desc for these regions
-                d_chunk = desc[desc['region'].isin(regions)]
-                if not d_chunk.empty:
-                    merged = merged.merge(d_chunk[['region'] + desc_cols], on='region', how='left')
+            merged = _merge_preloaded_inputs(
+                regions, start_date, end_date, preloaded_data, preloaded_static
+            )
         else:
             era5 = load_era5_data(regions=regions, start_date=start_date, end_date=end_date, dataset_id=dataset_id)
             modis = load_modis_data(regions=regions, start_date=start_date, end_date=end_date, dataset_id=dataset_id)
@@ -188,22 +165,49 @@ class ModelPredictor:
         import gc
         gc.collect()
 
-        spi_precip_history = None
+        spi_store = None
         if preloaded_data is not None or dataset_id == 'daily_ingestion':
-            spi_precip_history = load_spi_precip_history(
-                regions=regions,
-                end_date=end_date,
-                recent_precip=clean[['date', 'region', 'precipitation_sum_mm']],
-            )
+            spi_store = get_spi_precip_store(regions=regions, end_date=end_date)
         
         features, _ = engineer_features(
             clean,
             compute_climatology_from_data=False,
-            spi_precip_history=spi_precip_history,
+            spi_store=spi_store,
         )
         
         return features
     
+    def encode_shared_features(self, features: pd.DataFrame) -> pd.DataFrame:
+        """Apply this model's descriptor encodings to a ``prepare_shared_features`` frame."""
+        if features.empty:
+            return features
+        return apply_descriptor_string_encodings(features, self.descriptor_string_encodings)
+
+    def _feature_matrix(self, features: pd.DataFrame) -> pd.DataFrame:
+        """Model input columns in training order; missing features are zero-filled."""
+        feature_cols = [c for c in self.feature_columns if c in features.columns]
+        X = features[feature_cols].copy()
+        
+        missing_cols = set(self.feature_columns) - set(feature_cols)
+        if missing_cols:
+            for col in missing_cols:
+                X[col] = 0
+        
+        X = X[self.feature_columns]
+        return X.select_dtypes(include=[np.number])
+
+    def levels_from_proba(self, proba: np.ndarray) -> np.ndarray:
+        """Risk levels from a ``predict_proba`` matrix (thresholds if calibrated)."""
+        if not self.class_thresholds:
+            return np.asarray(self.model.classes_)[np.argmax(proba, axis=1)].astype(int)
+        return thresholded_levels(
+            proba,
+            self.model.classes_,
+            self.class_thresholds,
+            self.disaster_type,
+            landslide_l3_threshold=self.landslide_ui_l3_threshold,
+        )
+
     def predict(
         self,
         features: pd.DataFrame,
@@ -218,55 +222,34 @@ class ModelPredictor:
         Returns:
             Series of risk levels (0-3) or DataFrame of probabilities
         """
-        feature_cols = [c for c in self.feature_columns if c in features.columns]
-        X = features[feature_cols].copy()
-        
-        missing_cols = set(self.feature_columns) - set(feature_cols)
-        if missing_cols:
-            for col in missing_cols:
-                X[col] = 0
-        
-        X = X[self.feature_columns]
-        X = X.select_dtypes(include=[np.number])
+        X = self._feature_matrix(features)
+        proba = self.model.predict_proba(X)
         
         if return_proba:
-            proba = self.model.predict_proba(X)
             proba_df = pd.DataFrame(
                 proba,
                 index=features.index,
                 columns=[f'prob_level_{i}' for i in range(proba.shape[1])]
             )
             return proba_df
-        else:
-            if self.class_thresholds:
-                proba = self.model.predict_proba(X)
-                col_idx = {int(c): i for i, c in enumerate(self.model.classes_)}
-                t2 = float(self.class_thresholds.get("level_2", 0.5))
-                t3 = float(self.class_thresholds.get("level_3", 0.5))
-                t3_landslide_ui = float(self.landslide_ui_l3_threshold)
-                preds = []
-                n_cls = len(col_idx)
-                i2 = col_idx.get(2)
-                i3 = col_idx.get(3)
-                for row in proba:
-                    if self.disaster_type == "landslide" and n_cls == 3 and i2 is not None:
-                        if row[i2] >= t3_landslide_ui:
-                            preds.append(3)
-                        elif row[i2] >= t2:
-                            preds.append(2)
-                        else:
-                            preds.append(int(np.argmax(row)))
-                        continue
-                    if i3 is not None and row[i3] >= t3:
-                        preds.append(3)
-                    elif i2 is not None and row[i2] >= t2:
-                        preds.append(2)
-                    else:
-                        preds.append(int(np.argmax(row)))
-                predictions = np.array(preds, dtype=int)
-            else:
-                predictions = self.model.predict(X)
-            return pd.Series(predictions, index=features.index, name='risk_level')
+        return pd.Series(self.levels_from_proba(proba), index=features.index, name='risk_level')
+
+    def predict_many(self, features: pd.DataFrame) -> pd.DataFrame:
+        """Levels and probabilities for every row from a single ``predict_proba`` call.
+
+        Meant for batches spanning many regions/dates (backfills, calibration).
+        Returns ``risk_level`` plus ``prob_level_{i}`` columns on ``features.index``.
+        """
+        if features.empty:
+            return pd.DataFrame(index=features.index, columns=['risk_level'])
+        proba = self.model.predict_proba(self._feature_matrix(features))
+        out = pd.DataFrame(
+            proba,
+            index=features.index,
+            columns=[f'prob_level_{i}' for i in range(proba.shape[1])]
+        )
+        out.insert(0, 'risk_level', self.levels_from_proba(proba))
+        return out
     
     def predict_for_regions(
         self,
@@ -293,6 +276,118 @@ class ModelPredictor:
         return result
 
 
+def thresholded_levels(
+    proba: np.ndarray,
+    classes,
+    thresholds: Dict[str, float],
+    disaster_type: str,
+    landslide_l3_threshold: Optional[float] = None,
+) -> np.ndarray:
+    """L3 then L2 priority using calibrated thresholds; fallback argmax (column index).
+
+    Landslide models are 3-class: P(level 2) above the UI threshold
+    (``landslide_l3_threshold``, default ``thresholds['level_3']``) is shown as 3.
+    Array-based, so whole backfills and calibration sweeps are a few numpy ops.
+    """
+    proba = np.asarray(proba, dtype=float)
+    col_idx = {int(c): i for i, c in enumerate(classes)}
+    t2 = float(thresholds.get("level_2", 0.5))
+    t3 = float(thresholds.get("level_3", 0.5))
+    i2 = col_idx.get(2)
+    i3 = col_idx.get(3)
+
+    levels = np.argmax(proba, axis=1).astype(int)
+    if disaster_type == "landslide" and len(col_idx) == 3 and i2 is not None:
+        t3_ui = t3 if landslide_l3_threshold is None else float(landslide_l3_threshold)
+        p2 = proba[:, i2]
+        levels = np.where(p2 >= t2, 2, levels)
+        return np.where(p2 >= t3_ui, 3, levels)
+
+    # Later assignments win, so apply L2 first and let L3 override it.
+    if i2 is not None:
+        levels = np.where(proba[:, i2] >= t2, 2, levels)
+    if i3 is not None:
+        levels = np.where(proba[:, i3] >= t3, 3, levels)
+    return levels
+
+
+def _merge_preloaded_inputs(
+    regions: List[str],
+    start_date: str,
+    end_date: str,
+    preloaded_data: pd.DataFrame,
+    preloaded_static: Optional[Dict[str, pd.DataFrame]] = None,
+) -> pd.DataFrame:
+    """Filter preloaded weather to regions/dates and attach terrain + descriptors."""
+    # Filter preloaded data for requested regions and dates
+    merged = preloaded_data[
+        (preloaded_data['region'].isin(regions)) & 
+        (preloaded_data['date'] >= pd.to_datetime(start_date)) & 
+        (preloaded_data['date'] <= pd.to_datetime(end_date))
+    ].copy()
+    
+    # Load static data (terrain and descriptors)
+    if preloaded_static:
+        terrain = preloaded_static.get('terrain', pd.DataFrame())
+        desc = preloaded_static.get('desc', pd.DataFrame())
+    else:
+        terrain = load_terrain_data(regions=regions)
+        desc = load_region_descriptors(regions=regions)
+    
+    if not terrain.empty:
+        terrain_cols = [col for col in terrain.columns if col != 'region']
+        # Filter terrain for these regions
+        t_chunk = terrain[terrain['region'].isin(regions)]
+        if not t_chunk.empty:
+            merged = merged.merge(t_chunk[['region'] + terrain_cols], on='region', how='left')
+    
+    if not desc.empty:
+        desc_cols = [col for col in desc.columns if col not in ['region', 'elevation_mean_m', 'slope_mean_deg']]
+        # Filter desc for these regions
+        d_chunk = desc[desc['region'].isin(regions)]
+        if not d_chunk.empty:
+            merged = merged.merge(d_chunk[['region'] + desc_cols], on='region', how='left')
+    return merged
+
+
+def prepare_shared_features(
+    regions: List[str],
+    start_date: str,
+    end_date: str,
+    preloaded_data: pd.DataFrame,
+    preloaded_static: Optional[Dict[str, pd.DataFrame]] = None,
+) -> pd.DataFrame:
+    """Hazard-agnostic feature frame for a chunk of regions, engineered once.
+
+    Same steps as ``ModelPredictor.prepare_features`` on preloaded data, except that
+    descriptor strings are left raw: each predictor applies its own one-hot
+    vocabulary with ``ModelPredictor.encode_shared_features``. The encodings only
+    add per-region constant columns, so deferring them does not change imputation
+    or any engineered feature.
+    """
+    if preloaded_data is None or preloaded_data.empty:
+        return pd.DataFrame()
+
+    merged = _merge_preloaded_inputs(
+        regions, start_date, end_date, preloaded_data, preloaded_static
+    )
+    if merged.empty:
+        return pd.DataFrame()
+
+    if 'ndvi_mean' in merged.columns:
+        merged = forward_fill_ndvi_columns(merged)
+    clean = handle_missing_data(merged, REQUIRED_FEATURES)
+    del merged
+
+    spi_store = get_spi_precip_store(regions=regions, end_date=end_date)
+    features, _ = engineer_features(
+        clean,
+        compute_climatology_from_data=False,
+        spi_store=spi_store,
+    )
+    return features
+
+
 def load_predictor(disaster_type: str) -> ModelPredictor:
     """Load a predictor for a disaster type."""
     return ModelPredictor(disaster_type)
@@ -0,0 +1,246 @@
+"""
+Indexed monthly climatology for outlook percentiles.
+
+``climatology_monthly`` is turned once into a ``(region, month, metric)`` → sorted
+anchor array lookup, so mapping a value to an approximate percentile is a dict hit
+plus ``np.searchsorted`` instead of a DataFrame scan per anchor. The index is
+pickled to local disk and stamped with the format version and the source table's
+``last_modified_time``; it is rebuilt only when either changes.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import re
+import sys
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.bq_utils import load_from_bigquery
+from ml_training.config import CLIMATOLOGY_DATASET, CLIMATOLOGY_INDEX_PATH
+
+# Bump when the pickled layout changes
+CLIMATOLOGY_INDEX_VERSION = 1
+CLIMATOLOGY_TABLE = "climatology_monthly"
+
+# Percentile anchors used to place a value on ~0–100
+ANCHOR_PERCENTILES = (
+    (5, "p05"),
+    (10, "p10"),
+    (20, "p20"),
+    (50, "p50"),
+    (80, "p80"),
+    (95, "p95"),
+)
+_ANCHOR_BY_NAME = {name: float(pnum) for pnum, name in ANCHOR_PERCENTILES}
+_ANCHOR_COL = re.compile(r"^(?P<metric>.+)_(?P<pct>p\d\d)$")
+
+AnchorKey = Tuple[str, int, str]
+
+
+class ClimatologyIndex:
+    """Sorted percentile anchors per region × month × metric.
+
+    ``anchors[(region, month, metric)]`` is ``(values, percentiles)`` with both
+    arrays sorted by value and NaN anchors dropped; ``values`` holds every numeric
+    climatology column for exact lookups.
+    """
+
+    def __init__(
+        self,
+        anchors: Dict[AnchorKey, Tuple[np.ndarray, np.ndarray]],
+        values: Dict[AnchorKey, float],
+        source_stamp: Optional[int] = None,
+        project_id: Optional[str] = None,
+    ):
+        self.version = CLIMATOLOGY_INDEX_VERSION
+        self.anchors = anchors
+        self.values = values
+        self.source_stamp = source_stamp
+        self.project_id = project_id
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        source_stamp: Optional[int] = None,
+        project_id: Optional[str] = None,
+    ) -> "ClimatologyIndex":
+        anchors: Dict[AnchorKey, Tuple[np.ndarray, np.ndarray]] = {}
+        values: Dict[AnchorKey, float] = {}
+        if df is None or df.empty or "region" not in df.columns or "month" not in df.columns:
+            return cls(anchors, values, source_stamp=source_stamp, project_id=project_id)
+
+        value_cols = [
+            c for c in df.columns
+            if c not in ("region", "month") and pd.api.types.is_numeric_dtype(df[c])
+        ]
+        # metric -> [(anchor percentile, column position)]
+        metric_cols: Dict[str, list] = {}
+        for pos, col in enumerate(value_cols):
+            m = _ANCHOR_COL.match(col)
+            if m and m.group("pct") in _ANCHOR_BY_NAME:
+                metric_cols.setdefault(m.group("metric"), []).append((_ANCHOR_BY_NAME[m.group("pct")], pos))
+
+        regions = df["region"].to_numpy()
+        months = pd.to_numeric(df["month"], errors="coerce").to_numpy()
+        matrix = df[value_cols].to_numpy(dtype=np.float64)
+
+        for region, month, row in zip(regions, months, matrix):
+            if pd.isna(region) or np.isnan(month):
+                continue
+            month = int(month)
+            for col, v in zip(value_cols, row):
+                if not np.isnan(v):
+                    values[(region, month, col)] = float(v)
+            for metric, cols in metric_cols.items():
+                pcts = np.array([p for p, _ in cols], dtype=np.float64)
+                vals = row[[pos for _, pos in cols]]
+                keep = ~np.isnan(vals)
+                if keep.sum() < 2:
+                    continue
+                vals, pcts = vals[keep], pcts[keep]
+                order = np.argsort(vals, kind="stable")
+                anchors[(region, month, metric)] = (vals[order], pcts[order])
+
+        return cls(anchors, values, source_stamp=source_stamp, project_id=project_id)
+
+    def __len__(self) -> int:
+        return len(self.anchors)
+
+    @property
+    def empty(self) -> bool:
+        return not self.values
+
+    def value(self, region: str, month: int, column: str) -> Optional[float]:
+        """Raw climatology value (e.g. ``precipitation_sum_mm_p80``) or None."""
+        return self.values.get((region, int(month), column))
+
+    def _scaled_anchors(self, region, month, metric, scale):
+        entry = self.anchors.get((region, int(month), metric))
+        if entry is None:
+            return None
+        vals, pcts = entry
+        vals = vals * scale
+        if scale < 0:
+            order = np.argsort(vals, kind="stable")
+            vals, pcts = vals[order], pcts[order]
+        return vals, pcts
+
+    def percentile_approx(
+        self,
+        value: float,
+        region: str,
+        month: int,
+        metric: str,
+        scale: float = 1.0,
+    ) -> Optional[float]:
+        """Map ``value`` to ~0–100 using the monthly anchors for ``metric`` (scaled by ``scale``)."""
+        entry = self._scaled_anchors(region, month, metric, scale)
+        if entry is None:
+            return None
+        return float(_interp_anchors(np.array([value], dtype=np.float64), *entry)[0])
+
+
+def _interp_anchors(x: np.ndarray, vals: np.ndarray, pcts: np.ndarray) -> np.ndarray:
+    """Piecewise-linear percentile between anchors, with the outlook's tail rules.
+
+    Below the lowest anchor the percentile scales towards 0 (or is pinned when the
+    anchor is ≤ 0); above the highest it climbs towards 100 at half the last span.
+    """
+    out = np.full(x.shape, np.nan)
+    lo_v, lo_p = vals[0], pcts[0]
+    hi_v, hi_p = vals[-1], pcts[-1]
+
+    below = x <= lo_v
+    above = ~below & (x >= hi_v)
+    inside = ~below & ~above & ~np.isnan(x)
+
+    if below.any():
+        out[below] = lo_p if lo_v <= 0 else lo_p * (x[below] / lo_v)
+    if above.any():
+        span = max(hi_v - vals[-2], 1e-9)
+        extra = (x[above] - hi_v) / span
+        out[above] = np.minimum(100.0, hi_p + (100.0 - hi_p) * np.minimum(1.0, extra * 0.5))
+    if inside.any():
+        xi = x[inside]
+        i = np.searchsorted(vals, xi, side="left") - 1
+        t = (xi - vals[i]) / (vals[i + 1] - vals[i] + 1e-15)
+        out[inside] = pcts[i] + t * (pcts[i + 1] - pcts[i])
+    return np.clip(out, 0.0, 100.0)
+
+
+def climatology_table_stamp(project_id: str) -> Optional[int]:
+    """``last_modified_time`` (ms) of ``climatology_monthly``, or None if unavailable."""
+    query = f"""
+    SELECT last_modified_time
+    FROM `{project_id}.{CLIMATOLOGY_DATASET}.__TABLES__`
+    WHERE table_id = '{CLIMATOLOGY_TABLE}'
+    """
+    try:
+        df = load_from_bigquery(query, project_id=project_id)
+    except Exception as e:
+        print(f"Warning: Could not read climatology table stamp: {e}")
+        return None
+    if df is None or df.empty:
+        return None
+    return int(df["last_modified_time"].iloc[0])
+
+
+def _read_cached_index(path: Path) -> Optional[ClimatologyIndex]:
+    try:
+        with open(path, "rb") as f:
+            index = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Warning: Ignoring unreadable climatology index {path}: {e}")
+        return None
+    if getattr(index, "version", None) != CLIMATOLOGY_INDEX_VERSION:
+        return None
+    return index
+
+
+def _write_cached_index(index: ClimatologyIndex, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def load_climatology_index(
+    project_id: str,
+    load_frame: Callable[[], pd.DataFrame],
+    path: Optional[Path] = None,
+) -> ClimatologyIndex:
+    """Cached index if its stamp matches the table, else rebuild from ``load_frame()``.
+
+    When the stamp cannot be read (BigQuery unavailable) a cached index of the
+    current format is reused as is.
+    """
+    path = Path(path or CLIMATOLOGY_INDEX_PATH)
+    stamp = climatology_table_stamp(project_id)
+    cached = _read_cached_index(path)
+    if cached is not None and cached.project_id == project_id and not cached.empty:
+        if stamp is None or cached.source_stamp == stamp:
+            return cached
+
+    index = ClimatologyIndex.from_frame(load_frame(), source_stamp=stamp, project_id=project_id)
+    if index.empty:
+        if cached is not None and cached.project_id == project_id:
+            return cached
+        return index
+    if stamp is not None:
+        try:
+            _write_cached_index(index, path)
+        except OSError as e:
+            print(f"Warning: Could not write climatology index {path}: {e}")
+    print(f"Built climatology index ({len(index)} region/month/metric entries)")
+    return index
@@ -4,9 +4,12 @@ ML-based disaster detection: risk level is the model prediction (0–3).
 Weather and forecast series are loaded to build human-readable outlooks when risk ≥ 1.
 """
 
+import gc
 import os
 import sys
+import threading
 import warnings
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
@@ -30,6 +33,8 @@ from ml_training.data_preparation.load_training_data import (
     handle_missing_data,
 )
 from ml_training.data_preparation.feature_engineering import engineer_features
+from ml_training.data_preparation.region_partition import FrameOrPartition, region_rows
+from risk_assessment.climatology_index import ClimatologyIndex, load_climatology_index
 from ml_training.config import REQUIRED_FEATURES, PROJECT_ID, CLIMATOLOGY_DATASET
 from utils.datasets.era5_utils import compute_spi
 from config import get_region_name
@@ -38,21 +43,46 @@ from config import get_region_name
 ML_ROLLING_WINDOW_DAYS = 5
 ML_ROLLING_PROBA_HAZARDS = frozenset({"flood", "landslide"})
 
+# Resident size allowed for cached predictors (MB). Unset means no budget (every
+# model stays loaded); 0 keeps only the most recently used one, for hazard-first
+# runs on small workers. Predictors pinned by preload_predictors are never evicted.
+_BUDGET_ENV = os.getenv("PREDICTOR_MEMORY_BUDGET_MB", "").strip()
+PREDICTOR_MEMORY_BUDGET_MB: Optional[float] = float(_BUDGET_ENV) if _BUDGET_ENV else None
+
 
 class MLDisasterDetection:
     """ML-based disaster detection; risk score equals the ML class prediction."""
     
-    def __init__(self, project_id: str = None, region_name: str = None):
-        """Initialize detection system."""
+    def __init__(
+        self,
+        project_id: str = None,
+        region_name: str = None,
+        predictor_budget_mb: Optional[float] = None,
+    ):
+        """Initialize detection system.
+
+        ``predictor_budget_mb`` caps the resident size of cached predictors
+        (default ``PREDICTOR_MEMORY_BUDGET_MB``, None = no cap); least recently used
+        models are evicted beyond it, but the one in use and pinned ones are kept.
+        """
         self.project_id = project_id or PROJECT_ID
         self.region_name = region_name or get_region_name()
         self.dataset_id = "daily_ingestion"
+        self.predictor_budget_mb = (
+            PREDICTOR_MEMORY_BUDGET_MB if predictor_budget_mb is None else float(predictor_budget_mb)
+        )
         
         # Load climatology once (monthly percentiles)
         self.climatology = self._load_climatology()
         
-        # Cache ML predictors (lazy loading)
-        self._predictors = {}
+        # Cache ML predictors (lazy loading, least recently used first)
+        self._predictors: "OrderedDict[str, ModelPredictor]" = OrderedDict()
+        self._pinned_predictors: set = set()
+        self._predictors_lock = threading.Lock()
+
+        # Indexed climatology anchors (lazy; see climatology_index)
+        self._climatology_index: Optional[ClimatologyIndex] = None
+        self._climatology_index_lock = threading.Lock()
     
     def _load_climatology(self) -> pd.DataFrame:
         """Load monthly climatology percentiles from BigQuery."""
@@ -97,22 +127,59 @@ class MLDisasterDetection:
                 return getattr(self, '_climatology_cache', pd.DataFrame())
         return self._climatology_cache
     
+    @property
+    def climatology_index(self) -> ClimatologyIndex:
+        """Percentile lookup built from ``climatology_data`` (cached on local disk)."""
+        if self._climatology_index is None:
+            with self._climatology_index_lock:
+                if self._climatology_index is None:
+                    self._climatology_index = load_climatology_index(
+                        self.project_id, lambda: self.climatology_data
+                    )
+        return self._climatology_index
+
     def preload_climatology(self):
-        """Force load climatology data in main thread."""
-        _ = self.climatology_data
+        """Force load the climatology index in main thread."""
+        _ = self.climatology_index
     
     def _get_predictor(self, disaster_type: str) -> ModelPredictor:
         """Get or load ML predictor for disaster type."""
-        if disaster_type not in self._predictors:
-            # Clear other predictors to save memory if we're switching types
-            # (Only relevant if processing hazards sequentially in one process)
-            if self._predictors:
-                print(f"Clearing previous predictors to free memory...")
-                self._predictors = {}
-                import gc
-                gc.collect()
-            self._predictors[disaster_type] = load_predictor(disaster_type)
-        return self._predictors[disaster_type]
+        with self._predictors_lock:
+            predictor = self._predictors.pop(disaster_type, None)
+            if predictor is None:
+                predictor = load_predictor(disaster_type)
+            self._predictors[disaster_type] = predictor
+            self._evict_predictors()
+            return predictor
+
+    def _resident_predictor_mb(self) -> float:
+        return sum(getattr(p, "approx_size_mb", 0.0) for p in self._predictors.values())
+
+    def _over_predictor_budget(self) -> bool:
+        if self.predictor_budget_mb is None:
+            return False
+        return self.predictor_budget_mb <= 0 or self._resident_predictor_mb() > self.predictor_budget_mb
+
+    def _evict_predictors(self) -> None:
+        """Drop least recently used predictors until the cache fits the memory budget."""
+        evicted = []
+        # The most recently used predictor (last) is always kept
+        for d_type in list(self._predictors)[:-1]:
+            if not self._over_predictor_budget():
+                break
+            if d_type in self._pinned_predictors:
+                continue
+            del self._predictors[d_type]
+            evicted.append(d_type)
+        if evicted:
+            print(f"Evicted predictor(s) {', '.join(evicted)} to stay within memory budget...")
+            gc.collect()
+
+    def preload_predictors(self, disaster_types: List[str]) -> Dict[str, ModelPredictor]:
+        """Load predictors once and pin them (exempt from the budget) for this detector."""
+        with self._predictors_lock:
+            self._pinned_predictors.update(disaster_types)
+        return {d_type: self._get_predictor(d_type) for d_type in disaster_types}
     
     def _get_climatology_percentile(
         self, 
@@ -122,21 +189,7 @@ class MLDisasterDetection:
         percentile: str
     ) -> Optional[float]:
         """Get climatology percentile value for region/month/metric."""
-        df = self.climatology_data
-        if df.empty:
-            return None
-        
-        col_name = f"{metric}_{percentile}"
-        if col_name not in df.columns:
-            return None
-        
-        mask = (df['region'] == region) & (df['month'] == month)
-        result = df[mask]
-        
-        if result.empty or pd.isna(result[col_name].iloc[0]):
-            return None
-        
-        return float(result[col_name].iloc[0])
+        return self.climatology_index.value(region, month, f"{metric}_{percentile}")
     
     def _merge_river_discharge_recent(
         self,
@@ -369,39 +422,7 @@ class MLDisasterDetection:
         scale: float = 1.0,
     ) -> Optional[float]:
         """Map a value to ~0–100 using monthly climatology anchors for ``metric`` (scaled by ``scale``)."""
-        anchor_order = [
-            (5, "p05"),
-            (10, "p10"),
-            (20, "p20"),
-            (50, "p50"),
-            (80, "p80"),
-            (95, "p95"),
-        ]
-        pairs: List[Tuple[float, float]] = []
-        for pnum, pname in anchor_order:
-            v = self._get_climatology_percentile(region, month, metric, pname)
-            if v is not None and not (isinstance(v, float) and np.isnan(v)):
-                pairs.append((float(v) * scale, float(pnum)))
-        if len(pairs) < 2:
-            return None
-        pairs.sort(key=lambda x: x[0])
-        vals = [p[0] for p in pairs]
-        pcts = [p[1] for p in pairs]
-        if value <= vals[0]:
-            if vals[0] <= 0:
-                return max(0.0, min(100.0, pcts[0]))
-            est = pcts[0] * (value / vals[0])
-            return max(0.0, min(100.0, est))
-        if value >= vals[-1]:
-            span = max(vals[-1] - vals[-2], 1e-9)
-            extra = (value - vals[-1]) / span
-            est = min(100.0, pcts[-1] + (100.0 - pcts[-1]) * min(1.0, extra * 0.5))
-            return max(0.0, min(100.0, est))
-        for i in range(len(vals) - 1):
-            if vals[i] <= value <= vals[i + 1]:
-                t = (value - vals[i]) / (vals[i + 1] - vals[i] + 1e-15)
-                return max(0.0, min(100.0, pcts[i] + t * (pcts[i + 1] - pcts[i])))
-        return None
+        return self.climatology_index.percentile_approx(value, region, month, metric, scale=scale)
 
     def _outlook_metric_entry(
         self,
@@ -606,7 +627,7 @@ class MLDisasterDetection:
     ) -> Tuple[int, Dict]:
         """Single-day predict, or rolling-mean proba + thresholds for flood/landslide."""
         if precalculated_features is not None and not precalculated_features.empty:
-            features = precalculated_features
+            features = precalculated_features.copy()
         else:
             start_date = (date - pd.Timedelta(days=32)).strftime("%Y-%m-%d")
             end_date = date.strftime("%Y-%m-%d")
@@ -679,11 +700,16 @@ class MLDisasterDetection:
         disaster_type: str,
         region: str,
         date: pd.Timestamp,
-        preloaded_weather: Optional[pd.DataFrame] = None,
-        preloaded_forecast: Optional[pd.DataFrame] = None,
-        precalculated_features: Optional[pd.DataFrame] = None
+        preloaded_weather: Optional[FrameOrPartition] = None,
+        preloaded_forecast: Optional[FrameOrPartition] = None,
+        precalculated_features: Optional[FrameOrPartition] = None
     ) -> Tuple[int, Dict]:
         """Inner implementation of assess_risk (called within warning suppression)."""
+        # Narrow preloaded inputs (plain frames or region-partitioned) to this region
+        preloaded_weather = region_rows(preloaded_weather, region)
+        preloaded_forecast = region_rows(preloaded_forecast, region)
+        precalculated_features = region_rows(precalculated_features, region)
+
         # Step 1: Get ML prediction
         try:
             predictor = self._get_predictor(disaster_type)
@@ -699,13 +725,13 @@ class MLDisasterDetection:
         
         # Step 2: Load recent weather (32 days for ML features and outlooks)
         if preloaded_weather is not None and not preloaded_weather.empty:
-            weather_df = preloaded_weather[preloaded_weather['region'] == region].copy()
+            weather_df = preloaded_weather.copy()
         else:
             weather_df = self._load_recent_weather(region, date, days_back=32)
         
         # Step 3: Load forecast (optional)
         if preloaded_forecast is not None and not preloaded_forecast.empty:
-            forecast_df = preloaded_forecast[preloaded_forecast['region'] == region].copy()
+            forecast_df = preloaded_forecast.copy()
         else:
             include_flood = disaster_type in ['flood', 'landslide']
             forecast_df = self._load_forecast(region, date, days_ahead=7, include_flood=include_flood)
@@ -750,9 +776,9 @@ class MLDisasterDetection:
         disaster_type: str,
         region: str,
         date: pd.Timestamp,
-        preloaded_weather: Optional[pd.DataFrame] = None,
-        preloaded_forecast: Optional[pd.DataFrame] = None,
-        precalculated_features: Optional[pd.DataFrame] = None
+        preloaded_weather: Optional[FrameOrPartition] = None,
+        preloaded_forecast: Optional[FrameOrPartition] = None,
+        precalculated_features: Optional[FrameOrPartition] = None
     ) -> Tuple[int, Dict]:
         """
         Assess risk for a disaster type, region, and date.
@@ -761,6 +787,9 @@ class MLDisasterDetection:
         1. Gets ML prediction
         2. Loads recent weather and forecasts (for outlook text when risk >= 1)
         3. Returns final risk level (same as ML prediction)
+
+        Preloaded inputs may be whole-chunk frames or ``RegionPartitionedFrame``s;
+        either way only this region's rows are used.
         
         Returns:
             Tuple of (final_risk_level, assessment_details_dict)
@@ -12,6 +12,7 @@ import gc
 import datetime
 import uuid
 import concurrent.futures
+import multiprocessing
 from pathlib import Path
 from typing import Optional, Dict, Tuple, List
 from dotenv import load_dotenv
@@ -29,12 +30,14 @@ warnings.filterwarnings('ignore', message='.*SettingWithCopyWarning.*')
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.bq_utils import save_to_bigquery, load_from_bigquery
+from utils.bq_utils import merge_to_bigquery, load_from_bigquery
 from utils.earth_engine_utils import REGION_NAMES
 from risk_assessment.ml_detection import MLDisasterDetection
 from config import get_region_name
 from ml_training.config import MODIS_FORWARD_FILL_WINDOW
 from ml_training.data_preparation.load_training_data import forward_fill_ndvi_columns
+from ml_training.models.model_predictor import prepare_shared_features
+from ml_training.data_preparation.region_partition import partition_by_region, region_rows
 
 PROJECT_ID = os.getenv("PROJECT_ID")
 # Risk data is stored in risk_assessment dataset (not region-specific)
@@ -64,6 +67,16 @@ OUTLOOK_METRIC_KEYS = frozenset(
 
 CONTRIBUTING_METRICS_MAX_JSON = 12_000
 
+# One daily_evaluation / risk_changes row per hazard per region per day
+RISK_RESULT_KEYS = ["date", "region", "disaster_type"]
+
+# Per-region scoring backends for assess_daily_risks
+SCORING_BACKENDS = ("thread", "process")
+PROCESS_BATCH_SIZE = 10  # regions per process-pool task
+
+# Process-pool worker state (set by _init_scoring_worker)
+_WORKER_DETECTION = None
+
 
 def convert_numpy_types(obj):
     """Recursively convert NumPy types to native Python types for JSON serialization."""
@@ -370,8 +383,6 @@ def preload_all_weather(project_id, dataset_id, assessment_date, regions=None, d
             discharge_df = load_from_bigquery(discharge_query)
             if discharge_df is not None and not discharge_df.empty:
                 discharge_df['date'] = pd.to_datetime(discharge_df['date'])
-                # Deduplicate discharge data
-                discharge_df = discharge_df.sort_values(['region', 'date']).drop_duplicates(subset=['region', 'date'], keep='last')
                 era5_df = era5_df.merge(discharge_df, on=['date', 'region'], how='left')
         except Exception as e:
             print(f"Warning: Could not preload river discharge: {e}")
@@ -382,8 +393,7 @@ def preload_all_weather(project_id, dataset_id, assessment_date, regions=None, d
             landsat_df = load_from_bigquery(landsat_query)
             if landsat_df is not None and not landsat_df.empty:
                 landsat_df['date'] = pd.to_datetime(landsat_df['date'])
-                # Deduplicate landsat data
-                landsat_df = landsat_df.sort_values(['region', 'date']).drop_duplicates(subset=['region', 'date'], keep='last')
+                landsat_df = landsat_df.sort_values(['region', 'date'])
                 window_start = pd.Timestamp(start_date)
                 prior_ndvi = (
                     landsat_df[landsat_df['date'] < window_start]
@@ -411,8 +421,6 @@ def preload_all_weather(project_id, dataset_id, assessment_date, regions=None, d
             viirs_df = load_from_bigquery(viirs_query)
             if viirs_df is not None and not viirs_df.empty:
                 viirs_df['date'] = pd.to_datetime(viirs_df['date'])
-                # Deduplicate viirs data
-                viirs_df = viirs_df.sort_values(['region', 'date']).drop_duplicates(subset=['region', 'date'], keep='last')
                 era5_df = era5_df.merge(viirs_df, on=['date', 'region'], how='left')
         except Exception as e:
             print(f"Warning: Could not preload VIIRS: {e}")
@@ -543,6 +551,137 @@ def preload_all_static_data(project_id, regions):
     return {'terrain': terrain, 'desc': desc}
 
 
+def _init_scoring_worker(project_id, region_name, disaster_types, predictor_budget_mb, climatology_index):
+    """Process-pool initializer: load models and install the climatology index once per worker."""
+    global _WORKER_DETECTION
+    warnings.filterwarnings('ignore', category=FutureWarning)
+    warnings.filterwarnings('ignore', category=UserWarning)
+    detection = MLDisasterDetection(
+        project_id=project_id,
+        region_name=region_name,
+        predictor_budget_mb=predictor_budget_mb,
+    )
+    detection._climatology_index = climatology_index
+    detection.preload_predictors(disaster_types)
+    _WORKER_DETECTION = detection
+
+
+def _score_region_batch(batch):
+    """Process-pool entry: score compact region tasks with this worker's models."""
+    results = []
+    for (project_id, region, d_type, assessment_date, assessment_date_pd,
+         prev_row, weather_df, forecast_df, features) in batch:
+        results.append(_assess_single_region_hazard((
+            project_id, region, d_type, assessment_date, assessment_date_pd,
+            _WORKER_DETECTION, {region: prev_row} if prev_row else {},
+            weather_df, forecast_df, features,
+        )))
+    return results
+
+
+def _compact_process_tasks(tasks, batch_size):
+    """Strip thread tasks down to picklable per-region rows, grouped in batches."""
+    compact = []
+    for (project_id, region, d_type, assessment_date, assessment_date_pd,
+         _detection, prev_data_map, weather, forecast, features) in tasks:
+        compact.append((
+            project_id, region, d_type, assessment_date, assessment_date_pd,
+            prev_data_map.get(region),
+            region_rows(weather, region),
+            region_rows(forecast, region),
+            region_rows(features, region),
+        ))
+    return [compact[i:i + batch_size] for i in range(0, len(compact), batch_size)]
+
+
+class ProcessScoringPool:
+    """Process pool whose workers hold the models and climatology index for a run."""
+
+    def __init__(self, detection, disaster_types, max_workers, batch_size=PROCESS_BATCH_SIZE):
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_scoring_worker,
+            initargs=(
+                detection.project_id,
+                detection.region_name,
+                list(disaster_types),
+                detection.predictor_budget_mb,
+                detection.climatology_index,
+            ),
+        )
+
+    def map(self, tasks):
+        batches = _compact_process_tasks(tasks, self.batch_size)
+        results = []
+        for batch_results in self._executor.map(_score_region_batch, batches):
+            results.extend(batch_results)
+        return results
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _run_region_tasks(tasks, max_workers, process_pool=None):
+    """Score region tasks in parallel; returns (assessments, risk_changes, errors)."""
+    all_assessments = []
+    risk_changes_list = []
+    errors = []
+    
+    if process_pool is not None:
+        print(f"Starting process-pool prediction for {len(tasks)} regions using {process_pool.max_workers} processes...")
+        results = process_pool.map(tasks)
+    else:
+        print(f"Starting parallel prediction for {len(tasks)} regions using {max_workers} workers...")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_assess_single_region_hazard, tasks))
+        
+    for res, err in results:
+        if err: errors.append(err)
+        if res:
+            all_assessments.append(res[0])
+            if res[1]: risk_changes_list.append(res[1])
+    return all_assessments, risk_changes_list, errors
+
+
+def _save_chunk_results(project_id, dataset_id, all_assessments, risk_changes_list):
+    """Upsert one chunk's assessments (and risk changes) into BigQuery."""
+    if not all_assessments:
+        return
+    df = pd.DataFrame(all_assessments)
+    merge_to_bigquery(df, project_id, dataset_id, "daily_evaluation", key_columns=RISK_RESULT_KEYS)
+    if risk_changes_list:
+        risk_changes_df = pd.DataFrame(risk_changes_list)
+        merge_to_bigquery(risk_changes_df, project_id, dataset_id, "risk_changes", key_columns=RISK_RESULT_KEYS)
+    print(f"✓ Saved {len(df)} assessments for chunk")
+
+
+def _build_region_tasks(
+    project_id, regions, d_type, assessment_date, assessment_date_pd,
+    detection, prev_data_map, chunk_weather, chunk_forecasts, chunk_features,
+):
+    # Group each chunk frame once; workers look their region up in the slice table.
+    weather_parts = partition_by_region(chunk_weather) if not chunk_weather.empty else None
+    forecast_parts = partition_by_region(chunk_forecasts) if not chunk_forecasts.empty else None
+    feature_parts = partition_by_region(chunk_features) if not chunk_features.empty else None
+
+    tasks = []
+    for region in regions:
+        tasks.append((
+            project_id, region, d_type, assessment_date, assessment_date_pd, 
+            detection, prev_data_map, weather_parts, forecast_parts, feature_parts
+        ))
+    return tasks
+
+
 def assess_daily_risks(
     project_id: str = None, 
     region_name: str = None,
@@ -550,11 +689,29 @@ def assess_daily_risks(
     max_workers: int = 5,
     chunk_size: int = 50,
     assessment_date: Optional[datetime.date] = None,
+    single_scan: bool = True,
+    predictor_budget_mb: Optional[float] = None,
+    backend: str = "thread",
 ):
     """
     Assess risks for all regions and disaster types using ML models.
-    Parallelized and batched version with hazard-first chunking to save memory.
+    Parallelized and batched in region chunks.
+
+    By default (``single_scan=True``) the loop is chunk-first: each chunk's weather
+    window is loaded and engineered once and fanned out to every hazard's model,
+    all of which are loaded once per run. ``single_scan=False`` walks the chunks
+    hazard by hazard with its own feature pass, so only one model is needed at a
+    time; pair it with ``predictor_budget_mb`` (see ``MLDisasterDetection``) to
+    bound how many stay loaded.
+
+    ``backend="process"`` scores regions in a spawn-based process pool (created once
+    per run) instead of threads, so model inference is not serialized by the GIL.
+    Each worker loads the models once and receives the climatology index once;
+    ``max_workers`` is then the number of processes. Feature engineering and
+    saving stay in the parent.
     """
+    if backend not in SCORING_BACKENDS:
+        raise ValueError(f"Unknown scoring backend {backend!r}; expected one of {SCORING_BACKENDS}")
     if project_id is None:
         project_id = PROJECT_ID
     
@@ -571,22 +728,56 @@ def assess_daily_risks(
     if region_name is None:
         region_name = get_region_name()
 
-    detection = MLDisasterDetection(project_id=project_id, region_name=region_name)
+    detection = MLDisasterDetection(
+        project_id=project_id,
+        region_name=region_name,
+        predictor_budget_mb=predictor_budget_mb,
+    )
     
-    # Preload climatology data in main thread to avoid parallel loading logs
+    # Preload the climatology index in main thread to avoid parallel loading logs
     detection.preload_climatology()
     
     all_regions = REGION_NAMES()
     
     # Preload static data once for all regions
     static_data = preload_all_static_data(project_id, all_regions)
-    
+
+    process_pool = None
+    if backend == "process":
+        process_pool = ProcessScoringPool(detection, disaster_types, max_workers)
+    try:
+        if single_scan:
+            _assess_daily_risks_single_scan(
+                project_id, dataset_id, disaster_types, max_workers, chunk_size,
+                assessment_date, assessment_date_pd, detection, all_regions, static_data,
+                process_pool=process_pool,
+            )
+        else:
+            _assess_daily_risks_hazard_first(
+                project_id, dataset_id, disaster_types, max_workers, chunk_size,
+                assessment_date, assessment_date_pd, detection, all_regions, static_data,
+                process_pool=process_pool,
+            )
+    finally:
+        if process_pool is not None:
+            process_pool.close()
+
+    print(f"\n=== Risk Assessment Complete ===")
+
+
+def _assess_daily_risks_hazard_first(
+    project_id, dataset_id, disaster_types, max_workers, chunk_size,
+    assessment_date, assessment_date_pd, detection, all_regions, static_data,
+    process_pool=None,
+):
+    """Hazard-first loop: each hazard walks every chunk with its own feature pass."""
     # Process each disaster type sequentially
     for d_type in disaster_types:
         print(f"\n=== Processing {d_type} risks ===")
         
         # Preload previous assessments for this hazard in ONE query
         prev_data_map = get_previous_assessment_data_batched(project_id, RISK_DATASET, d_type, assessment_date)
+        predictor = detection._get_predictor(d_type)
         
         # Process regions in chunks for this hazard
         for i in range(0, len(all_regions), chunk_size):
@@ -615,7 +806,6 @@ def assess_daily_risks(
 
             # 2. Batch feature engineering for the entire chunk
             # This is much more memory efficient than doing it in parallel threads
-            predictor = detection._get_predictor(d_type)
             start_date_str = (assessment_date_pd - pd.Timedelta(days=32)).strftime("%Y-%m-%d")
             end_date_str = assessment_date_pd.strftime("%Y-%m-%d")
 
@@ -629,40 +819,14 @@ def assess_daily_risks(
 
             gc.collect()
 
-            tasks = []
-            for region in regions_to_run:
-                # Filter preloaded data for this region
-                region_weather = chunk_weather[chunk_weather['region'] == region] if not chunk_weather.empty else None
-                region_forecast = chunk_forecasts[chunk_forecasts['region'] == region] if not chunk_forecasts.empty else None
-                region_features = chunk_features[chunk_features['region'] == region] if not chunk_features.empty else None
-                
-                tasks.append((
-                    project_id, region, d_type, assessment_date, assessment_date_pd, 
-                    detection, prev_data_map, region_weather, region_forecast, region_features
-                ))
-            
-            print(f"Starting parallel prediction for {len(tasks)} regions using {max_workers} workers...")
-            all_assessments = []
-            risk_changes_list = []
-            errors = []
-            
-            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-                results = list(executor.map(_assess_single_region_hazard, tasks))
-                
-            for res, err in results:
-                if err: errors.append(err)
-                if res:
-                    all_assessments.append(res[0])
-                    if res[1]: risk_changes_list.append(res[1])
+            tasks = _build_region_tasks(
+                project_id, regions_to_run, d_type, assessment_date, assessment_date_pd,
+                detection, prev_data_map, chunk_weather, chunk_forecasts, chunk_features,
+            )
+            all_assessments, risk_changes_list, errors = _run_region_tasks(tasks, max_workers, process_pool)
             
             # Save results for this chunk immediately
-            if all_assessments:
-                df = pd.DataFrame(all_assessments)
-                save_to_bigquery(df, project_id, dataset_id, "daily_evaluation", mode="WRITE_APPEND")
-                if risk_changes_list:
-                    risk_changes_df = pd.DataFrame(risk_changes_list)
-                    save_to_bigquery(risk_changes_df, project_id, dataset_id, "risk_changes", mode="WRITE_APPEND")
-                print(f"✓ Saved {len(df)} assessments for chunk")
+            _save_chunk_results(project_id, dataset_id, all_assessments, risk_changes_list)
 
             # Explicitly clear chunk data
             del chunk_weather
@@ -676,7 +840,85 @@ def assess_daily_risks(
         del prev_data_map
         gc.collect()
 
-    print(f"\n=== Risk Assessment Complete ===")
+
+def _assess_daily_risks_single_scan(
+    project_id, dataset_id, disaster_types, max_workers, chunk_size,
+    assessment_date, assessment_date_pd, detection, all_regions, static_data,
+    process_pool=None,
+):
+    """Chunk-first loop: one weather/forecast load and one feature pass per chunk."""
+    # Every hazard scores every chunk: load each model once for the whole run
+    predictors = detection.preload_predictors(disaster_types)
+
+    prev_data_maps = {
+        d_type: get_previous_assessment_data_batched(project_id, RISK_DATASET, d_type, assessment_date)
+        for d_type in disaster_types
+    }
+    start_date_str = (assessment_date_pd - pd.Timedelta(days=32)).strftime("%Y-%m-%d")
+    end_date_str = assessment_date_pd.strftime("%Y-%m-%d")
+
+    for i in range(0, len(all_regions), chunk_size):
+        regions_chunk = all_regions[i:i + chunk_size]
+        chunk_no = i // chunk_size + 1
+
+        # Regions still to assess, per hazard
+        pending: Dict[str, List[str]] = {}
+        for d_type in disaster_types:
+            already = get_regions_already_assessed_for_date(
+                project_id, dataset_id, assessment_date, d_type, regions_chunk
+            )
+            regions_to_run = [r for r in regions_chunk if r not in already]
+            if regions_to_run:
+                pending[d_type] = regions_to_run
+        if not pending:
+            print(
+                f"--- chunk {chunk_no}: all {len(regions_chunk)} regions already have "
+                f"daily_evaluation for {assessment_date} for every hazard; skip ---"
+            )
+            continue
+
+        chunk_regions = [r for r in regions_chunk if any(r in rs for rs in pending.values())]
+        print(
+            f"--- chunk {chunk_no} ({len(chunk_regions)} regions; hazards: "
+            f"{', '.join(f'{d}={len(rs)}' for d, rs in pending.items())}) ---"
+        )
+
+        # 1. One weather/forecast load for every hazard in the chunk
+        chunk_weather = preload_all_weather(project_id, "daily_ingestion", assessment_date, regions=chunk_regions)
+        chunk_forecasts = preload_all_forecasts(project_id, "daily_ingestion", assessment_date, regions=chunk_regions)
+
+        # 2. One hazard-agnostic feature pass; each model only re-encodes descriptors
+        print(f"Engineering shared features for chunk...")
+        shared_features = prepare_shared_features(
+            chunk_regions, start_date_str, end_date_str,
+            preloaded_data=chunk_weather,
+            preloaded_static=static_data,
+        )
+        gc.collect()
+
+        all_assessments = []
+        risk_changes_list = []
+        for d_type, regions_to_run in pending.items():
+            print(f"Scoring {d_type} for {len(regions_to_run)} regions...")
+            chunk_features = predictors[d_type].encode_shared_features(shared_features)
+            tasks = _build_region_tasks(
+                project_id, regions_to_run, d_type, assessment_date, assessment_date_pd,
+                detection, prev_data_maps[d_type], chunk_weather, chunk_forecasts, chunk_features,
+            )
+            assessments, risk_changes, errors = _run_region_tasks(tasks, max_workers, process_pool)
+            all_assessments.extend(assessments)
+            risk_changes_list.extend(risk_changes)
+            del chunk_features
+
+        # Save all hazards for this chunk at once
+        _save_chunk_results(project_id, dataset_id, all_assessments, risk_changes_list)
+
+        del chunk_weather
+        del chunk_forecasts
+        del shared_features
+        del all_assessments
+        del risk_changes_list
+        gc.collect()
 
 
 if __name__ == "__main__":
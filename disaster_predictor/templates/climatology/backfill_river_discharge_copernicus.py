@@ -25,7 +25,7 @@ sys.path.insert(0, str(project_root))
 from dotenv import load_dotenv
 load_dotenv(project_root / ".env", override=False)
 
-from utils.bq_utils import load_from_bigquery, save_to_bigquery, execute_sql
+from utils.bq_utils import load_from_bigquery, merge_to_bigquery, execute_sql
 
 # Configuration
 BACKFILL_START_YEAR = 1984
@@ -144,7 +144,7 @@ def process_task(task: Dict[str, Any], project_id: str, client: Any, tmp_dir: Pa
         expected_cols = ["date", "region", "river_discharge", "source_system_version", "source_product_type", "created_at"]
         df = df[expected_cols]
         
-        save_to_bigquery(df, project_id, DATASET_ID, TABLE_ID, mode="WRITE_APPEND")
+        merge_to_bigquery(df, project_id, DATASET_ID, TABLE_ID, key_columns=["date", "region"])
         if target.exists():
             target.unlink()
         print(f" ✓ Finished Year {hyear}, Cluster {idx+1} in {time.time() - t0:.1f}s", flush=True)
@@ -22,7 +22,7 @@ from dotenv import load_dotenv
 load_dotenv(project_root / ".env", override=False)
 
 from utils.datasets.openmeteo_utils import fetch_openmeteo_flood_discharge
-from utils.bq_utils import load_from_bigquery, save_to_bigquery, execute_sql
+from utils.bq_utils import load_from_bigquery, merge_to_bigquery, execute_sql
 
 # Configuration
 BACKFILL_START = "1984-01-01"
@@ -70,7 +70,8 @@ def save_region_to_bq(df: pd.DataFrame, region_name: str, project_id: str):
     df["source_system_version"] = "openmeteo_glofas_v4"
     df["source_product_type"] = "reanalysis"
     df["created_at"] = pd.Timestamp.utcnow()
-    save_to_bigquery(df, project_id=project_id, dataset_id=DATASET_ID, table_id=TABLE_ID, mode="WRITE_APPEND")
+    # Upsert: only the discharge columns are updated on rows daily ingestion already wrote
+    merge_to_bigquery(df, project_id, DATASET_ID, TABLE_ID, key_columns=["date", "region_name"])
 
 def main():
     project_id = os.getenv("PROJECT_ID")
@@ -133,7 +133,7 @@ def _refetch_one_viirs_region(
     to_append = df[df["_dstr"].isin(gap_dates)].drop(columns=["_dstr"])
     if to_append.empty:
         return
-    if save_incremental(to_append, project_id, dataset_id, "viirs", mode="WRITE_APPEND", retry=True):
+    if save_incremental(to_append, project_id, dataset_id, "viirs", mode="WRITE_APPEND", retry=True, key_columns=["date", "region"]):
         print(f"      ✓ {region}: appended {len(to_append)} rows", flush=True)
     else:
         print(f"      ✗ {region}: append failed", flush=True)
@@ -226,7 +226,7 @@ def _refetch_era5_gaps(
         df = df.copy()
         df["region"] = region
         df["date"] = pd.to_datetime(df["date"], errors="coerce")
-        if save_incremental(df, project_id, dataset_id, "era5", mode="WRITE_APPEND", retry=True):
+        if save_incremental(df, project_id, dataset_id, "era5", mode="WRITE_APPEND", retry=True, key_columns=["date", "region"]):
             print(f"      ✓ Appended {len(df)} rows", flush=True)
         else:
             print(f"      ✗ Append failed", flush=True)
@@ -259,7 +259,7 @@ def _refetch_one_modis_region(
     to_append = df[df["_dstr"].isin(gap_dates)].drop(columns=["_dstr"])
     if to_append.empty:
         return
-    if save_incremental(to_append, project_id, dataset_id, "modis", mode="WRITE_APPEND", retry=True):
+    if save_incremental(to_append, project_id, dataset_id, "modis", mode="WRITE_APPEND", retry=True, key_columns=["date", "region"]):
         print(f"      ✓ {region}: appended {len(to_append)} rows", flush=True)
     else:
         print(f"      ✗ {region}: append failed", flush=True)
@@ -342,7 +342,7 @@ def _refetch_terrain_gaps(
             continue
         df = df.copy()
         df["region"] = region
-        if save_incremental(df, project_id, dataset_id, "terrain_static", mode="WRITE_APPEND", retry=True):
+        if save_incremental(df, project_id, dataset_id, "terrain_static", mode="WRITE_APPEND", retry=True, key_columns=["region"]):
             print(f"      ✓ Appended terrain", flush=True)
         else:
             print(f"      ✗ Append failed", flush=True)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+One-off cleanup before relying on MERGE writes: collapse duplicate key rows left by
+earlier WRITE_APPEND re-runs in the tables daily ingestion and risk assessment now
+upsert into (see utils.bq_utils.merge_to_bigquery).
+
+Run from project root once after deploying the MERGE writers; it is idempotent.
+"""
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from dotenv import load_dotenv
+load_dotenv(project_root / ".env", override=False)
+
+# (dataset, table, key columns)
+UPSERT_TABLES = [
+    ("daily_ingestion", "era5", ["date", "region"]),
+    ("daily_ingestion", "viirs", ["date", "region"]),
+    ("daily_ingestion", "landsat", ["date", "region"]),
+    ("daily_ingestion", "openmeteo_weather", ["date", "region_name"]),
+    ("daily_ingestion", "openmeteo_forecast", ["date", "region_name"]),
+    ("daily_ingestion", "firms", ["date", "region", "latitude", "longitude", "confidence"]),
+    ("daily_ingestion", "river_discharge_daily_alt", ["date", "region"]),
+    ("risk_assessment", "daily_evaluation", ["date", "region", "disaster_type"]),
+    ("risk_assessment", "risk_changes", ["date", "region", "disaster_type"]),
+]
+
+
+def main():
+    from config import get_project_id
+    from utils.bq_utils import deduplicate_bigquery_table
+
+    project_id = get_project_id()
+    failed = 0
+    for dataset_id, table_id, keys in UPSERT_TABLES:
+        print(f"Deduplicating {dataset_id}.{table_id} on {', '.join(keys)}...")
+        try:
+            deduplicate_bigquery_table(project_id, dataset_id, table_id, keys)
+            print("  ✓ done")
+        except Exception as e:
+            failed += 1
+            print(f"  ✗ {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,7 @@
 import os
 import json
+import uuid
+from google.api_core.exceptions import NotFound
 from google.oauth2 import service_account
 from google.cloud import bigquery
 from dotenv import load_dotenv
@@ -71,4 +73,160 @@ def execute_sql(sql, project_id=None, location=None):
     loc = location or os.getenv("BQ_LOCATION")
     
     query_job = client.query(sql, location=loc)
-    return query_job.result()
\ No newline at end of file
+    return query_job.result()
+
+# BigQuery legacy type names -> standard SQL types used in MERGE casts
+_SQL_TYPES = {
+    "INTEGER": "INT64",
+    "FLOAT": "FLOAT64",
+    "BOOLEAN": "BOOL",
+    "RECORD": "STRUCT",
+}
+_RANGE_TYPES = ("DATE", "DATETIME", "TIMESTAMP")
+
+
+def _sql_type(field) -> str:
+    return _SQL_TYPES.get(field.field_type, field.field_type)
+
+
+def _staged_column(field, staged_field) -> str:
+    """Staging column cast to the target column's type when the load inferred another one."""
+    ref = f"S.`{field.name}`"
+    if staged_field is None or field.mode == "REPEATED" or field.field_type in ("RECORD", "STRUCT"):
+        return ref
+    target = _sql_type(field)
+    if _sql_type(staged_field) == target:
+        return ref
+    if target == "JSON":
+        return f"SAFE.PARSE_JSON({ref})" if _sql_type(staged_field) == "STRING" else ref
+    if target == "DATE" and _sql_type(staged_field) in ("TIMESTAMP", "DATETIME"):
+        return f"DATE({ref})"
+    return f"SAFE_CAST({ref} AS {target})"
+
+
+def merge_to_bigquery(
+    df,
+    project_id=None,
+    dataset_id=None,
+    table_id=None,
+    key_columns=None,
+    schema=None,
+    range_column="date",
+):
+    """Upsert ``df`` into a table on ``key_columns`` (insert new keys, update existing ones).
+
+    The frame is loaded into a short-lived staging table with a load job and applied
+    with one MERGE, so re-runs replace rows instead of appending duplicates. Rows
+    with the same key within ``df`` keep the last one. New columns are added to the
+    target like ``save_to_bigquery``'s ``ALLOW_FIELD_ADDITION``. When ``range_column``
+    is a key, the target side of the MERGE is bounded to the frame's min/max of that
+    column so partitioned tables are pruned. A missing target is simply created.
+    """
+    if not key_columns:
+        raise ValueError("merge_to_bigquery requires key_columns")
+    if df is None or df.empty:
+        return None
+    missing = [k for k in key_columns if k not in df.columns]
+    if missing:
+        raise ValueError(f"Key columns {missing} not in frame for {dataset_id}.{table_id}")
+
+    if not project_id:
+        with open(KEY_PATH, "r") as f:
+            project_id = json.load(f).get("project_id")
+
+    credentials = service_account.Credentials.from_service_account_file(KEY_PATH)
+    client = bigquery.Client(credentials=credentials, project=project_id)
+    destination = f"{project_id}.{dataset_id}.{table_id}"
+
+    try:
+        target = client.get_table(destination)
+    except NotFound:
+        return save_to_bigquery(df, project_id, dataset_id, table_id, mode="WRITE_APPEND", schema=schema)
+
+    df = df.drop_duplicates(subset=list(key_columns), keep="last")
+    loc = os.getenv("BQ_LOCATION", target.location)
+    staging = f"{project_id}.{dataset_id}._staging_{table_id}_{uuid.uuid4().hex[:12]}"
+
+    job_config = bigquery.LoadJobConfig(
+        write_disposition="WRITE_TRUNCATE",
+        autodetect=(schema is None),
+        create_disposition=bigquery.CreateDisposition.CREATE_IF_NEEDED,
+    )
+    if schema is not None:
+        job_config.schema = schema
+
+    try:
+        job = client.load_table_from_dataframe(df, staging, job_config=job_config, location=loc)
+        job.result()
+        if job.error_result or job.errors:
+            raise RuntimeError(f"BigQuery staging load failed: {job.error_result or job.errors}")
+        staged = client.get_table(staging)
+        staged_fields = {f.name: f for f in staged.schema}
+
+        # Add columns the target does not have yet (nullable, as loaded)
+        target_names = {f.name for f in target.schema}
+        new_fields = [
+            bigquery.SchemaField(f.name, f.field_type, mode="NULLABLE", fields=f.fields)
+            if f.mode == "REQUIRED" else f
+            for f in staged.schema if f.name not in target_names
+        ]
+        if new_fields:
+            target.schema = list(target.schema) + new_fields
+            target = client.update_table(target, ["schema"])
+
+        fields = [f for f in target.schema if f.name in staged_fields]
+        cols = {f.name: _staged_column(f, staged_fields[f.name]) for f in fields}
+        key_set = set(key_columns)
+
+        on = " AND ".join(f"T.`{k}` = {cols[k]}" for k in key_columns)
+        if range_column in key_set:
+            field = next(f for f in fields if f.name == range_column)
+            lo, hi = df[range_column].min(), df[range_column].max()
+            if field.field_type in _RANGE_TYPES and lo == lo and hi == hi:
+                lo_s, hi_s = str(lo)[:10], str(hi)[:10]
+                if field.field_type == "DATE":
+                    on += f" AND T.`{range_column}` BETWEEN DATE '{lo_s}' AND DATE '{hi_s}'"
+                else:
+                    on += (
+                        f" AND T.`{range_column}` >= {field.field_type} '{lo_s}'"
+                        f" AND T.`{range_column}` < {field.field_type}_ADD({field.field_type} '{hi_s}', INTERVAL 1 DAY)"
+                    )
+
+        update_cols = [c for c in cols if c not in key_set]
+        update_clause = (
+            "WHEN MATCHED THEN UPDATE SET " + ", ".join(f"`{c}` = {cols[c]}" for c in update_cols)
+            if update_cols else ""
+        )
+        insert_cols = ", ".join(f"`{c}`" for c in cols)
+        insert_vals = ", ".join(cols.values())
+        sql = f"""
+        MERGE `{destination}` T
+        USING `{staging}` S
+        ON {on}
+        {update_clause}
+        WHEN NOT MATCHED THEN INSERT ({insert_cols}) VALUES ({insert_vals})
+        """
+        return client.query(sql, location=loc).result()
+    finally:
+        client.delete_table(staging, not_found_ok=True)
+
+
+def deduplicate_bigquery_table(project_id, dataset_id, table_id, key_columns, location=None):
+    """One-off cleanup: keep a single row per key in a table written by earlier appends.
+
+    Rows are rewritten in place (partitioning/clustering preserved); which duplicate
+    survives is arbitrary, matching the old read-side ``drop_duplicates``.
+    """
+    keys = ", ".join(f"`{k}`" for k in key_columns)
+    table = f"`{project_id}.{dataset_id}.{table_id}`"
+    sql = f"""
+    BEGIN TRANSACTION;
+    CREATE TEMP TABLE _dedup AS
+    SELECT * FROM {table}
+    WHERE TRUE
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY {keys}) = 1;
+    DELETE FROM {table} WHERE TRUE;
+    INSERT INTO {table} SELECT * FROM _dedup;
+    COMMIT TRANSACTION;
+    """
+    return execute_sql(sql, project_id=project_id, location=location)
@@ -686,35 +686,64 @@ def fetch_all_regions_era5(start_date: str, end_date: str, daily: bool = True) -
         return pd.DataFrame(columns=["date", "temp_2m_mean_C", "precipitation_sum_mm", "sm1_mean", "sm2_mean", "region"])
     return pd.concat(frames, ignore_index=True).sort_values(["region", "date"])
 
-def compute_spi(precip_series: pd.Series, scale: int = 30) -> pd.Series:
-    """Compute SPI at given scale (days) using gamma fit + normal quantile."""
-    rolling = precip_series.rolling(window=scale, min_periods=scale//2).sum()
-    valid = rolling.dropna()
+def fit_spi_distribution(rolling_sums: pd.Series) -> Optional[Dict[str, float]]:
+    """Fit the SPI distribution to rolling precip sums (NaN windows ignored).
+
+    Returns ``None`` when nothing can be fitted, a ``normal`` fallback when the
+    non-zero sums are degenerate, otherwise the mixed gamma parameters
+    (``q0`` = share of dry windows).
+    """
+    valid = rolling_sums.dropna()
     if valid.empty:
-        return pd.Series(index=precip_series.index, data=np.nan)
+        return None
 
-    q0 = (valid == 0).mean()
     nonzero = valid[valid > 0]
     if nonzero.empty:
-        return pd.Series(index=precip_series.index, data=np.nan)
+        return None
+
+    mean_val, var_val = nonzero.mean(), nonzero.var()
+    if var_val <= 0 or mean_val <= 0:
+        return {"kind": "normal", "mean": float(valid.mean()), "std": float(valid.std())}
+    return {
+        "kind": "gamma",
+        "q0": float((valid == 0).mean()),
+        "shape": float(mean_val**2 / var_val),
+        "scale": float(var_val / mean_val),
+    }
+
+
+def spi_from_distribution(rolling_sums: pd.Series, params: Dict[str, float]) -> pd.Series:
+    """Map rolling precip sums to SPI values with parameters from ``fit_spi_distribution``."""
+    spi = pd.Series(index=rolling_sums.index, data=np.nan)
+    valid = rolling_sums.dropna()
+    if valid.empty:
+        return spi
 
-    try:
-        mean_val, var_val = nonzero.mean(), nonzero.var()
-        if var_val <= 0 or mean_val <= 0:
-            spi = pd.Series(index=precip_series.index, data=np.nan)
-            spi.loc[valid.index] = (valid - valid.mean()) / (valid.std() + 1e-6)
-            return spi
-        
-        shape, scale_param = mean_val**2 / var_val, var_val / mean_val
-        cdf_nonzero = gamma.cdf(nonzero, shape, loc=0, scale=scale_param)
-        p = pd.Series(index=valid.index, dtype=float)
-        p.loc[valid == 0] = q0
-        p.loc[valid > 0] = q0 + (1 - q0) * cdf_nonzero
-        p = p.clip(1e-6, 1 - 1e-6)
-        
-        spi = pd.Series(index=precip_series.index, data=np.nan)
-        spi.loc[valid.index] = norm.ppf(p)
+    if params["kind"] == "normal":
+        spi.loc[valid.index] = (valid - params["mean"]) / (params["std"] + 1e-6)
         return spi
+
+    q0 = params["q0"]
+    values = valid.to_numpy(dtype=float)
+    p = np.full(len(values), np.nan)
+    p[values == 0] = q0
+    positive = values > 0
+    p[positive] = q0 + (1 - q0) * gamma.cdf(
+        values[positive], params["shape"], loc=0, scale=params["scale"]
+    )
+    p = np.clip(p, 1e-6, 1 - 1e-6)
+    spi.loc[valid.index] = norm.ppf(p)
+    return spi
+
+
+def compute_spi(precip_series: pd.Series, scale: int = 30) -> pd.Series:
+    """Compute SPI at given scale (days) using gamma fit + normal quantile."""
+    rolling = precip_series.rolling(window=scale, min_periods=scale//2).sum()
+    try:
+        params = fit_spi_distribution(rolling)
+        if params is None:
+            return pd.Series(index=precip_series.index, data=np.nan)
+        return spi_from_distribution(rolling, params)
     except Exception as e:
         return pd.Series(index=precip_series.index, data=np.nan)
 
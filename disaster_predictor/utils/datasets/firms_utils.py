@@ -4,9 +4,11 @@ import ee
 import datetime
 from typing import Optional
 from ..earth_engine_utils import regions_ee, standard_execution_flow
-from ..bq_utils import load_from_bigquery, save_to_bigquery, execute_sql
+from ..bq_utils import merge_to_bigquery
 
 FIRMS_COLLECTION = "FIRMS"
+# One row per detection
+FIRMS_KEY_COLUMNS = ["date", "region", "latitude", "longitude", "confidence"]
 
 def fetch_firms_fire_data(region_name: str, start_date: str, end_date: str) -> pd.DataFrame:
     """Fetch NASA FIRMS fire data for a specific region and date range."""
@@ -61,7 +63,7 @@ def fetch_firms_fire_data(region_name: str, start_date: str, end_date: str) -> p
 
 def sync_firms_incremental(project_id: str, dataset_id: str, region_name: str, table_id: str = "firms"):
     """
-    Fetch FIRMS data with smart incremental updates and deduplication.
+    Fetch FIRMS data incrementally and upsert it on FIRMS_KEY_COLUMNS.
     Fetches last 3 days to ensure no data is missed due to reporting delays.
     """
     # 1. Get safe date range
@@ -80,34 +82,8 @@ def sync_firms_incremental(project_id: str, dataset_id: str, region_name: str, t
         print("  No new FIRMS data found.")
         return
 
-    # 3. Handle Deduplication
-    full_table_id = f"{project_id}.{dataset_id}.{table_id}"
-    
-    # Check if table exists and has data for this range
-    try:
-        overlap_query = f"""
-        SELECT * FROM `{full_table_id}`
-        WHERE date >= '{start_str}' AND region = '{region_name}'
-        """
-        existing_data = load_from_bigquery(overlap_query)
-        
-        if existing_data is not None and not existing_data.empty:
-            # Combine and deduplicate
-            combined = pd.concat([existing_data, new_data], ignore_index=True)
-            # Normalize date to string for deduplication if needed, or keep as datetime
-            combined['date'] = pd.to_datetime(combined['date']).dt.date
-            deduped = combined.drop_duplicates(subset=['date', 'region', 'latitude', 'longitude', 'confidence'])
-            
-            # Delete existing overlap and re-insert deduped
-            delete_query = f"DELETE FROM `{full_table_id}` WHERE date >= '{start_str}' AND region = '{region_name}'"
-            execute_sql(delete_query)
-            
-            save_to_bigquery(deduped, project_id, dataset_id, table_id, mode="WRITE_APPEND")
-            print(f"  Inserted {len(deduped)} deduplicated FIRMS records.")
-        else:
-            save_to_bigquery(new_data, project_id, dataset_id, table_id, mode="WRITE_APPEND")
-            print(f"  Inserted {len(new_data)} new FIRMS records.")
-            
-    except Exception as e:
-        print(f"  FIRMS sync failed, falling back to simple append: {e}")
-        save_to_bigquery(new_data, project_id, dataset_id, table_id, mode="WRITE_APPEND")
+    # 3. Upsert: the 3-day lookback re-fetches detections already stored
+    new_data = new_data.copy()
+    new_data['date'] = pd.to_datetime(new_data['date']).dt.date
+    merge_to_bigquery(new_data, project_id, dataset_id, table_id, key_columns=FIRMS_KEY_COLUMNS)
+    print(f"  Upserted {len(new_data)} FIRMS records.")
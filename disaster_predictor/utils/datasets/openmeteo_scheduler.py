@@ -0,0 +1,275 @@
+"""
+Concurrent OpenMeteo batch scheduler.
+
+All region batches for the archive, forecast, hourly soil-moisture and flood endpoints
+are planned up front and run on a thread pool. A shared ``RateLimiter`` keeps the
+combined request rate inside OpenMeteo's minute/hour/day quotas (replacing the fixed
+per-request sleep), and every finished batch is checkpointed on local disk so a
+retried task only refetches what did not complete.
+"""
+
+import hashlib
+import os
+import pickle
+import re
+import shutil
+import threading
+import time
+import concurrent.futures
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from .openmeteo_utils import (
+    fetch_openmeteo_historical_batch,
+    fetch_openmeteo_forecast_batch,
+    fetch_openmeteo_forecast_hourly_batch,
+    fetch_openmeteo_flood_discharge_batch,
+)
+
+# OpenMeteo free-tier quotas as (window seconds, API calls per window).
+OPENMETEO_QUOTAS: Tuple[Tuple[float, float], ...] = (
+    (60.0, 600.0),
+    (3600.0, 5000.0),
+    (86400.0, 10000.0),
+)
+OPENMETEO_BATCH_SIZE = 50  # locations per request
+OPENMETEO_MAX_WORKERS = int(os.getenv("OPENMETEO_MAX_WORKERS", "4"))
+OPENMETEO_FORECAST_DAYS = 7
+
+CHECKPOINT_DIR = Path(
+    os.getenv(
+        "OPENMETEO_CHECKPOINT_DIR",
+        Path(__file__).resolve().parents[2] / "data" / "openmeteo_checkpoints",
+    )
+)
+
+HISTORICAL_KINDS = ("historical", "historical_flood")
+FORECAST_KINDS = ("forecast", "forecast_soil", "forecast_flood")
+
+
+class RateLimiter:
+    """Token buckets, one per ``(window, calls)`` quota; ``acquire`` waits until all have room.
+
+    Buckets start full and refill continuously at ``calls / window``. ``pause`` makes every
+    subsequent ``acquire`` wait (used after a per-minute 429).
+    """
+
+    def __init__(
+        self,
+        quotas: Sequence[Tuple[float, float]] = OPENMETEO_QUOTAS,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        now = clock()
+        self._buckets = [
+            {"capacity": float(calls), "rate": float(calls) / float(window), "tokens": float(calls)}
+            for window, calls in quotas
+        ]
+        self._updated = now
+        self._paused_until = now
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated)
+        for b in self._buckets:
+            b["tokens"] = min(b["capacity"], b["tokens"] + elapsed * b["rate"])
+        self._updated = now
+
+    def acquire(self, weight: float = 1.0) -> None:
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                wait = self._paused_until - now
+                if wait <= 0:
+                    needs = [min(weight, b["capacity"]) for b in self._buckets]
+                    short = [
+                        (need - b["tokens"]) / b["rate"]
+                        for need, b in zip(needs, self._buckets)
+                        if b["tokens"] < need
+                    ]
+                    if not short:
+                        for need, b in zip(needs, self._buckets):
+                            b["tokens"] -= need
+                        return
+                    wait = max(short)
+            self._sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            now = self._clock()
+            self._paused_until = max(self._paused_until, now + seconds)
+
+
+@dataclass
+class OpenMeteoJob:
+    """One request: an endpoint (``kind``) for one batch of regions."""
+
+    kind: str
+    batch: int
+    regions: Tuple[str, ...]
+    lats: Tuple[float, ...]
+    lons: Tuple[float, ...]
+    params: Dict = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        digest = hashlib.sha1(
+            repr((self.regions, sorted(self.params.items()))).encode("utf-8")
+        ).hexdigest()[:10]
+        return f"{self.kind}_{self.batch:04d}_{digest}"
+
+
+def plan_openmeteo_jobs(
+    regions: Dict[str, Dict],
+    historical_range: Optional[Tuple[str, str]] = None,
+    forecast_days: int = OPENMETEO_FORECAST_DAYS,
+    batch_size: int = OPENMETEO_BATCH_SIZE,
+    region_names: Optional[Sequence[str]] = None,
+) -> List[OpenMeteoJob]:
+    """Jobs for every batch and endpoint (archive + flood only when ``historical_range`` is set)."""
+    names = list(region_names) if region_names is not None else list(regions)
+    jobs: List[OpenMeteoJob] = []
+    for b, i in enumerate(range(0, len(names), batch_size)):
+        batch = tuple(names[i:i + batch_size])
+        lats = tuple(regions[n]["lat"] for n in batch)
+        lons = tuple(regions[n]["lon"] for n in batch)
+
+        def job(kind, **params):
+            jobs.append(OpenMeteoJob(kind, b, batch, lats, lons, params))
+
+        if historical_range is not None:
+            start_date, end_date = historical_range
+            job("historical", start_date=start_date, end_date=end_date)
+            job("historical_flood", start_date=start_date, end_date=end_date)
+        job("forecast", days_ahead=forecast_days)
+        job(
+            "forecast_soil",
+            past_days=0,
+            forecast_days=forecast_days,
+            include_soil_temperature=False,
+            include_sm1_sm2_equivalent=True,
+        )
+        job("forecast_flood", past_days=0, forecast_days=forecast_days)
+    return jobs
+
+
+_FETCHERS: Dict[str, Callable[..., List[pd.DataFrame]]] = {
+    "historical": fetch_openmeteo_historical_batch,
+    "historical_flood": fetch_openmeteo_flood_discharge_batch,
+    "forecast": fetch_openmeteo_forecast_batch,
+    "forecast_soil": fetch_openmeteo_forecast_hourly_batch,
+    "forecast_flood": fetch_openmeteo_flood_discharge_batch,
+}
+
+
+def _run_job(job: OpenMeteoJob, limiter: RateLimiter) -> List[pd.DataFrame]:
+    return _FETCHERS[job.kind](list(job.lats), list(job.lons), limiter=limiter, **job.params)
+
+
+class OpenMeteoCheckpoint:
+    """Finished job results (and phase markers) for one run, pickled under ``CHECKPOINT_DIR``."""
+
+    def __init__(self, run_key: str, root: Optional[Path] = None):
+        safe_key = re.sub(r"[^A-Za-z0-9._-]+", "_", run_key)
+        self.path = Path(root or CHECKPOINT_DIR) / safe_key
+
+    def _job_file(self, job: OpenMeteoJob) -> Path:
+        return self.path / f"{job.key}.pkl"
+
+    def load(self, job: OpenMeteoJob) -> Optional[List[pd.DataFrame]]:
+        try:
+            with open(self._job_file(job), "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"  Warning: Ignoring unreadable checkpoint for {job.key}: {e}")
+            return None
+
+    def save(self, job: OpenMeteoJob, frames: List[pd.DataFrame]) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        target = self._job_file(job)
+        tmp = target.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(frames, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, target)
+
+    def mark(self, name: str) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        (self.path / f"{name}.done").touch()
+
+    def is_marked(self, name: str) -> bool:
+        return (self.path / f"{name}.done").exists()
+
+    def clear(self) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def run_openmeteo_jobs(
+    jobs: Sequence[OpenMeteoJob],
+    limiter: Optional[RateLimiter] = None,
+    checkpoint: Optional[OpenMeteoCheckpoint] = None,
+    max_workers: int = OPENMETEO_MAX_WORKERS,
+) -> Dict[str, List[pd.DataFrame]]:
+    """Run jobs concurrently; returns ``{job.key: frames}``.
+
+    Jobs already in ``checkpoint`` are not refetched. On failure every job that did
+    finish is still checkpointed before the first error is re-raised.
+    """
+    results: Dict[str, List[pd.DataFrame]] = {}
+    pending: List[OpenMeteoJob] = []
+    for job in jobs:
+        cached = checkpoint.load(job) if checkpoint is not None else None
+        if cached is not None:
+            results[job.key] = cached
+        else:
+            pending.append(job)
+    if results:
+        print(f"  Resuming OpenMeteo fetch: {len(results)}/{len(jobs)} batches from checkpoint")
+    if not pending:
+        return results
+
+    limiter = limiter or RateLimiter()
+    print(f"  Fetching {len(pending)} OpenMeteo batches with {max_workers} workers...")
+    first_error: Optional[BaseException] = None
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(_run_job, job, limiter): job for job in pending}
+        for future in concurrent.futures.as_completed(futures):
+            job = futures[future]
+            if future.cancelled():
+                continue
+            try:
+                frames = future.result()
+            except Exception as e:
+                if first_error is None:
+                    first_error = e
+                    print(f"  ✗ {job.kind} batch {job.batch + 1} failed: {e}", flush=True)
+                    for other in futures:
+                        other.cancel()
+                continue
+            if checkpoint is not None:
+                checkpoint.save(job, frames)
+            results[job.key] = frames
+    if first_error is not None:
+        raise first_error
+    return results
+
+
+def results_by_region(
+    jobs: Sequence[OpenMeteoJob], results: Dict[str, List[pd.DataFrame]]
+) -> Dict[str, Dict[str, pd.DataFrame]]:
+    """``{kind: {region: frame}}`` from per-batch results (every kind is present, possibly empty)."""
+    out: Dict[str, Dict[str, pd.DataFrame]] = {kind: {} for kind in HISTORICAL_KINDS + FORECAST_KINDS}
+    for job in jobs:
+        frames = results.get(job.key)
+        if frames is None:
+            continue
+        for name, df in zip(job.regions, frames):
+            out[job.kind][name] = df
+    return out
@@ -1,12 +1,17 @@
+import json
+import os
+import threading
 import requests
 import requests_cache
 import openmeteo_requests
+import numpy as np
 import pandas as pd
 import time
 import random
+from pathlib import Path
 from timezonefinder import TimezoneFinder
 from datetime import date, timedelta, datetime
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Sequence, Tuple
 from ..earth_engine_utils import regions_openmeteo
 
 # Hourly Forecast API: soil moisture and soil temperature are only available via hourly, not daily.
@@ -26,17 +31,290 @@ HOURLY_SOIL_TEMPERATURE_VARS = [
     "soil_temperature_54cm",
 ]
 
+# Archive API hourly variables and their daily aggregation: (field, reducer, output column).
+HISTORICAL_HOURLY_FIELDS = [
+    "temperature_2m", "precipitation", "wind_speed_10m",
+    "wind_gusts_10m", "wind_direction_10m", "shortwave_radiation",
+    "et0_fao_evapotranspiration", "relative_humidity_2m",
+    "soil_moisture_0_to_7cm", "soil_moisture_7_to_28cm",
+]
+HISTORICAL_DAILY_RULES = [
+    ("temperature_2m", "min", "temperature_2m_min"),
+    ("temperature_2m", "max", "temperature_2m_max"),
+    ("temperature_2m", "mean", "temperature_2m_mean"),
+    ("precipitation", "sum", "precipitation_sum"),
+    ("wind_speed_10m", "max", "wind_speed_10m_max"),
+    ("wind_gusts_10m", "max", "wind_gusts_10m_max"),
+    ("wind_direction_10m", "mean", "wind_direction_10m_dominant"),
+    ("shortwave_radiation", "sum", "shortwave_radiation_sum"),
+    ("et0_fao_evapotranspiration", "sum", "evapotranspiration_sum"),
+    ("relative_humidity_2m", "mean", "relative_humidity_2m_mean"),
+    ("soil_moisture_0_to_7cm", "mean", "soil_moisture_0_to_7cm_mean"),
+    ("soil_moisture_7_to_28cm", "mean", "soil_moisture_7_to_28cm_mean"),
+]
+
+# Persisted "lat,lon" -> IANA timezone table (region centroids never move).
+TIMEZONE_TABLE_PATH = Path(
+    os.getenv(
+        "OPENMETEO_TIMEZONE_TABLE",
+        Path(__file__).resolve().parents[2] / "data" / "openmeteo_timezones.json",
+    )
+)
+
+_tz_lock = threading.Lock()
+_tz_finder: Optional[TimezoneFinder] = None
+_tz_table: Optional[Dict[str, str]] = None
+
+_session_lock = threading.Lock()
+_openmeteo_client = None
+_http_session: Optional[requests.Session] = None
+
+
+def _coord_key(lat, lon) -> str:
+    return f"{float(lat):.6f},{float(lon):.6f}"
+
+
+def _load_timezone_table() -> Dict[str, str]:
+    global _tz_table
+    if _tz_table is None:
+        try:
+            with open(TIMEZONE_TABLE_PATH) as f:
+                _tz_table = dict(json.load(f))
+        except (OSError, ValueError):
+            _tz_table = {}
+    return _tz_table
+
+
+def _save_timezone_table() -> None:
+    try:
+        TIMEZONE_TABLE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = TIMEZONE_TABLE_PATH.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(_tz_table, f, indent=0, sort_keys=True)
+        os.replace(tmp, TIMEZONE_TABLE_PATH)
+    except OSError as e:
+        print(f"Warning: Could not persist timezone table {TIMEZONE_TABLE_PATH}: {e}")
+
+
+def _resolve_timezones(lats: Sequence[float], lons: Sequence[float]) -> List[str]:
+    """Timezones for many coordinates; misses go through one shared TimezoneFinder and are persisted."""
+    global _tz_finder
+    with _tz_lock:
+        table = _load_timezone_table()
+        out = []
+        added = False
+        for lat, lon in zip(lats, lons):
+            key = _coord_key(lat, lon)
+            tz_name = table.get(key)
+            if tz_name is None:
+                if _tz_finder is None:
+                    _tz_finder = TimezoneFinder()
+                tz_name = _tz_finder.timezone_at(lat=lat, lng=lon)
+                if tz_name is None:
+                    raise ValueError(f"Could not determine timezone for coordinates: {lat}, {lon}")
+                table[key] = tz_name
+                added = True
+            out.append(tz_name)
+        if added:
+            _save_timezone_table()
+        return out
+
+
 def get_timezone(lat, lon):
-    tf = TimezoneFinder()
-    tz_name = tf.timezone_at(lat=lat, lng=lon)
-    if tz_name is None:
-        raise ValueError(f"Could not determine timezone for coordinates: {lat}, {lon}")
-    return tz_name
-
-def fetch_openmeteo_historical_batch(lats: List[float], lons: List[float], start_date: str, end_date: str, max_retries: int = 5) -> List[pd.DataFrame]:
-    """Fetch historical weather data from OpenMeteo for multiple locations in one call."""
-    cache_session = requests_cache.CachedSession('.cache', expire_after=3600)
-    openmeteo = openmeteo_requests.Client(session=cache_session)
+    return _resolve_timezones([lat], [lon])[0]
+
+
+def region_timezones(regions: Optional[Dict[str, Dict]] = None) -> Dict[str, str]:
+    """Region -> timezone for every ``regions_openmeteo`` region (precomputes the persisted table)."""
+    if regions is None:
+        regions = regions_openmeteo()
+    names = list(regions)
+    tz_names = _resolve_timezones(
+        [regions[n]["lat"] for n in names], [regions[n]["lon"] for n in names]
+    )
+    return dict(zip(names, tz_names))
+
+
+def _get_openmeteo_client():
+    """Process-wide Open-Meteo client over one cached HTTP session."""
+    global _openmeteo_client
+    with _session_lock:
+        if _openmeteo_client is None:
+            cache_session = requests_cache.CachedSession('.cache', expire_after=3600)
+            _openmeteo_client = openmeteo_requests.Client(session=cache_session)
+        return _openmeteo_client
+
+
+def _get_http_session() -> requests.Session:
+    """Pooled (uncached) session for the JSON hourly endpoints."""
+    global _http_session
+    with _session_lock:
+        if _http_session is None:
+            _http_session = requests.Session()
+        return _http_session
+
+
+def reduce_hourly_to_daily(
+    day_labels: np.ndarray,
+    values: np.ndarray,
+    rules: Sequence[Tuple[int, str, str]],
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Aggregate ``values`` (locations × fields × hours) to days in one pass.
+
+    ``day_labels`` gives the local date of each hour (shared by all locations);
+    ``rules`` are ``(field index, "sum"|"mean"|"min"|"max", output column)``.
+    NaNs are skipped like pandas: an all-NaN day sums to 0 and is NaN otherwise.
+    Returns the days and ``{output column: locations × days}``.
+    """
+    day_labels = np.asarray(day_labels)
+    if len(day_labels) > 1 and np.any(day_labels[1:] < day_labels[:-1]):
+        order = np.argsort(day_labels, kind="stable")
+        day_labels, values = day_labels[order], values[:, :, order]
+    starts = np.flatnonzero(np.r_[True, day_labels[1:] != day_labels[:-1]])
+    days = day_labels[starts]
+
+    valid = ~np.isnan(values)
+    sums = np.add.reduceat(np.where(valid, values, 0.0), starts, axis=2)
+    counts = None
+    mins = maxs = None
+    out: Dict[str, np.ndarray] = {}
+    for field, how, column in rules:
+        if how == "sum":
+            out[column] = sums[:, field]
+        elif how == "mean":
+            if counts is None:
+                counts = np.add.reduceat(valid.astype(np.int64), starts, axis=2)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                out[column] = np.where(counts[:, field] > 0, sums[:, field] / counts[:, field], np.nan)
+        elif how == "max":
+            if maxs is None:
+                maxs = np.fmax.reduceat(values, starts, axis=2)
+            out[column] = maxs[:, field]
+        elif how == "min":
+            if mins is None:
+                mins = np.fmin.reduceat(values, starts, axis=2)
+            out[column] = mins[:, field]
+        else:
+            raise ValueError(f"Unsupported daily reducer: {how}")
+    return days, out
+
+
+def _fit_length(values: np.ndarray, n: int) -> np.ndarray:
+    """Pad with NaN / truncate to ``n`` hours (the API may return a ragged tail)."""
+    out = np.full(n, np.nan)
+    m = min(len(values), n)
+    out[:m] = values[:m]
+    return out
+
+
+def _historical_daily_frames(
+    responses, lats: Sequence[float], lons: Sequence[float], start_date: str, end_date: str
+) -> List[pd.DataFrame]:
+    """Daily archive frames for all responses; locations sharing a timezone are reduced together."""
+    n_loc = len(responses)
+    tz_names = _resolve_timezones(lats[:n_loc], lons[:n_loc])
+    by_tz: Dict[str, List[int]] = {}
+    for i, tz_name in enumerate(tz_names):
+        by_tz.setdefault(tz_name, []).append(i)
+
+    rules = [(HISTORICAL_HOURLY_FIELDS.index(f), how, col) for f, how, col in HISTORICAL_DAILY_RULES]
+    n_fields = len(HISTORICAL_HOURLY_FIELDS)
+    all_dfs: List[pd.DataFrame] = [pd.DataFrame()] * n_loc
+    for tz_name, idxs in by_tz.items():
+        # Reconstruct hourly index in local time
+        h_start = pd.Timestamp(start_date, tz=tz_name)
+        h_end = pd.Timestamp(end_date, tz=tz_name) + pd.Timedelta(hours=23)
+        hourly_index = pd.date_range(start=h_start, end=h_end, freq="h", inclusive="both")
+        n_hours = len(hourly_index)
+
+        values = np.empty((len(idxs), n_fields, n_hours))
+        for k, i in enumerate(idxs):
+            hourly = responses[i].Hourly()
+            for j in range(n_fields):
+                values[k, j] = _fit_length(hourly.Variables(j).ValuesAsNumpy(), n_hours)
+
+        days, daily = reduce_hourly_to_daily(np.asarray(hourly_index.date), values, rules)
+        for k, i in enumerate(idxs):
+            df = pd.DataFrame({"date": days})
+            for column, arr in daily.items():
+                df[column] = arr[k]
+            all_dfs[i] = df
+    return all_dfs
+
+
+def _hourly_json_daily_frames(data_list: List[Dict], include_sm1_sm2_equivalent: bool) -> List[pd.DataFrame]:
+    """Daily means of every hourly variable in Forecast API JSON payloads, reduced per shared time axis."""
+    all_dfs: List[pd.DataFrame] = [pd.DataFrame()] * len(data_list)
+    groups: Dict[Tuple, List[int]] = {}
+    for i, loc_data in enumerate(data_list):
+        hourly = loc_data.get("hourly", {})
+        if not hourly or "time" not in hourly:
+            continue
+        times = hourly["time"]
+        key = (times[0] if times else None, times[-1] if times else None, len(times),
+               tuple(k for k in hourly if k != "time"))
+        groups.setdefault(key, []).append(i)
+
+    for key, idxs in groups.items():
+        first = data_list[idxs[0]]["hourly"]
+        fields = list(key[3])
+        day_labels = np.asarray(pd.to_datetime(first["time"]).date)
+        values = np.array(
+            [[np.asarray(data_list[i]["hourly"][f], dtype=float) for f in fields] for i in idxs],
+            dtype=float,
+        ).reshape(len(idxs), len(fields), len(day_labels))
+        rules = [(j, "mean", f) for j, f in enumerate(fields)]
+        days, daily = reduce_hourly_to_daily(day_labels, values, rules)
+
+        for k, i in enumerate(idxs):
+            df = pd.DataFrame({"date": days})
+            for column, arr in daily.items():
+                df[column] = arr[k]
+            # Depth-weighted equivalents of archive sm1 (0–7 cm) and sm2 (7–28 cm) for direct
+            # comparability: same metric names (sm1_mean, sm2_mean) so LLM/outlook can interpret
+            # "soil moisture layer 1" recent vs forecast without schema change.
+            if include_sm1_sm2_equivalent and all(c in df.columns for c in HOURLY_SOIL_MOISTURE_VARS):
+                a, b, c, d, e = [df[v] for v in HOURLY_SOIL_MOISTURE_VARS]
+                # sm1: 0–7 cm = 1 cm (0–1) + 2 cm (1–3) + 4 cm (3–7 from 3–9 layer)
+                df["sm1_mean"] = (1.0 * a + 2.0 * b + 4.0 * c) / 7.0
+                # sm2: 7–28 cm = 2 cm (7–9 from 3–9) + 18 cm (9–27) + 1 cm (27–28 from 27–81)
+                df["sm2_mean"] = (2.0 * c + 18.0 * d + 1.0 * e) / 21.0
+            all_dfs[i] = df
+    return all_dfs
+
+def call_weight(n_locations: int, n_variables: int, n_days: int) -> float:
+    """API calls one request counts as: per location, more than 10 variables or 2 weeks count extra."""
+    return n_locations * max(1.0, n_variables / 10.0) * max(1.0, n_days / 14.0)
+
+
+def _span_days(start_date: str, end_date: str) -> int:
+    return (pd.Timestamp(end_date) - pd.Timestamp(start_date)).days + 1
+
+
+def _pace(limiter, weight: float) -> None:
+    """Wait before a request: shared quota when scheduled, otherwise the usual jitter."""
+    if limiter is None:
+        time.sleep(1 + random.uniform(0.5, 1.5))
+    else:
+        limiter.acquire(weight)
+
+
+def _rate_limit_wait(limiter, wait: float = 65) -> None:
+    """Back off after a per-minute 429; with a shared limiter every worker pauses."""
+    print(f"  [Rate Limit] Waiting {wait}s before retry...", flush=True)
+    if limiter is None:
+        time.sleep(wait)
+    else:
+        limiter.pause(wait)
+
+
+def fetch_openmeteo_historical_batch(lats: List[float], lons: List[float], start_date: str, end_date: str, max_retries: int = 5, limiter=None) -> List[pd.DataFrame]:
+    """Fetch historical weather data from OpenMeteo for multiple locations in one call.
+
+    With ``limiter`` (see ``openmeteo_scheduler.RateLimiter``) requests are paced by the
+    shared quota instead of a fixed sleep; the same applies to the other ``*_batch`` fetchers.
+    """
+    openmeteo = _get_openmeteo_client()
     
     url = "https://archive-api.open-meteo.com/v1/archive"
     params = {
@@ -53,68 +331,9 @@ def fetch_openmeteo_historical_batch(lats: List[float], lons: List[float], start
     
     for attempt in range(max_retries):
         try:
-            time.sleep(1 + random.uniform(0.5, 1.5))
+            _pace(limiter, call_weight(len(lats), len(HISTORICAL_HOURLY_FIELDS), _span_days(start_date, end_date)))
             responses = openmeteo.weather_api(url, params=params, timeout=60)
-            
-            all_dfs = []
-            for i, response in enumerate(responses):
-                lat, lon = lats[i], lons[i]
-                hourly = response.Hourly()
-                tz_name = get_timezone(lat, lon)
-
-                # Reconstruct hourly index
-                h_start = pd.Timestamp(start_date, tz=tz_name)
-                h_end = pd.Timestamp(end_date, tz=tz_name) + pd.Timedelta(hours=23)
-                hourly_index = pd.date_range(start=h_start, end=h_end, freq="h", inclusive="both")
-
-                hourly_fields = [
-                    "temperature_2m", "precipitation", "wind_speed_10m",
-                    "wind_gusts_10m", "wind_direction_10m", "shortwave_radiation",
-                    "et0_fao_evapotranspiration", "relative_humidity_2m",
-                    "soil_moisture_0_to_7cm", "soil_moisture_7_to_28cm"
-                ]
-
-                hourly_df = pd.DataFrame({"datetime": hourly_index})
-                for j, field_name in enumerate(hourly_fields):
-                    values = pd.Series(hourly.Variables(j).ValuesAsNumpy(), dtype='float')
-                    values = values.reindex(range(len(hourly_index))).to_numpy()
-                    hourly_df[field_name] = values
-
-                hourly_df["date"] = hourly_df["datetime"].dt.date
-
-                # Aggregate to daily
-                agg_rules = {
-                    "temperature_2m": ["min", "max", "mean"],
-                    "precipitation": "sum",
-                    "wind_speed_10m": "max",
-                    "wind_gusts_10m": "max",
-                    "wind_direction_10m": "mean",
-                    "shortwave_radiation": "sum",
-                    "et0_fao_evapotranspiration": "sum",
-                    "relative_humidity_2m": "mean",
-                    "soil_moisture_0_to_7cm": "mean",
-                    "soil_moisture_7_to_28cm": "mean"
-                }
-
-                daily_agg = {}
-                for field, method in agg_rules.items():
-                    if isinstance(method, list):
-                        for m in method:
-                            daily_agg[f"{field}_{m}"] = hourly_df.groupby("date")[field].agg(m)
-                    else:
-                        daily_agg[f"{field}_{method if method != 'mean' else 'mean'}"] = hourly_df.groupby("date")[field].agg(method)
-
-                df = pd.DataFrame(daily_agg).reset_index()
-                df = df.rename(columns={
-                    "precipitation_sum": "precipitation_sum",
-                    "wind_direction_10m_mean": "wind_direction_10m_dominant",
-                    "shortwave_radiation_sum": "shortwave_radiation_sum",
-                    "et0_fao_evapotranspiration_sum": "evapotranspiration_sum",
-                    "soil_moisture_0_to_7cm_mean": "soil_moisture_0_to_7cm_mean",
-                    "soil_moisture_7_to_28cm_mean": "soil_moisture_7_to_28cm_mean"
-                })
-                all_dfs.append(df)
-            return all_dfs
+            return _historical_daily_frames(responses, lats, lons, start_date, end_date)
 
         except Exception as e:
             err_str = str(e).lower()
@@ -122,19 +341,16 @@ def fetch_openmeteo_historical_batch(lats: List[float], lons: List[float], start
                 print(f"  [Rate Limit] Hourly/Daily limit reached. Failing task.", flush=True)
                 raise
             if "429" in err_str or "too many requests" in err_str or "rate" in err_str or "limit" in err_str:
-                wait = 65
-                print(f"  [Rate Limit] Waiting {wait}s before retry...", flush=True)
-                time.sleep(wait)
+                _rate_limit_wait(limiter)
                 continue
             if attempt == max_retries - 1: raise
             time.sleep(min(30, 2 ** attempt))
 
     return [pd.DataFrame()] * len(lats)
 
-def fetch_openmeteo_forecast_batch(lats: List[float], lons: List[float], days_ahead: int = 7, max_retries: int = 5) -> List[pd.DataFrame]:
+def fetch_openmeteo_forecast_batch(lats: List[float], lons: List[float], days_ahead: int = 7, max_retries: int = 5, limiter=None) -> List[pd.DataFrame]:
     """Fetch weather forecast from OpenMeteo for multiple locations in one call."""
-    cache_session = requests_cache.CachedSession('.cache', expire_after=3600)
-    openmeteo = openmeteo_requests.Client(session=cache_session)
+    openmeteo = _get_openmeteo_client()
     
     url = "https://api.open-meteo.com/v1/forecast"
     params = {
@@ -148,14 +364,14 @@ def fetch_openmeteo_forecast_batch(lats: List[float], lons: List[float], days_ah
     
     for attempt in range(max_retries):
         try:
-            time.sleep(1 + random.uniform(0.5, 1.5))
+            _pace(limiter, call_weight(len(lats), len(params["daily"]), days_ahead))
             responses = openmeteo.weather_api(url, params=params, timeout=60)
             
+            tz_names = _resolve_timezones(lats[:len(responses)], lons[:len(responses)])
             all_dfs = []
             for i, response in enumerate(responses):
-                lat, lon = lats[i], lons[i]
                 daily = response.Daily()
-                tz_name = get_timezone(lat, lon)
+                tz_name = tz_names[i]
 
                 d_start = pd.to_datetime(daily.Time(), unit="s", utc=True).tz_convert(tz_name)
                 date_range = pd.date_range(start=d_start, periods=days_ahead, freq="D")
@@ -178,9 +394,7 @@ def fetch_openmeteo_forecast_batch(lats: List[float], lons: List[float], days_ah
                 print(f"  [Rate Limit] Hourly/Daily limit reached. Failing task.", flush=True)
                 raise
             if "429" in err_str or "too many requests" in err_str or "rate" in err_str or "limit" in err_str:
-                wait = 65
-                print(f"  [Rate Limit] Waiting {wait}s before retry...", flush=True)
-                time.sleep(wait)
+                _rate_limit_wait(limiter)
                 continue
             if attempt == max_retries - 1: raise
             time.sleep(min(30, 2 ** attempt))
@@ -194,10 +408,10 @@ def fetch_openmeteo_flood_discharge_batch(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     max_retries: int = 5,
+    limiter=None,
 ) -> List[pd.DataFrame]:
     """Fetch river discharge data from OpenMeteo Flood API for multiple locations."""
-    cache_session = requests_cache.CachedSession('.cache', expire_after=3600)
-    openmeteo = openmeteo_requests.Client(session=cache_session)
+    openmeteo = _get_openmeteo_client()
     
     url = "https://flood-api.open-meteo.com/v1/flood"
     params = {
@@ -216,20 +430,22 @@ def fetch_openmeteo_flood_discharge_batch(
     if start_date and end_date:
         params["start_date"] = start_date
         params["end_date"] = end_date
+        n_days = _span_days(start_date, end_date)
     else:
         params["past_days"] = past_days
         params["forecast_days"] = forecast_days
+        n_days = past_days + forecast_days
     
     for attempt in range(max_retries):
         try:
-            time.sleep(1 + random.uniform(0.5, 1.5))
+            _pace(limiter, call_weight(len(lats), len(params["daily"]), n_days))
             responses = openmeteo.weather_api(url, params=params, timeout=60)
             
+            tz_names = _resolve_timezones(lats[:len(responses)], lons[:len(responses)])
             all_dfs = []
             for i, response in enumerate(responses):
-                lat, lon = lats[i], lons[i]
                 daily = response.Daily()
-                tz_name = get_timezone(lat, lon)
+                tz_name = tz_names[i]
                 
                 d_start = pd.to_datetime(daily.Time(), unit="s", utc=True).tz_convert(tz_name)
                 discharge = daily.Variables(0).ValuesAsNumpy()
@@ -264,9 +480,7 @@ def fetch_openmeteo_flood_discharge_batch(
                 print(f"  [Rate Limit] Hourly/Daily limit reached. Failing task.", flush=True)
                 raise
             if "minutely" in err_str or "rate" in err_str or "limit" in err_str or "429" in err_str or "too many requests" in err_str:
-                wait = 65
-                print(f"  [Rate Limit] Waiting {wait}s before retry...", flush=True)
-                time.sleep(wait)
+                _rate_limit_wait(limiter)
                 continue
             if attempt < max_retries - 1:
                 time.sleep(min(5, 2 ** attempt))
@@ -283,6 +497,7 @@ def fetch_openmeteo_forecast_hourly_batch(
     include_soil_temperature: bool = True,
     include_sm1_sm2_equivalent: bool = True,
     max_retries: int = 5,
+    limiter=None,
 ) -> List[pd.DataFrame]:
     """Fetch past + forecast hourly data from Open-Meteo Forecast API for multiple locations."""
     url = "https://api.open-meteo.com/v1/forecast"
@@ -301,8 +516,8 @@ def fetch_openmeteo_forecast_hourly_batch(
     data = None
     for attempt in range(max_retries):
         try:
-            time.sleep(1 + random.uniform(0.5, 1.5))
-            r = requests.get(url, params=params, timeout=60)
+            _pace(limiter, call_weight(len(lats), len(hourly_vars), past_days + forecast_days))
+            r = _get_http_session().get(url, params=params, timeout=60)
             if r.status_code != 200:
                 try:
                     err_data = r.json()
@@ -319,9 +534,7 @@ def fetch_openmeteo_forecast_hourly_batch(
                 print(f"  [Rate Limit] Hourly/Daily limit reached. Failing task.", flush=True)
                 raise
             if "429" in err_str or "too many requests" in err_str or "rate" in err_str or "limit" in err_str:
-                wait = 65
-                print(f"  [Rate Limit] Waiting {wait}s before retry...", flush=True)
-                time.sleep(wait)
+                _rate_limit_wait(limiter)
                 continue
             if attempt == max_retries - 1:
                 raise
@@ -337,39 +550,11 @@ def fetch_openmeteo_forecast_hourly_batch(
     else:
         data_list = data
 
-    all_dfs = []
-    for loc_data in data_list:
-        hourly = loc_data.get("hourly", {})
-        if not hourly or "time" not in hourly:
-            all_dfs.append(pd.DataFrame())
-            continue
-
-        times = pd.to_datetime(hourly["time"])
-        df = pd.DataFrame({"datetime": times})
-        for key, values in hourly.items():
-            if key != "time":
-                df[key] = values
-        df["date"] = df["datetime"].dt.date
-
-        agg = {}
-        for col in df.columns:
-            if col in ("datetime", "date"): continue
-            agg[col] = df.groupby("date")[col].mean()
-        daily = pd.DataFrame(agg).reset_index()
-
-        if include_sm1_sm2_equivalent and all(c in daily.columns for c in HOURLY_SOIL_MOISTURE_VARS):
-            a, b, c, d, e = [daily[v] for v in HOURLY_SOIL_MOISTURE_VARS]
-            daily["sm1_mean"] = (1.0 * a + 2.0 * b + 4.0 * c) / 7.0
-            daily["sm2_mean"] = (2.0 * c + 18.0 * d + 1.0 * e) / 21.0
-        
-        all_dfs.append(daily)
-        
-    return all_dfs
+    return _hourly_json_daily_frames(data_list, include_sm1_sm2_equivalent)
 
 def fetch_openmeteo_historical(lat: float, lon: float, start_date: str, end_date: str, max_retries: int = 5) -> pd.DataFrame:
     """Fetch historical weather data from OpenMeteo."""
-    cache_session = requests_cache.CachedSession('.cache', expire_after=3600)
-    openmeteo = openmeteo_requests.Client(session=cache_session)
+    openmeteo = _get_openmeteo_client()
     
     url = "https://archive-api.open-meteo.com/v1/archive"
     params = {
@@ -388,62 +573,7 @@ def fetch_openmeteo_historical(lat: float, lon: float, start_date: str, end_date
         try:
             time.sleep(2 + random.uniform(0.5, 1.5)) # Slightly reduced wait but still cautious
             responses = openmeteo.weather_api(url, params=params, timeout=30)
-            response = responses[0]
-            hourly = response.Hourly()
-            tz_name = get_timezone(lat, lon)
-
-            # Reconstruct hourly index
-            h_start = pd.Timestamp(start_date, tz=tz_name)
-            h_end = pd.Timestamp(end_date, tz=tz_name) + pd.Timedelta(hours=23)
-            hourly_index = pd.date_range(start=h_start, end=h_end, freq="h", inclusive="both")
-
-            hourly_fields = [
-                "temperature_2m", "precipitation", "wind_speed_10m",
-                "wind_gusts_10m", "wind_direction_10m", "shortwave_radiation",
-                "et0_fao_evapotranspiration", "relative_humidity_2m",
-                "soil_moisture_0_to_7cm", "soil_moisture_7_to_28cm"
-            ]
-
-            hourly_df = pd.DataFrame({"datetime": hourly_index})
-            for i, field_name in enumerate(hourly_fields):
-                values = pd.Series(hourly.Variables(i).ValuesAsNumpy(), dtype='float')
-                values = values.reindex(range(len(hourly_index))).to_numpy()
-                hourly_df[field_name] = values
-
-            hourly_df["date"] = hourly_df["datetime"].dt.date
-
-            # Aggregate to daily
-            agg_rules = {
-                "temperature_2m": ["min", "max", "mean"],
-                "precipitation": "sum",
-                "wind_speed_10m": "max",
-                "wind_gusts_10m": "max",
-                "wind_direction_10m": "mean",
-                "shortwave_radiation": "sum",
-                "et0_fao_evapotranspiration": "sum",
-                "relative_humidity_2m": "mean",
-                "soil_moisture_0_to_7cm": "mean",
-                "soil_moisture_7_to_28cm": "mean"
-            }
-
-            daily_agg = {}
-            for field, method in agg_rules.items():
-                if isinstance(method, list):
-                    for m in method:
-                        daily_agg[f"{field}_{m}"] = hourly_df.groupby("date")[field].agg(m)
-                else:
-                    daily_agg[f"{field}_{method if method != 'mean' else 'mean'}"] = hourly_df.groupby("date")[field].agg(method)
-
-            df = pd.DataFrame(daily_agg).reset_index()
-            df = df.rename(columns={
-                "precipitation_sum": "precipitation_sum",
-                "wind_direction_10m_mean": "wind_direction_10m_dominant",
-                "shortwave_radiation_sum": "shortwave_radiation_sum",
-                "et0_fao_evapotranspiration_sum": "evapotranspiration_sum",
-                "soil_moisture_0_to_7cm_mean": "soil_moisture_0_to_7cm_mean",
-                "soil_moisture_7_to_28cm_mean": "soil_moisture_7_to_28cm_mean"
-            })
-            return df
+            return _historical_daily_frames(responses[:1], [lat], [lon], start_date, end_date)[0]
 
         except Exception as e:
             err_str = str(e).lower()
@@ -462,8 +592,7 @@ def fetch_openmeteo_historical(lat: float, lon: float, start_date: str, end_date
 
 def fetch_openmeteo_forecast(lat: float, lon: float, days_ahead: int = 7, max_retries: int = 5) -> pd.DataFrame:
     """Fetch weather forecast from OpenMeteo."""
-    cache_session = requests_cache.CachedSession('.cache', expire_after=3600)
-    openmeteo = openmeteo_requests.Client(session=cache_session)
+    openmeteo = _get_openmeteo_client()
     
     url = "https://api.open-meteo.com/v1/forecast"
     params = {
@@ -538,8 +667,7 @@ def fetch_openmeteo_flood_discharge(
     Returns:
         DataFrame with columns: date, river_discharge, ...
     """
-    cache_session = requests_cache.CachedSession('.cache', expire_after=3600)
-    openmeteo = openmeteo_requests.Client(session=cache_session)
+    openmeteo = _get_openmeteo_client()
     
     url = "https://flood-api.open-meteo.com/v1/flood"
     params = {
@@ -695,7 +823,7 @@ def fetch_openmeteo_forecast_hourly_with_soil_moisture(
                 time.sleep(0.5 + random.uniform(0.5, 1.5))
             else:
                 time.sleep(1 + random.uniform(0.5, 1.0))
-            r = requests.get(url, params=params, timeout=30)
+            r = _get_http_session().get(url, params=params, timeout=30)
             if r.status_code != 200:
                 try:
                     err_data = r.json()
@@ -724,49 +852,7 @@ def fetch_openmeteo_forecast_hourly_with_soil_moisture(
     if data is None:
         return pd.DataFrame()
 
-    hourly = data.get("hourly", {})
-    if not hourly or "time" not in hourly:
-        return pd.DataFrame()
-
-    times = pd.to_datetime(hourly["time"])
-    df = pd.DataFrame({"datetime": times})
-    for key, values in hourly.items():
-        if key != "time":
-            df[key] = values
-    df["date"] = df["datetime"].dt.date
-
-    # Daily mean for all requested variables
-    agg = {}
-    for col in df.columns:
-        if col in ("datetime", "date"):
-            continue
-        agg[col] = df.groupby("date")[col].mean()
-    daily = pd.DataFrame(agg).reset_index()
-
-    # Depth-weighted equivalents of archive sm1 (0–7 cm) and sm2 (7–28 cm) for direct
-    # comparability: same metric names (sm1_mean, sm2_mean) so LLM/outlook can interpret
-    # "soil moisture layer 1" recent vs forecast without schema change.
-    if include_sm1_sm2_equivalent and all(
-        c in daily.columns
-        for c in [
-            "soil_moisture_0_to_1cm",
-            "soil_moisture_1_to_3cm",
-            "soil_moisture_3_to_9cm",
-            "soil_moisture_9_to_27cm",
-            "soil_moisture_27_to_81cm",
-        ]
-    ):
-        a = daily["soil_moisture_0_to_1cm"]
-        b = daily["soil_moisture_1_to_3cm"]
-        c = daily["soil_moisture_3_to_9cm"]
-        d = daily["soil_moisture_9_to_27cm"]
-        e = daily["soil_moisture_27_to_81cm"]
-        # sm1: 0–7 cm = 1 cm (0–1) + 2 cm (1–3) + 4 cm (3–7 from 3–9 layer)
-        daily["sm1_mean"] = (1.0 * a + 2.0 * b + 4.0 * c) / 7.0
-        # sm2: 7–28 cm = 2 cm (7–9 from 3–9) + 18 cm (9–27) + 1 cm (27–28 from 27–81)
-        daily["sm2_mean"] = (2.0 * c + 18.0 * d + 1.0 * e) / 21.0
-
-    return daily
+    return _hourly_json_daily_frames([data], include_sm1_sm2_equivalent)[0]
 
 
 def merge_glofas_river_discharge_onto_openmeteo_daily(
@@ -845,75 +931,82 @@ def merge_glofas_river_discharge_onto_openmeteo_forecast(
     return out
 
 
+def _merge_river_discharge(daily: pd.DataFrame, flood: Optional[pd.DataFrame]) -> pd.DataFrame:
+    if flood is not None and not flood.empty and "river_discharge" in flood.columns:
+        f = flood[["date", "river_discharge"]].copy()
+        daily["date_norm"] = pd.to_datetime(daily["date"]).dt.normalize()
+        f["date_norm"] = pd.to_datetime(f["date"]).dt.normalize()
+        return daily.merge(f[["date_norm", "river_discharge"]], on="date_norm", how="left").drop(columns=["date_norm"])
+    daily["river_discharge"] = pd.NA
+    return daily
+
+
+def merge_openmeteo_historical_frames(
+    h_weather: pd.DataFrame, h_flood: Optional[pd.DataFrame]
+) -> pd.DataFrame:
+    """Archive weather for one region with GloFAS river_discharge left-joined by date."""
+    return _merge_river_discharge(h_weather, h_flood)
+
+
+def merge_openmeteo_forecast_frames(
+    f_weather: pd.DataFrame,
+    f_sm: Optional[pd.DataFrame],
+    f_flood: Optional[pd.DataFrame],
+) -> pd.DataFrame:
+    """Daily forecast for one region with hourly-derived sm1/sm2 and GloFAS river_discharge."""
+    if f_sm is not None and not f_sm.empty and all(c in f_sm.columns for c in ("date", "sm1_mean", "sm2_mean")):
+        f_weather = f_weather.merge(f_sm[["date", "sm1_mean", "sm2_mean"]], on="date", how="left")
+    return _merge_river_discharge(f_weather, f_flood)
+
+
 def sync_openmeteo_all_regions(project_id: str, dataset_id: str, historical_start: str, historical_end: str):
-    """Sync historical archive (weather + GloFAS river_discharge) and forecast (weather + GloFAS) for all regions using batch fetching."""
-    from ..bq_utils import save_to_bigquery
+    """Sync historical archive (weather + GloFAS river_discharge) and forecast (weather + GloFAS) for all regions.
+
+    Batches for every endpoint run concurrently through ``openmeteo_scheduler`` and are
+    checkpointed locally, so a retried run only refetches what did not finish.
+    """
+    from ..bq_utils import save_to_bigquery, merge_to_bigquery
+    from .openmeteo_scheduler import (
+        OpenMeteoCheckpoint,
+        plan_openmeteo_jobs,
+        run_openmeteo_jobs,
+        results_by_region,
+    )
     
     regions = regions_openmeteo()
     region_names = list(regions.keys())
-    lats = [regions[n]['lat'] for n in region_names]
-    lons = [regions[n]['lon'] for n in region_names]
-    
-    # Process in batches of 50 (OpenMeteo limit)
-    batch_size = 50
-    hist_all, fore_all = [], []
-    
-    for i in range(0, len(region_names), batch_size):
-        batch_names = region_names[i:i+batch_size]
-        batch_lats = lats[i:i+batch_size]
-        batch_lons = lons[i:i+batch_size]
-        n_batch = len(batch_names)
-        
-        print(f"Processing batch {i//batch_size + 1}: {n_batch} regions")
-        
-        # 1. Historical
-        print(f"  Fetching historical data...")
-        h_weather_list = fetch_openmeteo_historical_batch(batch_lats, batch_lons, historical_start, historical_end)
-        h_flood_list = fetch_openmeteo_flood_discharge_batch(batch_lats, batch_lons, start_date=historical_start, end_date=historical_end)
-        
-        for j, name in enumerate(batch_names):
-            h_weather = h_weather_list[j]
-            h_flood = h_flood_list[j]
-            if not h_weather.empty:
-                if not h_flood.empty and "river_discharge" in h_flood.columns:
-                    f = h_flood[["date", "river_discharge"]].copy()
-                    h_weather["date_norm"] = pd.to_datetime(h_weather["date"]).dt.normalize()
-                    f["date_norm"] = pd.to_datetime(f["date"]).dt.normalize()
-                    h_weather = h_weather.merge(f[["date_norm", "river_discharge"]], on="date_norm", how="left").drop(columns=["date_norm"])
-                else:
-                    h_weather["river_discharge"] = pd.NA
-                h_weather['region_name'] = name
-                hist_all.append(h_weather)
-
-        # 2. Forecast
-        print(f"  Fetching forecast data...")
-        f_weather_list = fetch_openmeteo_forecast_batch(batch_lats, batch_lons)
-        f_sm_list = fetch_openmeteo_forecast_hourly_batch(batch_lats, batch_lons, past_days=0, forecast_days=7, include_soil_temperature=False, include_sm1_sm2_equivalent=True)
-        f_flood_list = fetch_openmeteo_flood_discharge_batch(batch_lats, batch_lons, past_days=0, forecast_days=7)
-        
-        for j, name in enumerate(batch_names):
-            f_weather = f_weather_list[j]
-            f_sm = f_sm_list[j]
-            f_flood = f_flood_list[j]
-            if not f_weather.empty:
-                if not f_sm.empty and 'date' in f_sm.columns and 'sm1_mean' in f_sm.columns and 'sm2_mean' in f_sm.columns:
-                    f_weather = f_weather.merge(f_sm[['date', 'sm1_mean', 'sm2_mean']], on='date', how='left')
-                if not f_flood.empty and "river_discharge" in f_flood.columns:
-                    f = f_flood[["date", "river_discharge"]].copy()
-                    f_weather["date_norm"] = pd.to_datetime(f_weather["date"]).dt.normalize()
-                    f["date_norm"] = pd.to_datetime(f["date"]).dt.normalize()
-                    f_weather = f_weather.merge(f[["date_norm", "river_discharge"]], on="date_norm", how="left").drop(columns=["date_norm"])
-                else:
-                    f_weather["river_discharge"] = pd.NA
-                f_weather['region_name'] = name
-                fore_all.append(f_weather)
 
-    if hist_all:
+    jobs = plan_openmeteo_jobs(regions, historical_range=(historical_start, historical_end))
+    checkpoint = OpenMeteoCheckpoint(
+        f"sync_{dataset_id}_{historical_start}_{historical_end}_{date.today().isoformat()}"
+    )
+    frames = results_by_region(jobs, run_openmeteo_jobs(jobs, checkpoint=checkpoint))
+
+    hist_all, fore_all = [], []
+    for name in region_names:
+        h_weather = frames["historical"].get(name)
+        if h_weather is not None and not h_weather.empty:
+            h_weather = merge_openmeteo_historical_frames(h_weather, frames["historical_flood"].get(name))
+            h_weather['region_name'] = name
+            hist_all.append(h_weather)
+
+        f_weather = frames["forecast"].get(name)
+        if f_weather is not None and not f_weather.empty:
+            f_weather = merge_openmeteo_forecast_frames(
+                f_weather, frames["forecast_soil"].get(name), frames["forecast_flood"].get(name)
+            )
+            f_weather['region_name'] = name
+            fore_all.append(f_weather)
+
+    if hist_all and not checkpoint.is_marked("historical_saved"):
         df_hist = pd.concat(hist_all, ignore_index=True)
-        save_to_bigquery(df_hist, project_id, dataset_id, "openmeteo_weather", mode="WRITE_APPEND")
+        merge_to_bigquery(df_hist, project_id, dataset_id, "openmeteo_weather", key_columns=["date", "region_name"])
+        checkpoint.mark("historical_saved")
         print(f"✓ Saved {len(df_hist)} historical weather records")
     
     if fore_all:
         df_fore = pd.concat(fore_all, ignore_index=True)
         save_to_bigquery(df_fore, project_id, dataset_id, "openmeteo_forecast", mode="WRITE_TRUNCATE")
         print(f"✓ Saved {len(df_fore)} forecast records")
+
+    checkpoint.clear()
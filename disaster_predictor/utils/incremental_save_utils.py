@@ -6,8 +6,8 @@ Handles rate limiting and graceful failure recovery.
 import time
 import pandas as pd
 from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
-from typing import Set, Optional
-from utils.bq_utils import save_to_bigquery, load_from_bigquery
+from typing import List, Set, Optional
+from utils.bq_utils import save_to_bigquery, merge_to_bigquery, load_from_bigquery
 
 # GEE Rate Limits (conservative settings)
 # - 40 concurrent requests (default)
@@ -57,7 +57,8 @@ def save_incremental(
     dataset_id: str,
     table_id: str,
     mode: str = 'WRITE_APPEND',
-    retry: bool = True
+    retry: bool = True,
+    key_columns: Optional[List[str]] = None,
 ) -> bool:
     """
     Save DataFrame to BigQuery with retry logic and exponential backoff.
@@ -69,6 +70,7 @@ def save_incremental(
         table_id: BigQuery table ID
         mode: Write mode ('WRITE_APPEND' or 'WRITE_TRUNCATE')
         retry: Whether to retry on failure
+        key_columns: With WRITE_APPEND, upsert on these columns (MERGE) instead of appending
     
     Returns:
         True if successful, False otherwise
@@ -78,7 +80,10 @@ def save_incremental(
     
     for attempt in range(MAX_RETRIES if retry else 1):
         try:
-            save_to_bigquery(df, project_id, dataset_id, table_id, mode=mode)
+            if key_columns and mode == 'WRITE_APPEND':
+                merge_to_bigquery(df, project_id, dataset_id, table_id, key_columns=key_columns)
+            else:
+                save_to_bigquery(df, project_id, dataset_id, table_id, mode=mode)
             return True
         except Exception as e:
             error_str = str(e).lower()
@@ -217,7 +222,7 @@ def process_with_incremental_save(
                     print(f"  Saving batch of {len(batch_frames)} subregions to BigQuery...")
                     # Use TRUNCATE on first save if not skipping existing (to overwrite old data)
                     save_mode = 'WRITE_TRUNCATE' if is_first_save else 'WRITE_APPEND'
-                    if save_incremental(batch_df, project_id, dataset_id, table_id, mode=save_mode):
+                    if save_incremental(batch_df, project_id, dataset_id, table_id, mode=save_mode, key_columns=["date", "region"]):
                         print(f"  ✓ Batch saved ({len(batch_df)} records)")
                         batch_frames = []  # Clear batch
                         is_first_save = False  # Subsequent saves will append
@@ -244,7 +249,7 @@ def process_with_incremental_save(
         batch_df = pd.concat(batch_frames, ignore_index=True)
         print(f"  Saving final batch of {len(batch_frames)} subregions to BigQuery...")
         save_mode = 'WRITE_TRUNCATE' if is_first_save else 'WRITE_APPEND'
-        if save_incremental(batch_df, project_id, dataset_id, table_id, mode=save_mode):
+        if save_incremental(batch_df, project_id, dataset_id, table_id, mode=save_mode, key_columns=["date", "region"]):
             print(f"  ✓ Final batch saved ({len(batch_df)} records)")
             is_first_save = False
     
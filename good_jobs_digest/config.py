@@ -48,7 +48,14 @@ class Settings:
         self.GEMINI_USAGE_PATH = (ROOT / "data" / "gemini_usage.json").resolve()
         # Batching keeps the request count (and therefore the free-tier usage) low.
         self.LLM_SCORE_WORKERS = max(1, int(os.getenv("LLM_SCORE_WORKERS", "2")))
+        # Starting jobs per scoring request. Batches are then packed by estimated prompt
+        # tokens and the size that parses reliably is learned per model, up to the max.
         self.LLM_SCORE_BATCH_SIZE = max(1, int(os.getenv("LLM_SCORE_BATCH_SIZE", "8")))
+        self.LLM_SCORE_BATCH_MAX = max(
+            self.LLM_SCORE_BATCH_SIZE, int(os.getenv("LLM_SCORE_BATCH_MAX", "20"))
+        )
+        self.LLM_BATCH_PROMPT_TOKENS = int(os.getenv("LLM_BATCH_PROMPT_TOKENS", "32000"))
+        self.LLM_BATCH_STATS_PATH = (ROOT / "data" / "llm_batch_sizes.json").resolve()
         self.LLM_DESC_TRUNCATE = int(os.getenv("LLM_DESC_TRUNCATE", "2000"))
         self.LLM_MISSION_BATCH_SIZE = max(1, int(os.getenv("LLM_MISSION_BATCH_SIZE", "20")))
         self.LLM_MISSION_WORKERS = max(1, int(os.getenv("LLM_MISSION_WORKERS", "2")))
@@ -57,6 +64,18 @@ class Settings:
         self.REGISTRY_LLM_FILTER = _env_bool("REGISTRY_LLM_FILTER", True)
         self.SCORE_MAX_PER_RUN = int(os.getenv("SCORE_MAX_PER_RUN", "0"))  # 0 = no cap
         self.SCORE_MAX_AGE_DAYS = int(os.getenv("SCORE_MAX_AGE_DAYS", "30"))  # 0 = no age filter
+        # Reuse LLM scores of identical postings (same text, profile, prompt and model).
+        self.SCORE_CACHE_ENABLED = _env_bool("SCORE_CACHE_ENABLED", True)
+        # Local pre-ranker: order unscored jobs by similarity to the profile before the LLM.
+        # PRERANK_MODEL is a sentence-transformers model (optional install) or "tfidf".
+        self.PRERANK_ENABLED = _env_bool("PRERANK_ENABLED", True)
+        self.PRERANK_MODEL = os.getenv("PRERANK_MODEL", "all-MiniLM-L6-v2")
+        # TF-IDF table fitted once over the stored job vectors so similarities (and the
+        # cutoff below) don't shift with the candidate set. Delete it to refit.
+        self.PRERANK_IDF_PATH = (ROOT / "data" / "prerank_idf.json").resolve()
+        # Jobs below this similarity are not scored; 0 = order only. Tune with
+        # tools/backtest_prerank.py (cosine scale depends on the backend).
+        self.PRERANK_MIN_SIMILARITY = float(os.getenv("PRERANK_MIN_SIMILARITY", "0"))
         # Digest cutoff; 0 = include all scored jobs. Set >0 to filter weak matches from email.
         self.MIN_COMBINED_SCORE = float(os.getenv("MIN_COMBINED_SCORE", "0"))
         # Digest floor on the LLM candidate_fit score (fit_score column); 0 = disabled.
@@ -77,6 +96,17 @@ class Settings:
         ).resolve()
         self.INGEST_DELAY_MS = int(os.getenv("INGEST_DELAY_MS", "150"))
         self.INGEST_WORKERS = max(1, int(os.getenv("INGEST_WORKERS", "10")))
+        # Curated ingest engine: asyncio (per-ATS-host budgets) or the threaded sync client.
+        self.INGEST_ASYNC = _env_bool("INGEST_ASYNC", True)
+        # Async engine: companies polled at once, and the budget for hosts without a
+        # built-in one. INGEST_HOST_BUDGETS overrides per host: "api.lever.co=2:1.5,...".
+        self.INGEST_ASYNC_COMPANIES = max(1, int(os.getenv("INGEST_ASYNC_COMPANIES", "40")))
+        self.INGEST_HOST_CONCURRENCY = max(1, int(os.getenv("INGEST_HOST_CONCURRENCY", "4")))
+        self.INGEST_HOST_RPS = float(os.getenv("INGEST_HOST_RPS", "5"))
+        self.INGEST_HOST_BUDGETS = os.getenv("INGEST_HOST_BUDGETS", "")
+        # Conditional GETs on board list endpoints; unchanged boards skip normalize/persist.
+        self.LIST_CACHE_ENABLED = _env_bool("LIST_CACHE_ENABLED", True)
+        self.LIST_CACHE_PATH = (ROOT / os.getenv("LIST_CACHE_PATH", "data/list_validators.json")).resolve()
         # Poll 1/N of curated employers per ingest (stalest first). 1 = poll all every run.
         self.CURATED_POLL_ROTATION_DIVISOR = max(
             1, int(os.getenv("CURATED_POLL_ROTATION_DIVISOR", "1"))
@@ -145,6 +175,9 @@ class Settings:
         self.JOB_BOARDS_ENABLED = _env_bool("JOB_BOARDS_ENABLED", True)
         self.BOARD_INGEST_DELAY_MS = int(os.getenv("BOARD_INGEST_DELAY_MS", "2000"))
         self.BOARD_DETAIL_DELAY_MS = int(os.getenv("BOARD_DETAIL_DELAY_MS", "1500"))
+        # Boards fetched at once (distinct hosts; per-host delays still apply). The pause
+        # between boards only applies when BOARD_FETCH_WORKERS=1.
+        self.BOARD_FETCH_WORKERS = max(1, int(os.getenv("BOARD_FETCH_WORKERS", "4")))
         self.BOARD_PAUSE_BETWEEN_MS = int(os.getenv("BOARD_PAUSE_BETWEEN_MS", "3000"))
         self.WEBSHARE_PROXIES_PATH = (
             ROOT / os.getenv("WEBSHARE_PROXIES_PATH", "config/webshare_proxies.txt")
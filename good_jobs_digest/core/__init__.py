@@ -1,10 +1,11 @@
 """Shared models and persistence helpers."""
 
 from core.models import CompanyRow, effective_poll_enabled
-from core.persist import persist_normalized_job
+from core.persist import persist_normalized_job, persist_normalized_jobs
 
 __all__ = [
     "CompanyRow",
     "effective_poll_enabled",
     "persist_normalized_job",
+    "persist_normalized_jobs",
 ]
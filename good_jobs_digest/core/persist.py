@@ -7,7 +7,7 @@ from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Any
 
 from normalize.dedup import canonical_key, merge_duplicate
-from rank.prefilter import evaluate_title
+from rank.prefilter import title_gate
 from storage.repository import JobRepository, content_hash
 
 if TYPE_CHECKING:
@@ -17,6 +17,46 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+def _apply_duplicate(norm: dict[str, Any], existing: dict[str, Any]) -> None:
+    """Point ``norm`` at the winning posting when it duplicates ``existing``."""
+    merged = merge_duplicate(existing, norm)
+    norm.update(
+        {
+            "source": merged["source"],
+            "ats_type": merged["ats_type"],
+            "ats_slug": merged["ats_slug"],
+            "source_job_id": merged["source_job_id"],
+            "url": merged["url"],
+            "title": merged["title"],
+            "company_name": merged["company_name"],
+            "location_text": merged.get("location_text"),
+            "description_text": merged.get("description_text") or norm["description_text"],
+        }
+    )
+
+
+def _upsert_fields(norm: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "company_name": norm["company_name"],
+        "mission_category": norm.get("mission_category"),
+        "ats_type": norm["ats_type"],
+        "ats_slug": norm["ats_slug"],
+        "source": norm["source"],
+        "source_job_id": norm["source_job_id"],
+        "title": norm["title"],
+        "url": norm["url"],
+        "location_text": norm.get("location_text"),
+        "is_remote": bool(norm.get("is_remote")),
+        "salary_text": norm.get("salary_text"),
+        "description_text": norm["description_text"],
+        "chash": content_hash(norm["description_text"]),
+        "posted_at": norm.get("posted_at_hint"),
+        "canonical_job_id": norm.get("canonical_job_id"),
+        "registry_ats_type": norm.get("registry_ats_type"),
+        "registry_ats_slug": norm.get("registry_ats_slug"),
+    }
+
+
 def persist_normalized_job(
     repo: JobRepository,
     settings: Settings,
@@ -26,64 +66,61 @@ def persist_normalized_job(
     ingested_at: str | None = None,
 ) -> int:
     """Upsert job, apply title prefilter, queue BQ batch merge. Returns sqlite job id."""
-    norm = dict(norm)
-    norm["canonical_job_id"] = canonical_key(norm)
-
-    existing_dup = repo.find_by_canonical_id(norm["canonical_job_id"])
-    if existing_dup is not None:
-        merged = merge_duplicate(dict(existing_dup), norm)
-        norm.update(
-            {
-                "source": merged["source"],
-                "ats_type": merged["ats_type"],
-                "ats_slug": merged["ats_slug"],
-                "source_job_id": merged["source_job_id"],
-                "url": merged["url"],
-                "title": merged["title"],
-                "company_name": merged["company_name"],
-                "location_text": merged.get("location_text"),
-                "description_text": merged.get("description_text") or norm["description_text"],
-            }
-        )
-
-    chash = content_hash(norm["description_text"])
-    jid, _changed = repo.upsert_job(
-        company_name=norm["company_name"],
-        mission_category=norm.get("mission_category"),
-        ats_type=norm["ats_type"],
-        ats_slug=norm["ats_slug"],
-        source=norm["source"],
-        source_job_id=norm["source_job_id"],
-        title=norm["title"],
-        url=norm["url"],
-        location_text=norm.get("location_text"),
-        is_remote=bool(norm.get("is_remote")),
-        salary_text=norm.get("salary_text"),
-        description_text=norm["description_text"],
-        chash=chash,
-        posted_at=norm.get("posted_at_hint"),
-        canonical_job_id=norm.get("canonical_job_id"),
-        registry_ats_type=norm.get("registry_ats_type"),
-        registry_ats_slug=norm.get("registry_ats_slug"),
-    )
-    verdict = evaluate_title(
-        norm["title"],
-        include_keywords=settings.TARGET_ROLE_KEYWORDS,
-        exclude_keywords=settings.EXCLUDE_TITLE_KEYWORDS,
-        seniority_exclude_keywords=getattr(settings, "SENIORITY_EXCLUDE_KEYWORDS", ()),
-    )
-    passes = verdict.passed
-    repo.set_prefilter(jid, passes, reason=verdict.reason)
-    if bq and passes and getattr(settings, "BQ_WRITE_JOBS", True):
+    return persist_normalized_jobs(repo, settings, [norm], bq=bq, ingested_at=ingested_at)[0]
+
+
+def persist_normalized_jobs(
+    repo: JobRepository,
+    settings: Settings,
+    norms: list[dict[str, Any]],
+    *,
+    bq: JobBigQuery | None = None,
+    ingested_at: str | None = None,
+) -> list[int]:
+    """persist_normalized_job for a whole board: one write session, bulk upsert + prefilter.
+
+    A posting whose canonical id matches an earlier one in the same batch merges into
+    it, as it would have when persisted one at a time. Returns sqlite job ids in order.
+    """
+    if not norms:
+        return []
+    prepared: list[dict[str, Any]] = []
+    batch_by_canonical: dict[str, dict[str, Any]] = {}
+    with repo.write_session():
+        for raw in norms:
+            norm = dict(raw)
+            norm["canonical_job_id"] = canonical_key(norm)
+            existing_dup = batch_by_canonical.get(norm["canonical_job_id"])
+            if existing_dup is None:
+                row = repo.find_by_canonical_id(norm["canonical_job_id"])
+                existing_dup = dict(row) if row is not None else None
+            if existing_dup is not None:
+                _apply_duplicate(norm, existing_dup)
+            batch_by_canonical[norm["canonical_job_id"]] = norm
+            prepared.append(norm)
+
+        results = repo.upsert_jobs([_upsert_fields(norm) for norm in prepared])
+        job_ids = [jid for jid, _changed in results]
+        passing: list[int] = []
+        verdicts: list[tuple[int, bool, str | None]] = []
+        gate_verdicts = title_gate(settings).evaluate_titles(norm["title"] for norm in prepared)
+        for jid, verdict in zip(job_ids, gate_verdicts):
+            verdicts.append((jid, verdict.passed, verdict.reason))
+            if verdict.passed:
+                passing.append(jid)
+        repo.set_prefilters(verdicts)
         use_batch = getattr(settings, "BQ_BATCH_NORMALIZED", True)
         merge_on_ingest = getattr(settings, "BQ_MERGE_ON_INGEST", False)
-        if use_batch or merge_on_ingest:
-            saved = repo.get_job(jid)
-            if saved is not None:
-                ts = ingested_at or datetime.now(timezone.utc).replace(microsecond=0).isoformat()
-                job_dict = dict(saved)
-                if use_batch:
-                    bq.queue_normalized_job(job_dict, ingested_at=ts)
-                elif merge_on_ingest:
-                    bq.merge_normalized_job(job_dict, ingested_at=ts)
-    return jid
+        to_bq = []
+        if bq and getattr(settings, "BQ_WRITE_JOBS", True) and (use_batch or merge_on_ingest):
+            to_bq = [saved for saved in map(repo.get_job, passing) if saved is not None]
+
+    if to_bq:
+        ts = ingested_at or datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+        for saved in to_bq:
+            job_dict = dict(saved)
+            if use_batch:
+                bq.queue_normalized_job(job_dict, ingested_at=ts)
+            elif merge_on_ingest:
+                bq.merge_normalized_job(job_dict, ingested_at=ts)
+    return job_ids
@@ -76,9 +76,14 @@ def _health_footer(
             lines.append("")
     if llm_usage:
         used = llm_usage.get("used")
-        budget = llm_usage.get("budget")
-        cap = f"{used}/{budget}" if budget else str(used)
-        lines += [f"Gemini requests today: **{cap}**.", ""]
+        if used is not None:
+            budget = llm_usage.get("budget")
+            cap = f"{used}/{budget}" if budget else str(used)
+            lines += [f"Gemini requests today: **{cap}**.", ""]
+        hits = llm_usage.get("cache_hits")
+        if hits is not None:
+            misses = int(llm_usage.get("cache_misses") or 0)
+            lines += [f"Score cache today: **{hits}** reused, {misses} scored fresh.", ""]
     return lines
 
 
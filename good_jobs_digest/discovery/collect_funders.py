@@ -36,7 +36,7 @@ def main() -> int:
         "--pool-path",
         type=Path,
         default=DEFAULT_POOL_PATH,
-        help="employer_candidates.jsonl path",
+        help="employer candidate pool (SQLite; a .jsonl path opens its .db sibling)",
     )
     parser.add_argument(
         "--summary-path",
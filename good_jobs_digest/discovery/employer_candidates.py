@@ -1,19 +1,59 @@
-"""Shared employer candidate pool mined from aggregators and discovery runs."""
+"""Shared employer candidate pool mined from aggregators and discovery runs.
+
+The pool lives in its own SQLite file (kept apart from jobs.db so ``reset-db``
+does not drop it), keyed by the normalized company name: appends are
+``INSERT OR IGNORE`` against that key and probed flags are updated in place.
+An older ``employer_candidates.jsonl`` next to the database is imported the
+first time the pool is opened; ``import`` / ``export`` convert explicitly.
+
+Usage: python -m discovery.employer_candidates {import,export} FILE [--pool-path PATH]
+"""
 
 from __future__ import annotations
 
+import argparse
 import json
 import logging
+import sqlite3
+import threading
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 from discovery.resolve import EmployerCandidate, parse_ats_from_text
 
 logger = logging.getLogger(__name__)
 
 ROOT = Path(__file__).resolve().parents[1]
-DEFAULT_POOL_PATH = ROOT / "data" / "employer_candidates.jsonl"
+DEFAULT_POOL_PATH = ROOT / "data" / "employer_candidates.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS employer_candidates (
+  name_key TEXT PRIMARY KEY,
+  company_name TEXT NOT NULL,
+  discovery_source TEXT NOT NULL,
+  mission_category TEXT,
+  website TEXT,
+  ats_hint_type TEXT,
+  ats_hint_slug TEXT,
+  seen_at TEXT NOT NULL,
+  probed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_employer_candidates_probed ON employer_candidates (probed);
+"""
+
+_COLUMNS = (
+    "name_key",
+    "company_name",
+    "discovery_source",
+    "mission_category",
+    "website",
+    "ats_hint_type",
+    "ats_hint_slug",
+    "seen_at",
+    "probed",
+)
 
 
 def _utc_now_iso() -> str:
@@ -24,6 +64,130 @@ def _norm_name(name: str) -> str:
     return name.strip().lower()
 
 
+def _record_row(record: dict[str, Any]) -> tuple[Any, ...] | None:
+    name = str(record.get("company_name") or "").strip()
+    if not name:
+        return None
+    hint = record.get("ats_hint")
+    hint_type = hint_slug = None
+    if isinstance(hint, (list, tuple)) and len(hint) == 2:
+        hint_type, hint_slug = str(hint[0]), str(hint[1])
+    return (
+        _norm_name(name),
+        name,
+        str(record.get("discovery_source") or "mining"),
+        str(record.get("mission_category") or "mission").strip(),
+        str(record.get("website") or "").strip(),
+        hint_type,
+        hint_slug,
+        str(record.get("seen_at") or _utc_now_iso()),
+        1 if record.get("probed") else 0,
+    )
+
+
+class EmployerCandidatePool:
+    """SQLite-backed pool; one connection per process and path (see ``_pool``)."""
+
+    def __init__(self, db_path: Path):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        # The pool is rebuilt from discovery anyway; skip the fsync per commit.
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM employer_candidates").fetchone()[0])
+
+    def add(self, records: Iterable[dict[str, Any]]) -> int:
+        """Insert records whose company is not in the pool yet; return how many were new."""
+        rows = [row for row in map(_record_row, records) if row is not None]
+        if not rows:
+            return 0
+        qmarks = ",".join("?" * len(_COLUMNS))
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                f"INSERT OR IGNORE INTO employer_candidates ({', '.join(_COLUMNS)}) VALUES ({qmarks})",
+                rows,
+            )
+            return self._conn.total_changes - before
+
+    def unprobed(self, limit: int | None = None) -> list[EmployerCandidate]:
+        sql = "SELECT * FROM employer_candidates WHERE probed = 0 ORDER BY rowid"
+        if limit is not None:
+            sql += f" LIMIT {max(0, int(limit))}"
+        with self._lock:
+            rows = self._conn.execute(sql).fetchall()
+        return [
+            EmployerCandidate(
+                company_name=r["company_name"],
+                mission_category=r["mission_category"] or "mission",
+                website=r["website"] or "",
+                discovery_source=r["discovery_source"] or "mining",
+                ats_hint=(r["ats_hint_type"], r["ats_hint_slug"]) if r["ats_hint_type"] else None,
+            )
+            for r in rows
+        ]
+
+    def mark_probed(self, company_names: Iterable[str]) -> None:
+        keys = [(_norm_name(n),) for n in company_names]
+        with self._lock, self._conn:
+            self._conn.executemany("UPDATE employer_candidates SET probed = 1 WHERE name_key = ?", keys)
+
+    def import_jsonl(self, path: Path) -> int:
+        records: list[dict[str, Any]] = []
+        for line in path.read_text(encoding="utf-8").splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        return self.add(records)
+
+    def export_jsonl(self, path: Path) -> int:
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM employer_candidates ORDER BY rowid").fetchall()
+        lines = [
+            json.dumps(
+                {
+                    "company_name": r["company_name"],
+                    "discovery_source": r["discovery_source"],
+                    "mission_category": r["mission_category"],
+                    "website": r["website"],
+                    "ats_hint": [r["ats_hint_type"], r["ats_hint_slug"]] if r["ats_hint_type"] else None,
+                    "seen_at": r["seen_at"],
+                    "probed": bool(r["probed"]),
+                },
+                ensure_ascii=True,
+            )
+            for r in rows
+        ]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+        return len(lines)
+
+
+@lru_cache(maxsize=None)
+def _pool(db_path: Path) -> EmployerCandidatePool:
+    legacy = db_path.with_suffix(".jsonl")
+    fresh = not db_path.exists()
+    pool = EmployerCandidatePool(db_path)
+    if fresh and legacy.is_file():
+        added = pool.import_jsonl(legacy)
+        logger.info("Imported %s employer candidate(s) from %s", added, legacy.name)
+    return pool
+
+
+def open_pool(pool_path: Path = DEFAULT_POOL_PATH) -> EmployerCandidatePool:
+    """The pool at ``pool_path``; a ``.jsonl`` path (old CLI flags) opens its ``.db`` sibling."""
+    return _pool(pool_path.with_suffix(".db").resolve())
+
+
 def mine_employer_candidate(
     norm: dict[str, Any],
     *,
@@ -49,17 +213,7 @@ def mine_employer_candidate(
         "seen_at": _utc_now_iso(),
         "probed": False,
     }
-    _append_unique(record, pool_path)
-
-
-def _append_unique(record: dict[str, Any], pool_path: Path) -> None:
-    pool_path.parent.mkdir(parents=True, exist_ok=True)
-    key = _norm_name(record["company_name"])
-    existing_keys = _load_keys(pool_path)
-    if key in existing_keys:
-        return
-    with pool_path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(record, ensure_ascii=True) + "\n")
+    open_pool(pool_path).add([record])
 
 
 def append_employer_candidates(
@@ -68,102 +222,52 @@ def append_employer_candidates(
     pool_path: Path = DEFAULT_POOL_PATH,
 ) -> int:
     """Append discovery candidates to the pool; return count of new rows."""
-    existing_keys = _load_keys(pool_path)
-    added = 0
-    for cand in candidates:
-        name = cand.company_name.strip()
-        if not name:
-            continue
-        key = _norm_name(name)
-        if key in existing_keys:
-            continue
-        record = {
-            "company_name": name,
+    now = _utc_now_iso()
+    added = open_pool(pool_path).add(
+        {
+            "company_name": cand.company_name,
             "discovery_source": cand.discovery_source or "discovery",
-            "mission_category": (cand.mission_category or "mission").strip(),
-            "website": (cand.website or "").strip(),
+            "mission_category": cand.mission_category,
+            "website": cand.website,
             "ats_hint": list(cand.ats_hint) if cand.ats_hint else None,
-            "seen_at": _utc_now_iso(),
+            "seen_at": now,
             "probed": False,
         }
-        _append_unique(record, pool_path)
-        existing_keys.add(key)
-        added += 1
+        for cand in candidates
+    )
     if added:
         logger.info("Appended %s new employer candidate(s) to %s", added, pool_path.name)
     return added
 
 
-def _load_keys(pool_path: Path) -> set[str]:
-    if not pool_path.is_file():
-        return set()
-    keys: set[str] = set()
-    for line in pool_path.read_text(encoding="utf-8").splitlines():
-        if not line.strip():
-            continue
-        try:
-            obj = json.loads(line)
-            name = _norm_name(str(obj.get("company_name") or ""))
-            if name:
-                keys.add(name)
-        except json.JSONDecodeError:
-            continue
-    return keys
-
-
 def load_unprobed_candidates(
     pool_path: Path = DEFAULT_POOL_PATH,
     *,
     limit: int | None = None,
 ) -> list[EmployerCandidate]:
-    if not pool_path.is_file():
-        return []
-    out: list[EmployerCandidate] = []
-    for line in pool_path.read_text(encoding="utf-8").splitlines():
-        if not line.strip():
-            continue
-        try:
-            raw = json.loads(line)
-        except json.JSONDecodeError:
-            continue
-        if raw.get("probed"):
-            continue
-        name = (raw.get("company_name") or "").strip()
-        if not name:
-            continue
-        hint_raw = raw.get("ats_hint")
-        hint: tuple[str, str] | None = None
-        if isinstance(hint_raw, list) and len(hint_raw) == 2:
-            hint = (str(hint_raw[0]), str(hint_raw[1]))
-        out.append(
-            EmployerCandidate(
-                company_name=name,
-                mission_category=str(raw.get("mission_category") or "mission"),
-                website=str(raw.get("website") or ""),
-                discovery_source=str(raw.get("discovery_source") or "mining"),
-                ats_hint=hint,
-            )
-        )
-        if limit is not None and len(out) >= limit:
-            break
-    return out
+    return open_pool(pool_path).unprobed(limit)
 
 
 def mark_probed(company_names: list[str], pool_path: Path = DEFAULT_POOL_PATH) -> None:
-    """Rewrite pool file marking given companies as probed."""
-    if not pool_path.is_file():
-        return
-    wanted = {_norm_name(n) for n in company_names}
-    lines_out: list[str] = []
-    for line in pool_path.read_text(encoding="utf-8").splitlines():
-        if not line.strip():
-            continue
-        try:
-            obj = json.loads(line)
-        except json.JSONDecodeError:
-            lines_out.append(line)
-            continue
-        if _norm_name(str(obj.get("company_name") or "")) in wanted:
-            obj["probed"] = True
-        lines_out.append(json.dumps(obj, ensure_ascii=True))
-    pool_path.write_text("\n".join(lines_out) + "\n", encoding="utf-8")
+    """Mark the given companies as probed."""
+    open_pool(pool_path).mark_probed(company_names)
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s", datefmt="%H:%M:%S")
+    parser = argparse.ArgumentParser(description="Import or export the employer candidate pool as JSONL.")
+    parser.add_argument("action", choices=("import", "export"))
+    parser.add_argument("file", type=Path, help="JSONL file to read (import) or write (export)")
+    parser.add_argument("--pool-path", type=Path, default=DEFAULT_POOL_PATH)
+    args = parser.parse_args()
+
+    pool = open_pool(args.pool_path)
+    if args.action == "import":
+        logger.info("Imported %s new candidate(s) from %s", pool.import_jsonl(args.file), args.file)
+    else:
+        logger.info("Exported %s candidate(s) to %s", pool.export_jsonl(args.file), args.file)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -13,7 +13,12 @@ from pathlib import Path
 from uuid import uuid4
 
 from config import settings
-from profile.preferences import build_scoring_input, digest_remote_only, load_preferences
+from profile.preferences import (
+    build_scoring_input,
+    digest_remote_only,
+    load_preferences,
+    render_scoring_context,
+)
 from digest.builder import build_markdown_digest
 from mail.mailer import JobDigestMailer
 from core.curated import CURATED_ATS_TYPES, load_curated_board_keys
@@ -21,6 +26,9 @@ from digest.formatting import dedupe_by_company_title
 from digest.selection import exclude_already_sent
 from pipelines.curated_ats.ingest import ingest_curated_ats
 from pipelines.job_boards import ingest_job_boards
+from rank.batch_packing import BatchSizeLearner
+from rank.preranker import PreRanker, load_backend
+from rank.score_cache import ScoreCache
 from rank.scorer import JobScorer
 from rank.employer_mission_gate import filter_jobs_by_employer_mission
 from storage.bq_repository import JobBigQuery
@@ -136,13 +144,37 @@ def cmd_score(args: argparse.Namespace) -> None:
         preferences_path=settings.PREFERENCES_PATH,
         profile_path=settings.PROFILE_PATH,
     )
-    scorer = JobScorer(settings)
+    cache = (
+        ScoreCache(repo)
+        if settings.SCORE_CACHE_ENABLED
+        else None
+    )
+    batch_sizes = BatchSizeLearner(
+        settings.LLM_BATCH_STATS_PATH,
+        initial=settings.LLM_SCORE_BATCH_SIZE,
+        ceiling=settings.LLM_SCORE_BATCH_MAX,
+    )
+    scorer = JobScorer(settings, cache=cache, batch_sizes=batch_sizes)
     bq = _connect_bq()
     score_limit = getattr(args, "max", None)
     if score_limit is None and settings.SCORE_MAX_PER_RUN > 0:
         score_limit = settings.SCORE_MAX_PER_RUN
     max_age = settings.SCORE_MAX_AGE_DAYS if settings.SCORE_MAX_AGE_DAYS > 0 else None
-    rows = repo.jobs_needing_score(limit=score_limit, max_age_days=max_age)
+    prefs = load_preferences(settings.PREFERENCES_PATH)
+    preranker = (
+        PreRanker(repo, load_backend(settings), render_scoring_context(prefs))
+        if settings.PRERANK_ENABLED and prefs
+        else None
+    )
+    if preranker is None:
+        rows = repo.jobs_needing_score(limit=score_limit, max_age_days=max_age)
+    else:
+        # The cap applies after ranking, so a capped run scores the best matches first.
+        rows = preranker.rank(
+            repo.jobs_needing_score(max_age_days=max_age),
+            min_similarity=settings.PRERANK_MIN_SIMILARITY,
+            limit=score_limit,
+        )
     cap_note = score_limit if score_limit else "none"
     age_note = max_age if max_age else "none"
     logger.info(
@@ -214,6 +246,8 @@ def cmd_score(args: argparse.Namespace) -> None:
             )
     if bq and settings.BQ_WRITE_LLM_SCORES:
         bq.flush_llm_scores()
+    if cache is not None:
+        cache.record_run()
     logger.info("Score finished (%s ok, %s skipped)", ok, skipped)
 
 
@@ -289,6 +323,9 @@ def cmd_digest(args: argparse.Namespace) -> None:
                 }
         except (OSError, json.JSONDecodeError):
             llm_usage = None
+    cache_counts = repo.score_cache_counts(date.today().isoformat())
+    if cache_counts:
+        llm_usage = {**(llm_usage or {}), "cache_hits": cache_counts[0], "cache_misses": cache_counts[1]}
 
     text = build_markdown_digest(
         curated_rows,
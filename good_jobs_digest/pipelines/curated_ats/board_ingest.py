@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any, Callable
 
 from core.models import CompanyRow
-from core.persist import persist_normalized_job
+from core.persist import persist_normalized_jobs
 from normalize.handlers import (
     normalize_ashby,
     normalize_bamboohr,
@@ -35,8 +36,10 @@ from pipelines.curated_ats.clients import (
     workable,
     workday,
 )
+from pipelines.curated_ats.clients.async_host_pool import AsyncHostPool
 from pipelines.curated_ats.clients.host_pool import HostRateLimitedHttp
-from rank.prefilter import prefilter_title
+from pipelines.curated_ats.clients.list_cache import mark_board_incomplete, unchanged_since
+from rank.prefilter import title_gate
 from storage.poll_overrides import set_poll_disabled
 
 if False:  # TYPE_CHECKING
@@ -48,12 +51,67 @@ logger = logging.getLogger(__name__)
 
 
 def _title_passes(settings, title: str) -> bool:
-    return prefilter_title(
-        title,
-        include_keywords=settings.TARGET_ROLE_KEYWORDS,
-        exclude_keywords=settings.EXCLUDE_TITLE_KEYWORDS,
-        seniority_exclude_keywords=getattr(settings, "SENIORITY_EXCLUDE_KEYWORDS", ()),
-    )
+    return title_gate(settings).evaluate(title).passed
+
+
+class _BoardDiff:
+    """One board's listing IDs diffed in memory against its stored jobs.
+
+    Known IDs are loaded in one query; IDs already stored are only touched
+    (``last_seen_at``), and only new ones get a detail fetch and a normalized row.
+    ``write`` stores the results in one transaction, after the board's fetches (also
+    when one of them raised, so postings fetched before the failure are not lost).
+    """
+
+    def __init__(self, repo, ats_type: str, ats_slug: str):
+        self.ats_type = ats_type
+        self.ats_slug = ats_slug
+        self._known = repo.known_job_ids(ats_type, ats_slug)
+        self.seen_ids: list[str] = []
+        self.norms: list[dict[str, Any]] = []
+
+    def is_new(self, sid: str) -> bool:
+        if sid in self._known:
+            self.seen_ids.append(sid)
+            return False
+        self._known.add(sid)  # a listing repeated in the same feed is fetched once
+        return True
+
+    def detail_failed(self, sid: str, reason: object) -> None:
+        """A new posting's detail request failed; it is skipped and stays unknown.
+
+        The board's list validators are dropped too, so the next poll fetches it again
+        even if the list itself has not changed.
+        """
+        logger.warning("%s:%s detail %s failed: %s", self.ats_type, self.ats_slug, sid, reason)
+        mark_board_incomplete()
+
+    def retry_later(self, sid: str, status: int) -> bool:
+        """True (and ``detail_failed``) for a detail status worth retrying: not 200, not 404.
+
+        A 404 means the posting is gone; fetching it again would not help.
+        """
+        if status in (200, 404):
+            return False
+        self.detail_failed(sid, f"HTTP {status}")
+        return True
+
+    def write(self, repo, settings, *, bq, fetched_at: str) -> None:
+        with repo.write_session():
+            repo.touch_board_jobs(self.ats_type, self.ats_slug, self.seen_ids, fetched_at)
+            persist_normalized_jobs(repo, settings, self.norms, bq=bq, ingested_at=fetched_at)
+
+
+def _board_unchanged(repo, ats_type: str, ats_slug: str, status: int, fetched_at: str) -> bool:
+    """On a 304 list, re-mark the postings of the last full poll as seen; nothing else to do."""
+    if status != 304:
+        return False
+    since = unchanged_since()
+    if since:
+        with repo.write_session():
+            repo.touch_unchanged_board(ats_type, ats_slug, since, fetched_at)
+    logger.debug("%s:%s list unchanged since %s", ats_type, ats_slug, since)
+    return True
 
 
 def _ingest_listings(
@@ -64,7 +122,7 @@ def _ingest_listings(
     bq,
     ingest_batch_id: str,
     fetched_at: str,
-    http: HostRateLimitedHttp,
+    http: HostRateLimitedHttp | AsyncHostPool,
     listings: list[dict[str, Any]],
     normalizer: Callable[..., dict[str, Any]],
     ats_type: str,
@@ -77,17 +135,18 @@ def _ingest_listings(
         logger.warning("Disabling poll: %s:%s (404)", ats_type, row.ats_slug)
         set_poll_disabled(settings.POLL_OVERRIDES_PATH, ats_type, row.ats_slug)
         return
+    if _board_unchanged(repo, ats_type, row.ats_slug, status, fetched_at):
+        return
     if status != 200 and not listings:
         logger.warning("%s:%s status %s", ats_type, row.ats_slug, status)
         return
+    diff = _BoardDiff(repo, ats_type, row.ats_slug)
     for listing in listings:
         title = str(listing.get(title_key) or listing.get("text") or listing.get("name") or "")
         if not _title_passes(settings, title):
             continue
         sid = str(listing.get(id_key) or listing.get("shortcode") or listing.get("slug") or title)
-        existing = repo.get_job_by_key(ats_type, row.ats_slug, sid)
-        if existing is not None:
-            repo.touch_job(ats_type, row.ats_slug, sid, fetched_at)
+        if not diff.is_new(sid):
             continue
         if bq:
             bq.insert_raw_payload(
@@ -102,13 +161,108 @@ def _ingest_listings(
                 payload_kind="listing_item",
                 payload=listing,
             )
-        norm = normalizer(
-            listing,
+        diff.norms.append(
+            normalizer(
+                listing,
+                company_name=row.company_name,
+                mission_category=row.mission_category,
+                ats_slug=row.ats_slug,
+            )
+        )
+    diff.write(repo, settings, bq=bq, fetched_at=fetched_at)
+
+
+# ats_type -> (sync list fetcher, async list fetcher, normalizer) for single-request boards.
+_SIMPLE_ATS: dict[str, tuple[Callable[..., Any], Callable[..., Any], Callable[..., dict[str, Any]]]] = {
+    "ashby": (ashby.fetch_ashby_jobs, ashby.fetch_ashby_jobs_async, normalize_ashby),
+    "workable": (workable.fetch_workable_jobs, workable.fetch_workable_jobs_async, normalize_workable),
+    "recruitee": (recruitee.fetch_recruitee_offers, recruitee.fetch_recruitee_offers_async, normalize_recruitee),
+    "personio": (personio.fetch_personio_jobs, personio.fetch_personio_jobs_async, normalize_personio),
+    "bamboohr": (bamboohr.fetch_bamboohr_jobs, bamboohr.fetch_bamboohr_jobs_async, normalize_bamboohr),
+    "breezy": (breezy.fetch_breezy_jobs, breezy.fetch_breezy_jobs_async, normalize_breezy),
+    "jazzhr": (jazzhr.fetch_jazzhr_jobs, jazzhr.fetch_jazzhr_jobs_async, normalize_jazzhr),
+    "teamtailor": (teamtailor.fetch_teamtailor_jobs, teamtailor.fetch_teamtailor_jobs_async, normalize_teamtailor),
+}
+
+
+def _greenhouse_new_ids(settings, listings: list[dict[str, Any]], diff: _BoardDiff) -> list[str]:
+    """Listing IDs that pass the title gate and are not stored yet (need a detail fetch)."""
+    ids: list[str] = []
+    for listing in listings:
+        title = str(listing.get("title") or "")
+        if not _title_passes(settings, title):
+            continue
+        jid = str(listing.get("id") or "")
+        if not jid:
+            continue
+        if diff.is_new(jid):
+            ids.append(jid)
+    return ids
+
+
+def _add_greenhouse_job(
+    diff: _BoardDiff,
+    row: CompanyRow,
+    *,
+    bq,
+    ingest_batch_id: str,
+    fetched_at: str,
+    jid: str,
+    job: dict[str, Any] | None,
+    jstatus: int,
+) -> None:
+    if diff.retry_later(jid, jstatus) or jstatus != 200 or not job:
+        return
+    if bq:
+        bq.insert_raw_payload(
+            fetched_at=fetched_at,
+            ingest_batch_id=ingest_batch_id,
+            ats_type="greenhouse",
+            ats_slug=row.ats_slug,
+            company_name=row.company_name,
+            source_job_id=jid,
+            request_url=f"{greenhouse.GREENHOUSE_BASE}/{row.ats_slug}/jobs/{jid}",
+            http_status=jstatus,
+            payload_kind="detail_item",
+            payload=job,
+        )
+    diff.norms.append(
+        normalize_greenhouse(
+            job, company_name=row.company_name, mission_category=row.mission_category, ats_slug=row.ats_slug
+        )
+    )
+
+
+def _smartrecruiters_new_items(settings, items: list[dict[str, Any]], diff: _BoardDiff) -> list[dict[str, Any]]:
+    new_items: list[dict[str, Any]] = []
+    for item in items:
+        title = str(item.get("name") or "")
+        if not _title_passes(settings, title):
+            continue
+        sid = str(item.get("id") or "")
+        if not sid:
+            continue
+        if diff.is_new(sid):
+            new_items.append(item)
+    return new_items
+
+
+def _smartrecruiters_detail_ref(item: dict[str, Any]) -> str | None:
+    ref = item.get("ref")
+    return ref if isinstance(ref, str) and ref.startswith("http") else None
+
+
+def _add_smartrecruiters_item(
+    diff: _BoardDiff, row: CompanyRow, item: dict[str, Any], detail: dict[str, Any] | None
+) -> None:
+    diff.norms.append(
+        normalize_smartrecruiters(
+            {"list": item, "detail": detail},
             company_name=row.company_name,
             mission_category=row.mission_category,
             ats_slug=row.ats_slug,
         )
-        persist_normalized_job(repo, settings, norm, bq=bq, ingested_at=fetched_at)
+    )
 
 
 def ingest_company_board(
@@ -123,51 +277,28 @@ def ingest_company_board(
     smartrecruiters_api_key: str = "",
 ) -> None:
     ats = row.ats_type
+    common = dict(repo=repo, settings=settings, row=row, bq=bq, ingest_batch_id=ingest_batch_id, fetched_at=fetched_at)
     if ats == "greenhouse":
         listings, status = greenhouse.fetch_greenhouse_job_list(http, row.ats_slug)
-        url = f"https://boards-api.greenhouse.io/v1/boards/{row.ats_slug}/jobs"
-        for listing in listings:
-            title = str(listing.get("title") or "")
-            if not _title_passes(settings, title):
-                continue
-            jid = str(listing.get("id") or "")
-            if not jid:
-                continue
-            existing = repo.get_job_by_key("greenhouse", row.ats_slug, jid)
-            if existing is not None:
-                repo.touch_job("greenhouse", row.ats_slug, jid, fetched_at)
-                continue
-            job, jstatus = greenhouse.fetch_greenhouse_job(http, row.ats_slug, jid)
-            if jstatus != 200 or not job:
-                continue
-            if bq:
-                bq.insert_raw_payload(
-                    fetched_at=fetched_at,
-                    ingest_batch_id=ingest_batch_id,
-                    ats_type="greenhouse",
-                    ats_slug=row.ats_slug,
-                    company_name=row.company_name,
-                    source_job_id=jid,
-                    request_url=f"{url}/{jid}",
-                    http_status=jstatus,
-                    payload_kind="detail_item",
-                    payload=job,
+        if _board_unchanged(repo, "greenhouse", row.ats_slug, status, fetched_at):
+            return
+        diff = _BoardDiff(repo, "greenhouse", row.ats_slug)
+        try:
+            for jid in _greenhouse_new_ids(settings, listings, diff):
+                job, jstatus = greenhouse.fetch_greenhouse_job(http, row.ats_slug, jid)
+                _add_greenhouse_job(
+                    diff, row, bq=bq, ingest_batch_id=ingest_batch_id, fetched_at=fetched_at,
+                    jid=jid, job=job, jstatus=jstatus,
                 )
-            norm = normalize_greenhouse(
-                job, company_name=row.company_name, mission_category=row.mission_category, ats_slug=row.ats_slug
-            )
-            persist_normalized_job(repo, settings, norm, bq=bq, ingested_at=fetched_at)
+        finally:
+            # A failing detail fetch still ends the board, but what it fetched before is kept.
+            diff.write(repo, settings, bq=bq, fetched_at=fetched_at)
         return
 
     if ats == "lever":
         jobs, status = lever.fetch_lever_postings(http, row.ats_slug, row.ats_region)
         _ingest_listings(
-            repo=repo,
-            settings=settings,
-            row=row,
-            bq=bq,
-            ingest_batch_id=ingest_batch_id,
-            fetched_at=fetched_at,
+            **common,
             http=http,
             listings=jobs,
             normalizer=normalize_lever,
@@ -186,55 +317,31 @@ def ingest_company_board(
         if status == 404:
             set_poll_disabled(settings.POLL_OVERRIDES_PATH, "smartrecruiters", row.ats_slug)
             return
-        for item in items:
-            title = str(item.get("name") or "")
-            if not _title_passes(settings, title):
-                continue
-            sid = str(item.get("id") or "")
-            if not sid:
-                continue
-            existing = repo.get_job_by_key("smartrecruiters", row.ats_slug, sid)
-            if existing is not None:
-                repo.touch_job("smartrecruiters", row.ats_slug, sid, fetched_at)
-                continue
-            detail = None
-            ref = item.get("ref")
-            if isinstance(ref, str) and ref.startswith("http"):
-                detail = smartrecruiters.fetch_sr_posting_detail(http, ref, smartrecruiters_api_key)
-            norm = normalize_smartrecruiters(
-                {"list": item, "detail": detail},
-                company_name=row.company_name,
-                mission_category=row.mission_category,
-                ats_slug=row.ats_slug,
-            )
-            persist_normalized_job(repo, settings, norm, bq=bq, ingested_at=fetched_at)
+        if _board_unchanged(repo, "smartrecruiters", row.ats_slug, status, fetched_at):
+            return
+        diff = _BoardDiff(repo, "smartrecruiters", row.ats_slug)
+        try:
+            for item in _smartrecruiters_new_items(settings, items, diff):
+                ref = _smartrecruiters_detail_ref(item)
+                detail, dstatus = (
+                    smartrecruiters.fetch_sr_posting_detail(http, ref, smartrecruiters_api_key) if ref else (None, 200)
+                )
+                if not diff.retry_later(str(item.get("id")), dstatus):
+                    _add_smartrecruiters_item(diff, row, item, detail)
+        finally:
+            diff.write(repo, settings, bq=bq, fetched_at=fetched_at)
         return
 
-    simple_fetchers: dict[str, tuple[Any, Any, str]] = {
-        "ashby": (ashby.fetch_ashby_jobs, normalize_ashby, "ashby"),
-        "workable": (workable.fetch_workable_jobs, normalize_workable, "workable"),
-        "recruitee": (recruitee.fetch_recruitee_offers, normalize_recruitee, "recruitee"),
-        "personio": (personio.fetch_personio_jobs, normalize_personio, "personio"),
-        "bamboohr": (bamboohr.fetch_bamboohr_jobs, normalize_bamboohr, "bamboohr"),
-        "breezy": (breezy.fetch_breezy_jobs, normalize_breezy, "breezy"),
-        "jazzhr": (jazzhr.fetch_jazzhr_jobs, normalize_jazzhr, "jazzhr"),
-        "teamtailor": (teamtailor.fetch_teamtailor_jobs, normalize_teamtailor, "teamtailor"),
-    }
-    if ats in simple_fetchers:
-        fetch_fn, norm_fn, label = simple_fetchers[ats]
+    if ats in _SIMPLE_ATS:
+        fetch_fn, _fetch_async, norm_fn = _SIMPLE_ATS[ats]
         listings, status = fetch_fn(http, row.ats_slug)
         _ingest_listings(
-            repo=repo,
-            settings=settings,
-            row=row,
-            bq=bq,
-            ingest_batch_id=ingest_batch_id,
-            fetched_at=fetched_at,
+            **common,
             http=http,
             listings=listings,
             normalizer=norm_fn,
-            ats_type=label,
-            list_url=f"{label}:{row.ats_slug}",
+            ats_type=ats,
+            list_url=f"{ats}:{row.ats_slug}",
             status=status,
         )
         return
@@ -242,12 +349,142 @@ def ingest_company_board(
     if ats == "workday":
         listings, status, _wd = workday.fetch_workday_jobs(http, row.ats_slug)
         _ingest_listings(
-            repo=repo,
-            settings=settings,
-            row=row,
-            bq=bq,
-            ingest_batch_id=ingest_batch_id,
-            fetched_at=fetched_at,
+            **common,
+            http=http,
+            listings=listings,
+            normalizer=normalize_workday,
+            ats_type="workday",
+            list_url=f"workday:{row.ats_slug}",
+            status=status,
+            title_key="title",
+            id_key="bulletFields",
+        )
+        return
+
+    logger.warning("Unknown ats_type %s for %s", ats, row.company_name)
+
+
+# Placeholder result of a detail request that raised.
+_FAILED = object()
+
+
+async def _gather_details(diff: _BoardDiff, sids: list[str], aws) -> list[Any]:
+    """Run a board's detail requests concurrently; results in order, ``_FAILED`` where one raised.
+
+    Failures are logged and skipped, so the rest of the board is still written.
+    """
+    results = await asyncio.gather(*aws, return_exceptions=True)
+    out: list[Any] = []
+    for sid, result in zip(sids, results):
+        if isinstance(result, Exception):
+            diff.detail_failed(sid, result)
+            result = _FAILED
+        elif isinstance(result, BaseException):
+            raise result
+        out.append(result)
+    return out
+
+
+async def ingest_company_board_async(
+    http: AsyncHostPool,
+    repo,
+    settings,
+    row: CompanyRow,
+    *,
+    bq=None,
+    ingest_batch_id: str = "",
+    fetched_at: str = "",
+    smartrecruiters_api_key: str = "",
+) -> None:
+    """ingest_company_board on the async engine; detail fetches for new IDs run concurrently.
+
+    SQLite reads and the board's single write transaction run inline on the event
+    loop: they contain no awaits, so boards cannot interleave inside a transaction.
+    """
+    ats = row.ats_type
+    common = dict(repo=repo, settings=settings, row=row, bq=bq, ingest_batch_id=ingest_batch_id, fetched_at=fetched_at)
+    if ats == "greenhouse":
+        listings, status = await greenhouse.fetch_greenhouse_job_list_async(http, row.ats_slug)
+        if _board_unchanged(repo, "greenhouse", row.ats_slug, status, fetched_at):
+            return
+        diff = _BoardDiff(repo, "greenhouse", row.ats_slug)
+        new_ids = _greenhouse_new_ids(settings, listings, diff)
+        details = await _gather_details(
+            diff, new_ids, (greenhouse.fetch_greenhouse_job_async(http, row.ats_slug, jid) for jid in new_ids)
+        )
+        for jid, result in zip(new_ids, details):
+            if result is _FAILED:
+                continue
+            job, jstatus = result
+            _add_greenhouse_job(
+                diff, row, bq=bq, ingest_batch_id=ingest_batch_id, fetched_at=fetched_at,
+                jid=jid, job=job, jstatus=jstatus,
+            )
+        diff.write(repo, settings, bq=bq, fetched_at=fetched_at)
+        return
+
+    if ats == "lever":
+        jobs, status = await lever.fetch_lever_postings_async(http, row.ats_slug, row.ats_region)
+        _ingest_listings(
+            **common,
+            http=http,
+            listings=jobs,
+            normalizer=normalize_lever,
+            ats_type="lever",
+            list_url=f"lever:{row.ats_slug}",
+            status=status,
+            title_key="text",
+            id_key="id",
+        )
+        return
+
+    if ats == "smartrecruiters":
+        items, status = await smartrecruiters.fetch_smartrecruiters_posting_list_async(
+            http, row.ats_slug, smartrecruiters_api_key
+        )
+        if status == 404:
+            set_poll_disabled(settings.POLL_OVERRIDES_PATH, "smartrecruiters", row.ats_slug)
+            return
+        if _board_unchanged(repo, "smartrecruiters", row.ats_slug, status, fetched_at):
+            return
+        diff = _BoardDiff(repo, "smartrecruiters", row.ats_slug)
+        new_items = _smartrecruiters_new_items(settings, items, diff)
+
+        async def _detail(item: dict[str, Any]) -> tuple[dict[str, Any] | None, int]:
+            ref = _smartrecruiters_detail_ref(item)
+            if not ref:
+                return None, 200
+            return await smartrecruiters.fetch_sr_posting_detail_async(http, ref, smartrecruiters_api_key)
+
+        sids = [str(item.get("id")) for item in new_items]
+        details = await _gather_details(diff, sids, (_detail(item) for item in new_items))
+        for sid, item, result in zip(sids, new_items, details):
+            if result is _FAILED:
+                continue
+            detail, dstatus = result
+            if not diff.retry_later(sid, dstatus):
+                _add_smartrecruiters_item(diff, row, item, detail)
+        diff.write(repo, settings, bq=bq, fetched_at=fetched_at)
+        return
+
+    if ats in _SIMPLE_ATS:
+        _fetch, fetch_async, norm_fn = _SIMPLE_ATS[ats]
+        listings, status = await fetch_async(http, row.ats_slug)
+        _ingest_listings(
+            **common,
+            http=http,
+            listings=listings,
+            normalizer=norm_fn,
+            ats_type=ats,
+            list_url=f"{ats}:{row.ats_slug}",
+            status=status,
+        )
+        return
+
+    if ats == "workday":
+        listings, status, _wd = await workday.fetch_workday_jobs_async(http, row.ats_slug)
+        _ingest_listings(
+            **common,
             http=http,
             listings=listings,
             normalizer=normalize_workday,
@@ -4,14 +4,21 @@ from __future__ import annotations
 
 from typing import Any
 
+import httpx
+
+from pipelines.curated_ats.clients.async_host_pool import AsyncHostPool
 from pipelines.curated_ats.clients.host_pool import HostRateLimitedHttp
 
 ASHBY_API = "https://api.ashbyhq.com/posting-api/job-board"
 
 
-def fetch_ashby_jobs(http: HostRateLimitedHttp, slug: str) -> tuple[list[dict[str, Any]], int]:
-    url = f"{ASHBY_API}/{slug}?includeCompensation=true"
-    r = http.get(url)
+def _url(slug: str) -> str:
+    return f"{ASHBY_API}/{slug}?includeCompensation=true"
+
+
+def _parse(r: httpx.Response) -> tuple[list[dict[str, Any]], int]:
+    if r.status_code == 304:
+        return [], 304  # unchanged since the last poll
     if r.status_code == 404:
         return [], 404
     if r.status_code >= 400:
@@ -22,3 +29,11 @@ def fetch_ashby_jobs(http: HostRateLimitedHttp, slug: str) -> tuple[list[dict[st
         return [], 200
     listed = [j for j in jobs if j.get("isListed") is not False]
     return listed, 200
+
+
+def fetch_ashby_jobs(http: HostRateLimitedHttp, slug: str) -> tuple[list[dict[str, Any]], int]:
+    return _parse(http.get_list(_url(slug)))
+
+
+async def fetch_ashby_jobs_async(http: AsyncHostPool, slug: str) -> tuple[list[dict[str, Any]], int]:
+    return _parse(await http.get_list(_url(slug)))
@@ -0,0 +1,203 @@
+"""Asyncio HTTP client with per-ATS-host concurrency and request-rate budgets."""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import httpx
+from tenacity import retry, stop_after_attempt, wait_exponential
+
+from pipelines.curated_ats.clients.list_cache import ListValidatorCache, conditional_get_result
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional h2 package (httpx[http2]); without it we stay on
+# HTTP/1.1 keep-alive, which still reuses connections per host.
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@dataclass(frozen=True)
+class HostBudget:
+    """At most ``concurrency`` requests in flight and ``rps`` request starts per second."""
+
+    concurrency: int
+    rps: float
+
+
+# Keyed by host or parent domain: every company on *.recruitee.com shares one budget,
+# since they are served by the same infrastructure.
+DEFAULT_HOST_BUDGETS: dict[str, HostBudget] = {
+    "boards-api.greenhouse.io": HostBudget(8, 10.0),
+    "api.lever.co": HostBudget(4, 5.0),
+    "api.eu.lever.co": HostBudget(4, 5.0),
+    "api.ashbyhq.com": HostBudget(4, 5.0),
+    "api.smartrecruiters.com": HostBudget(4, 5.0),
+    "apply.workable.com": HostBudget(2, 2.0),
+    "myworkdayjobs.com": HostBudget(4, 4.0),
+    "recruitee.com": HostBudget(4, 5.0),
+    "personio.de": HostBudget(4, 5.0),
+    "personio.com": HostBudget(4, 5.0),
+    "bamboohr.com": HostBudget(4, 5.0),
+    "breezy.hr": HostBudget(4, 5.0),
+    "applytojob.com": HostBudget(4, 5.0),
+    "teamtailor.com": HostBudget(4, 5.0),
+}
+
+
+# Responses that mean "slow down / try again": retried after Retry-After (or a backoff),
+# and the host's whole budget waits, not just the one request.
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+STATUS_RETRIES = 3
+MAX_RETRY_AFTER_SEC = 60.0
+
+
+def retry_after_seconds(r: httpx.Response) -> float | None:
+    """``Retry-After`` as seconds (delta or HTTP date), capped; None when absent or unparseable."""
+    raw = (r.headers.get("retry-after") or "").strip()
+    if not raw:
+        return None
+    try:
+        seconds = float(raw)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(raw)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        seconds = (when - datetime.now(timezone.utc)).total_seconds()
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER_SEC)
+
+
+def parse_host_budgets(raw: str) -> dict[str, HostBudget]:
+    """``host=concurrency:rps`` pairs, comma separated (e.g. ``api.lever.co=2:1.5``)."""
+    budgets: dict[str, HostBudget] = {}
+    for part in (raw or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            host, spec = part.split("=", 1)
+            conc, rps = spec.split(":", 1)
+            budgets[host.strip().lower()] = HostBudget(max(1, int(conc)), max(0.0, float(rps)))
+        except ValueError:
+            logger.warning("Ignoring malformed host budget %r (want host=concurrency:rps)", part)
+    return budgets
+
+
+class AsyncHostPool:
+    """Shared ``httpx.AsyncClient`` for async ATS ingest; budgets apply per host key.
+
+    Unlike ``HostRateLimitedHttp`` the pacing never sleeps while holding a lock:
+    each request reserves the next start slot for its host and waits for it, so
+    requests to one host overlap up to that host's concurrency. A 429 or 5xx
+    gateway response holds the host's start slots for its ``Retry-After`` (or an
+    exponential backoff) and is then retried, up to ``STATUS_RETRIES`` times.
+    """
+
+    def __init__(
+        self,
+        *,
+        default_budget: HostBudget,
+        budgets: dict[str, HostBudget] | None = None,
+        max_connections: int = 100,
+        list_cache: ListValidatorCache | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self._default = default_budget
+        self._list_cache = list_cache
+        self._budgets = {**DEFAULT_HOST_BUDGETS, **(budgets or {})}
+        self._client = httpx.AsyncClient(
+            timeout=90.0,
+            follow_redirects=True,
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            transport=transport,
+        )
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._next_start: dict[str, float] = {}
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+    def _budget_key(self, host: str) -> tuple[str, HostBudget]:
+        host = host.lower()
+        parts = host.split(".")
+        for i in range(len(parts) - 1):
+            key = ".".join(parts[i:])
+            if key in self._budgets:
+                return key, self._budgets[key]
+        return host, self._default
+
+    async def _pace(self, key: str, budget: HostBudget) -> None:
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        # Single-threaded event loop: reading and advancing the slot cannot interleave.
+        start = max(now, self._next_start.get(key, 0.0))
+        if budget.rps > 0:
+            self._next_start[key] = start + 1.0 / budget.rps
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    def _hold(self, key: str, seconds: float) -> None:
+        """Start no request to ``key`` for ``seconds`` (a 429 / 5xx backoff)."""
+        until = asyncio.get_running_loop().time() + seconds
+        self._next_start[key] = max(self._next_start.get(key, 0.0), until)
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        key, budget = self._budget_key(urlparse(url).hostname or "default")
+        sem = self._semaphores.get(key)
+        if sem is None:
+            sem = self._semaphores[key] = asyncio.Semaphore(budget.concurrency)
+        for attempt in range(STATUS_RETRIES + 1):
+            async with sem:
+                await self._pace(key, budget)
+                r = await self._client.request(method, url, **kwargs)
+            if r.status_code not in RETRY_STATUSES or attempt == STATUS_RETRIES:
+                return r
+            delay = retry_after_seconds(r)
+            if delay is None:
+                delay = min(2.0**attempt, 8.0)
+            logger.info("%s %s HTTP %s; retrying in %.1fs", method, url, r.status_code, delay)
+            self._hold(key, delay)
+        return r
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=8))
+    async def get(self, url: str, headers: dict[str, str] | None = None) -> httpx.Response:
+        return await self._request("GET", url, headers=headers)
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=8))
+    async def post(
+        self,
+        url: str,
+        *,
+        json: dict | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> httpx.Response:
+        return await self._request("POST", url, json=json, headers=headers)
+
+    async def get_list(self, url: str, headers: dict[str, str] | None = None) -> httpx.Response:
+        """GET a board list endpoint; a bodiless 304 means unchanged since the last poll."""
+        if self._list_cache is None:
+            return await self.get(url, headers=headers)
+        conditional = {**(headers or {}), **self._list_cache.request_headers(url)}
+        return conditional_get_result(self._list_cache, url, await self.get(url, headers=conditional))
+
+    def forget_list(self, url: str) -> None:
+        if self._list_cache is not None:
+            self._list_cache.discard(url)
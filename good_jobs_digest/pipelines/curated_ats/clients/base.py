@@ -44,3 +44,9 @@ class ThrottledHttp:
         finally:
             self._last_request_end = time.monotonic()
         return r
+
+    def get_list(self, url: str, headers: dict[str, str] | None = None) -> httpx.Response:
+        return self.get(url, headers=headers)  # no validator cache on the legacy client
+
+    def forget_list(self, url: str) -> None:
+        pass
@@ -4,15 +4,30 @@ from __future__ import annotations
 
 from typing import Any
 
+import httpx
+
+from pipelines.curated_ats.clients.async_host_pool import AsyncHostPool
 from pipelines.curated_ats.clients.host_pool import HostRateLimitedHttp
 
 
-def fetch_breezy_jobs(http: HostRateLimitedHttp, company: str) -> tuple[list[dict[str, Any]], int]:
-    url = f"https://{company}.breezy.hr/json"
-    r = http.get(url)
+def _url(company: str) -> str:
+    return f"https://{company}.breezy.hr/json"
+
+
+def _parse(r: httpx.Response) -> tuple[list[dict[str, Any]], int]:
+    if r.status_code == 304:
+        return [], 304  # unchanged since the last poll
     if r.status_code == 404:
         return [], 404
     if r.status_code >= 400:
         return [], r.status_code
     data = r.json()
     return (data if isinstance(data, list) else []), 200
+
+
+def fetch_breezy_jobs(http: HostRateLimitedHttp, company: str) -> tuple[list[dict[str, Any]], int]:
+    return _parse(http.get_list(_url(company)))
+
+
+async def fetch_breezy_jobs_async(http: AsyncHostPool, company: str) -> tuple[list[dict[str, Any]], int]:
+    return _parse(await http.get_list(_url(company)))
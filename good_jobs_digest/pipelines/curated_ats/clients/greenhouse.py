@@ -5,6 +5,9 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+import httpx
+
+from pipelines.curated_ats.clients.async_host_pool import AsyncHostPool
 from pipelines.curated_ats.clients.host_pool import HostRateLimitedHttp
 
 logger = logging.getLogger(__name__)
@@ -12,12 +15,9 @@ logger = logging.getLogger(__name__)
 GREENHOUSE_BASE = "https://boards-api.greenhouse.io/v1/boards"
 
 
-def fetch_greenhouse_job_list(
-    http: HostRateLimitedHttp, board_token: str
-) -> tuple[list[dict[str, Any]], int]:
-    """List jobs without full description (fast pass)."""
-    url = f"{GREENHOUSE_BASE}/{board_token}/jobs"
-    r = http.get(url)
+def _parse_job_list(r: httpx.Response, board_token: str) -> tuple[list[dict[str, Any]], int]:
+    if r.status_code == 304:
+        return [], 304  # unchanged since the last poll
     if r.status_code == 404:
         return [], 404
     if r.status_code >= 400:
@@ -29,12 +29,9 @@ def fetch_greenhouse_job_list(
     return jobs, 200
 
 
-def fetch_greenhouse_job(
-    http: HostRateLimitedHttp, board_token: str, job_id: str | int
+def _parse_job(
+    r: httpx.Response, board_token: str, job_id: str | int
 ) -> tuple[dict[str, Any] | None, int]:
-    """Fetch single job with full content."""
-    url = f"{GREENHOUSE_BASE}/{board_token}/jobs/{job_id}"
-    r = http.get(url)
     if r.status_code == 404:
         return None, 404
     if r.status_code >= 400:
@@ -44,6 +41,34 @@ def fetch_greenhouse_job(
     return data if isinstance(data, dict) else None, 200
 
 
+def fetch_greenhouse_job_list(
+    http: HostRateLimitedHttp, board_token: str
+) -> tuple[list[dict[str, Any]], int]:
+    """List jobs without full description (fast pass)."""
+    return _parse_job_list(http.get_list(f"{GREENHOUSE_BASE}/{board_token}/jobs"), board_token)
+
+
+async def fetch_greenhouse_job_list_async(
+    http: AsyncHostPool, board_token: str
+) -> tuple[list[dict[str, Any]], int]:
+    return _parse_job_list(await http.get_list(f"{GREENHOUSE_BASE}/{board_token}/jobs"), board_token)
+
+
+def fetch_greenhouse_job(
+    http: HostRateLimitedHttp, board_token: str, job_id: str | int
+) -> tuple[dict[str, Any] | None, int]:
+    """Fetch single job with full content."""
+    r = http.get(f"{GREENHOUSE_BASE}/{board_token}/jobs/{job_id}")
+    return _parse_job(r, board_token, job_id)
+
+
+async def fetch_greenhouse_job_async(
+    http: AsyncHostPool, board_token: str, job_id: str | int
+) -> tuple[dict[str, Any] | None, int]:
+    r = await http.get(f"{GREENHOUSE_BASE}/{board_token}/jobs/{job_id}")
+    return _parse_job(r, board_token, job_id)
+
+
 def fetch_greenhouse_jobs(http, board_token: str) -> tuple[list[dict[str, Any]], int]:
     """Legacy: full board with content=true (avoid in daily ingest)."""
     url = f"{GREENHOUSE_BASE}/{board_token}/jobs?content=true"
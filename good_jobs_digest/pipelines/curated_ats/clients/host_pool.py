@@ -10,15 +10,24 @@ from urllib.parse import urlparse
 import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from pipelines.curated_ats.clients.list_cache import ListValidatorCache, conditional_get_result
+
 logger = logging.getLogger(__name__)
 
 
 class HostRateLimitedHttp:
     """Shared client safe for ThreadPoolExecutor; throttle per hostname."""
 
-    def __init__(self, delay_ms: int = 150):
+    def __init__(
+        self,
+        delay_ms: int = 150,
+        *,
+        list_cache: ListValidatorCache | None = None,
+        transport: httpx.BaseTransport | None = None,
+    ):
         self._delay_ms = max(0, int(delay_ms))
-        self._client = httpx.Client(timeout=90.0, follow_redirects=True)
+        self._client = httpx.Client(timeout=90.0, follow_redirects=True, transport=transport)
+        self._list_cache = list_cache
         self._locks: dict[str, threading.Lock] = {}
         self._last_end: dict[str, float] = {}
         self._global_lock = threading.Lock()
@@ -75,3 +84,14 @@ class HostRateLimitedHttp:
         finally:
             with self._host_lock(host):
                 self._last_end[host] = time.monotonic()
+
+    def get_list(self, url: str, headers: dict[str, str] | None = None) -> httpx.Response:
+        """GET a board list endpoint; a bodiless 304 means unchanged since the last poll."""
+        if self._list_cache is None:
+            return self.get(url, headers=headers)
+        conditional = {**(headers or {}), **self._list_cache.request_headers(url)}
+        return conditional_get_result(self._list_cache, url, self.get(url, headers=conditional))
+
+    def forget_list(self, url: str) -> None:
+        if self._list_cache is not None:
+            self._list_cache.discard(url)
@@ -4,12 +4,19 @@ from __future__ import annotations
 
 from typing import Any
 
+import httpx
+
+from pipelines.curated_ats.clients.async_host_pool import AsyncHostPool
 from pipelines.curated_ats.clients.host_pool import HostRateLimitedHttp
 
 
-def fetch_jazzhr_jobs(http: HostRateLimitedHttp, company: str) -> tuple[list[dict[str, Any]], int]:
-    url = f"https://{company}.applytojob.com/apply/jobs/json"
-    r = http.get(url)
+def _url(company: str) -> str:
+    return f"https://{company}.applytojob.com/apply/jobs/json"
+
+
+def _parse(r: httpx.Response) -> tuple[list[dict[str, Any]], int]:
+    if r.status_code == 304:
+        return [], 304  # unchanged since the last poll
     if r.status_code == 404:
         return [], 404
     if r.status_code >= 400:
@@ -17,3 +24,11 @@ def fetch_jazzhr_jobs(http: HostRateLimitedHttp, company: str) -> tuple[list[dic
     data = r.json()
     jobs = data if isinstance(data, list) else data.get("jobs") if isinstance(data, dict) else None
     return (jobs if isinstance(jobs, list) else []), 200
+
+
+def fetch_jazzhr_jobs(http: HostRateLimitedHttp, company: str) -> tuple[list[dict[str, Any]], int]:
+    return _parse(http.get_list(_url(company)))
+
+
+async def fetch_jazzhr_jobs_async(http: AsyncHostPool, company: str) -> tuple[list[dict[str, Any]], int]:
+    return _parse(await http.get_list(_url(company)))
@@ -5,6 +5,9 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+import httpx
+
+from pipelines.curated_ats.clients.async_host_pool import AsyncHostPool
 from pipelines.curated_ats.clients.host_pool import HostRateLimitedHttp
 
 logger = logging.getLogger(__name__)
@@ -17,33 +20,62 @@ def _lever_base(region: str) -> str:
     return LEVER_EU if (region or "").lower() == "eu" else LEVER_GLOBAL
 
 
+_PAGE_LIMIT = 100
+
+
+def _page_url(base: str, site: str, skip: int) -> str:
+    return f"{base}/{site}?mode=json&limit={_PAGE_LIMIT}&skip={skip}"
+
+
+def _parse_page(r: httpx.Response, site: str) -> tuple[list[dict[str, Any]] | None, int]:
+    """(page postings, status); postings is None when paging must stop here."""
+    if r.status_code == 304:
+        return [], 304  # first page unchanged since the last poll
+    if r.status_code == 404:
+        return None, 404
+    if r.status_code >= 400:
+        logger.warning("Lever %s HTTP %s", site, r.status_code)
+        return None, r.status_code
+    chunk = r.json()
+    if not isinstance(chunk, list):
+        return None, r.status_code
+    return chunk, r.status_code
+
+
 def fetch_lever_postings(http: HostRateLimitedHttp, site: str, region: str) -> tuple[list[dict[str, Any]], int]:
     """Paginate Lever postings. Returns (all postings, last_http_status)."""
     base = _lever_base(region)
     out: list[dict[str, Any]] = []
     skip = 0
-    limit = 100
-    last_status = 200
     while True:
-        url = f"{base}/{site}?mode=json&limit={limit}&skip={skip}"
-        r = http.get(url)
-        last_status = r.status_code
-        if r.status_code == 404:
-            try:
-                err = r.json()
-                if isinstance(err, dict) and err.get("ok") is False:
-                    return [], 404
-            except Exception:
-                return [], 404
-            return [], 404
-        if r.status_code >= 400:
-            logger.warning("Lever %s HTTP %s", site, r.status_code)
-            return out if out else [], r.status_code
-        chunk = r.json()
-        if not isinstance(chunk, list):
-            break
+        url = _page_url(base, site, skip)
+        r = http.get_list(url) if skip == 0 else http.get(url)
+        chunk, status = _parse_page(r, site)
+        if chunk is None:
+            return ([] if status == 404 else out), status
+        out.extend(chunk)
+        if len(chunk) < _PAGE_LIMIT:
+            return out, status
+        if skip == 0:
+            http.forget_list(url)  # only single-page boards can be skipped as unchanged
+        skip += _PAGE_LIMIT
+
+
+async def fetch_lever_postings_async(
+    http: AsyncHostPool, site: str, region: str
+) -> tuple[list[dict[str, Any]], int]:
+    base = _lever_base(region)
+    out: list[dict[str, Any]] = []
+    skip = 0
+    while True:
+        url = _page_url(base, site, skip)
+        r = await (http.get_list(url) if skip == 0 else http.get(url))
+        chunk, status = _parse_page(r, site)
+        if chunk is None:
+            return ([] if status == 404 else out), status
         out.extend(chunk)
-        if len(chunk) < limit:
-            break
-        skip += limit
-    return out, last_status
+        if len(chunk) < _PAGE_LIMIT:
+            return out, status
+        if skip == 0:
+            http.forget_list(url)  # only single-page boards can be skipped as unchanged
+        skip += _PAGE_LIMIT
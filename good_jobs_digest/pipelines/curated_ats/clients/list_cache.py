@@ -0,0 +1,188 @@
+"""Conditional-request cache for curated ATS list endpoints.
+
+Each list URL keeps the ``ETag`` / ``Last-Modified`` validators and a SHA-256 of
+the body from its last successful poll. The next poll sends ``If-None-Match`` /
+``If-Modified-Since``. A 304, or a 200 whose body hashes the same (for ATSs that
+ignore validators), is reported to the client as a synthetic 304, and the board
+handler skips re-normalizing and re-persisting it.
+
+New validators only become durable once the board's ingest finished
+(``board_poll``), so a poll that failed half way is re-fetched in full next time.
+A poll that finished but had to skip postings (a detail request answered 429/5xx)
+calls ``mark_board_incomplete``; its list URLs are then dropped from the cache, so
+the next poll re-reads the list and fetches those postings again.
+Each entry also keeps the time of that poll, so the handler of an unchanged board
+knows which stored postings were listed then (``unchanged_since``).
+The cache is dropped when the title gate changes, since listings it skipped
+before could now pass.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Iterator
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+
+class _BoardPoll:
+    """List URLs requested by one board poll, and when its list was last seen unchanged."""
+
+    def __init__(self) -> None:
+        self.urls: list[str] = []
+        self.unchanged_since: str | None = None
+        self.incomplete = False
+
+
+# The board poll running in this thread / asyncio task.
+_current_poll: ContextVar[_BoardPoll | None] = ContextVar("board_poll", default=None)
+
+
+def title_gate_fingerprint(settings) -> str:
+    parts = [
+        sorted(settings.TARGET_ROLE_KEYWORDS),
+        sorted(settings.EXCLUDE_TITLE_KEYWORDS),
+        sorted(getattr(settings, "SENIORITY_EXCLUDE_KEYWORDS", ())),
+    ]
+    return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()[:16]
+
+
+class ListValidatorCache:
+    """URL -> validators of the last fully ingested response, persisted as JSON."""
+
+    def __init__(self, path: Path, gate: str = ""):
+        self._path = path
+        self._gate = gate
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not self._path.exists():
+            return
+        try:
+            data = json.loads(self._path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning("Ignoring unreadable list cache %s: %s", self._path, exc)
+            return
+        if data.get("version") != CACHE_VERSION or data.get("gate") != self._gate:
+            logger.info("List cache reset (format or title gate changed)")
+            return
+        entries = data.get("entries")
+        if isinstance(entries, dict):
+            self._entries = entries
+
+    def save(self) -> None:
+        with self._lock:
+            payload = {"version": CACHE_VERSION, "gate": self._gate, "entries": self._entries}
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._path.with_suffix(self._path.suffix + ".tmp")
+        tmp.write_text(json.dumps(payload, sort_keys=True) + "\n", encoding="utf-8")
+        tmp.replace(self._path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def request_headers(self, url: str) -> dict[str, str]:
+        with self._lock:
+            entry = self._entries.get(url)
+        if not entry:
+            return {}
+        headers: dict[str, str] = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def unchanged(self, url: str, r: httpx.Response) -> bool:
+        """True if ``r`` repeats the cached response; stages new validators otherwise."""
+        if r.status_code == 304:
+            with self._lock:
+                return url in self._entries
+        if r.status_code != 200:
+            return False
+        body_sha256 = hashlib.sha256(r.content).hexdigest()
+        entry = {
+            "etag": r.headers.get("etag"),
+            "last_modified": r.headers.get("last-modified"),
+            "body_sha256": body_sha256,
+        }
+        with self._lock:
+            previous = self._entries.get(url)
+            self._pending[url] = entry
+        return previous is not None and previous.get("body_sha256") == body_sha256
+
+    def polled_at(self, url: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(url)
+        return entry.get("polled_at") if entry else None
+
+    def commit(self, urls: list[str], polled_at: str) -> None:
+        with self._lock:
+            for url in urls:
+                entry = self._pending.pop(url, None)
+                if entry is not None:
+                    self._entries[url] = {**entry, "polled_at": polled_at}
+
+    def discard(self, url: str) -> None:
+        """Stop caching ``url`` (e.g. the first page of a board that now paginates)."""
+        with self._lock:
+            self._pending.pop(url, None)
+            self._entries.pop(url, None)
+
+
+def conditional_get_result(cache: ListValidatorCache, url: str, r: httpx.Response) -> httpx.Response:
+    """``r`` itself, or a bodiless 304 when the list is unchanged since the last poll."""
+    poll = _current_poll.get()
+    if poll is not None:
+        poll.urls.append(url)
+    if not cache.unchanged(url, r):
+        return r
+    if poll is not None:
+        poll.unchanged_since = cache.polled_at(url)
+    return httpx.Response(304, request=r.request)
+
+
+def unchanged_since() -> str | None:
+    """Time of the last full poll of the current board, once its list came back unchanged."""
+    poll = _current_poll.get()
+    return poll.unchanged_since if poll is not None else None
+
+
+def mark_board_incomplete() -> None:
+    """The current board poll skipped postings; don't let its list read as unchanged next time."""
+    poll = _current_poll.get()
+    if poll is not None:
+        poll.incomplete = True
+
+
+@contextmanager
+def board_poll(cache: ListValidatorCache | None, polled_at: str) -> Iterator[None]:
+    """Commit the list validators seen inside the block only if it completes.
+
+    A completed poll marked incomplete forgets its list URLs instead.
+    """
+    poll = _BoardPoll()
+    token = _current_poll.set(poll)
+    try:
+        yield
+        if cache is not None:
+            if poll.incomplete:
+                for url in poll.urls:
+                    cache.discard(url)
+            else:
+                cache.commit(poll.urls, polled_at)
+    finally:
+        _current_poll.reset(token)
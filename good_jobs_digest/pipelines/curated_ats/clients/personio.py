@@ -5,18 +5,19 @@ from __future__ import annotations
 import xml.etree.ElementTree as ET
 from typing import Any
 
+import httpx
+
+from pipelines.curated_ats.clients.async_host_pool import AsyncHostPool
 from pipelines.curated_ats.clients.host_pool import HostRateLimitedHttp
 
 
-def fetch_personio_jobs(
-    http: HostRateLimitedHttp, company: str, *, tld: str = "de"
-) -> tuple[list[dict[str, Any]], int]:
-    url = f"https://{company}.jobs.personio.{tld}/xml"
-    r = http.get(url)
-    if r.status_code == 404:
-        if tld == "de":
-            return fetch_personio_jobs(http, company, tld="com")
-        return [], 404
+def _url(company: str, tld: str) -> str:
+    return f"https://{company}.jobs.personio.{tld}/xml"
+
+
+def _parse(r: httpx.Response, tld: str) -> tuple[list[dict[str, Any]], int]:
+    if r.status_code == 304:
+        return [], 304  # unchanged since the last poll
     if r.status_code >= 400:
         return [], r.status_code
     try:
@@ -31,3 +32,21 @@ def fetch_personio_jobs(
                 job[child.tag] = child.text or ""
         jobs.append(job)
     return jobs, 200
+
+
+def fetch_personio_jobs(
+    http: HostRateLimitedHttp, company: str, *, tld: str = "de"
+) -> tuple[list[dict[str, Any]], int]:
+    r = http.get_list(_url(company, tld))
+    if r.status_code == 404 and tld == "de":
+        return fetch_personio_jobs(http, company, tld="com")
+    return _parse(r, tld)
+
+
+async def fetch_personio_jobs_async(
+    http: AsyncHostPool, company: str, *, tld: str = "de"
+) -> tuple[list[dict[str, Any]], int]:
+    r = await http.get_list(_url(company, tld))
+    if r.status_code == 404 and tld == "de":
+        return await fetch_personio_jobs_async(http, company, tld="com")
+    return _parse(r, tld)
@@ -5,6 +5,9 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+import httpx
+
+from pipelines.curated_ats.clients.async_host_pool import AsyncHostPool
 from pipelines.curated_ats.clients.host_pool import HostRateLimitedHttp
 
 logger = logging.getLogger(__name__)
@@ -19,14 +22,59 @@ def _headers(api_key: str) -> dict[str, str]:
     return h
 
 
+def _parse_detail(r: httpx.Response) -> tuple[dict[str, Any] | None, int]:
+    if r.status_code >= 400:
+        return None, r.status_code
+    data = r.json()
+    return (data if isinstance(data, dict) else None), r.status_code
+
+
 def fetch_sr_posting_detail(
     http: HostRateLimitedHttp, detail_url: str, api_key: str
-) -> dict[str, Any] | None:
-    r = http.get(detail_url, headers=_headers(api_key) or None)
+) -> tuple[dict[str, Any] | None, int]:
+    return _parse_detail(http.get(detail_url, headers=_headers(api_key) or None))
+
+
+async def fetch_sr_posting_detail_async(
+    http: AsyncHostPool, detail_url: str, api_key: str
+) -> tuple[dict[str, Any] | None, int]:
+    return _parse_detail(await http.get(detail_url, headers=_headers(api_key) or None))
+
+
+_PAGE_LIMIT = 100
+
+
+def _page_url(company_identifier: str, offset: int) -> str:
+    return f"{SR_BASE}/{company_identifier}/postings?limit={_PAGE_LIMIT}&offset={offset}"
+
+
+def _parse_page(
+    r: httpx.Response, company_identifier: str
+) -> tuple[list[dict[str, Any]] | None, int, int]:
+    """(page postings, totalFound, status); postings is None when paging must stop here."""
+    if r.status_code == 304:
+        return [], 0, 304  # first page unchanged since the last poll
+    if r.status_code == 404:
+        return None, 0, 404
     if r.status_code >= 400:
-        return None
+        logger.warning("SmartRecruiters %s list HTTP %s", company_identifier, r.status_code)
+        return None, 0, r.status_code
     data = r.json()
-    return data if isinstance(data, dict) else None
+    if not isinstance(data, dict):
+        return None, 0, r.status_code
+    content = data.get("content") or []
+    return content, int(data.get("totalFound") or 0), r.status_code
+
+
+def _extend_page(items: list[dict[str, Any]], content: list[Any], offset: int, total: int) -> int | None:
+    """Append one page; returns the next offset, or None when this was the last page."""
+    if not content:
+        return None
+    items.extend(item for item in content if isinstance(item, dict))
+    offset += len(content)
+    if offset >= total or len(content) < _PAGE_LIMIT:
+        return None
+    return offset
 
 
 def fetch_smartrecruiters_posting_list(
@@ -35,34 +83,41 @@ def fetch_smartrecruiters_posting_list(
     api_key: str,
 ) -> tuple[list[dict[str, Any]], int]:
     """List postings only (no per-job detail calls)."""
-    offset = 0
-    limit = 100
     items: list[dict[str, Any]] = []
-    last_status = 200
     hdrs = _headers(api_key) or None
-    while True:
-        url = f"{SR_BASE}/{company_identifier}/postings?limit={limit}&offset={offset}"
-        r = http.get(url, headers=hdrs)
-        last_status = r.status_code
-        if r.status_code == 404:
-            return [], 404
-        if r.status_code >= 400:
-            logger.warning("SmartRecruiters %s list HTTP %s", company_identifier, r.status_code)
-            return items if items else [], r.status_code
-        data = r.json()
-        if not isinstance(data, dict):
-            break
-        content = data.get("content") or []
-        total = int(data.get("totalFound") or 0)
-        if not content:
-            break
-        for item in content:
-            if isinstance(item, dict):
-                items.append(item)
-        offset += len(content)
-        if offset >= total or len(content) < limit:
-            break
-    return items, last_status
+    offset: int | None = 0
+    while offset is not None:
+        url = _page_url(company_identifier, offset)
+        r = http.get_list(url, headers=hdrs) if offset == 0 else http.get(url, headers=hdrs)
+        content, total, status = _parse_page(r, company_identifier)
+        if content is None:
+            return ([] if status == 404 else items), status
+        first_page = offset == 0
+        offset = _extend_page(items, content, offset, total)
+        if first_page and offset is not None:
+            http.forget_list(url)  # only single-page boards can be skipped as unchanged
+    return items, status
+
+
+async def fetch_smartrecruiters_posting_list_async(
+    http: AsyncHostPool,
+    company_identifier: str,
+    api_key: str,
+) -> tuple[list[dict[str, Any]], int]:
+    items: list[dict[str, Any]] = []
+    hdrs = _headers(api_key) or None
+    offset: int | None = 0
+    while offset is not None:
+        url = _page_url(company_identifier, offset)
+        r = await (http.get_list(url, headers=hdrs) if offset == 0 else http.get(url, headers=hdrs))
+        content, total, status = _parse_page(r, company_identifier)
+        if content is None:
+            return ([] if status == 404 else items), status
+        first_page = offset == 0
+        offset = _extend_page(items, content, offset, total)
+        if first_page and offset is not None:
+            http.forget_list(url)  # only single-page boards can be skipped as unchanged
+    return items, status
 
 
 def fetch_all_smartrecruiters_postings(http, company_identifier: str, api_key: str):
@@ -79,6 +134,6 @@ def fetch_all_smartrecruiters_postings(http, company_identifier: str, api_key: s
         ref = item.get("ref")
         detail = None
         if isinstance(ref, str) and ref.startswith("http"):
-            detail = fetch_sr_posting_detail(http, ref, api_key)
+            detail, _status = fetch_sr_posting_detail(http, ref, api_key)
         combined.append({"list": item, "detail": detail})
     return combined, status
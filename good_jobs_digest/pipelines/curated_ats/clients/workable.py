@@ -4,12 +4,19 @@ from __future__ import annotations
 
 from typing import Any
 
+import httpx
+
+from pipelines.curated_ats.clients.async_host_pool import AsyncHostPool
 from pipelines.curated_ats.clients.host_pool import HostRateLimitedHttp
 
 
-def fetch_workable_jobs(http: HostRateLimitedHttp, subdomain: str) -> tuple[list[dict[str, Any]], int]:
-    url = f"https://apply.workable.com/api/v3/accounts/{subdomain}/jobs"
-    r = http.get(url)
+def _url(subdomain: str) -> str:
+    return f"https://apply.workable.com/api/v3/accounts/{subdomain}/jobs"
+
+
+def _parse(r: httpx.Response) -> tuple[list[dict[str, Any]], int]:
+    if r.status_code == 304:
+        return [], 304  # unchanged since the last poll
     if r.status_code == 404:
         return [], 404
     if r.status_code >= 400:
@@ -17,3 +24,11 @@ def fetch_workable_jobs(http: HostRateLimitedHttp, subdomain: str) -> tuple[list
     data = r.json()
     jobs = data.get("jobs") if isinstance(data, dict) else data
     return (jobs if isinstance(jobs, list) else []), 200
+
+
+def fetch_workable_jobs(http: HostRateLimitedHttp, subdomain: str) -> tuple[list[dict[str, Any]], int]:
+    return _parse(http.get_list(_url(subdomain)))
+
+
+async def fetch_workable_jobs_async(http: AsyncHostPool, subdomain: str) -> tuple[list[dict[str, Any]], int]:
+    return _parse(await http.get_list(_url(subdomain)))
@@ -4,8 +4,14 @@ from __future__ import annotations
 
 from typing import Any
 
+import httpx
+
+from pipelines.curated_ats.clients.async_host_pool import AsyncHostPool
 from pipelines.curated_ats.clients.host_pool import HostRateLimitedHttp
 
+WORKDAY_HOSTS = ("wd1", "wd3", "wd5")
+_SEARCH_BODY = {"appliedFacets": {}, "limit": 50, "offset": 0, "searchText": ""}
+
 
 def _split_slug(slug: str) -> tuple[str, str]:
     parts = slug.split("|", 1)
@@ -14,20 +20,40 @@ def _split_slug(slug: str) -> tuple[str, str]:
     return slug, "External"
 
 
+def _url(wd: str, tenant: str, site: str) -> str:
+    return f"https://{wd}.myworkdayjobs.com/wday/cxs/{tenant}/{site}/jobs"
+
+
+def _postings(r: httpx.Response, wd: str, tenant: str, site: str) -> list[dict[str, Any]]:
+    """Tagged postings from one host's response; empty means try the next host."""
+    if r.status_code != 200:
+        return []
+    data = r.json()
+    postings = data.get("jobPostings") or data.get("jobs") or []
+    if not isinstance(postings, list):
+        return []
+    for item in postings:
+        item["_wd_host"] = wd
+        item["_tenant"] = tenant
+        item["_site"] = site
+    return postings
+
+
 def fetch_workday_jobs(http: HostRateLimitedHttp, slug: str) -> tuple[list[dict[str, Any]], int, str]:
     tenant, site = _split_slug(slug)
-    for wd in ("wd1", "wd3", "wd5"):
-        url = f"https://{wd}.myworkdayjobs.com/wday/cxs/{tenant}/{site}/jobs"
-        body = {"appliedFacets": {}, "limit": 50, "offset": 0, "searchText": ""}
-        r = http.post(url, json=body)
-        if r.status_code != 200:
-            continue
-        data = r.json()
-        postings = data.get("jobPostings") or data.get("jobs") or []
-        if isinstance(postings, list) and postings:
-            for item in postings:
-                item["_wd_host"] = wd
-                item["_tenant"] = tenant
-                item["_site"] = site
+    for wd in WORKDAY_HOSTS:
+        r = http.post(_url(wd, tenant, site), json=dict(_SEARCH_BODY))
+        postings = _postings(r, wd, tenant, site)
+        if postings:
+            return postings, 200, wd
+    return [], 404, ""
+
+
+async def fetch_workday_jobs_async(http: AsyncHostPool, slug: str) -> tuple[list[dict[str, Any]], int, str]:
+    tenant, site = _split_slug(slug)
+    for wd in WORKDAY_HOSTS:
+        r = await http.post(_url(wd, tenant, site), json=dict(_SEARCH_BODY))
+        postings = _postings(r, wd, tenant, site)
+        if postings:
             return postings, 200, wd
     return [], 404, ""
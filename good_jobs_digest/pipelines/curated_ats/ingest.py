@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -12,8 +13,10 @@ from config import Settings
 from core.curated import load_curated_board_keys
 from core.curated_poll_rotation import poll_batch_size, select_poll_batch
 from core.models import CompanyRow, effective_poll_enabled
-from pipelines.curated_ats.board_ingest import ingest_company_board
+from pipelines.curated_ats.board_ingest import ingest_company_board, ingest_company_board_async
+from pipelines.curated_ats.clients.async_host_pool import AsyncHostPool, HostBudget, parse_host_budgets
 from pipelines.curated_ats.clients.host_pool import HostRateLimitedHttp
+from pipelines.curated_ats.clients.list_cache import ListValidatorCache, board_poll, title_gate_fingerprint
 from pipelines.curated_ats.loader import load_curated_companies
 from storage.poll_overrides import load_overrides
 
@@ -69,32 +72,109 @@ def _ingest_company_task(
     bq: JobBigQuery | None,
     ingest_batch_id: str,
     http: HostRateLimitedHttp,
+    list_cache: ListValidatorCache | None = None,
     polled_keys: list[tuple[str, str]] | None = None,
     lock: threading.Lock | None = None,
 ) -> None:
     logger.info("Curated ATS: %s (%s)", row.company_name, row.ats_type)
     polled_at = _now_iso()
-    try:
-        ingest_company_board(
-            http,
-            repo,
-            settings,
-            row,
-            bq=bq,
-            ingest_batch_id=ingest_batch_id,
-            fetched_at=polled_at,
-            smartrecruiters_api_key=settings.SMARTRECRUITERS_API_KEY,
-        )
-    except Exception as exc:  # noqa: BLE001
-        logger.error("Curated ingest failed for %s: %s", row.company_name, exc)
-    finally:
-        _touch_poll_time(
-            row,
-            repo=repo,
-            bq=bq,
-            polled_at=polled_at,
-            polled_keys=polled_keys,
-            lock=lock,
+    # One connection and one commit per company: the board's jobs and its poll stamp.
+    with repo.write_session():
+        try:
+            with board_poll(list_cache, polled_at):
+                ingest_company_board(
+                    http,
+                    repo,
+                    settings,
+                    row,
+                    bq=bq,
+                    ingest_batch_id=ingest_batch_id,
+                    fetched_at=polled_at,
+                    smartrecruiters_api_key=settings.SMARTRECRUITERS_API_KEY,
+                )
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Curated ingest failed for %s: %s", row.company_name, exc)
+        finally:
+            _touch_poll_time(
+                row,
+                repo=repo,
+                bq=bq,
+                polled_at=polled_at,
+                polled_keys=polled_keys,
+                lock=lock,
+            )
+
+
+async def _ingest_company_task_async(
+    row: CompanyRow,
+    *,
+    repo: JobRepository,
+    settings: Settings,
+    bq: JobBigQuery | None,
+    ingest_batch_id: str,
+    http: AsyncHostPool,
+    list_cache: ListValidatorCache | None,
+    polled_keys: list[tuple[str, str]],
+    slots: asyncio.Semaphore,
+) -> None:
+    async with slots:
+        logger.info("Curated ATS: %s (%s)", row.company_name, row.ats_type)
+        polled_at = _now_iso()
+        try:
+            with board_poll(list_cache, polled_at):
+                await ingest_company_board_async(
+                    http,
+                    repo,
+                    settings,
+                    row,
+                    bq=bq,
+                    ingest_batch_id=ingest_batch_id,
+                    fetched_at=polled_at,
+                    smartrecruiters_api_key=settings.SMARTRECRUITERS_API_KEY,
+                )
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Curated ingest failed for %s: %s", row.company_name, exc)
+        finally:
+            # Sessions are per thread, and every task shares the loop's thread: a session
+            # held across the awaits above would be joined by other boards' writes. The
+            # board's diff commits in its own session; the poll stamp gets one here.
+            with repo.write_session():
+                _touch_poll_time(row, repo=repo, bq=bq, polled_at=polled_at, polled_keys=polled_keys)
+
+
+async def _ingest_companies_async(
+    companies: list[CompanyRow],
+    *,
+    repo: JobRepository,
+    settings: Settings,
+    bq: JobBigQuery | None,
+    ingest_batch_id: str,
+    list_cache: ListValidatorCache | None,
+    polled_keys: list[tuple[str, str]],
+) -> None:
+    """Poll companies on one event loop; per-host budgets pace the requests."""
+    budget = HostBudget(settings.INGEST_HOST_CONCURRENCY, settings.INGEST_HOST_RPS)
+    slots = asyncio.Semaphore(settings.INGEST_ASYNC_COMPANIES)
+    async with AsyncHostPool(
+        default_budget=budget,
+        budgets=parse_host_budgets(settings.INGEST_HOST_BUDGETS),
+        list_cache=list_cache,
+    ) as http:
+        await asyncio.gather(
+            *(
+                _ingest_company_task_async(
+                    row,
+                    repo=repo,
+                    settings=settings,
+                    bq=bq,
+                    ingest_batch_id=ingest_batch_id,
+                    http=http,
+                    list_cache=list_cache,
+                    polled_keys=polled_keys,
+                    slots=slots,
+                )
+                for row in companies
+            )
         )
 
 
@@ -127,37 +207,60 @@ def ingest_curated_ats(
         limit=limit,
     )
     batch_cap = poll_batch_size(len(all_companies), divisor)
+    engine = "async" if settings.INGEST_ASYNC else f"threads={settings.INGEST_WORKERS}"
     logger.info(
         "Curated ingest: polling %s / %s companies "
-        "(rotation divisor=%s, batch cap=%s, workers=%s)",
+        "(rotation divisor=%s, batch cap=%s, engine=%s)",
         len(companies),
         len(all_companies),
         divisor,
         batch_cap,
-        settings.INGEST_WORKERS,
+        engine,
     )
 
-    workers = max(1, settings.INGEST_WORKERS)
+    list_cache = (
+        ListValidatorCache(settings.LIST_CACHE_PATH, gate=title_gate_fingerprint(settings))
+        if settings.LIST_CACHE_ENABLED
+        else None
+    )
     polled_keys: list[tuple[str, str]] = []
-    lock = threading.Lock()
-    with HostRateLimitedHttp(settings.INGEST_DELAY_MS) as http:
-        with ThreadPoolExecutor(max_workers=workers) as pool:
-            futures = [
-                pool.submit(
-                    _ingest_company_task,
-                    row,
-                    repo=repo,
-                    settings=settings,
-                    bq=bq,
-                    ingest_batch_id=ingest_batch_id,
-                    http=http,
-                    polled_keys=polled_keys,
-                    lock=lock,
-                )
-                for row in companies
-            ]
-            for fut in as_completed(futures):
-                fut.result()
+    if settings.INGEST_ASYNC:
+        asyncio.run(
+            _ingest_companies_async(
+                companies,
+                repo=repo,
+                settings=settings,
+                bq=bq,
+                ingest_batch_id=ingest_batch_id,
+                list_cache=list_cache,
+                polled_keys=polled_keys,
+            )
+        )
+    else:
+        workers = max(1, settings.INGEST_WORKERS)
+        lock = threading.Lock()
+        with HostRateLimitedHttp(settings.INGEST_DELAY_MS, list_cache=list_cache) as http:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(
+                        _ingest_company_task,
+                        row,
+                        repo=repo,
+                        settings=settings,
+                        bq=bq,
+                        ingest_batch_id=ingest_batch_id,
+                        http=http,
+                        list_cache=list_cache,
+                        polled_keys=polled_keys,
+                        lock=lock,
+                    )
+                    for row in companies
+                ]
+                for fut in as_completed(futures):
+                    fut.result()
+    if list_cache is not None:
+        list_cache.save()
+        logger.info("List validator cache: %s board list URL(s)", len(list_cache))
 
     if bq:
         try:
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from typing import Any, Callable
 
 from config import Settings
@@ -45,8 +47,8 @@ from normalize.boards import (
     normalize_workonclimate,
 )
 from discovery.employer_candidates import mine_employer_candidate
-from core.persist import persist_normalized_job
-from rank.prefilter import prefilter_title
+from core.persist import persist_normalized_jobs
+from rank.prefilter import title_gate
 from pipelines.job_boards.sources.climatebase import JOB_DETAIL_URL, JOBS_URL, _parse_next_data
 from pipelines.job_boards.sources.eighty_k_hours import (
     ALGOLIA_API_KEY,
@@ -86,10 +88,25 @@ from storage.repository import JobRepository
 
 logger = logging.getLogger(__name__)
 
-# Populated by _ingest_api_board so the health footer can distinguish "fetched a lot
-# but nothing matched" from "fetched nothing at all" (a broken source).
-_LAST_FETCH_COUNTS: dict[str, int] = {}
-_LAST_FETCH_ERRORS: dict[str, str] = {}
+
+@dataclass
+class _FetchedBoard:
+    """One board's fetch-stage output, normalized and persisted later on the writer thread.
+
+    ``normalize`` maps a raw job to its normalized row, or None when the title gate
+    drops it; the raw job is what lands in BigQuery as the listing payload.
+    """
+
+    raw_jobs: list[dict[str, Any]]
+    normalize: Callable[[dict[str, Any]], dict[str, Any] | None]
+    request_url: str
+    fetched: int
+    # Set when a paged fetch stopped early; ``raw_jobs`` still holds the pages before it.
+    error: str | None = None
+
+
+def _title_passes(settings: Settings, title: str) -> bool:
+    return title_gate(settings).evaluate(title).passed
 
 
 def ingest_job_boards(
@@ -100,7 +117,12 @@ def ingest_job_boards(
     ingest_batch_id: str = "",
     fetched_at: str = "",
 ) -> dict[str, int]:
-    """Fetch all enabled boards; return counts per board id."""
+    """Fetch all enabled boards; return counts per board id.
+
+    Boards are fetched concurrently (BOARD_FETCH_WORKERS threads; ResilientHttp
+    keeps its delay per host), and each result is normalized and persisted on the
+    calling thread as it arrives, so SQLite keeps a single writer.
+    """
     if not settings.JOB_BOARDS_ENABLED:
         logger.info("JOB_BOARDS_ENABLED=false — skipping job boards")
         return {}
@@ -114,12 +136,11 @@ def ingest_job_boards(
     http = ResilientHttp(delay_ms=settings.BOARD_INGEST_DELAY_MS, proxy_pool=pool)
     detail_http = ResilientHttp(delay_ms=settings.BOARD_DETAIL_DELAY_MS, proxy_pool=pool)
 
-    counts: dict[str, int] = {}
-    steps: list[tuple[str, Callable[[], int]]] = [
-        (BOARD_CLIMATEBASE, lambda: _ingest_climatebase(repo, settings, http, detail_http, bq, ingest_batch_id, fetched_at)),
-        (BOARD_80000HOURS, lambda: _ingest_80000hours(repo, settings, http, bq, ingest_batch_id, fetched_at)),
-        (BOARD_ESCAPETHECITY, lambda: _ingest_escapethecity(repo, settings, http, bq, ingest_batch_id, fetched_at)),
-        (BOARD_TECHJOBSFORGOOD, lambda: _ingest_techjobsforgood(repo, settings, http, detail_http, bq, ingest_batch_id, fetched_at)),
+    steps: list[tuple[str, Callable[[], _FetchedBoard]]] = [
+        (BOARD_CLIMATEBASE, lambda: _fetch_climatebase(settings, http, detail_http)),
+        (BOARD_80000HOURS, lambda: _fetch_80000hours(settings, http)),
+        (BOARD_ESCAPETHECITY, lambda: _fetch_escapethecity(settings, http)),
+        (BOARD_TECHJOBSFORGOOD, lambda: _fetch_techjobsforgood(settings, http, detail_http)),
     ]
     # API/feed boards: (board id, enabled, zero-arg fetch, normalizer).
     api_boards: tuple[tuple[str, bool, Callable[[], Any], Callable[..., dict[str, Any]]], ...] = (
@@ -191,9 +212,7 @@ def ingest_job_boards(
         steps.append(
             (
                 board_id,
-                lambda ff=fetch_fn, nf=norm_fn, bid=board_id: _ingest_api_board(
-                    repo, settings, ff, nf, bid, bq, ingest_batch_id, fetched_at
-                ),
+                lambda ff=fetch_fn, nf=norm_fn, bid=board_id: _fetch_api_board(settings, ff, nf, bid),
             )
         )
 
@@ -215,90 +234,104 @@ def ingest_job_boards(
         steps.append(
             (
                 board_id,
-                lambda m=mod, nf=norm_fn, bid=board_id: _ingest_html_board(
-                    repo, settings, m, nf, bid, bq, ingest_batch_id, fetched_at
-                ),
+                lambda m=mod, nf=norm_fn, bid=board_id: _fetch_html_board(m, nf, bid),
             )
         )
-    stats: list[dict[str, Any]] = []
-    for board_id, fn in steps:
+
+    workers = max(1, settings.BOARD_FETCH_WORKERS)
+    # With a single worker boards run back to back, so keep the pause between them.
+    pause_s = settings.BOARD_PAUSE_BETWEEN_MS / 1000.0 if workers == 1 else 0.0
+
+    def fetch(board_id: str, fn: Callable[[], _FetchedBoard]) -> _FetchedBoard:
         logger.info("Job board ingest: %s", board_id)
-        error: str | None = None
         try:
-            counts[board_id] = fn()
-        except Exception as exc:  # noqa: BLE001
-            logger.error("Job board %s failed: %s", board_id, exc)
-            counts[board_id] = 0
-            error = str(exc)[:300]
-        stats.append(
-            {
+            return fn()
+        finally:
+            polite_sleep(pause_s)
+
+    counts: dict[str, int] = {}
+    stats_by_board: dict[str, dict[str, Any]] = {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="board-fetch") as executor:
+        futures = {executor.submit(fetch, board_id, fn): board_id for board_id, fn in steps}
+        for fut in as_completed(futures):
+            board_id = futures[fut]
+            fetched: _FetchedBoard | None = None
+            error: str | None = None
+            # One connection and one commit per board; fetches never run inside it.
+            with repo.write_session():
+                try:
+                    fetched = fut.result()
+                    counts[board_id] = _persist_fetched_board(
+                        repo,
+                        settings,
+                        board_id,
+                        fetched,
+                        bq=bq,
+                        ingest_batch_id=ingest_batch_id,
+                        fetched_at=fetched_at,
+                    )
+                except Exception as exc:  # noqa: BLE001
+                    logger.error("Job board %s failed: %s", board_id, exc)
+                    counts[board_id] = 0
+                    error = str(exc)[:300]
+            stats_by_board[board_id] = {
                 "source": board_id,
-                "fetched": _LAST_FETCH_COUNTS.get(board_id, 0),
+                "fetched": fetched.fetched if fetched else 0,
                 "passed": counts[board_id],
-                "error": error or _LAST_FETCH_ERRORS.get(board_id),
+                "error": error or (fetched.error if fetched else None),
             }
-        )
-        polite_sleep(settings.BOARD_PAUSE_BETWEEN_MS / 1000.0)
-    repo.record_source_stats(stats, run_at=fetched_at or None)
-    return counts
+    repo.record_source_stats([stats_by_board[bid] for bid, _fn in steps], run_at=fetched_at or None)
+    return {bid: counts[bid] for bid, _fn in steps}
 
 
-def _persist_board_job(
+def _persist_fetched_board(
     repo: JobRepository,
     settings: Settings,
-    norm: dict[str, Any],
+    board_id: str,
+    board: _FetchedBoard,
     *,
     bq: JobBigQuery | None,
     ingest_batch_id: str,
     fetched_at: str,
-    raw_payload: dict[str, Any] | None = None,
-    request_url: str | None = None,
-    http_status: int = 200,
-) -> bool:
-    """Upsert job; return True if prefilter passed."""
-    mine_employer_candidate(norm, discovery_source=norm.get("source") or norm.get("ats_slug") or "job_board")
-    if bq and raw_payload is not None:
-        bq.insert_raw_payload(
-            fetched_at=fetched_at,
-            ingest_batch_id=ingest_batch_id,
-            ats_type=norm["ats_type"],
-            ats_slug=norm["ats_slug"],
-            company_name=norm["company_name"],
-            source_job_id=norm["source_job_id"],
-            request_url=request_url,
-            http_status=http_status,
-            payload_kind="listing_item",
-            payload=raw_payload,
-        )
-
-    jid = persist_normalized_job(repo, settings, norm, bq=bq, ingested_at=fetched_at)
-    saved = repo.get_job(jid)
-    return bool(saved and saved["prefilter_pass"])
+) -> int:
+    """Normalize and upsert one fetched board; return how many jobs passed the prefilter."""
+    norms: list[dict[str, Any]] = []
+    for raw in board.raw_jobs:
+        norm = board.normalize(raw)
+        if norm is None:
+            continue
+        mine_employer_candidate(norm, discovery_source=norm.get("source") or norm.get("ats_slug") or "job_board")
+        if bq:
+            bq.insert_raw_payload(
+                fetched_at=fetched_at,
+                ingest_batch_id=ingest_batch_id,
+                ats_type=norm["ats_type"],
+                ats_slug=norm["ats_slug"],
+                company_name=norm["company_name"],
+                source_job_id=norm["source_job_id"],
+                request_url=board.request_url,
+                http_status=200,
+                payload_kind="listing_item",
+                payload=raw,
+            )
+        norms.append(norm)
+    job_ids = persist_normalized_jobs(repo, settings, norms, bq=bq, ingested_at=fetched_at)
+    n = 0
+    for jid in job_ids:
+        saved = repo.get_job(jid)
+        n += bool(saved and saved["prefilter_pass"])
+    logger.info("%s: fetched=%s prefilter_pass=%s", board_id, board.fetched, n)
+    return n
 
 
-def _ingest_climatebase(
-    repo: JobRepository,
-    settings: Settings,
-    http: ResilientHttp,
-    detail_http: ResilientHttp,
-    bq: JobBigQuery | None,
-    ingest_batch_id: str,
-    fetched_at: str,
-) -> int:
+def _fetch_climatebase(settings: Settings, http: ResilientHttp, detail_http: ResilientHttp) -> _FetchedBoard:
     resp = http.get(JOBS_URL, headers={**BROWSER_HEADERS, "Referer": "https://climatebase.org/"})
     payload = _parse_next_data(resp.text)
     rows = payload.get("props", {}).get("pageProps", {}).get("jobs") or []
     rows = rows[: settings.CLIMATEBASE_MAX_LISTINGS]
-    _LAST_FETCH_COUNTS[BOARD_CLIMATEBASE] = len(rows)
-    n = 0
+    raw_jobs: list[dict[str, Any]] = []
     for listing in rows:
-        title = str(listing.get("title") or "")
-        if not prefilter_title(
-            title,
-            include_keywords=settings.TARGET_ROLE_KEYWORDS,
-            exclude_keywords=settings.EXCLUDE_TITLE_KEYWORDS,
-            seniority_exclude_keywords=getattr(settings, "SENIORITY_EXCLUDE_KEYWORDS", ()),
-        ):
+        if not _title_passes(settings, str(listing.get("title") or "")):
             continue
         detail = None
         if settings.CLIMATEBASE_FETCH_DETAILS:
@@ -314,111 +347,80 @@ def _ingest_climatebase(
                     detail = dpayload.get("props", {}).get("pageProps", {})
                 except Exception as exc:  # noqa: BLE001
                     logger.warning("Climatebase detail %s: %s", jid, exc)
-        norm = normalize_climatebase_listing(listing, detail)
-        if _persist_board_job(
-            repo,
-            settings,
-            norm,
-            bq=bq,
-            ingest_batch_id=ingest_batch_id,
-            fetched_at=fetched_at,
-            raw_payload={"listing": listing, "detail": detail},
-            request_url=JOBS_URL,
-        ):
-            n += 1
-    return n
+        raw_jobs.append({"listing": listing, "detail": detail})
+    return _FetchedBoard(
+        raw_jobs=raw_jobs,
+        normalize=lambda raw: normalize_climatebase_listing(raw["listing"], raw["detail"]),
+        request_url=JOBS_URL,
+        fetched=len(rows),
+    )
 
 
-def _ingest_80000hours(
-    repo: JobRepository,
-    settings: Settings,
+def _fetch_algolia_hits(
     http: ResilientHttp,
-    bq: JobBigQuery | None,
-    ingest_batch_id: str,
-    fetched_at: str,
-) -> int:
+    url: str,
+    headers: dict[str, str],
+    *,
+    max_pages: int,
+    extra_params: str = "",
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Hits from every page, and the error that stopped paging early (pages before it are kept)."""
+    hits: list[dict[str, Any]] = []
+    for page in range(max_pages):
+        params = f"hitsPerPage=100&page={page}{extra_params}"
+        try:
+            resp = http.post_json(url, body={"params": params}, extra_headers=headers)
+            resp.raise_for_status()
+            page_hits = resp.json().get("hits") or []
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Algolia page %s of %s failed after %s hits: %s", page, url, len(hits), exc)
+            return hits, f"page {page}: {exc}"[:300]
+        if not page_hits:
+            break
+        hits.extend(page_hits)
+    return hits, None
+
+
+def _fetch_80000hours(settings: Settings, http: ResilientHttp) -> _FetchedBoard:
     headers = {
         "X-Algolia-Application-Id": ALGOLIA_APP_ID,
         "X-Algolia-API-Key": ALGOLIA_API_KEY,
         "Content-Type": "application/json",
     }
-    n = 0
-    _LAST_FETCH_COUNTS[BOARD_80000HOURS] = 0
-    for page in range(settings.BOARD_80000HOURS_MAX_PAGES):
-        params = f"hitsPerPage=100&page={page}"
-        resp = http.post_json(ALGOLIA_URL, body={"params": params}, extra_headers=headers)
-        resp.raise_for_status()
-        hits = resp.json().get("hits") or []
-        if not hits:
-            break
-        _LAST_FETCH_COUNTS[BOARD_80000HOURS] += len(hits)
-        for hit in hits:
-            job = normalize_80k_hit(hit)
-            norm = normalize_80000hours(job)
-            if _persist_board_job(
-                repo,
-                settings,
-                norm,
-                bq=bq,
-                ingest_batch_id=ingest_batch_id,
-                fetched_at=fetched_at,
-                raw_payload=hit,
-                request_url=ALGOLIA_URL,
-            ):
-                n += 1
-    return n
+    hits, error = _fetch_algolia_hits(http, ALGOLIA_URL, headers, max_pages=settings.BOARD_80000HOURS_MAX_PAGES)
+    return _FetchedBoard(
+        raw_jobs=hits,
+        normalize=lambda hit: normalize_80000hours(normalize_80k_hit(hit)),
+        request_url=ALGOLIA_URL,
+        fetched=len(hits),
+        error=error,
+    )
 
 
-def _ingest_escapethecity(
-    repo: JobRepository,
-    settings: Settings,
-    http: ResilientHttp,
-    bq: JobBigQuery | None,
-    ingest_batch_id: str,
-    fetched_at: str,
-) -> int:
+def _fetch_escapethecity(settings: Settings, http: ResilientHttp) -> _FetchedBoard:
     url = f"https://{ETC_APP_ID}-dsn.algolia.net/1/indexes/{ETC_INDEX}/query"
     headers = {
         "X-Algolia-Application-Id": ETC_APP_ID,
         "X-Algolia-API-Key": ETC_API_KEY,
         "Content-Type": "application/json",
     }
-    n = 0
-    _LAST_FETCH_COUNTS[BOARD_ESCAPETHECITY] = 0
-    for page in range(settings.BOARD_ESCAPETHECITY_MAX_PAGES):
-        params = f"hitsPerPage=100&page={page}&filters={ETC_JOB_FILTER}"
-        resp = http.post_json(url, body={"params": params}, extra_headers=headers)
-        resp.raise_for_status()
-        hits = resp.json().get("hits") or []
-        if not hits:
-            break
-        _LAST_FETCH_COUNTS[BOARD_ESCAPETHECITY] += len(hits)
-        for hit in hits:
-            job = normalize_etc_hit(hit)
-            norm = normalize_escapethecity(job)
-            if _persist_board_job(
-                repo,
-                settings,
-                norm,
-                bq=bq,
-                ingest_batch_id=ingest_batch_id,
-                fetched_at=fetched_at,
-                raw_payload=hit,
-                request_url=url,
-            ):
-                n += 1
-    return n
+    hits, error = _fetch_algolia_hits(
+        http,
+        url,
+        headers,
+        max_pages=settings.BOARD_ESCAPETHECITY_MAX_PAGES,
+        extra_params=f"&filters={ETC_JOB_FILTER}",
+    )
+    return _FetchedBoard(
+        raw_jobs=hits,
+        normalize=lambda hit: normalize_escapethecity(normalize_etc_hit(hit)),
+        request_url=url,
+        fetched=len(hits),
+        error=error,
+    )
 
 
-def _ingest_techjobsforgood(
-    repo: JobRepository,
-    settings: Settings,
-    http: ResilientHttp,
-    detail_http: ResilientHttp,
-    bq: JobBigQuery | None,
-    ingest_batch_id: str,
-    fetched_at: str,
-) -> int:
+def _fetch_techjobsforgood(settings: Settings, http: ResilientHttp, detail_http: ResilientHttp) -> _FetchedBoard:
     resp = http.get(
         TJFG_JOBS_URL,
         try_direct=True,
@@ -426,16 +428,10 @@ def _ingest_techjobsforgood(
         proxy_only=False,
     )
     listings = _parse_listing_cards(resp.text)
-    _LAST_FETCH_COUNTS[BOARD_TECHJOBSFORGOOD] = len(listings)
-    n = 0
+    raw_jobs: list[dict[str, Any]] = []
     for listing in listings:
         title = str(listing.get("title") or "")
-        if not prefilter_title(
-            title,
-            include_keywords=settings.TARGET_ROLE_KEYWORDS,
-            exclude_keywords=settings.EXCLUDE_TITLE_KEYWORDS,
-            seniority_exclude_keywords=getattr(settings, "SENIORITY_EXCLUDE_KEYWORDS", ()),
-        ):
+        if not _title_passes(settings, title):
             continue
         detail = None
         if settings.TJFG_FETCH_DETAILS and listing.get("id"):
@@ -454,136 +450,80 @@ def _ingest_techjobsforgood(
                 }
             except Exception as exc:  # noqa: BLE001
                 logger.warning("TJFG detail %s: %s", listing.get("id"), exc)
-        norm = normalize_techjobsforgood(listing, detail)
-        if _persist_board_job(
-            repo,
-            settings,
-            norm,
-            bq=bq,
-            ingest_batch_id=ingest_batch_id,
-            fetched_at=fetched_at,
-            raw_payload={"listing": listing, "detail": detail},
-            request_url=TJFG_JOBS_URL,
-        ):
-            n += 1
-    return n
+        raw_jobs.append({"listing": listing, "detail": detail})
+    return _FetchedBoard(
+        raw_jobs=raw_jobs,
+        normalize=lambda raw: normalize_techjobsforgood(raw["listing"], raw["detail"]),
+        request_url=TJFG_JOBS_URL,
+        fetched=len(listings),
+    )
 
 
-def _ingest_reliefweb(
-    repo: JobRepository,
-    settings: Settings,
-    http: ResilientHttp,
-    bq: JobBigQuery | None,
-    ingest_batch_id: str,
-    fetched_at: str,
-) -> int:
-    if not settings.reliefweb_configured():
-        return 0
-    appname = settings.RELIEFWEB_APPNAME
+def _fetch_reliefweb(settings: Settings, http: ResilientHttp) -> _FetchedBoard:
     api = "https://api.reliefweb.int/v2/jobs"
-    n = 0
-    offset = 0
-    limit = min(100, settings.RELIEFWEB_JOBS_LIMIT)
-    while offset < settings.RELIEFWEB_JOBS_LIMIT:
-        url = f"{api}?appname={appname}&limit={limit}&offset={offset}&profile=full&sort[]=date:desc"
-        resp = http.get(url)
-        resp.raise_for_status()
-        data = resp.json()
-        items = data.get("data") or []
-        if not items:
-            break
-        for item in items:
-            norm = normalize_reliefweb(item)
-            if _persist_board_job(
-                repo,
-                settings,
-                norm,
-                bq=bq,
-                ingest_batch_id=ingest_batch_id,
-                fetched_at=fetched_at,
-                raw_payload=item,
-                request_url=url,
-            ):
-                n += 1
-        offset += len(items)
-        total = (data.get("total") or {}).get("value")
-        if total is not None and offset >= int(total):
-            break
-        polite_sleep(0.5)
-    return n
+    items: list[dict[str, Any]] = []
+    error: str | None = None
+    if settings.reliefweb_configured():
+        appname = settings.RELIEFWEB_APPNAME
+        limit = min(100, settings.RELIEFWEB_JOBS_LIMIT)
+        while len(items) < settings.RELIEFWEB_JOBS_LIMIT:
+            offset = len(items)
+            url = f"{api}?appname={appname}&limit={limit}&offset={offset}&profile=full&sort[]=date:desc"
+            try:
+                resp = http.get(url)
+                resp.raise_for_status()
+                data = resp.json()
+            except Exception as exc:  # noqa: BLE001
+                # Keep the pages already fetched; the stats row records why paging stopped.
+                logger.warning("ReliefWeb offset %s failed after %s jobs: %s", offset, len(items), exc)
+                error = f"offset {offset}: {exc}"[:300]
+                break
+            page = data.get("data") or []
+            if not page:
+                break
+            items.extend(page)
+            total = (data.get("total") or {}).get("value")
+            if total is not None and len(items) >= int(total):
+                break
+            polite_sleep(0.5)
+    return _FetchedBoard(
+        raw_jobs=items, normalize=normalize_reliefweb, request_url=api, fetched=len(items), error=error
+    )
 
 
-def _ingest_html_board(
-    repo: JobRepository,
-    settings: Settings,
-    module,
-    normalize_fn,
-    board_id: str,
-    bq: JobBigQuery | None,
-    ingest_batch_id: str,
-    fetched_at: str,
-) -> int:
+def _fetch_html_board(module, normalize_fn, board_id: str) -> _FetchedBoard:
     listings = module.fetch_jobs()
-    _LAST_FETCH_COUNTS[board_id] = len(listings)
-    n = 0
-    for listing in listings:
-        norm = normalize_fn(listing)
-        if _persist_board_job(
-            repo,
-            settings,
-            norm,
-            bq=bq,
-            ingest_batch_id=ingest_batch_id,
-            fetched_at=fetched_at,
-            raw_payload=listing,
-            request_url=getattr(module, "LIST_URL", board_id),
-        ):
-            n += 1
-    return n
+    return _FetchedBoard(
+        raw_jobs=listings,
+        normalize=normalize_fn,
+        request_url=getattr(module, "LIST_URL", board_id),
+        fetched=len(listings),
+    )
 
 
-def _ingest_api_board(
-    repo: JobRepository,
-    settings: Settings,
-    fetch_fn,
-    normalize_fn,
-    board_id: str,
-    bq: JobBigQuery | None,
-    ingest_batch_id: str,
-    fetched_at: str,
-) -> int:
+def _fetch_api_board(settings: Settings, fetch_fn, normalize_fn, board_id: str) -> _FetchedBoard:
     result = fetch_fn()
-    _LAST_FETCH_COUNTS[board_id] = int(result.job_count or 0)
-    _LAST_FETCH_ERRORS.pop(board_id, None)
-    if not result.ok:
-        logger.error("%s fetch failed: %s", board_id, result.error)
-        _LAST_FETCH_ERRORS[board_id] = str(result.error or "fetch failed")[:300]
-        return 0
-    jobs = list(result.jobs or [])
-    n = 0
-    for job in jobs:
+
+    def normalize(job: dict[str, Any]) -> dict[str, Any] | None:
         # Gate on the NORMALIZED title: raw payloads disagree about where the title
         # lives (Jobicy uses jobTitle, RemoteOK position, HN has none at all — its
         # title is parsed out of the comment body), and WWR's raw title is prefixed
         # with the company name. Normalizing first is cheap and uniform.
         norm = normalize_fn(job)
-        if not prefilter_title(
-            str(norm.get("title") or ""),
-            include_keywords=settings.TARGET_ROLE_KEYWORDS,
-            exclude_keywords=settings.EXCLUDE_TITLE_KEYWORDS,
-            seniority_exclude_keywords=getattr(settings, "SENIORITY_EXCLUDE_KEYWORDS", ()),
-        ):
-            continue
-        if _persist_board_job(
-            repo,
-            settings,
-            norm,
-            bq=bq,
-            ingest_batch_id=ingest_batch_id,
-            fetched_at=fetched_at,
-            raw_payload=job,
+        return norm if _title_passes(settings, str(norm.get("title") or "")) else None
+
+    if not result.ok:
+        logger.error("%s fetch failed: %s", board_id, result.error)
+        return _FetchedBoard(
+            raw_jobs=[],
+            normalize=normalize,
             request_url=board_id,
-        ):
-            n += 1
-    logger.info("%s: fetched=%s prefilter_pass=%s", board_id, result.job_count, n)
-    return n
+            fetched=int(result.job_count or 0),
+            error=str(result.error or "fetch failed")[:300],
+        )
+    return _FetchedBoard(
+        raw_jobs=list(result.jobs or []),
+        normalize=normalize,
+        request_url=board_id,
+        fetched=int(result.job_count or 0),
+    )
@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 import logging
+import threading
 import time
-from typing import Any
+from contextlib import contextmanager
+from typing import Any, Iterator
+from urllib.parse import urlparse
 
 import httpx
 
@@ -15,7 +18,11 @@ logger = logging.getLogger(__name__)
 
 
 class ResilientHttp:
-    """Sequential client: polite delay, retries, proxy fallback when blocked."""
+    """Polite client: per-host delay, retries, proxy fallback when blocked.
+
+    Safe to share between board fetch threads: requests to one host run one at a
+    time with ``delay_ms`` between them, while different hosts proceed in parallel.
+    """
 
     def __init__(
         self,
@@ -27,19 +34,29 @@ class ResilientHttp:
         self._delay_ms = max(0, int(delay_ms))
         self._proxy_pool = proxy_pool
         self._timeout = timeout
-        self._last_end = 0.0
-
-    def _throttle(self) -> None:
-        if self._delay_ms <= 0:
-            return
-        gap = self._delay_ms / 1000.0
-        now = time.monotonic()
-        wait_s = gap - (now - self._last_end)
-        if wait_s > 0:
-            time.sleep(wait_s)
-
-    def _mark_done(self) -> None:
-        self._last_end = time.monotonic()
+        self._last_end: dict[str, float] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._global_lock = threading.Lock()
+
+    def _host_lock(self, host: str) -> threading.Lock:
+        with self._global_lock:
+            if host not in self._locks:
+                self._locks[host] = threading.Lock()
+            return self._locks[host]
+
+    @contextmanager
+    def _polite(self, url: str) -> Iterator[None]:
+        """Hold the host's slot for one attempt, ``delay_ms`` after its previous one ended."""
+        host = urlparse(url).netloc or "default"
+        with self._host_lock(host):
+            if self._delay_ms > 0:
+                wait_s = self._delay_ms / 1000.0 - (time.monotonic() - self._last_end.get(host, 0.0))
+                if wait_s > 0:
+                    time.sleep(wait_s)
+            try:
+                yield
+            finally:
+                self._last_end[host] = time.monotonic()
 
     @staticmethod
     def looks_blocked(html: str, status_code: int) -> bool:
@@ -69,14 +86,12 @@ class ResilientHttp:
 
         if try_direct and not proxy_only:
             try:
-                self._throttle()
-                with httpx.Client(
+                with self._polite(url), httpx.Client(
                     headers=hdrs,
                     timeout=self._timeout,
                     follow_redirects=True,
                 ) as client:
                     resp = client.get(url)
-                self._mark_done()
                 if not self.looks_blocked(resp.text, resp.status_code):
                     return resp
                 errors.append(f"direct: blocked (HTTP {resp.status_code})")
@@ -86,15 +101,13 @@ class ResilientHttp:
         if try_proxies and self._proxy_pool:
             for ep in self._proxy_pool.cycle():
                 try:
-                    self._throttle()
-                    with httpx.Client(
+                    with self._polite(url), httpx.Client(
                         proxy=ep.url,
                         headers=hdrs,
                         timeout=self._timeout,
                         follow_redirects=True,
                     ) as client:
                         resp = client.get(url)
-                    self._mark_done()
                     if not self.looks_blocked(resp.text, resp.status_code):
                         logger.debug("OK via proxy %s for %s", ep.label(), url[:60])
                         return resp
@@ -119,14 +132,12 @@ class ResilientHttp:
 
         if try_direct:
             try:
-                self._throttle()
-                with httpx.Client(
+                with self._polite(url), httpx.Client(
                     headers=hdrs,
                     timeout=self._timeout,
                     follow_redirects=True,
                 ) as client:
                     resp = client.post(url, content=content)
-                self._mark_done()
                 if resp.status_code < 500:
                     return resp
                 errors.append(f"direct: HTTP {resp.status_code}")
@@ -136,15 +147,13 @@ class ResilientHttp:
         if try_proxies and self._proxy_pool:
             for ep in self._proxy_pool.cycle():
                 try:
-                    self._throttle()
-                    with httpx.Client(
+                    with self._polite(url), httpx.Client(
                         proxy=ep.url,
                         headers=hdrs,
                         timeout=self._timeout,
                         follow_redirects=True,
                     ) as client:
                         resp = client.post(url, content=content)
-                    self._mark_done()
                     if resp.status_code < 500:
                         return resp
                     errors.append(f"{ep.label()}: HTTP {resp.status_code}")
@@ -0,0 +1,104 @@
+"""Token-aware packing of jobs into multi-job scoring requests.
+
+Token counts are estimated from characters (~4 per token for English prose);
+the estimate only has to keep a batch well inside the model's limits, not be
+exact.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Sequence, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text or "") // CHARS_PER_TOKEN + 1
+
+
+def pack_batches(items: Sequence[tuple[T, int]], *, max_jobs: int, token_budget: int) -> list[list[T]]:
+    """Group ``(item, tokens)`` pairs into batches of at most ``max_jobs`` and ``token_budget``.
+
+    Items are packed shortest first, so each batch holds jobs of similar length and
+    one long posting does not drag a batch of short ones past the budget. An item
+    larger than the budget on its own still gets a batch of one.
+    """
+    max_jobs = max(1, max_jobs)
+    batches: list[list[T]] = []
+    current: list[T] = []
+    used = 0
+    for item, tokens in sorted(items, key=lambda pair: pair[1]):
+        if current and (len(current) >= max_jobs or used + tokens > token_budget):
+            batches.append(current)
+            current, used = [], 0
+        current.append(item)
+        used += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+class BatchSizeLearner:
+    """Largest batch size that parses reliably, per model, persisted between runs.
+
+    A batch that parses at the current limit raises it by one (up to ``ceiling``);
+    a batch whose reply is truncated or unparseable halves the limit below the
+    failed size. Failures then cost one bisection once instead of on every batch
+    of the run. Callers don't record batches that got no reply at all.
+    """
+
+    def __init__(self, path: Path | None, *, initial: int, ceiling: int):
+        self._path = path
+        self._initial = max(1, initial)
+        self._ceiling = max(self._initial, ceiling)
+        self._lock = threading.Lock()
+        self._limits: dict[str, int] = self._load()
+
+    def _load(self) -> dict[str, int]:
+        if self._path is None:
+            return {}
+        try:
+            data = json.loads(self._path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return {str(k): int(v) for k, v in data.items() if isinstance(v, int) and v > 0}
+
+    def save(self) -> None:
+        if self._path is None:
+            return
+        with self._lock:
+            payload = dict(self._limits)
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._path.write_text(json.dumps(payload, sort_keys=True), encoding="utf-8")
+        except OSError as exc:  # pragma: no cover - disk issues shouldn't kill a run
+            logger.debug("could not persist batch sizes: %s", exc)
+
+    def limit(self, model: str) -> int:
+        with self._lock:
+            return min(self._ceiling, self._limits.get(model, self._initial))
+
+    def record(self, model: str, size: int, ok: bool) -> None:
+        if size <= 1:
+            return  # single-job prompts say nothing about batch parsing
+        with self._lock:
+            current = min(self._ceiling, self._limits.get(model, self._initial))
+            if ok and size >= current:
+                new = min(self._ceiling, current + 1)
+            elif not ok:
+                new = max(1, min(current, size // 2))
+            else:
+                return
+            if new != current:
+                logger.info("Batch size for %s: %s -> %s", model, current, new)
+            self._limits[model] = new
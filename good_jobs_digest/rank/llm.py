@@ -144,11 +144,26 @@ class GeminiClient:
             Path(getattr(settings, "GEMINI_USAGE_PATH", "data/gemini_usage.json")),
             int(getattr(settings, "GEMINI_DAILY_REQUEST_BUDGET", 800)),
         )
+        self._local = threading.local()
 
     @property
     def usage(self) -> UsageLedger:
         return self._ledger
 
+    @property
+    def last_call_unanswered(self) -> bool:
+        """True when this thread's last failed ``generate_json`` never got a model reply.
+
+        Network errors, 429/5xx and retired models set it; empty or unparseable
+        replies do not.
+        """
+        return getattr(self._local, "unanswered", False)
+
+    @property
+    def model(self) -> str:
+        """Model requests currently go to (changes when a fallback takes over)."""
+        return self._model
+
     def generate_json(
         self,
         prompt: str,
@@ -173,6 +188,7 @@ class GeminiClient:
             config["response_schema"] = schema
 
         delay = 2.0
+        answered = False
         # Model swaps shouldn't eat the retry budget meant for transient errors.
         for attempt in range(1, self._max_retries + len(self._fallbacks) + 1):
             self._ledger.reserve()  # propagates BudgetExhausted
@@ -183,6 +199,7 @@ class GeminiClient:
                     contents=prompt,
                     config=types.GenerateContentConfig(**config),
                 )
+                answered = True
                 text = (getattr(response, "text", "") or "").strip()
                 if not text:
                     logger.info("gemini returned empty text (attempt %s)", attempt)
@@ -213,4 +230,5 @@ class GeminiClient:
                     break
                 time.sleep(delay)
                 delay *= 2
+        self._local.unanswered = not answered
         return None
@@ -14,32 +14,34 @@ Rules, in order:
    role-family qualifier together with an engineer/engineering token.
 
 No ML/machine-learning qualifiers on purpose — ML roles are not targeted.
+
+All keyword lists are compiled once into a ``TitleGate`` (cached per keyword
+set), which finds every matching keyword in a single pass over the title.
 """
 
 from __future__ import annotations
 
-import re
 from dataclasses import dataclass
 from functools import lru_cache
-from typing import Iterable
+from typing import Iterable, Sequence
 
 # Role-family qualifiers marking a title as data/analytics/AI engineering.
-_ROLE_FAMILY_RES: tuple[re.Pattern[str], ...] = tuple(
-    re.compile(p)
-    for p in (
-        r"\bdata\b",
-        r"\banalytics?\b",
-        r"\bai\b",
-        r"\bartificial intelligence\b",
-        r"\betl\b",
-        r"\belt\b",
-        r"\bpipelines?\b",
-        r"\bintegrations?\b",
-        r"\bplatform\b",
-    )
+_ROLE_FAMILY_WORDS = (
+    "data",
+    "analytic",
+    "analytics",
+    "ai",
+    "artificial intelligence",
+    "etl",
+    "elt",
+    "pipeline",
+    "pipelines",
+    "integration",
+    "integrations",
+    "platform",
 )
 
-_ENGINEER_TOKEN_RE = re.compile(r"\bengineer(?:ing)?\b")
+_ENGINEER_WORDS = ("engineer", "engineering")
 
 # Exclude keywords that describe an engineering discipline which may legitimately
 # co-occur with a data/AI qualifier. They reject only qualifier-less titles.
@@ -65,14 +67,13 @@ _DISCIPLINE_EXCLUDES = frozenset(
     }
 )
 
-
-@lru_cache(maxsize=1024)
-def _word_re(keyword: str) -> re.Pattern[str]:
-    return re.compile(r"\b" + re.escape(keyword) + r"\b")
+# Keyword groups in the automaton; a match is reported as (group, index in its list).
+_INCLUDE, _EXCLUDE, _SENIORITY, _FAMILY, _ENGINEER = range(5)
+_END = ""  # trie key holding the matches that end at a node (never a character)
 
 
-def _has_role_family(title: str) -> bool:
-    return any(p.search(title) for p in _ROLE_FAMILY_RES)
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"  # same class as regex \w
 
 
 @dataclass(frozen=True)
@@ -81,6 +82,118 @@ class TitleVerdict:
     reason: str | None = None
 
 
+class TitleGate:
+    """All gate keywords compiled into one character trie, matched in a single scan.
+
+    A keyword matches where a word-boundary regex around it would: the trie is
+    walked from every word boundary and a match counts when it also ends on one.
+    Every matched keyword of every list comes back from the one pass, so verdicts
+    and reasons are the same as checking the lists one by one.
+    """
+
+    def __init__(
+        self,
+        include_keywords: Sequence[str],
+        exclude_keywords: Sequence[str],
+        seniority_exclude_keywords: Sequence[str] = (),
+    ):
+        self._exclude = list(exclude_keywords)
+        self._seniority = list(seniority_exclude_keywords)
+        self._root: dict = {}
+        groups = (
+            (_INCLUDE, include_keywords),
+            (_EXCLUDE, self._exclude),
+            (_SENIORITY, self._seniority),
+            (_FAMILY, _ROLE_FAMILY_WORDS),
+            (_ENGINEER, _ENGINEER_WORDS),
+        )
+        for group, words in groups:
+            for i, word in enumerate(words):
+                if not word:
+                    continue
+                node = self._root
+                for ch in word:
+                    node = node.setdefault(ch, {})
+                node.setdefault(_END, []).append((group, i))
+
+    def _scan(self, t: str) -> dict[int, list[int]]:
+        n = len(t)
+        word = [_is_word_char(ch) for ch in t]
+        word.append(False)
+        found: dict[int, list[int]] = {}
+        prev = False
+        for i in range(n):
+            here = word[i]
+            if here == prev:
+                continue  # not a word boundary
+            prev = here
+            node = self._root
+            j = i
+            while j < n:
+                node = node.get(t[j])
+                if node is None:
+                    break
+                j += 1
+                ends = node.get(_END)
+                if ends and word[j - 1] != word[j]:
+                    for group, idx in ends:
+                        found.setdefault(group, []).append(idx)
+        return found
+
+    def evaluate(self, title: str) -> TitleVerdict:
+        """Apply the title gate; returns pass/fail plus a short reason on failure."""
+        t = (title or "").lower().strip()
+        if not t:
+            return TitleVerdict(False, "empty title")
+
+        found = self._scan(t)
+        role_family = _FAMILY in found
+
+        for idx in sorted(found.get(_EXCLUDE, ())):
+            ex = self._exclude[idx]
+            if ex in _DISCIPLINE_EXCLUDES and role_family:
+                continue  # e.g. "Data Software Engineer" keeps its data qualifier
+            return TitleVerdict(False, f"excluded keyword: {ex}")
+
+        if _SENIORITY in found:
+            return TitleVerdict(False, f"seniority: {self._seniority[min(found[_SENIORITY])]}")
+
+        matched = _INCLUDE in found or (role_family and _ENGINEER in found)
+        if not matched:
+            return TitleVerdict(False, "no target role keyword")
+
+        return TitleVerdict(True, None)
+
+    def evaluate_titles(self, titles: Iterable[str]) -> list[TitleVerdict]:
+        """``evaluate`` over many titles; repeated titles are scanned once."""
+        seen: dict[str, TitleVerdict] = {}
+        out: list[TitleVerdict] = []
+        for title in titles:
+            verdict = seen.get(title)
+            if verdict is None:
+                verdict = seen[title] = self.evaluate(title)
+            out.append(verdict)
+        return out
+
+
+@lru_cache(maxsize=32)
+def compile_title_gate(
+    include_keywords: tuple[str, ...],
+    exclude_keywords: tuple[str, ...],
+    seniority_exclude_keywords: tuple[str, ...] = (),
+) -> TitleGate:
+    return TitleGate(include_keywords, exclude_keywords, seniority_exclude_keywords)
+
+
+def title_gate(settings) -> TitleGate:
+    """The compiled gate for the settings' current keyword lists."""
+    return compile_title_gate(
+        tuple(settings.TARGET_ROLE_KEYWORDS),
+        tuple(settings.EXCLUDE_TITLE_KEYWORDS),
+        tuple(getattr(settings, "SENIORITY_EXCLUDE_KEYWORDS", ())),
+    )
+
+
 def evaluate_title(
     title: str,
     *,
@@ -89,30 +202,22 @@ def evaluate_title(
     seniority_exclude_keywords: Iterable[str] = (),
 ) -> TitleVerdict:
     """Apply the title gate; returns pass/fail plus a short reason on failure."""
-    t = (title or "").lower().strip()
-    if not t:
-        return TitleVerdict(False, "empty title")
-
-    role_family = _has_role_family(t)
-
-    for ex in exclude_keywords:
-        if not ex or not _word_re(ex).search(t):
-            continue
-        if ex in _DISCIPLINE_EXCLUDES and role_family:
-            continue  # e.g. "Data Software Engineer" keeps its data qualifier
-        return TitleVerdict(False, f"excluded keyword: {ex}")
-
-    for kw in seniority_exclude_keywords:
-        if kw and _word_re(kw).search(t):
-            return TitleVerdict(False, f"seniority: {kw}")
-
-    matched = any(kw and _word_re(kw).search(t) for kw in include_keywords)
-    if not matched and role_family and _ENGINEER_TOKEN_RE.search(t):
-        matched = True
-    if not matched:
-        return TitleVerdict(False, "no target role keyword")
-
-    return TitleVerdict(True, None)
+    return compile_title_gate(
+        tuple(include_keywords), tuple(exclude_keywords), tuple(seniority_exclude_keywords)
+    ).evaluate(title)
+
+
+def evaluate_titles(
+    titles: Iterable[str],
+    *,
+    include_keywords: list[str],
+    exclude_keywords: list[str],
+    seniority_exclude_keywords: Iterable[str] = (),
+) -> list[TitleVerdict]:
+    """``evaluate_title`` for a batch of titles, compiling the keyword lists once."""
+    return compile_title_gate(
+        tuple(include_keywords), tuple(exclude_keywords), tuple(seniority_exclude_keywords)
+    ).evaluate_titles(titles)
 
 
 def prefilter_title(
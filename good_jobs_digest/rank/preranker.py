@@ -0,0 +1,261 @@
+"""Local pre-ranker: order unscored jobs by similarity to the profile before the LLM.
+
+The scoring budget then goes to the most promising jobs first, and jobs below a
+similarity cutoff are not sent to the LLM at all. Vectors come from a small
+sentence-embedding model when ``sentence-transformers`` is installed and from a
+pure-Python TF-IDF otherwise; both run on CPU. Job vectors are stored in SQLite
+(``job_embeddings``) and only recomputed when the embedded text changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import re
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Protocol, Sequence
+
+if False:  # TYPE_CHECKING
+    from config import Settings
+    from storage.repository import JobRepository
+
+logger = logging.getLogger(__name__)
+
+TFIDF_BACKEND = "tfidf"
+EMBED_DESC_CHARS = 2000
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_STOPWORDS = frozenset(
+    """
+    a an and are as at be been but by can do for from has have if in into is it its
+    of on or our so such that the their them they this to us was we were what when
+    where which while who will with would you your
+    """.split()
+)
+
+
+def job_text(row: Mapping[str, Any]) -> str:
+    # The title is the strongest signal a short description can't outweigh, so it
+    # goes in twice.
+    title = str(row["title"] or "")
+    desc = str(row["description_text"] or "")[:EMBED_DESC_CHARS]
+    return f"{title}\n{title}\n{desc}"
+
+
+def _tokens(text: str) -> list[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in _STOPWORDS]
+
+
+class EmbeddingBackend(Protocol):
+    name: str
+
+    def encode(self, texts: Sequence[str]) -> list[bytes]: ...
+
+    def similarities(self, profile_text: str, vectors: Sequence[bytes]) -> list[float]: ...
+
+
+class TfidfBackend:
+    """Bag-of-words cosine with IDF fitted once over the stored job vectors.
+
+    Stored vectors are raw term counts. The IDF table is fitted the first time
+    the pre-ranker runs and persisted with the backend name, so a job's
+    similarity doesn't depend on which other jobs are ranked alongside it and a
+    cutoff tuned by the backtest means the same in a score run. Delete the file
+    to refit (and re-tune the cutoff). Without a fitted table the IDF comes from
+    the vectors passed in.
+    """
+
+    name = "tfidf-v1"
+
+    def __init__(self, idf_path: Path | None = None):
+        self._idf_path = idf_path
+        self._idf: tuple[int, dict[str, int]] | None = self._load_idf()
+
+    def _load_idf(self) -> tuple[int, dict[str, int]] | None:
+        if self._idf_path is None:
+            return None
+        try:
+            data = json.loads(self._idf_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not isinstance(data, dict) or data.get("backend") != self.name:
+            return None
+        n_docs, df = data.get("n_docs"), data.get("df")
+        if not isinstance(n_docs, int) or n_docs <= 0 or not isinstance(df, dict):
+            return None
+        return n_docs, {str(t): int(c) for t, c in df.items()}
+
+    @property
+    def fitted_docs(self) -> int:
+        """Jobs the IDF table was fitted over; 0 = not fitted yet."""
+        return self._idf[0] if self._idf else 0
+
+    def fit(self, vectors: Iterable[bytes]) -> None:
+        df: Counter[str] = Counter()
+        n_docs = 0
+        for v in vectors:
+            df.update(json.loads(v).keys())
+            n_docs += 1
+        if not n_docs:
+            return
+        self._idf = (n_docs, dict(df))
+        if self._idf_path is None:
+            return
+        payload = {"backend": self.name, "n_docs": n_docs, "df": dict(df)}
+        try:
+            self._idf_path.parent.mkdir(parents=True, exist_ok=True)
+            self._idf_path.write_text(json.dumps(payload, sort_keys=True), encoding="utf-8")
+        except OSError as exc:  # pragma: no cover - disk issues shouldn't kill a run
+            logger.debug("could not persist TF-IDF table: %s", exc)
+
+    def encode(self, texts: Sequence[str]) -> list[bytes]:
+        return [json.dumps(Counter(_tokens(t)), sort_keys=True).encode("utf-8") for t in texts]
+
+    def similarities(self, profile_text: str, vectors: Sequence[bytes]) -> list[float]:
+        docs = [json.loads(v) for v in vectors]
+        profile = Counter(_tokens(profile_text))
+        if self._idf is not None:
+            n_docs, df = self._idf
+        else:
+            n_docs = len(docs) + 1
+            df = Counter(profile.keys())
+            for doc in docs:
+                df.update(doc.keys())
+
+        def weigh(counts: Mapping[str, int]) -> dict[str, float]:
+            weights = {
+                t: (1.0 + math.log(c)) * (math.log((1 + n_docs) / (1 + df.get(t, 0))) + 1.0)
+                for t, c in counts.items()
+            }
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            return {t: w / norm for t, w in weights.items()}
+
+        p = weigh(profile)
+        out: list[float] = []
+        for doc in docs:
+            d = weigh(doc)
+            if len(d) > len(p):
+                out.append(sum(w * d.get(t, 0.0) for t, w in p.items()))
+            else:
+                out.append(sum(w * p.get(t, 0.0) for t, w in d.items()))
+        return out
+
+
+class SentenceBackend:
+    """Normalized sentence-transformers embeddings compared by dot product."""
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+
+        self._model = SentenceTransformer(model_name, device="cpu")
+        self.name = f"st:{model_name}"
+
+    def _encode(self, texts: Sequence[str]) -> list[array]:
+        matrix = self._model.encode(list(texts), normalize_embeddings=True, convert_to_numpy=True)
+        return [array("f", row.astype("float32").tobytes()) for row in matrix]
+
+    def encode(self, texts: Sequence[str]) -> list[bytes]:
+        return [vec.tobytes() for vec in self._encode(texts)]
+
+    def similarities(self, profile_text: str, vectors: Sequence[bytes]) -> list[float]:
+        profile = self._encode([profile_text])[0]
+        out: list[float] = []
+        for blob in vectors:
+            vec = array("f")
+            vec.frombytes(blob)
+            out.append(sum(a * b for a, b in zip(profile, vec)))
+        return out
+
+
+def load_backend(settings: Settings) -> EmbeddingBackend:
+    model = (settings.PRERANK_MODEL or "").strip()
+    if model and model.lower() != TFIDF_BACKEND:
+        try:
+            return SentenceBackend(model)
+        except ImportError:
+            logger.info("sentence-transformers not installed — pre-ranking with TF-IDF")
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Embedding model %s unavailable (%s) — pre-ranking with TF-IDF", model, exc)
+    return TfidfBackend(settings.PRERANK_IDF_PATH)
+
+
+class PreRanker:
+    """Similarity of each job to the rendered scoring profile, with vectors cached in SQLite."""
+
+    def __init__(self, repo: JobRepository, backend: EmbeddingBackend, profile_text: str):
+        self._repo = repo
+        self._backend = backend
+        self._profile_text = profile_text
+
+    def similarities(self, rows: Sequence[Mapping[str, Any]]) -> dict[int, float]:
+        if not rows:
+            return {}
+        texts = {int(r["id"]): job_text(r) for r in rows}
+        hashes = {jid: hashlib.sha256(t.encode("utf-8")).hexdigest() for jid, t in texts.items()}
+        stored = self._repo.get_job_embeddings(list(texts), backend=self._backend.name)
+        stale = [jid for jid, h in hashes.items() if stored.get(jid, ("", b""))[0] != h]
+        if stale:
+            fresh = self._backend.encode([texts[jid] for jid in stale])
+            self._repo.put_job_embeddings(
+                self._backend.name, [(jid, hashes[jid], vec) for jid, vec in zip(stale, fresh)]
+            )
+            stored.update((jid, (hashes[jid], vec)) for jid, vec in zip(stale, fresh))
+            logger.info("Pre-ranker: embedded %s job(s) with %s", len(stale), self._backend.name)
+        if isinstance(self._backend, TfidfBackend) and not self._backend.fitted_docs:
+            self._backend.fit(self._repo.job_embedding_vectors(self._backend.name))
+            logger.info("Pre-ranker: fitted TF-IDF over %s stored job(s)", self._backend.fitted_docs)
+        ids = list(texts)
+        sims = self._backend.similarities(self._profile_text, [stored[jid][1] for jid in ids])
+        return dict(zip(ids, sims))
+
+    def rank(
+        self,
+        rows: Sequence[Mapping[str, Any]],
+        *,
+        min_similarity: float = 0.0,
+        limit: int | None = None,
+    ) -> list[Any]:
+        """Rows most similar first, dropping those under ``min_similarity``, capped at ``limit``."""
+        sims = self.similarities(rows)
+        ranked = sorted(rows, key=lambda r: sims[int(r["id"])], reverse=True)
+        kept = [r for r in ranked if sims[int(r["id"])] >= min_similarity]
+        if len(kept) < len(ranked):
+            logger.info(
+                "Pre-ranker: skipped %s job(s) below similarity %.3f",
+                len(ranked) - len(kept),
+                min_similarity,
+            )
+        if limit is not None and limit > 0:
+            kept = kept[:limit]
+        return kept
+
+
+@dataclass(frozen=True)
+class RecallPoint:
+    cutoff: float
+    kept: int
+    positives_kept: int
+    positives: int
+
+    @property
+    def recall(self) -> float:
+        return self.positives_kept / self.positives if self.positives else 1.0
+
+
+def recall_curve(
+    similarities: Sequence[float],
+    positives: Sequence[bool],
+    cutoffs: Sequence[float],
+) -> list[RecallPoint]:
+    """For each cutoff: jobs that would still reach the LLM and the share of good matches kept."""
+    total_pos = sum(1 for p in positives if p)
+    points: list[RecallPoint] = []
+    for cutoff in cutoffs:
+        kept = [p for s, p in zip(similarities, positives) if s >= cutoff]
+        points.append(RecallPoint(cutoff, len(kept), sum(1 for p in kept if p), total_pos))
+    return points
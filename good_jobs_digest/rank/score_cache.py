@@ -0,0 +1,97 @@
+"""Persistent LLM score cache: identical postings reuse an earlier JobScorePayload.
+
+A score depends on the posting as the model sees it and on everything else in the
+prompt, so the key hashes the normalized posting (description cut to what the
+prompt includes, title, company, mission category, location, remote flag and
+salary hint) together with the rendered scoring profile, the prompt template
+version and the model that produced the score. Changing any of those simply
+misses the cache; nothing has to be invalidated by hand.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+from typing import Any
+
+from pydantic import ValidationError
+
+from normalize.schema import JobScorePayload
+
+if False:  # TYPE_CHECKING
+    from storage.repository import JobRepository
+
+logger = logging.getLogger(__name__)
+
+_WS_RE = re.compile(r"\s+")
+
+
+def _norm_text(value: Any) -> str:
+    return _WS_RE.sub(" ", str(value or "")).strip().lower()
+
+
+def _sha(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def score_cache_key(
+    row: dict[str, Any],
+    *,
+    scoring_input: str,
+    prompt_version: str,
+    model: str,
+    desc_limit: int,
+) -> str:
+    # Whitespace/case-only edits and anything past the prompt's truncation point
+    # cannot change the score, so they must not change the key either.
+    desc = _norm_text(row.get("description_text"))[:desc_limit]
+    parts = [
+        _sha(desc),
+        _norm_text(row.get("title")),
+        _norm_text(row.get("company_name")),
+        _norm_text(row.get("mission_category")),
+        _norm_text(row.get("location_text")),
+        bool(row.get("is_remote")),
+        _norm_text(row.get("salary_text")),
+        _sha(scoring_input),
+        prompt_version,
+        model,
+    ]
+    return _sha(json.dumps(parts))
+
+
+class ScoreCache:
+    """SQLite-backed payload cache with per-run counters.
+
+    ``hits`` were answered without a call, ``misses`` were scored fresh, and
+    ``budget_skipped`` were left unscored because the daily LLM budget ran out.
+    """
+
+    def __init__(self, repo: JobRepository):
+        self._repo = repo
+        self.hits = 0
+        self.misses = 0
+        self.budget_skipped = 0
+
+    def lookup(self, keys: list[str]) -> dict[str, JobScorePayload]:
+        payloads: dict[str, JobScorePayload] = {}
+        for key, raw in self._repo.get_cached_scores(keys).items():
+            try:
+                payloads[key] = JobScorePayload.model_validate_json(raw)
+            except ValidationError:
+                logger.debug("Ignoring cached score %s that no longer validates", key[:12])
+        return payloads
+
+    def store(self, key: str, payload: JobScorePayload, *, model: str) -> None:
+        self._repo.put_cached_score(key, payload.as_dict(), model=model)
+
+    def record_run(self) -> None:
+        self._repo.record_score_cache_counts(self.hits, self.misses)
+        logger.info(
+            "Score cache: %s hit(s), %s miss(es), %s left unscored by the LLM budget",
+            self.hits,
+            self.misses,
+            self.budget_skipped,
+        )
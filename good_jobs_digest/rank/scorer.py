@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import re
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
@@ -14,7 +16,9 @@ from pydantic import ValidationError
 
 from config import Settings
 from normalize.schema import JobScorePayload
+from rank.batch_packing import BatchSizeLearner, estimate_tokens, pack_batches
 from rank.llm import BudgetExhausted, GeminiClient
+from rank.score_cache import ScoreCache, score_cache_key
 
 logger = logging.getLogger(__name__)
 
@@ -64,6 +68,17 @@ BATCH_SCORE_JSON_SCHEMA: dict[str, Any] = {
     },
 }
 
+# Output budget of a batch request: a score object is ~700 tokens of JSON, and
+# the model's output limit caps how many of them one response can hold.
+_OUTPUT_TOKENS_PER_JOB = 700
+_OUTPUT_TOKENS_OVERHEAD = 512
+_MAX_BATCH_OUTPUT_TOKENS = 16384
+_MAX_JOBS_BY_OUTPUT = (_MAX_BATCH_OUTPUT_TOKENS - _OUTPUT_TOKENS_OVERHEAD) // _OUTPUT_TOKENS_PER_JOB
+
+# Per-job prompt lines besides the description (company, title, location, ...).
+_JOB_HEADER_TOKENS = 80
+
+
 def _extract_json_object(text: str) -> str:
     if not text:
         return "{}"
@@ -101,21 +116,70 @@ def _truncate_desc(text: str, limit: int) -> str:
 
 
 class JobScorer:
-    def __init__(self, settings: Settings, llm: GeminiClient | None = None):
+    def __init__(
+        self,
+        settings: Settings,
+        llm: GeminiClient | None = None,
+        *,
+        cache: ScoreCache | None = None,
+        batch_sizes: BatchSizeLearner | None = None,
+    ):
         self._settings = settings
         self._desc_limit = int(getattr(settings, "LLM_DESC_TRUNCATE", 2000) or 2000)
         prompts = Path(__file__).parent / "prompts"
         self._template = (prompts / "score_job.txt").read_text(encoding="utf-8")
         self._batch_template = (prompts / "score_jobs_batch.txt").read_text(encoding="utf-8")
         self._llm = llm or GeminiClient(settings)
+        self._cache = cache
+        self._batch_sizes = batch_sizes or BatchSizeLearner(
+            None,
+            initial=settings.LLM_SCORE_BATCH_SIZE,
+            ceiling=getattr(settings, "LLM_SCORE_BATCH_MAX", settings.LLM_SCORE_BATCH_SIZE),
+        )
         self.budget_exhausted = False
+        # Per worker thread: whether the last failed _call_llm got no model reply at all.
+        self._last_call = threading.local()
+
+    @property
+    def _model(self) -> str:
+        # The client may have failed over to a fallback model mid-run.
+        return str(getattr(self._llm, "model", None) or self._settings.GEMINI_MODEL)
+
+    @property
+    def prompt_version(self) -> str:
+        """Hash of everything in the prompt besides the profile and the job itself."""
+        parts = [
+            self._template,
+            self._batch_template,
+            json.dumps(BATCH_SCORE_JSON_SCHEMA, sort_keys=True),
+            ", ".join(self._settings.TARGET_ROLE_KEYWORDS),
+        ]
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()[:16]
 
     def _max_tokens_for_batch(self, n_jobs: int) -> int:
         """Batch JSON needs more tokens than a single score object."""
         base = int(getattr(self._settings, "GEMINI_MAX_OUTPUT_TOKENS", 4096))
         if n_jobs <= 1:
             return base
-        return max(base, min(16384, 700 * n_jobs + 512))
+        return max(
+            base,
+            min(_MAX_BATCH_OUTPUT_TOKENS, _OUTPUT_TOKENS_PER_JOB * n_jobs + _OUTPUT_TOKENS_OVERHEAD),
+        )
+
+    def _job_tokens(self, row: dict[str, Any]) -> int:
+        desc = str(row.get("description_text") or "")[: self._desc_limit]
+        return _JOB_HEADER_TOKENS + estimate_tokens(desc)
+
+    def _pack(self, rows: list[dict[str, Any]], scoring_input: str) -> list[list[dict[str, Any]]]:
+        """Batches sized by the learned job limit and the prompt token budget."""
+        max_jobs = min(self._batch_sizes.limit(self._model), _MAX_JOBS_BY_OUTPUT)
+        fixed = estimate_tokens(self._batch_template) + estimate_tokens(scoring_input)
+        budget = int(getattr(self._settings, "LLM_BATCH_PROMPT_TOKENS", 32000)) - fixed
+        return pack_batches(
+            [(row, self._job_tokens(row)) for row in rows],
+            max_jobs=max_jobs,
+            token_budget=budget,
+        )
 
     def _call_llm(
         self,
@@ -125,8 +189,10 @@ class JobScorer:
         temperatures: tuple[float, ...] = (0.15, 0.0),
         max_output_tokens: int | None = None,
     ) -> dict[str, Any] | None:
+        self._last_call.unanswered = False
         if self.budget_exhausted:
             return None
+        answered = False
         for attempt, temp in enumerate(temperatures):
             try:
                 raw = self._llm.generate_json(
@@ -142,7 +208,10 @@ class JobScorer:
                 return None
             if raw is not None:
                 return raw
+            if not getattr(self._llm, "last_call_unanswered", False):
+                answered = True
             logger.info("score attempt %s produced no JSON", attempt + 1)
+        self._last_call.unanswered = not answered
         return None
 
     def _build_single_prompt(self, row: dict[str, Any], scoring_input: str) -> str:
@@ -159,7 +228,9 @@ class JobScorer:
         )
 
     def _build_batch_prompt(self, rows: list[dict[str, Any]], scoring_input: str) -> str:
-        per_job_limit = max(800, self._desc_limit // max(1, len(rows)))
+        # Batches are packed to fit the prompt budget, so each job keeps the full
+        # single-job description instead of a 1/n share of it.
+        per_job_limit = self._desc_limit
         blocks: list[str] = []
         for i, row in enumerate(rows, start=1):
             blocks.append(
@@ -198,12 +269,28 @@ class JobScorer:
         if len(rows) == 1:
             jid = int(rows[0]["id"])
             return [(jid, self.score_job(rows[0], scoring_input))]
+        limit = self._batch_sizes.limit(self._model)
+        if len(rows) > limit:
+            # The learned size dropped after this batch was packed (a failure elsewhere
+            # in the run): split now rather than spend a request on a likely failure.
+            out: list[tuple[int, JobScorePayload | None]] = []
+            for i in range(0, len(rows), limit):
+                out += self._score_chunk(rows[i : i + limit], scoring_input)
+            return out
 
+        model = self._model
         raw = self._call_llm(
             prompt=self._build_batch_prompt(rows, scoring_input),
             schema=BATCH_SCORE_JSON_SCHEMA,
             max_output_tokens=self._max_tokens_for_batch(len(rows)),
         )
+        scores_raw = raw.get("scores") if raw is not None else None
+        # Only a short or unparseable reply says the batch was too big; no reply at all
+        # (network errors, 429/5xx) leaves the learned size alone.
+        unanswered = raw is None and getattr(self._last_call, "unanswered", False)
+        if not self.budget_exhausted and not unanswered:
+            parsed = isinstance(scores_raw, list) and len(scores_raw) >= len(rows)
+            self._batch_sizes.record(model, len(rows), parsed)
         if raw is None:
             if len(rows) > 1:
                 mid = len(rows) // 2
@@ -218,7 +305,6 @@ class JobScorer:
                 )
             return [(int(r["id"]), None) for r in rows]
 
-        scores_raw = raw.get("scores")
         if not isinstance(scores_raw, list):
             return [(int(r["id"]), None) for r in rows]
 
@@ -239,21 +325,86 @@ class JobScorer:
         rows: list[dict[str, Any]],
         scoring_input: str,
     ) -> Iterator[tuple[int, JobScorePayload | None]]:
-        """Score many jobs using a thread pool; optional multi-job Ollama batches."""
+        """Score many jobs using a thread pool; optional multi-job Ollama batches.
+
+        With a score cache, cached postings are answered without a call and
+        postings sharing a key within the run are scored once.
+        """
+        if self._cache is None:
+            yield from self._score_uncached(rows, scoring_input)
+            return
+
+        cache = self._cache
+        version = self.prompt_version
+
+        def cache_key(row: dict[str, Any], model: str) -> str:
+            return score_cache_key(
+                row,
+                scoring_input=scoring_input,
+                prompt_version=version,
+                model=model,
+                desc_limit=self._desc_limit,
+            )
+
+        lookup_model = self._model
+        keys = {int(row["id"]): cache_key(row, lookup_model) for row in rows}
+        cached = cache.lookup(list(keys.values()))
+        to_score: dict[str, dict[str, Any]] = {}
+        duplicates: dict[str, list[int]] = {}
+        n_cached = 0
+        for row in rows:
+            jid = int(row["id"])
+            key = keys[jid]
+            if key in cached:
+                n_cached += 1
+                yield jid, cached[key]
+            elif key in to_score:
+                duplicates.setdefault(key, []).append(jid)
+            else:
+                to_score[key] = row
+        cache.hits += n_cached
+        logger.info(
+            "Score cache: %s cached, %s in-run duplicate(s), %s to score",
+            n_cached,
+            len(rows) - len(to_score) - n_cached,
+            len(to_score),
+        )
+        for jid, payload in self._score_uncached(list(to_score.values()), scoring_input):
+            key = keys[jid]
+            dups = duplicates.pop(key, [])
+            if payload is not None:
+                cache.misses += 1
+                cache.hits += len(dups)
+                # The client may have failed over mid-run: file the score under the
+                # model that actually produced it.
+                model = self._model
+                cache.store(
+                    key if model == lookup_model else cache_key(to_score[key], model),
+                    payload,
+                    model=model,
+                )
+            elif self.budget_exhausted:
+                cache.budget_skipped += 1 + len(dups)
+            yield jid, payload
+            for dup in dups:
+                yield dup, payload
+
+    def _score_uncached(
+        self,
+        rows: list[dict[str, Any]],
+        scoring_input: str,
+    ) -> Iterator[tuple[int, JobScorePayload | None]]:
         if not rows:
             return
 
-        batch_size = max(1, self._settings.LLM_SCORE_BATCH_SIZE)
         workers = max(1, self._settings.LLM_SCORE_WORKERS)
-        chunks: list[list[dict[str, Any]]] = []
-        for i in range(0, len(rows), batch_size):
-            chunks.append(rows[i : i + batch_size])
+        chunks = self._pack(rows, scoring_input)
 
         logger.info(
-            "Scoring %s jobs (%s chunks, batch_size=%s, workers=%s)",
+            "Scoring %s jobs (%s chunks, batch_size<=%s, workers=%s)",
             len(rows),
             len(chunks),
-            batch_size,
+            self._batch_sizes.limit(self._model),
             workers,
         )
         t0 = time.monotonic()
@@ -277,3 +428,4 @@ class JobScorer:
                         rate = done / elapsed if elapsed > 0 else 0
                         logger.info("Scored %s/%s (%.1f jobs/min)", done, len(rows), rate * 60)
                     yield jid, payload
+        self._batch_sizes.save()
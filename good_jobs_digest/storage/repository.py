@@ -6,9 +6,10 @@ import hashlib
 import json
 import logging
 import sqlite3
+import threading
 from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from email.utils import parsedate_to_datetime
 from pathlib import Path
 from typing import Any, Iterator
@@ -37,6 +38,58 @@ _JOBS_EXTRA_COLUMNS: dict[str, str] = {
     "seniority_ok": "INTEGER",
 }
 
+# Wait this long for another connection's write lock before "database is locked".
+_BUSY_TIMEOUT_S = 30.0
+
+# Keys per (source, ats_slug, source_job_id) IN (...) lookup: 3 bound parameters
+# each, under SQLite's historical 999-parameter limit. Bare source_job_id lists
+# (plus the few fixed parameters) fit _ID_CHUNK per statement.
+_KEY_CHUNK = 300
+_ID_CHUNK = 900
+
+JobKey = tuple[str, str, str]
+
+# A changed content hash refreshes last_changed_at and clears the LLM scores so the
+# job is rescored; an unchanged one only refreshes the listing fields and last_seen_at.
+# SET expressions read the row as it was before the update.
+_UPSERT_JOB_SQL = """
+INSERT INTO jobs (
+  company_name, mission_category, ats_type, ats_slug, source, source_job_id,
+  title, url, location_text, is_remote, salary_text, posted_at,
+  description_text, content_hash, first_seen_at, last_seen_at,
+  last_changed_at, prefilter_pass, canonical_job_id, registry_ats_type, registry_ats_slug
+) VALUES (
+  :company_name, :mission_category, :ats_type, :ats_slug, :source, :source_job_id,
+  :title, :url, :location_text, :is_remote, :salary_text, :posted_at,
+  :description_text, :content_hash, :now_iso, :now_iso,
+  :now_iso, 0, :canonical_job_id, :registry_ats_type, :registry_ats_slug
+)
+ON CONFLICT (source, ats_slug, source_job_id) DO UPDATE SET
+  company_name = excluded.company_name,
+  mission_category = excluded.mission_category,
+  title = excluded.title,
+  url = excluded.url,
+  location_text = excluded.location_text,
+  is_remote = excluded.is_remote,
+  salary_text = excluded.salary_text,
+  posted_at = COALESCE(excluded.posted_at, jobs.posted_at),
+  description_text = excluded.description_text,
+  content_hash = excluded.content_hash,
+  last_seen_at = excluded.last_seen_at,
+  last_changed_at = CASE WHEN jobs.content_hash = excluded.content_hash
+    THEN jobs.last_changed_at ELSE excluded.last_changed_at END,
+  relevance_score = CASE WHEN jobs.content_hash = excluded.content_hash THEN jobs.relevance_score END,
+  mission_score = CASE WHEN jobs.content_hash = excluded.content_hash THEN jobs.mission_score END,
+  fit_score = CASE WHEN jobs.content_hash = excluded.content_hash THEN jobs.fit_score END,
+  remote_ok = CASE WHEN jobs.content_hash = excluded.content_hash THEN jobs.remote_ok END,
+  eu_hire_ok = CASE WHEN jobs.content_hash = excluded.content_hash THEN jobs.eu_hire_ok END,
+  timezone_ok = CASE WHEN jobs.content_hash = excluded.content_hash THEN jobs.timezone_ok END,
+  seniority_ok = CASE WHEN jobs.content_hash = excluded.content_hash THEN jobs.seniority_ok END,
+  combined_score = CASE WHEN jobs.content_hash = excluded.content_hash THEN jobs.combined_score END,
+  llm_json = CASE WHEN jobs.content_hash = excluded.content_hash THEN jobs.llm_json END,
+  last_scored_at = CASE WHEN jobs.content_hash = excluded.content_hash THEN jobs.last_scored_at END
+"""
+
 
 @dataclass
 class JobRow:
@@ -76,17 +129,51 @@ class JobRepository:
     def __init__(self, db_path: Path):
         self._db_path = db_path
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path, timeout=_BUSY_TIMEOUT_S)
+        conn.row_factory = sqlite3.Row
+        return conn
 
     @contextmanager
     def _conn(self) -> Iterator[sqlite3.Connection]:
-        conn = sqlite3.connect(self._db_path)
-        conn.row_factory = sqlite3.Row
+        session = getattr(self._local, "conn", None)
+        if session is not None:
+            # Inside write_session(): share its connection, commit when it ends.
+            yield session
+            return
+        conn = self._connect()
         try:
             yield conn
             conn.commit()
         finally:
             conn.close()
 
+    @contextmanager
+    def write_session(self) -> Iterator[None]:
+        """Route this thread's repository calls through one connection, committed once.
+
+        Ingest used to pay a connect + commit (and WAL fsync) for every statement,
+        five or six per posting. Inside the block all calls from the current thread
+        share one connection; it commits when the block exits normally and rolls back
+        if it raises. Nested blocks join the outer session. Sessions are per thread,
+        so concurrent ingest workers each hold their own connection. SQLite's write
+        lock is taken at the first write and held until the commit, so do network
+        I/O before writing, not between writes.
+        """
+        if getattr(self._local, "conn", None) is not None:
+            yield
+            return
+        conn = self._connect()
+        self._local.conn = conn
+        try:
+            yield
+            conn.commit()
+        finally:
+            self._local.conn = None
+            conn.close()
+
     @staticmethod
     def _ensure_jobs_columns(conn: sqlite3.Connection) -> None:
         """Additive migration: add any missing jobs columns (no-op on fresh DBs)."""
@@ -136,6 +223,38 @@ class JobRepository:
                 "CREATE INDEX IF NOT EXISTS idx_employer_mission_pass "
                 "ON employer_mission (mission_pass)"
             )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_score_cache (
+                  cache_key TEXT PRIMARY KEY,
+                  payload TEXT NOT NULL,
+                  model TEXT,
+                  created_at TEXT NOT NULL,
+                  last_hit_at TEXT
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_score_cache_daily (
+                  day TEXT PRIMARY KEY,
+                  hits INTEGER NOT NULL DEFAULT 0,
+                  misses INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS job_embeddings (
+                  job_id INTEGER NOT NULL,
+                  backend TEXT NOT NULL,
+                  text_hash TEXT NOT NULL,
+                  vector BLOB NOT NULL,
+                  created_at TEXT NOT NULL,
+                  PRIMARY KEY (job_id, backend)
+                )
+                """
+            )
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS run_source_stats (
@@ -188,6 +307,53 @@ class JobRepository:
             dt = dt.replace(tzinfo=timezone.utc)
         return dt.replace(microsecond=0).isoformat()
 
+    @staticmethod
+    def _upsert_params(job: dict[str, Any], now_iso: str) -> dict[str, Any]:
+        """Named parameters for _UPSERT_JOB_SQL from upsert_job keyword arguments."""
+        return {
+            "company_name": job["company_name"],
+            "mission_category": job.get("mission_category"),
+            "ats_type": job["ats_type"],
+            "ats_slug": job["ats_slug"],
+            "source": job["source"],
+            "source_job_id": job["source_job_id"],
+            "title": job["title"],
+            "url": job["url"],
+            "location_text": job.get("location_text"),
+            "is_remote": 1 if job.get("is_remote") else 0,
+            "salary_text": job.get("salary_text"),
+            "posted_at": JobRepository._parse_posted_at_hint(job.get("posted_at")),
+            "description_text": job["description_text"],
+            "content_hash": job["chash"],
+            "now_iso": job.get("now_iso") or now_iso,
+            "canonical_job_id": job.get("canonical_job_id"),
+            "registry_ats_type": job.get("registry_ats_type"),
+            "registry_ats_slug": job.get("registry_ats_slug"),
+        }
+
+    @staticmethod
+    def _rows_by_key(
+        conn: sqlite3.Connection,
+        keys: list[JobKey],
+        columns: str,
+    ) -> dict[JobKey, sqlite3.Row]:
+        """(source, ats_slug, source_job_id) -> row, looked up in chunks of _KEY_CHUNK keys."""
+        unique = list(dict.fromkeys(keys))
+        found: dict[JobKey, sqlite3.Row] = {}
+        for i in range(0, len(unique), _KEY_CHUNK):
+            chunk = unique[i : i + _KEY_CHUNK]
+            placeholders = ",".join("(?, ?, ?)" for _ in chunk)
+            rows = conn.execute(
+                f"""
+                SELECT source, ats_slug, source_job_id, {columns} FROM jobs
+                WHERE (source, ats_slug, source_job_id) IN ({placeholders})
+                """,
+                [part for key in chunk for part in key],
+            ).fetchall()
+            for r in rows:
+                found[(r["source"], r["ats_slug"], r["source_job_id"])] = r
+        return found
+
     def upsert_job(
         self,
         *,
@@ -211,111 +377,56 @@ class JobRepository:
         registry_ats_slug: str | None = None,
     ) -> tuple[int, bool]:
         """Insert or update job. Returns (job_id, content_changed_or_new)."""
+        job = {
+            "company_name": company_name,
+            "mission_category": mission_category,
+            "ats_type": ats_type,
+            "ats_slug": ats_slug,
+            "source": source,
+            "source_job_id": source_job_id,
+            "title": title,
+            "url": url,
+            "location_text": location_text,
+            "is_remote": is_remote,
+            "salary_text": salary_text,
+            "description_text": description_text,
+            "chash": chash,
+            "posted_at": posted_at,
+            "canonical_job_id": canonical_job_id,
+            "registry_ats_type": registry_ats_type,
+            "registry_ats_slug": registry_ats_slug,
+        }
+        return self.upsert_jobs([job], now_iso=now_iso)[0]
+
+    def upsert_jobs(
+        self,
+        jobs: list[dict[str, Any]],
+        *,
+        now_iso: str | None = None,
+    ) -> list[tuple[int, bool]]:
+        """Bulk upsert_job: each dict takes upsert_job's keyword arguments.
+
+        One hash lookup, one executemany of INSERT ... ON CONFLICT DO UPDATE and one
+        id lookup for the whole list. Returns (job_id, content_changed_or_new) per
+        input, with the same results as calling upsert_job for each in order.
+        """
+        if not jobs:
+            return []
         now_iso = now_iso or _utc_now_iso()
-        is_remote_i = 1 if is_remote else 0
-        posted_iso = self._parse_posted_at_hint(posted_at)
+        params = [self._upsert_params(job, now_iso) for job in jobs]
+        keys: list[JobKey] = [(p["source"], p["ats_slug"], p["source_job_id"]) for p in params]
         with self._conn() as conn:
-            row = conn.execute(
-                """
-                SELECT id, content_hash FROM jobs
-                WHERE source = ? AND ats_slug = ? AND source_job_id = ?
-                """,
-                (source, ats_slug, source_job_id),
-            ).fetchone()
-            if row is None:
-                conn.execute(
-                    """
-                    INSERT INTO jobs (
-                      company_name, mission_category, ats_type, ats_slug, source, source_job_id,
-                      title, url, location_text, is_remote, salary_text, posted_at,
-                      description_text, content_hash, first_seen_at, last_seen_at,
-                      last_changed_at, prefilter_pass, canonical_job_id, registry_ats_type, registry_ats_slug
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?, ?, ?)
-                    """,
-                    (
-                        company_name,
-                        mission_category,
-                        ats_type,
-                        ats_slug,
-                        source,
-                        source_job_id,
-                        title,
-                        url,
-                        location_text,
-                        is_remote_i,
-                        salary_text,
-                        posted_iso,
-                        description_text,
-                        chash,
-                        now_iso,
-                        now_iso,
-                        now_iso,
-                        canonical_job_id,
-                        registry_ats_type,
-                        registry_ats_slug,
-                    ),
-                )
-                jid = int(conn.execute("SELECT last_insert_rowid()").fetchone()[0])
-                return jid, True
-
-            jid = int(row["id"])
-            old_hash = row["content_hash"]
-            changed = old_hash != chash
-            new_last_changed = now_iso if changed else None
-            if changed:
-                conn.execute(
-                    """
-                    UPDATE jobs SET
-                      company_name = ?, mission_category = ?, title = ?, url = ?,
-                      location_text = ?, is_remote = ?, salary_text = ?,
-                      posted_at = COALESCE(?, posted_at), description_text = ?,
-                      content_hash = ?, last_seen_at = ?, last_changed_at = ?,
-                      relevance_score = NULL, mission_score = NULL, fit_score = NULL,
-                      remote_ok = NULL, eu_hire_ok = NULL, timezone_ok = NULL, seniority_ok = NULL,
-                      combined_score = NULL, llm_json = NULL, last_scored_at = NULL
-                    WHERE id = ?
-                    """,
-                    (
-                        company_name,
-                        mission_category,
-                        title,
-                        url,
-                        location_text,
-                        is_remote_i,
-                        salary_text,
-                        posted_iso,
-                        description_text,
-                        chash,
-                        now_iso,
-                        now_iso,
-                        jid,
-                    ),
-                )
-            else:
-                conn.execute(
-                    """
-                    UPDATE jobs SET
-                      company_name = ?, mission_category = ?, title = ?, url = ?,
-                      location_text = ?, is_remote = ?, salary_text = ?,
-                      posted_at = COALESCE(?, posted_at), description_text = ?,
-                      last_seen_at = ?
-                    WHERE id = ?
-                    """,
-                    (
-                        company_name,
-                        mission_category,
-                        title,
-                        url,
-                        location_text,
-                        is_remote_i,
-                        salary_text,
-                        posted_iso,
-                        description_text,
-                        now_iso,
-                        jid,
-                    ),
-                )
-            return jid, changed
+            hashes = {
+                key: row["content_hash"]
+                for key, row in self._rows_by_key(conn, keys, "content_hash").items()
+            }
+            changed: list[bool] = []
+            for key, p in zip(keys, params):
+                changed.append(hashes.get(key) != p["content_hash"])
+                hashes[key] = p["content_hash"]
+            conn.executemany(_UPSERT_JOB_SQL, params)
+            ids = self._rows_by_key(conn, keys, "id")
+        return [(int(ids[key]["id"]), c) for key, c in zip(keys, changed)]
 
     def find_by_canonical_id(self, canonical_job_id: str) -> sqlite3.Row | None:
         if not canonical_job_id:
@@ -340,6 +451,15 @@ class JobRepository:
                 (source, ats_slug, source_job_id),
             ).fetchone()
 
+    def known_job_ids(self, source: str, ats_slug: str) -> set[str]:
+        """source_job_ids already stored for one board, in a single query."""
+        with self._conn() as conn:
+            rows = conn.execute(
+                "SELECT source_job_id FROM jobs WHERE source = ? AND ats_slug = ?",
+                (source, ats_slug),
+            ).fetchall()
+        return {str(r["source_job_id"]) for r in rows}
+
     def touch_job(self, source: str, ats_slug: str, source_job_id: str, now_iso: str | None = None) -> None:
         now_iso = now_iso or _utc_now_iso()
         with self._conn() as conn:
@@ -351,6 +471,49 @@ class JobRepository:
                 (now_iso, source, ats_slug, source_job_id),
             )
 
+    def touch_board_jobs(
+        self,
+        source: str,
+        ats_slug: str,
+        source_job_ids: list[str],
+        now_iso: str | None = None,
+    ) -> None:
+        """touch_job for many postings of one board: one UPDATE per _ID_CHUNK ids."""
+        ids = list(dict.fromkeys(source_job_ids))
+        if not ids:
+            return
+        now_iso = now_iso or _utc_now_iso()
+        with self._conn() as conn:
+            for i in range(0, len(ids), _ID_CHUNK):
+                chunk = ids[i : i + _ID_CHUNK]
+                qmarks = ",".join("?" * len(chunk))
+                conn.execute(
+                    f"""
+                    UPDATE jobs SET last_seen_at = ?
+                    WHERE source = ? AND ats_slug = ? AND source_job_id IN ({qmarks})
+                    """,
+                    [now_iso, source, ats_slug, *chunk],
+                )
+
+    def touch_unchanged_board(
+        self, source: str, ats_slug: str, seen_since: str, now_iso: str | None = None
+    ) -> int:
+        """Re-mark a board's postings as seen when its list is unchanged since ``seen_since``.
+
+        Postings listed by that poll were stamped ``last_seen_at >= seen_since``;
+        older rows had already dropped off the board and stay stale.
+        """
+        now_iso = now_iso or _utc_now_iso()
+        with self._conn() as conn:
+            cur = conn.execute(
+                """
+                UPDATE jobs SET last_seen_at = ?
+                WHERE source = ? AND ats_slug = ? AND last_seen_at >= ?
+                """,
+                (now_iso, source, ats_slug, seen_since),
+            )
+            return cur.rowcount
+
     def set_prefilter(self, job_id: int, passes: bool, reason: str | None = None) -> None:
         v = 1 if passes else 0
         with self._conn() as conn:
@@ -359,6 +522,19 @@ class JobRepository:
                 (v, None if passes else reason, job_id),
             )
 
+    def set_prefilters(self, verdicts: list[tuple[int, bool, str | None]]) -> None:
+        """Bulk set_prefilter for (job_id, passes, reason) tuples."""
+        if not verdicts:
+            return
+        with self._conn() as conn:
+            conn.executemany(
+                "UPDATE jobs SET prefilter_pass = ?, prefilter_reason = ? WHERE id = ?",
+                [
+                    (1 if passes else 0, None if passes else reason, job_id)
+                    for job_id, passes, reason in verdicts
+                ],
+            )
+
     def jobs_needing_score(
         self,
         *,
@@ -519,6 +695,7 @@ class JobRepository:
                 return 0
             qmarks = ",".join("?" * len(to_delete))
             cur = conn.execute(f"DELETE FROM jobs WHERE id IN ({qmarks})", to_delete)
+            conn.execute(f"DELETE FROM job_embeddings WHERE job_id IN ({qmarks})", to_delete)
             return cur.rowcount
 
     def mark_digest_included(self, job_ids: list[int], at_iso: str | None = None) -> None:
@@ -641,6 +818,105 @@ class JobRepository:
                 ],
             )
 
+    def get_cached_scores(self, cache_keys: list[str], *, now_iso: str | None = None) -> dict[str, str]:
+        """Cached LLM score payloads (JSON) for the given keys; marks the hits."""
+        keys = list(dict.fromkeys(cache_keys))
+        if not keys:
+            return {}
+        now_iso = now_iso or _utc_now_iso()
+        found: dict[str, str] = {}
+        with self._conn() as conn:
+            for i in range(0, len(keys), _ID_CHUNK):
+                chunk = keys[i : i + _ID_CHUNK]
+                qmarks = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT cache_key, payload FROM llm_score_cache WHERE cache_key IN ({qmarks})",
+                    chunk,
+                ).fetchall()
+                found.update((r["cache_key"], r["payload"]) for r in rows)
+                conn.execute(
+                    f"UPDATE llm_score_cache SET last_hit_at = ? WHERE cache_key IN ({qmarks})",
+                    [now_iso, *chunk],
+                )
+        return found
+
+    def put_cached_score(self, cache_key: str, payload: dict[str, Any], *, model: str) -> None:
+        with self._conn() as conn:
+            conn.execute(
+                """
+                INSERT INTO llm_score_cache (cache_key, payload, model, created_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (cache_key) DO UPDATE SET
+                  payload = excluded.payload,
+                  created_at = excluded.created_at
+                """,
+                (cache_key, json.dumps(payload), model, _utc_now_iso()),
+            )
+
+    def get_job_embeddings(self, job_ids: list[int], *, backend: str) -> dict[int, tuple[str, bytes]]:
+        """Stored pre-ranker vectors as ``job_id -> (text_hash, vector)``."""
+        found: dict[int, tuple[str, bytes]] = {}
+        with self._conn() as conn:
+            for i in range(0, len(job_ids), _ID_CHUNK):
+                chunk = job_ids[i : i + _ID_CHUNK]
+                qmarks = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT job_id, text_hash, vector FROM job_embeddings"
+                    f" WHERE backend = ? AND job_id IN ({qmarks})",
+                    [backend, *chunk],
+                ).fetchall()
+                found.update((int(r["job_id"]), (r["text_hash"], bytes(r["vector"]))) for r in rows)
+        return found
+
+    def job_embedding_vectors(self, backend: str) -> list[bytes]:
+        """Every stored pre-ranker vector for ``backend``."""
+        with self._conn() as conn:
+            rows = conn.execute(
+                "SELECT vector FROM job_embeddings WHERE backend = ?", (backend,)
+            ).fetchall()
+        return [bytes(r["vector"]) for r in rows]
+
+    def put_job_embeddings(self, backend: str, items: list[tuple[int, str, bytes]]) -> None:
+        if not items:
+            return
+        now_iso = _utc_now_iso()
+        with self._conn() as conn:
+            conn.executemany(
+                """
+                INSERT INTO job_embeddings (job_id, backend, text_hash, vector, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (job_id, backend) DO UPDATE SET
+                  text_hash = excluded.text_hash,
+                  vector = excluded.vector,
+                  created_at = excluded.created_at
+                """,
+                [(job_id, backend, text_hash, vector, now_iso) for job_id, text_hash, vector in items],
+            )
+
+    def record_score_cache_counts(self, hits: int, misses: int, *, day: str | None = None) -> None:
+        """Add one score run's cache hits / misses to the day's totals."""
+        if not hits and not misses:
+            return
+        day = day or date.today().isoformat()
+        with self._conn() as conn:
+            conn.execute(
+                """
+                INSERT INTO llm_score_cache_daily (day, hits, misses) VALUES (?, ?, ?)
+                ON CONFLICT (day) DO UPDATE SET
+                  hits = hits + excluded.hits,
+                  misses = misses + excluded.misses
+                """,
+                (day, hits, misses),
+            )
+
+    def score_cache_counts(self, day: str) -> tuple[int, int] | None:
+        """(hits, misses) recorded for ``day`` (YYYY-MM-DD), or None if nothing was scored."""
+        with self._conn() as conn:
+            row = conn.execute(
+                "SELECT hits, misses FROM llm_score_cache_daily WHERE day = ?", (day,)
+            ).fetchone()
+        return (int(row["hits"]), int(row["misses"])) if row else None
+
     def latest_source_stats(self) -> list[sqlite3.Row]:
         """Per-source stats from the most recent ingest run."""
         with self._conn() as conn:
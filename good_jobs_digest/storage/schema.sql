@@ -85,3 +85,29 @@ CREATE TABLE IF NOT EXISTS run_source_stats (
 );
 
 CREATE INDEX IF NOT EXISTS idx_run_source_stats_run ON run_source_stats (run_at DESC);
+
+-- LLM score payloads keyed by posting + profile + prompt + model (rank/score_cache.py),
+-- and the day's hit / miss totals for the digest footer.
+CREATE TABLE IF NOT EXISTS llm_score_cache (
+  cache_key TEXT PRIMARY KEY,
+  payload TEXT NOT NULL,
+  model TEXT,
+  created_at TEXT NOT NULL,
+  last_hit_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS llm_score_cache_daily (
+  day TEXT PRIMARY KEY,
+  hits INTEGER NOT NULL DEFAULT 0,
+  misses INTEGER NOT NULL DEFAULT 0
+);
+
+-- Pre-ranker job vectors (rank/preranker.py), recomputed when the embedded text changes.
+CREATE TABLE IF NOT EXISTS job_embeddings (
+  job_id INTEGER NOT NULL,
+  backend TEXT NOT NULL,
+  text_hash TEXT NOT NULL,
+  vector BLOB NOT NULL,
+  created_at TEXT NOT NULL,
+  PRIMARY KEY (job_id, backend)
+);
@@ -0,0 +1,178 @@
+"""Async curated ingest: per-host budgets and parity with the sync board ingest."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+
+from config import Settings
+from core.models import CompanyRow
+from pipelines.curated_ats import board_ingest
+from pipelines.curated_ats.clients.async_host_pool import (
+    AsyncHostPool,
+    HostBudget,
+    parse_host_budgets,
+)
+from pipelines.curated_ats.clients.host_pool import HostRateLimitedHttp
+from storage.repository import JobRepository
+
+
+def test_parse_host_budgets_skips_malformed_entries():
+    budgets = parse_host_budgets("api.lever.co=2:1.5, bogus, Apply.Workable.com=1:0.5")
+    assert budgets == {
+        "api.lever.co": HostBudget(2, 1.5),
+        "apply.workable.com": HostBudget(1, 0.5),
+    }
+
+
+def test_budget_key_matches_parent_domain():
+    async def run():
+        async with AsyncHostPool(default_budget=HostBudget(3, 0)) as pool:
+            assert pool._budget_key("acme.recruitee.com")[0] == "recruitee.com"
+            assert pool._budget_key("wd3.myworkdayjobs.com")[0] == "myworkdayjobs.com"
+            assert pool._budget_key("example.org") == ("example.org", HostBudget(3, 0))
+
+    asyncio.run(run())
+
+
+def test_host_concurrency_budget_caps_in_flight_requests():
+    in_flight = {"now": 0, "max": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        return httpx.Response(200, json={})
+
+    async def run():
+        async with AsyncHostPool(
+            default_budget=HostBudget(2, 0),
+            transport=httpx.MockTransport(handler),
+        ) as pool:
+            await asyncio.gather(*(pool.get(f"https://example.org/{i}") for i in range(8)))
+
+    asyncio.run(run())
+    assert in_flight["max"] == 2
+
+
+def test_host_rps_budget_spaces_request_starts():
+    starts: list[float] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        starts.append(asyncio.get_running_loop().time())
+        return httpx.Response(200, json={})
+
+    async def run():
+        async with AsyncHostPool(
+            default_budget=HostBudget(5, 20.0),
+            transport=httpx.MockTransport(handler),
+        ) as pool:
+            await asyncio.gather(*(pool.get(f"https://example.org/{i}") for i in range(5)))
+
+    asyncio.run(run())
+    # Start slots are 50 ms apart; individual arrivals jitter, the overall span cannot.
+    assert len(starts) == 5
+    assert starts[-1] - starts[0] >= 0.18
+
+
+def _greenhouse_handler(request: httpx.Request) -> httpx.Response:
+    path = request.url.path
+    if path.endswith("/jobs"):
+        return httpx.Response(
+            200,
+            json={"jobs": [{"id": i, "title": "Data Engineer"} for i in (1, 2, 3)] + [{"id": 4, "title": "Chef"}]},
+        )
+    jid = path.rsplit("/", 1)[-1]
+    if jid == "3":
+        return httpx.Response(404)
+    return httpx.Response(
+        200,
+        json={
+            "id": int(jid),
+            "title": "Data Engineer",
+            "absolute_url": f"https://boards.greenhouse.io/co/jobs/{jid}",
+            "content": f"role {jid}",
+            "location": {"name": f"Remote, Region {jid}"},
+        },
+    )
+
+
+def test_async_greenhouse_board_matches_sync(tmp_path):
+    row = CompanyRow(company_name="Co", ats_type="greenhouse", ats_slug="co")
+    settings = Settings()
+    fetched_at = "2026-06-01T00:00:00+00:00"
+
+    sync_repo = JobRepository(tmp_path / "sync.db")
+    sync_repo.init_db()
+    with HostRateLimitedHttp(0, transport=httpx.MockTransport(_greenhouse_handler)) as http:
+        board_ingest.ingest_company_board(http, sync_repo, settings, row, fetched_at=fetched_at)
+
+    async_repo = JobRepository(tmp_path / "async.db")
+    async_repo.init_db()
+
+    async def run():
+        async with AsyncHostPool(
+            default_budget=HostBudget(4, 0),
+            transport=httpx.MockTransport(_greenhouse_handler),
+        ) as pool:
+            await board_ingest.ingest_company_board_async(pool, async_repo, settings, row, fetched_at=fetched_at)
+
+    asyncio.run(run())
+
+    assert async_repo.known_job_ids("greenhouse", "co") == sync_repo.known_job_ids("greenhouse", "co") == {"1", "2"}
+    for jid in (1, 2):
+        assert async_repo.get_job(jid)["description_text"] == sync_repo.get_job(jid)["description_text"]
+
+
+def test_429_waits_for_retry_after_and_holds_the_host():
+    starts: list[tuple[str, float]] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        starts.append((request.url.path, asyncio.get_running_loop().time()))
+        if request.url.path == "/a" and len(starts) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0.2"})
+        return httpx.Response(200, json={})
+
+    async def run():
+        async with AsyncHostPool(
+            default_budget=HostBudget(2, 0),
+            transport=httpx.MockTransport(handler),
+        ) as pool:
+            first = asyncio.create_task(pool.get("https://example.org/a"))
+            await asyncio.sleep(0.05)
+            second = await pool.get("https://example.org/b")
+            return (await first).status_code, second.status_code
+
+    assert asyncio.run(run()) == (200, 200)
+    t0 = starts[0][1]
+    assert sorted(path for path, _ in starts) == ["/a", "/a", "/b"]
+    # Both the retry and the other request to the host waited out Retry-After.
+    assert all(t - t0 >= 0.19 for _, t in starts[1:])
+
+
+def test_async_board_skips_a_failing_detail_and_writes_the_rest(tmp_path, monkeypatch):
+    row = CompanyRow(company_name="Co", ats_type="greenhouse", ats_slug="co")
+    repo = JobRepository(tmp_path / "t.db")
+    repo.init_db()
+    real_detail = board_ingest.greenhouse.fetch_greenhouse_job_async
+
+    async def flaky_detail(http, slug, jid):
+        if jid == "2":
+            raise httpx.ConnectError("reset by peer")
+        return await real_detail(http, slug, jid)
+
+    monkeypatch.setattr(board_ingest.greenhouse, "fetch_greenhouse_job_async", flaky_detail)
+
+    async def run():
+        async with AsyncHostPool(
+            default_budget=HostBudget(4, 0),
+            transport=httpx.MockTransport(_greenhouse_handler),
+        ) as pool:
+            await board_ingest.ingest_company_board_async(
+                pool, repo, Settings(), row, fetched_at="2026-06-01T00:00:00+00:00"
+            )
+
+    asyncio.run(run())
+    assert repo.known_job_ids("greenhouse", "co") == {"1"}
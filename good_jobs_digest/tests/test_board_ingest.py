@@ -0,0 +1,95 @@
+"""Curated board ingest diffs listings against the board's stored jobs."""
+
+from __future__ import annotations
+
+import pytest
+
+from config import Settings
+from core.models import CompanyRow
+from pipelines.curated_ats import board_ingest
+from storage.repository import JobRepository, content_hash
+
+
+def _seed(repo: JobRepository, sid: str) -> None:
+    repo.upsert_job(
+        company_name="Co",
+        mission_category=None,
+        ats_type="greenhouse",
+        ats_slug="co",
+        source="greenhouse",
+        source_job_id=sid,
+        title="Data Engineer",
+        url=f"http://u/{sid}",
+        location_text=None,
+        is_remote=True,
+        salary_text=None,
+        description_text="old",
+        chash=content_hash("old"),
+        now_iso="2026-05-01T10:00:00+00:00",
+    )
+
+
+def test_greenhouse_fetches_details_only_for_new_ids(tmp_path, monkeypatch):
+    repo = JobRepository(tmp_path / "t.db")
+    repo.init_db()
+    _seed(repo, "1")
+    listings = [
+        {"id": 1, "title": "Data Engineer"},
+        {"id": 2, "title": "Data Engineer"},
+        {"id": 2, "title": "Data Engineer"},
+    ]
+    detail_calls: list[str] = []
+
+    def fake_detail(http, slug, jid):
+        detail_calls.append(jid)
+        return {
+            "id": int(jid),
+            "title": "Data Engineer",
+            "absolute_url": f"https://boards.greenhouse.io/co/jobs/{jid}",
+            "content": "new role",
+            "location": {"name": "Remote"},
+        }, 200
+
+    monkeypatch.setattr(board_ingest.greenhouse, "fetch_greenhouse_job_list", lambda http, slug: (listings, 200))
+    monkeypatch.setattr(board_ingest.greenhouse, "fetch_greenhouse_job", fake_detail)
+
+    row = CompanyRow(company_name="Co", ats_type="greenhouse", ats_slug="co")
+    board_ingest.ingest_company_board(
+        None, repo, Settings(), row, fetched_at="2026-06-01T00:00:00+00:00"
+    )
+
+    assert detail_calls == ["2"]
+    assert repo.known_job_ids("greenhouse", "co") == {"1", "2"}
+    known = repo.get_job(1)
+    assert known["last_seen_at"] == "2026-06-01T00:00:00+00:00"
+    assert known["description_text"] == "old"
+
+
+def test_greenhouse_keeps_postings_fetched_before_a_failing_detail(tmp_path, monkeypatch):
+    repo = JobRepository(tmp_path / "t.db")
+    repo.init_db()
+    _seed(repo, "1")
+    listings = [{"id": i, "title": "Data Engineer"} for i in (1, 2, 3)]
+
+    def fake_detail(http, slug, jid):
+        if jid == "3":
+            raise ConnectionError("reset by peer")
+        return {
+            "id": int(jid),
+            "title": "Data Engineer",
+            "absolute_url": f"https://boards.greenhouse.io/co/jobs/{jid}",
+            "content": "new role",
+            "location": {"name": "Remote"},
+        }, 200
+
+    monkeypatch.setattr(board_ingest.greenhouse, "fetch_greenhouse_job_list", lambda http, slug: (listings, 200))
+    monkeypatch.setattr(board_ingest.greenhouse, "fetch_greenhouse_job", fake_detail)
+
+    row = CompanyRow(company_name="Co", ats_type="greenhouse", ats_slug="co")
+    with pytest.raises(ConnectionError):
+        board_ingest.ingest_company_board(
+            None, repo, Settings(), row, fetched_at="2026-06-01T00:00:00+00:00"
+        )
+
+    assert repo.known_job_ids("greenhouse", "co") == {"1", "2"}
+    assert repo.get_job(1)["last_seen_at"] == "2026-06-01T00:00:00+00:00"
@@ -2,8 +2,17 @@
 
 from __future__ import annotations
 
+import json
+
 from discovery.ats_registry import careers_url, parse_ats_from_text, CURATED_ATS_TYPES
-from discovery.employer_candidates import mine_employer_candidate, load_unprobed_candidates
+from discovery.employer_candidates import (
+    append_employer_candidates,
+    load_unprobed_candidates,
+    mark_probed,
+    mine_employer_candidate,
+    open_pool,
+)
+from discovery.resolve import EmployerCandidate
 from normalize.dedup import canonical_key, merge_duplicate, source_priority
 
 
@@ -85,3 +94,36 @@ def test_mine_employer_candidate(tmp_path):
     assert len(rows) == 1
     assert rows[0].company_name == "Watershed"
     assert rows[0].ats_hint == ("greenhouse", "watershed")
+
+
+def test_candidate_pool_dedupes_by_name_and_marks_probed_in_place(tmp_path):
+    pool = tmp_path / "pool.db"
+    cands = [
+        EmployerCandidate(company_name="Watershed", discovery_source="bcorp"),
+        EmployerCandidate(company_name=" watershed ", discovery_source="funder"),
+        EmployerCandidate(company_name="Ember", discovery_source="funder"),
+    ]
+    assert append_employer_candidates(cands, pool_path=pool) == 2
+    assert append_employer_candidates(cands, pool_path=pool) == 0
+
+    mark_probed(["WATERSHED"], pool)
+
+    assert [c.company_name for c in load_unprobed_candidates(pool)] == ["Ember"]
+
+
+def test_legacy_jsonl_pool_is_imported_and_exported(tmp_path):
+    legacy = tmp_path / "employer_candidates.jsonl"
+    legacy.write_text(
+        '{"company_name": "Ember", "discovery_source": "funder", "ats_hint": ["lever", "ember"], "probed": false}\n'
+        "not json\n"
+        '{"company_name": "Done Co", "discovery_source": "funder", "probed": true}\n',
+        encoding="utf-8",
+    )
+
+    rows = load_unprobed_candidates(legacy)
+    assert [(c.company_name, c.ats_hint) for c in rows] == [("Ember", ("lever", "ember"))]
+    assert len(open_pool(tmp_path / "employer_candidates.db")) == 2
+
+    out = tmp_path / "export.jsonl"
+    assert open_pool(legacy).export_jsonl(out) == 2
+    assert [json.loads(line)["probed"] for line in out.read_text().splitlines()] == [False, True]
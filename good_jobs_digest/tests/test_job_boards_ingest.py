@@ -0,0 +1,107 @@
+"""Job boards: concurrent fetch stage, single-writer persist stage."""
+
+from __future__ import annotations
+
+import threading
+
+import httpx
+
+from config import Settings
+from normalize.boards import normalize_climatebase_listing
+from pipelines.job_boards import ingest as board_ingest
+from pipelines.job_boards.sources.types import JobBoardFetchResult
+from storage.repository import JobRepository
+
+_API_BOARD_FLAGS = (
+    "BOARD_ARBEITNOW_ENABLED",
+    "BOARD_JOBICY_ENABLED",
+    "BOARD_HIMALAYAS_ENABLED",
+    "BOARD_REMOTEOK_ENABLED",
+    "BOARD_WEWORKREMOTELY_ENABLED",
+    "BOARD_WORKINGNOMADS_ENABLED",
+    "BOARD_HN_ENABLED",
+    "BOARD_INDEED_ENABLED",
+)
+
+
+def _empty_board(*args) -> board_ingest._FetchedBoard:
+    return board_ingest._FetchedBoard(raw_jobs=[], normalize=lambda raw: None, request_url="", fetched=0)
+
+
+def test_boards_fetch_concurrently_and_persist_on_calling_thread(tmp_path, monkeypatch):
+    settings = Settings()
+    settings.WEBSHARE_PROXY_LIST_URL = ""
+    settings.WEBSHARE_API_KEY = ""
+    settings.WEBSHARE_PROXIES_PATH = tmp_path / "proxies.txt"
+    settings.BOARD_FETCH_WORKERS = 3
+    for flag in _API_BOARD_FLAGS:
+        setattr(settings, flag, False)
+    repo = JobRepository(tmp_path / "t.db")
+    repo.init_db()
+
+    writer_threads: set[str] = set()
+    monkeypatch.setattr(
+        board_ingest,
+        "mine_employer_candidate",
+        lambda norm, **kw: writer_threads.add(threading.current_thread().name),
+    )
+    listing = {"id": 7, "title": "Data Engineer", "employer_name": "Co", "locations": ["Remote"]}
+    monkeypatch.setattr(
+        board_ingest,
+        "_fetch_climatebase",
+        lambda *args: board_ingest._FetchedBoard(
+            raw_jobs=[{"listing": listing, "detail": None}],
+            normalize=lambda raw: normalize_climatebase_listing(raw["listing"], raw["detail"]),
+            request_url="https://climatebase.org/jobs",
+            fetched=5,
+        ),
+    )
+
+    def broken_board(*args):
+        raise RuntimeError("blocked")
+
+    monkeypatch.setattr(board_ingest, "_fetch_80000hours", broken_board)
+    monkeypatch.setattr(board_ingest, "_fetch_escapethecity", _empty_board)
+    monkeypatch.setattr(board_ingest, "_fetch_techjobsforgood", _empty_board)
+    monkeypatch.setattr(
+        board_ingest.remotive,
+        "fetch_jobs",
+        lambda: JobBoardFetchResult(source="remotive", ok=False, method="api", job_count=0, error="HTTP 503"),
+    )
+
+    counts = board_ingest.ingest_job_boards(repo, settings, fetched_at="2026-06-01T00:00:00+00:00")
+
+    assert list(counts) == ["climatebase", "80000hours", "escapethecity", "techjobsforgood", "remotive"]
+    assert counts["climatebase"] == 1
+    assert writer_threads == {threading.current_thread().name}
+    stats = {r["source"]: r for r in repo.latest_source_stats()}
+    assert (stats["climatebase"]["fetched"], stats["climatebase"]["passed"]) == (5, 1)
+    assert stats["80000hours"]["error"] == "blocked"
+    assert stats["remotive"]["error"] == "HTTP 503"
+
+
+class _PagedHttp:
+    """Answers Algolia page queries from ``pages``; a status code instead of hits fails that page."""
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    def post_json(self, url, *, body, extra_headers):
+        page = int(body["params"].split("page=")[1].split("&")[0])
+        request = httpx.Request("POST", url)
+        answer = self.pages[page] if page < len(self.pages) else []
+        if isinstance(answer, int):
+            return httpx.Response(answer, request=request)
+        return httpx.Response(200, json={"hits": answer}, request=request)
+
+
+def test_failing_page_keeps_the_pages_fetched_before_it():
+    settings = Settings()
+    settings.BOARD_80000HOURS_MAX_PAGES = 5
+    http = _PagedHttp([[{"objectID": "a"}, {"objectID": "b"}], 503, [{"objectID": "c"}]])
+
+    board = board_ingest._fetch_80000hours(settings, http)
+
+    assert [hit["objectID"] for hit in board.raw_jobs] == ["a", "b"]
+    assert board.fetched == 2
+    assert board.error.startswith("page 1:") and "503" in board.error
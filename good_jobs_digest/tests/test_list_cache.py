@@ -0,0 +1,137 @@
+"""Conditional list requests: validators, body-hash fallback and unchanged boards."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from config import Settings
+from core.models import CompanyRow
+from pipelines.curated_ats import board_ingest
+from pipelines.curated_ats.clients.host_pool import HostRateLimitedHttp
+from pipelines.curated_ats.clients.list_cache import ListValidatorCache, board_poll
+from storage.repository import JobRepository
+
+LIST_URL = "https://apply.workable.com/api/v3/accounts/co/jobs"
+
+
+def _http(cache: ListValidatorCache, handler) -> HostRateLimitedHttp:
+    return HostRateLimitedHttp(0, list_cache=cache, transport=httpx.MockTransport(handler))
+
+
+def test_etag_304_and_identical_body_both_read_as_unchanged(tmp_path):
+    cache = ListValidatorCache(tmp_path / "v.json")
+    seen_headers: list[httpx.Headers] = []
+
+    def etag_server(request: httpx.Request) -> httpx.Response:
+        seen_headers.append(request.headers)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"jobs": []}, headers={"ETag": '"v1"'})
+
+    with _http(cache, etag_server) as http, board_poll(cache, "2026-06-01T00:00:00+00:00"):
+        assert http.get_list(LIST_URL).status_code == 200
+    with _http(cache, etag_server) as http, board_poll(cache, "2026-06-02T00:00:00+00:00"):
+        assert http.get_list(LIST_URL).status_code == 304
+    assert seen_headers[1]["if-none-match"] == '"v1"'
+
+    # No validators from the server: an identical body is reported as a 304 too.
+    plain_url = LIST_URL + "/plain"
+    with _http(cache, lambda req: httpx.Response(200, json={"jobs": [1]})) as http:
+        with board_poll(cache, "2026-06-01T00:00:00+00:00"):
+            assert http.get_list(plain_url).status_code == 200
+        with board_poll(cache, "2026-06-02T00:00:00+00:00"):
+            assert http.get_list(plain_url).status_code == 304
+
+
+def test_failed_poll_does_not_commit_validators(tmp_path):
+    cache = ListValidatorCache(tmp_path / "v.json")
+    with _http(cache, lambda req: httpx.Response(200, json={"jobs": []})) as http:
+        with pytest.raises(RuntimeError):
+            with board_poll(cache, "2026-06-01T00:00:00+00:00"):
+                http.get_list(LIST_URL)
+                raise RuntimeError("persist failed")
+        with board_poll(cache, "2026-06-02T00:00:00+00:00"):
+            assert http.get_list(LIST_URL).status_code == 200
+
+
+def test_title_gate_change_resets_saved_cache(tmp_path):
+    path = tmp_path / "v.json"
+    cache = ListValidatorCache(path, gate="a")
+    with _http(cache, lambda req: httpx.Response(200, json={"jobs": []})) as http:
+        with board_poll(cache, "2026-06-01T00:00:00+00:00"):
+            http.get_list(LIST_URL)
+    cache.save()
+
+    assert len(ListValidatorCache(path, gate="a")) == 1
+    assert len(ListValidatorCache(path, gate="b")) == 0
+
+
+def test_unchanged_board_only_touches_postings_of_last_poll(tmp_path):
+    repo = JobRepository(tmp_path / "t.db")
+    repo.init_db()
+    settings = Settings()
+    cache = ListValidatorCache(tmp_path / "v.json")
+    row = CompanyRow(company_name="Co", ats_type="workable", ats_slug="co")
+    body = {"jobs": [{"shortcode": "A1", "title": "Data Engineer", "description": "d"}]}
+    fetches: list[int] = []
+
+    def server(request: httpx.Request) -> httpx.Response:
+        fetches.append(1)
+        return httpx.Response(200, json=body)
+
+    def poll(fetched_at: str) -> None:
+        with _http(cache, server) as http, board_poll(cache, fetched_at):
+            board_ingest.ingest_company_board(http, repo, settings, row, fetched_at=fetched_at)
+
+    poll("2026-06-01T00:00:00+00:00")
+    assert repo.known_job_ids("workable", "co") == {"A1"}
+    with repo.write_session():
+        repo.touch_board_jobs("workable", "co", ["A1"], "2026-05-01T00:00:00+00:00")  # as if delisted since
+    repo.upsert_job(
+        company_name="Co", mission_category=None, ats_type="workable", ats_slug="co", source="workable",
+        source_job_id="B2", title="Data Engineer", url="http://u/B2", location_text=None, is_remote=True,
+        salary_text=None, description_text="d", chash="x", now_iso="2026-06-01T00:00:00+00:00",
+    )
+
+    poll("2026-06-02T00:00:00+00:00")
+
+    assert len(fetches) == 2
+    touched = {r["source_job_id"]: r["last_seen_at"] for r in map(repo.get_job, (1, 2))}
+    assert touched == {"A1": "2026-05-01T00:00:00+00:00", "B2": "2026-06-02T00:00:00+00:00"}
+
+
+def test_board_with_a_5xx_detail_is_refetched_on_the_next_poll(tmp_path):
+    repo = JobRepository(tmp_path / "t.db")
+    repo.init_db()
+    settings = Settings()
+    cache = ListValidatorCache(tmp_path / "v.json")
+    row = CompanyRow(company_name="Co", ats_type="greenhouse", ats_slug="co")
+    detail_status = [503]
+
+    def server(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/jobs"):
+            return httpx.Response(200, json={"jobs": [{"id": 7, "title": "Data Engineer"}]})
+        if detail_status[0] != 200:
+            return httpx.Response(detail_status[0])
+        return httpx.Response(
+            200,
+            json={
+                "id": 7,
+                "title": "Data Engineer",
+                "absolute_url": "https://boards.greenhouse.io/co/jobs/7",
+                "content": "role",
+                "location": {"name": "Remote"},
+            },
+        )
+
+    def poll(fetched_at: str) -> None:
+        with _http(cache, server) as http, board_poll(cache, fetched_at):
+            board_ingest.ingest_company_board(http, repo, settings, row, fetched_at=fetched_at)
+
+    poll("2026-06-01T00:00:00+00:00")
+    assert repo.known_job_ids("greenhouse", "co") == set()
+
+    detail_status[0] = 200
+    poll("2026-06-02T00:00:00+00:00")
+    assert repo.known_job_ids("greenhouse", "co") == {"7"}
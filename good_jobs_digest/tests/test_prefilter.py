@@ -1,4 +1,4 @@
-from rank.prefilter import evaluate_title, prefilter_title
+from rank.prefilter import compile_title_gate, evaluate_title, evaluate_titles, prefilter_title
 
 INCLUDE = [
     "artificial intelligence engineer",
@@ -148,3 +148,20 @@ def test_reasons_reported():
     assert evaluate_title("Software Engineer", **kw).reason == "excluded keyword: software engineer"
     assert evaluate_title("Office Coordinator", **kw).reason == "no target role keyword"
     assert evaluate_title("Data Engineer", **kw).reason is None
+
+
+def test_reason_is_first_listed_keyword_even_when_matches_overlap():
+    # "intern" and "internship" start at the same position; list order decides.
+    kw = dict(include_keywords=INCLUDE, exclude_keywords=EXCLUDE, seniority_exclude_keywords=SENIORITY)
+    assert evaluate_title("Data Engineering Internship", **kw).reason == "excluded keyword: internship"
+    assert evaluate_title("Sales Engineer Intern", **kw).reason == "excluded keyword: intern"
+    assert evaluate_title("Lead Senior Data Engineer", **kw).reason == "seniority: senior"
+
+
+def test_evaluate_titles_matches_single_title_verdicts():
+    kw = dict(include_keywords=INCLUDE, exclude_keywords=EXCLUDE, seniority_exclude_keywords=SENIORITY)
+    titles = ["Data Engineer", "Senior Data Engineer", "Software Engineer", "", "Data Engineer", "C++ Dev"]
+    assert evaluate_titles(titles, **kw) == [evaluate_title(t, **kw) for t in titles]
+    assert compile_title_gate(tuple(INCLUDE), tuple(EXCLUDE), tuple(SENIORITY)) is compile_title_gate(
+        tuple(INCLUDE), tuple(EXCLUDE), tuple(SENIORITY)
+    )
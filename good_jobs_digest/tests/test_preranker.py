@@ -0,0 +1,88 @@
+"""Embedding pre-ranker: similarity order, stored vectors, cutoff and recall."""
+
+from __future__ import annotations
+
+from rank.preranker import PreRanker, TfidfBackend, recall_curve
+from storage.repository import JobRepository
+
+PROFILE = "Data engineer: Python, SQL, dbt, Airflow pipelines for climate and energy data."
+
+
+class CountingTfidf(TfidfBackend):
+    def __init__(self):
+        super().__init__()
+        self.encoded: list[str] = []
+
+    def encode(self, texts):
+        self.encoded.extend(texts)
+        return super().encode(texts)
+
+
+def _row(job_id: int, title: str, desc: str) -> dict:
+    return {"id": job_id, "title": title, "description_text": desc}
+
+
+def _repo(tmp_path) -> JobRepository:
+    repo = JobRepository(tmp_path / "t.db")
+    repo.init_db()
+    return repo
+
+
+def test_rank_orders_by_similarity_and_applies_cutoff_then_cap(tmp_path):
+    rows = [
+        _row(1, "Account Executive", "Close enterprise deals and grow sales pipeline quota."),
+        _row(2, "Data Engineer", "Build Python and SQL pipelines with dbt and Airflow for energy data."),
+        _row(3, "Analytics Engineer", "SQL and dbt models for a climate startup."),
+    ]
+    ranker = PreRanker(_repo(tmp_path), TfidfBackend(), PROFILE)
+
+    sims = ranker.similarities(rows)
+    assert sims[2] > sims[3] > sims[1]
+    assert [r["id"] for r in ranker.rank(rows)] == [2, 3, 1]
+    assert [r["id"] for r in ranker.rank(rows, min_similarity=sims[3])] == [2, 3]
+    assert [r["id"] for r in ranker.rank(rows, min_similarity=sims[3], limit=1)] == [2]
+
+
+def test_job_vectors_are_stored_and_only_recomputed_when_text_changes(tmp_path):
+    repo = _repo(tmp_path)
+    backend = CountingTfidf()
+    rows = [_row(1, "Data Engineer", "Python"), _row(2, "ML Engineer", "PyTorch")]
+
+    PreRanker(repo, backend, PROFILE).similarities(rows)
+    PreRanker(repo, backend, PROFILE).similarities(rows)
+    assert len(backend.encoded) == 2
+
+    PreRanker(repo, backend, PROFILE).similarities([rows[0], _row(2, "ML Engineer", "JAX")])
+    assert len(backend.encoded) == 3
+    assert set(repo.get_job_embeddings([1, 2], backend=backend.name)) == {1, 2}
+
+
+def test_tfidf_idf_is_fitted_once_so_similarity_does_not_depend_on_candidates(tmp_path):
+    repo = _repo(tmp_path)
+    idf_path = tmp_path / "idf.json"
+    scored = [
+        _row(1, "Data Engineer", "Python and SQL pipelines with dbt."),
+        _row(2, "Account Executive", "Enterprise sales quota."),
+        _row(3, "Analytics Engineer", "dbt models in SQL."),
+    ]
+    backend = TfidfBackend(idf_path)
+    backtest = PreRanker(repo, backend, PROFILE).similarities(scored)
+    assert backend.fitted_docs == 3
+
+    unscored = [scored[0], _row(4, "Python Developer", "Python APIs and SQL databases.")]
+    reloaded = TfidfBackend(idf_path)
+    assert reloaded.fitted_docs == 3
+    production = PreRanker(repo, reloaded, PROFILE).similarities(unscored)
+
+    assert production[1] == backtest[1]
+    assert reloaded.fitted_docs == 3
+
+
+def test_recall_curve_counts_good_matches_kept_per_cutoff():
+    sims = [0.9, 0.5, 0.4, 0.1]
+    good = [True, False, True, False]
+
+    points = recall_curve(sims, good, [0.0, 0.45, 0.95])
+
+    assert [(p.kept, p.positives_kept) for p in points] == [(4, 2), (2, 1), (0, 0)]
+    assert [p.recall for p in points] == [1.0, 0.5, 0.0]
@@ -75,6 +75,19 @@ def test_footer_flags_silent_sources(tmp_path):
     assert "63/800" in md
 
 
+def test_footer_shows_score_cache_counts(tmp_path):
+    repo = _repo(tmp_path)
+    repo.record_score_cache_counts(30, 12, day="2026-08-01")
+    repo.record_score_cache_counts(5, 0, day="2026-08-01")
+    hits, misses = repo.score_cache_counts("2026-08-01")
+    md = build_markdown_digest(
+        [], [], digest_date=date(2026, 8, 1),
+        llm_usage={"used": 12, "budget": 300, "cache_hits": hits, "cache_misses": misses},
+    )
+    assert "Score cache today: **35** reused, 12 scored fresh." in md
+    assert repo.score_cache_counts("2026-08-02") is None
+
+
 def test_footer_reads_as_bullets_in_html():
     """The HTML part only renders headings, bullets and paragraphs."""
     from mail.markdown_html import markdown_to_html
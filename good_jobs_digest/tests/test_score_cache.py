@@ -0,0 +1,113 @@
+"""LLM score cache: identical postings reuse a stored payload instead of a call."""
+
+from __future__ import annotations
+
+from config import Settings
+from rank.llm import BudgetExhausted
+from rank.score_cache import ScoreCache
+from rank.scorer import JobScorer
+from storage.repository import JobRepository
+from tests.stub_llm import StubLLM
+from tests.test_scorer_batch import _payload, _row
+
+
+def _scorer(repo: JobRepository, llm: StubLLM) -> JobScorer:
+    settings = Settings()
+    settings.LLM_SCORE_BATCH_SIZE = 1
+    settings.LLM_SCORE_WORKERS = 1
+    cache = ScoreCache(repo)
+    return JobScorer(settings, llm=llm, cache=cache)
+
+
+def _repo(tmp_path) -> JobRepository:
+    repo = JobRepository(tmp_path / "t.db")
+    repo.init_db()
+    return repo
+
+
+def test_duplicates_in_run_are_scored_once_and_cached(tmp_path):
+    repo = _repo(tmp_path)
+    llm = StubLLM([_payload(role_relevance=91)])
+    scorer = _scorer(repo, llm)
+    cross_post = {**_row(2), "description_text": "  Build   PIPELINES "}
+
+    results = dict(scorer.score_jobs_parallel([_row(1), cross_post], "profile"))
+
+    assert len(llm.prompts) == 1
+    assert results[1].role_relevance == results[2].role_relevance == 91
+    assert (scorer._cache.hits, scorer._cache.misses) == (1, 1)
+
+    rerun_llm = StubLLM()
+    rerun = dict(_scorer(repo, rerun_llm).score_jobs_parallel([_row(3)], "profile"))
+    assert rerun_llm.prompts == []
+    assert rerun[3].role_relevance == 91
+
+
+def test_profile_change_misses_cache(tmp_path):
+    repo = _repo(tmp_path)
+    list(_scorer(repo, StubLLM([_payload()])).score_jobs_parallel([_row(1)], "profile"))
+
+    llm = StubLLM([_payload(candidate_fit=10)])
+    results = dict(_scorer(repo, llm).score_jobs_parallel([_row(1)], "new profile"))
+
+    assert len(llm.prompts) == 1
+    assert results[1].candidate_fit == 10
+
+
+def test_failed_scores_are_not_cached(tmp_path):
+    repo = _repo(tmp_path)
+    list(_scorer(repo, StubLLM([None, None])).score_jobs_parallel([_row(1)], "profile"))
+
+    llm = StubLLM([_payload()])
+    results = dict(_scorer(repo, llm).score_jobs_parallel([_row(1)], "profile"))
+    assert len(llm.prompts) == 1
+    assert results[1] is not None
+
+
+def test_prompt_fields_outside_the_description_change_the_key(tmp_path):
+    repo = _repo(tmp_path)
+    list(_scorer(repo, StubLLM([_payload()])).score_jobs_parallel([_row(1)], "profile"))
+
+    for change in ({"is_remote": False}, {"salary_text": "EUR 90k"}, {"mission_category": "health"}):
+        llm = StubLLM([_payload()])
+        list(_scorer(repo, llm).score_jobs_parallel([{**_row(1), **change}], "profile"))
+        assert len(llm.prompts) == 1, change
+
+
+class _FailoverLLM(StubLLM):
+    """Switches to a fallback model on its first call, like GeminiClient on a 404."""
+
+    model = "primary"
+
+    def generate_json(self, prompt, **kwargs):
+        self.model = "fallback"
+        return super().generate_json(prompt, **kwargs)
+
+
+def test_scores_are_stored_under_the_model_that_produced_them(tmp_path):
+    repo = _repo(tmp_path)
+    list(_scorer(repo, _FailoverLLM([_payload()])).score_jobs_parallel([_row(1)], "profile"))
+
+    on_fallback = StubLLM()
+    on_fallback.model = "fallback"
+    assert dict(_scorer(repo, on_fallback).score_jobs_parallel([_row(1)], "profile"))[1] is not None
+    assert on_fallback.prompts == []
+
+    on_primary = StubLLM([_payload()])
+    on_primary.model = "primary"
+    list(_scorer(repo, on_primary).score_jobs_parallel([_row(1)], "profile"))
+    assert len(on_primary.prompts) == 1
+
+
+class _BudgetBlownLLM(StubLLM):
+    def generate_json(self, prompt, **kwargs):
+        raise BudgetExhausted("spent")
+
+
+def test_budget_skipped_jobs_are_not_counted_as_misses(tmp_path):
+    scorer = _scorer(_repo(tmp_path), _BudgetBlownLLM())
+
+    results = dict(scorer.score_jobs_parallel([_row(1), {**_row(2), "title": "ML Engineer"}], "profile"))
+
+    assert results == {1: None, 2: None}
+    assert (scorer._cache.hits, scorer._cache.misses, scorer._cache.budget_skipped) == (0, 0, 2)
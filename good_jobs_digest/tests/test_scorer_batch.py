@@ -6,6 +6,7 @@ from unittest.mock import patch
 
 from config import Settings
 from normalize.schema import JobScorePayload
+from rank.batch_packing import BatchSizeLearner, pack_batches
 from rank.scorer import JobScorer, _loads_json_response
 from tests.stub_llm import StubLLM
 
@@ -75,3 +76,54 @@ def test_score_chunk_splits_on_batch_failure():
     assert len(results) == 2
     assert results[0][1] is not None
     assert results[1][1] is not None
+
+
+def test_pack_batches_groups_similar_lengths_within_budget():
+    items = [("long", 900), ("a", 100), ("b", 120), ("c", 110), ("huge", 5000)]
+    batches = pack_batches(items, max_jobs=3, token_budget=1000)
+    assert batches == [["a", "c", "b"], ["long"], ["huge"]]
+
+
+def test_batch_size_learner_grows_halves_and_persists(tmp_path):
+    path = tmp_path / "sizes.json"
+    learner = BatchSizeLearner(path, initial=4, ceiling=6)
+    learner.record("m", 4, True)
+    learner.record("m", 3, True)  # below the limit: says nothing new
+    assert learner.limit("m") == 5
+    learner.record("m", 5, False)
+    assert learner.limit("m") == 2
+    assert learner.limit("other") == 4
+    learner.save()
+    assert BatchSizeLearner(path, initial=4, ceiling=6).limit("m") == 2
+
+
+def test_failed_batch_lowers_size_for_rest_of_run():
+    settings = Settings()
+    settings.LLM_SCORE_BATCH_SIZE = 4
+    settings.LLM_SCORE_WORKERS = 1
+    # 4-job batch fails at both temperatures, then the halves parse.
+    two = {"scores": [_payload(), _payload()]}
+    llm = StubLLM([None, None, two, two])
+    scorer = JobScorer(settings, llm=llm)
+
+    results = dict(scorer.score_jobs_parallel([_row(i) for i in range(1, 5)], "profile"))
+
+    assert len(llm.prompts) == 4
+    assert all(results[i] is not None for i in range(1, 5))
+    assert scorer._batch_sizes.limit(settings.GEMINI_MODEL) == 3  # halved to 2, then +1
+
+
+def test_unanswered_batch_keeps_learned_size():
+    settings = Settings()
+    settings.LLM_SCORE_BATCH_SIZE = 4
+    settings.LLM_SCORE_WORKERS = 1
+    # The 4-job batch gets no reply (network error / 5xx), then the halves parse.
+    two = {"scores": [_payload(), _payload()]}
+    llm = StubLLM([None, None, two, two])
+    llm.last_call_unanswered = True
+    scorer = JobScorer(settings, llm=llm)
+
+    results = dict(scorer.score_jobs_parallel([_row(i) for i in range(1, 5)], "profile"))
+
+    assert all(results[i] is not None for i in range(1, 5))
+    assert scorer._batch_sizes.limit(settings.GEMINI_MODEL) == 4
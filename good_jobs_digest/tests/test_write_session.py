@@ -0,0 +1,137 @@
+"""Tests for the batched SQLite write path (write_session, bulk upsert)."""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from config import Settings
+from core.persist import persist_normalized_job, persist_normalized_jobs
+from storage.repository import JobRepository, content_hash
+
+
+def _job(sid: str, desc: str = "v1", **overrides):
+    job = dict(
+        company_name="Co",
+        mission_category=None,
+        ats_type="greenhouse",
+        ats_slug="co",
+        source="greenhouse",
+        source_job_id=sid,
+        title="Data Engineer",
+        url=f"http://u/{sid}",
+        location_text=None,
+        is_remote=False,
+        salary_text=None,
+        description_text=desc,
+        chash=content_hash(desc),
+    )
+    job.update(overrides)
+    return job
+
+
+def _count(db) -> int:
+    conn = sqlite3.connect(db)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_upsert_jobs_matches_sequential_upserts(tmp_path):
+    batch = [_job("1"), _job("2"), _job("1"), _job("2", desc="v2")]
+    seq_repo = JobRepository(tmp_path / "seq.db")
+    seq_repo.init_db()
+    sequential = [seq_repo.upsert_job(**job, now_iso="2026-05-01T10:00:00+00:00") for job in batch]
+
+    repo = JobRepository(tmp_path / "bulk.db")
+    repo.init_db()
+    bulk = repo.upsert_jobs(batch, now_iso="2026-05-01T10:00:00+00:00")
+
+    assert bulk == sequential == [(1, True), (2, True), (1, False), (2, True)]
+    assert repo.get_job(2)["description_text"] == "v2"
+
+
+def test_upsert_jobs_content_change_clears_scores(tmp_path):
+    repo = JobRepository(tmp_path / "t.db")
+    repo.init_db()
+    repo.upsert_jobs([_job("1"), _job("2")], now_iso="2026-05-01T10:00:00+00:00")
+    repo.set_prefilters([(1, True, None), (2, True, None)])
+    for jid in (1, 2):
+        repo.save_score(jid, relevance=80, mission=80, fit=80, remote_ok=True, combined=80.0, llm_payload={})
+
+    repo.upsert_jobs([_job("1"), _job("2", desc="v2")], now_iso="2026-05-02T10:00:00+00:00")
+
+    same, changed = repo.get_job(1), repo.get_job(2)
+    assert same["combined_score"] == 80.0
+    assert same["last_changed_at"] == "2026-05-01T10:00:00+00:00"
+    assert same["last_seen_at"] == "2026-05-02T10:00:00+00:00"
+    assert changed["combined_score"] is None
+    assert changed["last_scored_at"] is None
+    assert changed["last_changed_at"] == "2026-05-02T10:00:00+00:00"
+
+
+def test_write_session_commits_once_on_exit(tmp_path):
+    db = tmp_path / "t.db"
+    repo = JobRepository(db)
+    repo.init_db()
+    with repo.write_session():
+        repo.upsert_job(**_job("1"))
+        repo.touch_board_jobs("greenhouse", "co", ["1"], "2026-06-01T00:00:00+00:00")
+        assert repo.get_job(1)["last_seen_at"] == "2026-06-01T00:00:00+00:00"
+        assert _count(db) == 0  # not visible to other connections yet
+    assert _count(db) == 1
+
+
+def test_write_session_rolls_back_on_error(tmp_path):
+    db = tmp_path / "t.db"
+    repo = JobRepository(db)
+    repo.init_db()
+    with pytest.raises(RuntimeError):
+        with repo.write_session():
+            repo.upsert_job(**_job("1"))
+            raise RuntimeError("boom")
+    assert _count(db) == 0
+    repo.upsert_job(**_job("1"))  # repository still usable outside a session
+    assert _count(db) == 1
+
+
+def test_persist_normalized_jobs_merges_duplicates_within_batch(tmp_path):
+    settings = Settings()
+    norms = [
+        {
+            "company_name": "Co",
+            "ats_type": "job_board",
+            "ats_slug": "climatebase",
+            "source": "climatebase",
+            "source_job_id": "cb-1",
+            "title": "Data Engineer",
+            "url": "https://climatebase.org/job/1",
+            "location_text": "Berlin, Germany",
+            "description_text": "desc",
+        },
+        {
+            "company_name": "Co",
+            "ats_type": "greenhouse",
+            "ats_slug": "co",
+            "source": "greenhouse",
+            "source_job_id": "gh-1",
+            "title": "Data Engineer",
+            "url": "https://boards.greenhouse.io/co/jobs/1",
+            "location_text": "Berlin, Germany",
+            "description_text": "desc",
+        },
+    ]
+    seq_repo = JobRepository(tmp_path / "seq.db")
+    seq_repo.init_db()
+    sequential = [persist_normalized_job(seq_repo, settings, n) for n in norms]
+
+    repo = JobRepository(tmp_path / "bulk.db")
+    repo.init_db()
+    bulk = persist_normalized_jobs(repo, settings, norms)
+
+    assert bulk == sequential
+    assert _count(tmp_path / "bulk.db") == _count(tmp_path / "seq.db") == 2
+    assert repo.get_job(bulk[1])["source"] == seq_repo.get_job(sequential[1])["source"] == "greenhouse"
+    assert repo.get_job(bulk[1])["prefilter_pass"] == 1
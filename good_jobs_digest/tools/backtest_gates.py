@@ -2,7 +2,7 @@
 """Replay the current title gate over stored jobs (read-only) and report deltas.
 
 Compares each row's stored prefilter_pass (decided at ingest time) with what
-rank.prefilter.evaluate_title decides today using the live settings, so keyword
+rank.prefilter decides today using the live settings, so keyword
 or gate changes can be validated against real data before a rescore.
 
 Usage: python tools/backtest_gates.py [--db data/jobs.db] [--samples 12]
@@ -19,7 +19,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from config import settings  # noqa: E402
-from rank.prefilter import evaluate_title  # noqa: E402
+from rank.prefilter import title_gate  # noqa: E402
 
 
 def _reason_bucket(reason: str | None) -> str:
@@ -43,11 +43,6 @@ def main() -> int:
     ).fetchall()
     conn.close()
 
-    kw = dict(
-        include_keywords=settings.TARGET_ROLE_KEYWORDS,
-        exclude_keywords=settings.EXCLUDE_TITLE_KEYWORDS,
-        seniority_exclude_keywords=settings.SENIORITY_EXCLUDE_KEYWORDS,
-    )
 
     now_pass = 0
     gained: list[sqlite3.Row] = []
@@ -56,8 +51,8 @@ def main() -> int:
     gained_by_source: Counter[str] = Counter()
     digested_lost: list[tuple[sqlite3.Row, str]] = []
 
-    for row in rows:
-        verdict = evaluate_title(row["title"], **kw)
+    verdicts = title_gate(settings).evaluate_titles(row["title"] for row in rows)
+    for row, verdict in zip(rows, verdicts):
         if verdict.passed:
             now_pass += 1
         old = bool(row["prefilter_pass"])
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Replay the embedding pre-ranker over already-scored jobs and report recall.
+
+A job counts as a good match when its stored LLM scores would put it in the
+digest (combined_score >= --min-combined and fit_score >= MIN_CANDIDATE_FIT).
+For a range of similarity cutoffs the report shows how many jobs would still be
+sent to the LLM and what share of the good matches survives, so
+PRERANK_MIN_SIMILARITY can be set from real data. Job vectors computed here are
+stored in the db and reused by the next score run, as is the TF-IDF table when
+that backend is in use.
+
+Usage: python tools/backtest_prerank.py [--db data/jobs.db] [--min-combined 60] [--target-recall 0.95]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import settings  # noqa: E402
+from profile.preferences import load_preferences, render_scoring_context  # noqa: E402
+from rank.preranker import PreRanker, TfidfBackend, load_backend, recall_curve  # noqa: E402
+from storage.repository import JobRepository  # noqa: E402
+
+
+def _quantiles(values: list[float], steps: int) -> list[float]:
+    ordered = sorted(values)
+    return sorted({ordered[min(len(ordered) - 1, len(ordered) * i // steps)] for i in range(steps)})
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db", default=str(settings.SQLITE_PATH))
+    parser.add_argument("--min-combined", type=float, default=60.0)
+    parser.add_argument("--target-recall", type=float, default=0.95)
+    parser.add_argument("--steps", type=int, default=20, help="cutoffs tried (similarity quantiles)")
+    parser.add_argument("--samples", type=int, default=8)
+    args = parser.parse_args()
+
+    prefs = load_preferences(settings.PREFERENCES_PATH)
+    if not prefs:
+        print(f"No preferences at {settings.PREFERENCES_PATH} — nothing to rank against")
+        return 1
+
+    repo = JobRepository(Path(args.db))
+    repo.init_db()
+    conn = sqlite3.connect(args.db)
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute(
+        "SELECT id, title, company_name, description_text, combined_score, fit_score"
+        " FROM jobs WHERE combined_score IS NOT NULL"
+    ).fetchall()
+    conn.close()
+    if not rows:
+        print("No scored jobs yet")
+        return 1
+
+    backend = load_backend(settings)
+    sims = PreRanker(repo, backend, render_scoring_context(prefs)).similarities(rows)
+    scores = [sims[int(r["id"])] for r in rows]
+    positives = [
+        float(r["combined_score"]) >= args.min_combined
+        and (r["fit_score"] or 0) >= settings.MIN_CANDIDATE_FIT
+        for r in rows
+    ]
+    points = recall_curve(scores, positives, _quantiles(scores, max(2, args.steps)))
+
+    n_pos = sum(positives)
+    print(f"Backend: {backend.name} | scored jobs: {len(rows)} | good matches: {n_pos}")
+    if isinstance(backend, TfidfBackend):
+        print(f"TF-IDF fitted over {backend.fitted_docs} stored jobs ({settings.PRERANK_IDF_PATH})")
+    print(f"Current PRERANK_MIN_SIMILARITY: {settings.PRERANK_MIN_SIMILARITY}")
+    print()
+    print(f"  {'cutoff':>8}  {'to LLM':>8}  {'saved':>6}  {'recall':>6}")
+    for p in points:
+        saved = 1 - p.kept / len(rows)
+        print(f"  {p.cutoff:8.4f}  {p.kept:8d}  {saved:6.0%}  {p.recall:6.1%}")
+    print()
+
+    good = [p for p in points if p.recall >= args.target_recall]
+    if good:
+        best = max(good, key=lambda p: p.cutoff)
+        print(
+            f"Highest cutoff keeping >= {args.target_recall:.0%} of good matches: "
+            f"{best.cutoff:.4f} ({len(rows) - best.kept} of {len(rows)} LLM calls saved)"
+        )
+        missed = sorted(
+            (r for r, s, pos in zip(rows, scores, positives) if pos and s < best.cutoff),
+            key=lambda r: -float(r["combined_score"]),
+        )
+        for r in missed[: args.samples]:
+            print(f"    - {r['title']} — {r['company_name']} (combined {r['combined_score']:.0f})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())